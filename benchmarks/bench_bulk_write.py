@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Write throughput: per-row ORM ingest vs the bulk upsert layer.
+
+Ingests synthetic conversations with messages (Claude.ai API payload
+shape) into a fresh database, then ingests the same payloads again:
+
+  * before: one ``filter_by(id=...)`` lookup per conversation, then ORM
+    objects added or mutated one by one (the old sync/migration path)
+  * after: BulkWriter, SQLite ``INSERT ... ON CONFLICT DO UPDATE`` run as
+    chunked executemany
+
+Reports rows (conversations + messages) per second for both passes.
+
+Usage: python benchmarks/bench_bulk_write.py [--conversations 2000] [--messages 10]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy.orm import sessionmaker
+
+from src.models.bulk import BulkWriter, api_conversation_row, api_message_rows, parse_api_datetime
+from src.models.conversation import Conversation, Message, init_database
+from src.models.database import dispose_engines
+from synthetic import WORDS
+
+
+def make_payloads(conversations: int, messages: int) -> list:
+    body = " ".join(WORDS[:200])
+    return [
+        {
+            "uuid": f"conv-{i:06d}",
+            "name": f"Conversation {i}",
+            "created_at": "2025-01-01T00:00:00Z",
+            "updated_at": "2025-01-02T00:00:00Z",
+            "model": "claude",
+            "message_count": messages,
+            "chat_messages": [
+                {"uuid": f"conv-{i:06d}-{j}", "sender": "human" if j % 2 == 0 else "assistant",
+                 "text": body, "index": j, "created_at": "2025-01-01T00:00:00Z"}
+                for j in range(messages)
+            ],
+        }
+        for i in range(conversations)
+    ]
+
+
+def orm_ingest(engine, payloads: list):
+    Session = sessionmaker(bind=engine)
+    session = Session()
+    try:
+        for conv_data in payloads:
+            conv = session.query(Conversation).filter_by(id=conv_data["uuid"]).first()
+            if conv:
+                conv.title = conv_data.get("name", "Untitled")
+                conv.updated_at = parse_api_datetime(conv_data.get("updated_at"))
+                conv.model = conv_data.get("model", "unknown")
+                conv.message_count = conv_data.get("message_count", 0)
+            else:
+                session.add(Conversation(
+                    id=conv_data["uuid"],
+                    title=conv_data.get("name", "Untitled"),
+                    created_at=parse_api_datetime(conv_data.get("created_at")),
+                    updated_at=parse_api_datetime(conv_data.get("updated_at")),
+                    model=conv_data.get("model", "unknown"),
+                    message_count=conv_data.get("message_count", 0),
+                ))
+            for row in api_message_rows(conv_data):
+                msg = session.query(Message).filter_by(id=row["id"]).first()
+                if msg:
+                    msg.content = row["content"]
+                    msg.role = row["role"]
+                else:
+                    session.add(Message(**row))
+            session.commit()
+    finally:
+        session.close()
+
+
+def bulk_ingest(engine, payloads: list):
+    writer = BulkWriter(engine)
+    writer.upsert_conversations([api_conversation_row(conv_data) for conv_data in payloads])
+    writer.upsert_messages([row for conv_data in payloads for row in api_message_rows(conv_data)])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark conversation/message write throughput")
+    parser.add_argument("--conversations", type=int, default=2000)
+    parser.add_argument("--messages", type=int, default=10, help="Messages per conversation")
+    args = parser.parse_args()
+
+    payloads = make_payloads(args.conversations, args.messages)
+    rows = args.conversations * (1 + args.messages)
+    print(f"{args.conversations} conversations x {args.messages} messages = {rows} rows per pass")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, ingest in (("before: per-row ORM", orm_ingest), ("after: bulk upsert", bulk_ingest)):
+            engine = init_database(str(Path(tmp) / f"{ingest.__name__}.db"))
+            for phase in ("first ingest", "re-ingest"):
+                start = time.perf_counter()
+                ingest(engine, payloads)
+                elapsed = time.perf_counter() - start
+                print(f"{label:22s} {phase:13s} {elapsed:7.2f} s  {rows / elapsed:10.0f} rows/s")
+            dispose_engines()
+
+
+if __name__ == "__main__":
+    main()
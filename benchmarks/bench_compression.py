@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Compressed content storage: database size, ingest throughput, read latency.
+
+Ingests the same synthetic conversations (long assistant messages with a
+Zipf-distributed vocabulary, closer to real prose than uniform random
+words) into a fresh database per mode:
+
+  * off:  plain TEXT (MCP_CONTENT_COMPRESSION unset)
+  * zlib: level 6
+  * zstd: level 3 with a dictionary trained on the "off" database
+
+and reports the database file size, message ingest rate through
+BulkWriter, and the latency of loading a conversation's messages through
+the ORM (decompression included). The FTS tables still hold their own
+uncompressed copy, so "table bytes" (sum of stored content lengths) shows
+the content saving separately from the file size.
+
+Usage: python benchmarks/bench_compression.py [--conversations 2000] [--messages 10]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import select, text
+from sqlalchemy.orm import Session
+
+from deployment.scripts.compress_content import train_dictionary
+from src.models.bulk import BulkWriter
+from src.models.compression import reset_codec
+from src.models.conversation import Message, init_database
+from src.models.database import dispose_engines
+from synthetic import WORDS
+
+# 1/rank word frequencies, like natural language
+WEIGHTS = [1 / rank for rank in range(1, len(WORDS) + 1)]
+
+
+def prose(rng: random.Random, words: int) -> str:
+    sentences = []
+    while words > 0:
+        length = min(words, rng.randint(8, 24))
+        sentences.append(" ".join(rng.choices(WORDS, WEIGHTS, k=length)).capitalize() + ".")
+        words -= length
+    return " ".join(sentences)
+
+
+def make_rows(conversations: int, messages: int, seed: int = 42):
+    rng = random.Random(seed)
+    conversation_rows, message_rows = [], []
+    for i in range(conversations):
+        conv_id = f"conv-{i:06d}"
+        conversation_rows.append({"id": conv_id, "title": f"Conversation {i}", "message_count": messages})
+        for j in range(messages):
+            # Short questions, long answers
+            words = rng.randint(10, 40) if j % 2 == 0 else rng.randint(150, 600)
+            message_rows.append({
+                "id": f"{conv_id}-{j}", "conversation_id": conv_id,
+                "role": "user" if j % 2 == 0 else "assistant",
+                "content": prose(rng, words), "created_at": None, "index": j, "extra_data": {},
+            })
+    return conversation_rows, message_rows
+
+
+def run(db_path: Path, conversation_rows, message_rows, samples: int = 500):
+    engine = init_database(str(db_path))
+    writer = BulkWriter(engine)
+    start = time.perf_counter()
+    writer.upsert_conversations(conversation_rows)
+    writer.upsert_messages(message_rows)
+    ingest = time.perf_counter() - start
+
+    with engine.connect() as conn:
+        conn.execute(text("PRAGMA wal_checkpoint(TRUNCATE)"))
+        table_bytes = conn.execute(text("SELECT sum(length(content)) FROM messages")).scalar()
+
+    rng = random.Random(7)
+    ids = [row["id"] for row in conversation_rows]
+    latencies = []
+    with Session(engine) as session:
+        for conv_id in rng.sample(ids, min(samples, len(ids))):
+            start = time.perf_counter()
+            messages = session.scalars(
+                select(Message).where(Message.conversation_id == conv_id).order_by(Message.index)
+            ).all()
+            [message.to_dict() for message in messages]
+            latencies.append((time.perf_counter() - start) * 1000)
+            session.expunge_all()
+
+    latencies.sort()
+    return {
+        "file_mb": db_path.stat().st_size / 1e6,
+        "table_mb": table_bytes / 1e6,
+        "rows_per_second": len(message_rows) / ingest,
+        "p50_ms": statistics.median(latencies),
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark compressed content storage")
+    parser.add_argument("--conversations", type=int, default=2000)
+    parser.add_argument("--messages", type=int, default=10, help="Messages per conversation")
+    args = parser.parse_args()
+
+    conversation_rows, message_rows = make_rows(args.conversations, args.messages)
+    raw_mb = sum(len(row["content"].encode()) for row in message_rows) / 1e6
+    print(f"{args.conversations} conversations, {len(message_rows)} messages, {raw_mb:.1f} MB of message text")
+    print(f"{'mode':6s} {'file MB':>8s} {'table MB':>9s} {'ingest rows/s':>14s} {'read p50 ms':>12s} {'p95 ms':>7s}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        modes = [("off", {}), ("zlib", {})]
+        try:
+            import zstandard  # noqa: F401
+            modes.append(("zstd", {"MCP_ZSTD_DICTIONARY": str(Path(tmp) / "content.zdict")}))
+        except ImportError:
+            print("zstandard not installed; skipping zstd")
+
+        for mode, env in modes:
+            if mode == "zstd":
+                train_dictionary(str(Path(tmp) / "off.db"), env["MCP_ZSTD_DICTIONARY"])
+            os.environ["MCP_CONTENT_COMPRESSION"] = mode
+            os.environ.update(env)
+            reset_codec()
+
+            result = run(Path(tmp) / f"{mode}.db", conversation_rows, message_rows)
+            print(f"{mode:6s} {result['file_mb']:8.1f} {result['table_mb']:9.1f} "
+                  f"{result['rows_per_second']:14.0f} {result['p50_ms']:12.2f} {result['p95_ms']:7.2f}")
+        dispose_engines()
+
+
+if __name__ == "__main__":
+    main()
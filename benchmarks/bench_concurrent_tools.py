@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Concurrent tool-call latency: blocking ORM handlers vs the async store.
+
+Builds a synthetic database, then fires a steady stream of cheap
+``get_conversation`` calls interleaved with expensive ``bulk_operations``
+analyze calls, all on one event loop. The "before" handlers run sync
+SQLAlchemy ORM queries directly on the loop (as the server used to); the
+"after" handlers go through ConversationStore on aiosqlite.
+
+Usage: python benchmarks/bench_concurrent_tools.py [--conversations 2000]
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy.orm import sessionmaker
+
+from src.models.conversation import Conversation, Message, init_database
+from src.models.store import ConversationStore
+from synthetic import populate
+
+
+class BlockingHandlers:
+    """The pre-store handlers: sync ORM calls made directly on the event loop."""
+
+    def __init__(self, db_path: str):
+        self.Session = sessionmaker(bind=init_database(db_path))
+
+    async def get_conversation(self, conversation_id: str):
+        session = self.Session()
+        try:
+            conv = session.query(Conversation).filter_by(id=conversation_id).first()
+            messages = session.query(Message).filter_by(
+                conversation_id=conversation_id
+            ).order_by(Message.index).all()
+            result = conv.to_dict()
+            result["messages"] = [msg.to_dict() for msg in messages]
+            return result
+        finally:
+            session.close()
+
+    async def analyze(self, conversation_ids: list):
+        session = self.Session()
+        try:
+            total_chars = 0
+            for conv_id in conversation_ids:
+                messages = session.query(Message).filter_by(conversation_id=conv_id).all()
+                total_chars += sum(len(msg.content) for msg in messages)
+            return total_chars
+        finally:
+            session.close()
+
+    async def close(self):
+        pass
+
+
+class StoreHandlers:
+    """Handlers going through the async ConversationStore."""
+
+    def __init__(self, db_path: str):
+        self.store = ConversationStore(db_path)
+
+    async def get_conversation(self, conversation_id: str):
+        return await self.store.get_conversation(conversation_id)
+
+    async def analyze(self, conversation_ids: list):
+        return await self.store.analyze_conversations(conversation_ids)
+
+    async def close(self):
+        await self.store.close()
+
+
+async def run_workload(handlers, ids: list, calls: int, interval: float, analyze_every: int) -> dict:
+    """Issue calls at a fixed arrival rate and record each call's latency."""
+    latencies = {"get_conversation": [], "analyze": []}
+    rng = random.Random(42)
+
+    async def timed(kind: str, arrived: float, coro):
+        # Measured from arrival so time spent waiting for a blocked loop counts
+        await coro
+        latencies[kind].append(time.perf_counter() - arrived)
+
+    tasks = []
+    start = time.perf_counter()
+    for i in range(calls):
+        arrived = start + i * interval
+        if i % analyze_every == 0:
+            coro = timed("analyze", arrived, handlers.analyze(rng.sample(ids, 500)))
+        else:
+            coro = timed("get_conversation", arrived, handlers.get_conversation(rng.choice(ids)))
+        tasks.append(asyncio.create_task(coro))
+        # Sleep until the next scheduled arrival (no-op if the loop fell behind)
+        await asyncio.sleep(max(0.0, start + (i + 1) * interval - time.perf_counter()))
+
+    await asyncio.gather(*tasks)
+    await handlers.close()
+    return latencies
+
+
+def percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def report(label: str, latencies: dict):
+    print(f"{label}")
+    for kind, values in latencies.items():
+        print(
+            f"  {kind:17s} n={len(values):4d}  "
+            f"p50 {statistics.median(values) * 1000:8.1f} ms  "
+            f"p99 {percentile(values, 99) * 1000:8.1f} ms  "
+            f"max {max(values) * 1000:8.1f} ms"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark concurrent tool-call latency")
+    parser.add_argument("--conversations", type=int, default=2000)
+    parser.add_argument("--messages", type=int, default=20, help="Messages per conversation")
+    parser.add_argument("--calls", type=int, default=400)
+    parser.add_argument("--interval-ms", type=float, default=8.0, help="Time between call arrivals")
+    parser.add_argument("--analyze-every", type=int, default=20, help="Every Nth call is an analyze")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = str(Path(tmp) / "bench.db")
+        ids = populate(db_path, args.conversations, args.messages)
+        print(f"Database: {args.conversations} conversations x {args.messages} messages")
+
+        for label, factory in (("before: blocking ORM on event loop", BlockingHandlers),
+                               ("after: async ConversationStore", StoreHandlers)):
+            latencies = asyncio.run(run_workload(
+                factory(db_path), ids, args.calls, args.interval_ms / 1000, args.analyze_every
+            ))
+            report(label, latencies)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+FTS rebuild: one 'rebuild' transaction vs the chunked shadow-table rebuild.
+
+Fills a database with synthetic messages, then rebuilds both FTS indexes
+twice while a writer thread upserts one message at a time and a reader
+thread runs searches:
+
+  * single: rebuild_fts() in one transaction (what rebuild_search_index did)
+  * chunked: FTSRebuilder, ``--batch-size`` rows per transaction, into
+    shadow tables swapped in at the end
+
+Reports the rebuild time and write/search latency while it runs. Writers
+queue behind the rebuild's write lock, so the worst write latency is the
+number to watch.
+
+Usage: python benchmarks/bench_fts_rebuild.py [--conversations 2000] [--messages 20]
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import text
+
+from src.models.bulk import BulkWriter
+from src.models.conversation import init_database, rebuild_fts
+from src.models.database import dispose_engines
+from src.models.fts_rebuild import FTSRebuilder
+from synthetic import random_text
+
+
+def populate(engine, conversations: int, messages: int, words: int):
+    rng = random.Random(42)
+    writer = BulkWriter(engine)
+    writer.upsert_conversations([
+        {"id": f"conv-{i:06d}", "title": f"Conversation {i}", "search_vector": random_text(rng, 50)}
+        for i in range(conversations)
+    ])
+    writer.upsert_messages([
+        {"id": f"conv-{i:06d}-{j}", "conversation_id": f"conv-{i:06d}", "role": "user",
+         "content": random_text(rng, words), "created_at": None, "index": j, "extra_data": {}}
+        for i in range(conversations) for j in range(messages)
+    ])
+
+
+def load(engine, stop: threading.Event, writes: list, reads: list):
+    """Upsert one message and run one search at a time until stopped"""
+    rng = random.Random(7)
+    writer = BulkWriter(engine)
+    i = 0
+    while not stop.is_set():
+        start = time.perf_counter()
+        writer.upsert_messages([{"id": f"live-{i}", "conversation_id": "conv-000000", "role": "user",
+                                 "content": random_text(rng, 50), "created_at": None,
+                                 "index": 100000 + i, "extra_data": {}}])
+        writes.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        with engine.connect() as conn:
+            conn.execute(text(
+                "SELECT rowid FROM messages_fts WHERE messages_fts MATCH :q ORDER BY rank LIMIT 20"
+            ), {"q": rng.choice(["alpha", "sqlite", "index", "search"])}).all()
+        reads.append((time.perf_counter() - start) * 1000)
+        i += 1
+        time.sleep(0.005)
+
+
+def run(label: str, engine, rebuild):
+    stop = threading.Event()
+    writes, reads = [], []
+    thread = threading.Thread(target=load, args=(engine, stop, writes, reads))
+    thread.start()
+    time.sleep(0.2)
+    start = time.perf_counter()
+    rebuild()
+    elapsed = time.perf_counter() - start
+    stop.set()
+    thread.join()
+
+    writes.sort()
+    print(f"{label:8s} {elapsed:9.2f} {len(writes):7d} {statistics.median(writes):9.1f} "
+          f"{writes[int(len(writes) * 0.99) - 1]:9.1f} {writes[-1]:9.1f} {max(reads):10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark FTS rebuilds under concurrent load")
+    parser.add_argument("--conversations", type=int, default=2000)
+    parser.add_argument("--messages", type=int, default=20, help="Messages per conversation")
+    parser.add_argument("--words", type=int, default=200, help="Words per message")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Rows per chunk for the chunked rebuild")
+    parser.add_argument("--pause", type=float, default=0.05, help="Seconds between chunks")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = init_database(str(Path(tmp) / "conversations.db"))
+        populate(engine, args.conversations, args.messages, args.words)
+        print(f"{args.conversations} conversations x {args.messages} messages of {args.words} words")
+        print(f"{'mode':8s} {'rebuild s':>9s} {'writes':>7s} {'p50 ms':>9s} {'p99 ms':>9s} "
+              f"{'max ms':>9s} {'search max':>10s}")
+
+        def single():
+            with engine.begin() as conn:
+                rebuild_fts(conn)
+
+        run("single", engine, single)
+        run("chunked", engine, FTSRebuilder(engine, batch_size=args.batch_size, pause=args.pause).rebuild)
+        dispose_engines()
+
+
+if __name__ == "__main__":
+    main()
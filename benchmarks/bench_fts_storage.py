@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+FTS storage: regular FTS5 tables vs external-content tables.
+
+Ingests synthetic conversations with messages into two fresh databases:
+
+  * before: the old schema, where conversations_fts and messages_fts are
+    regular FTS5 tables holding a second copy of every text, kept in sync
+    by UPDATE triggers
+  * after: the current schema, external-content FTS5 tables over views
+    of conversations and messages, kept in sync by delete/insert trigger
+    pairs that only fire when indexed columns change
+
+Reports the file size after ingest, ingest and re-write throughput (a
+pass that changes the content of ``--rewrites`` messages, then one that
+only retags conversations), and how long init_database takes to migrate
+the "before" database in place.
+
+Usage: python benchmarks/bench_fts_storage.py [--conversations 2000] [--messages 10]
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import text
+
+from src.models.bulk import BulkWriter
+from src.models.conversation import drop_fts_triggers, init_database
+from src.models.database import dispose_engines
+from synthetic import random_text
+
+LEGACY_FTS = [
+    "CREATE VIRTUAL TABLE conversations_fts USING fts5(id UNINDEXED, title, content, tokenize='porter unicode61')",
+    "CREATE VIRTUAL TABLE messages_fts USING fts5(id UNINDEXED, conversation_id UNINDEXED, content,"
+    " tokenize='porter unicode61')",
+    """CREATE TRIGGER conversations_ai AFTER INSERT ON conversations BEGIN
+        INSERT INTO conversations_fts(id, title, content) VALUES (new.id, new.title, new.search_vector);
+    END""",
+    """CREATE TRIGGER conversations_au AFTER UPDATE ON conversations BEGIN
+        UPDATE conversations_fts SET title = new.title, content = new.search_vector WHERE id = new.id;
+    END""",
+    """CREATE TRIGGER conversations_ad AFTER DELETE ON conversations BEGIN
+        DELETE FROM conversations_fts WHERE id = old.id;
+    END""",
+    """CREATE TRIGGER messages_ai AFTER INSERT ON messages BEGIN
+        INSERT INTO messages_fts(id, conversation_id, content) VALUES (new.id, new.conversation_id, new.content);
+    END""",
+    """CREATE TRIGGER messages_au AFTER UPDATE ON messages BEGIN
+        UPDATE messages_fts SET content = new.content WHERE id = new.id;
+    END""",
+    """CREATE TRIGGER messages_ad AFTER DELETE ON messages BEGIN
+        DELETE FROM messages_fts WHERE id = old.id;
+    END""",
+]
+
+
+def legacy_database(db_path: str):
+    engine = init_database(db_path)
+    with engine.begin() as conn:
+        drop_fts_triggers(conn)
+        for name in ("conversations_fts", "messages_fts"):
+            conn.execute(text(f"DROP TABLE {name}"))
+            conn.execute(text(f"DROP VIEW {name}_source"))
+        for ddl in LEGACY_FTS:
+            conn.execute(text(ddl))
+    return engine
+
+
+def make_rows(conversations: int, messages: int, words: int, seed: int = 42):
+    rng = random.Random(seed)
+    conversation_rows = [
+        {"id": f"conv-{i:06d}", "title": f"Conversation {i}", "search_vector": random_text(rng, 50), "tags": []}
+        for i in range(conversations)
+    ]
+    message_rows = [
+        {"id": f"conv-{i:06d}-{j}", "conversation_id": f"conv-{i:06d}", "role": "user",
+         "content": random_text(rng, words), "created_at": None, "index": j, "extra_data": {}}
+        for i in range(conversations) for j in range(messages)
+    ]
+    return conversation_rows, message_rows
+
+
+def file_mb(engine, db_path: Path) -> float:
+    with engine.connect() as conn:
+        conn.execute(text("PRAGMA wal_checkpoint(TRUNCATE)"))
+    return db_path.stat().st_size / 1e6
+
+
+def timed(label: str, rows: int, fn):
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:28s} {elapsed:7.2f} s  {rows / elapsed:9.0f} rows/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark FTS5 storage layouts")
+    parser.add_argument("--conversations", type=int, default=2000)
+    parser.add_argument("--messages", type=int, default=10, help="Messages per conversation")
+    parser.add_argument("--words", type=int, default=200, help="Words per message")
+    parser.add_argument("--rewrites", type=int, default=1000,
+                        help="Messages rewritten in the update pass (the old UPDATE triggers scan the FTS table per row)")
+    args = parser.parse_args()
+
+    conversation_rows, message_rows = make_rows(args.conversations, args.messages, args.words)
+    rng = random.Random(1)
+    rewritten = [{**row, "content": random_text(rng, args.words)} for row in message_rows[:args.rewrites]]
+    retagged = [{"id": row["id"], "tags": ["bench"]} for row in conversation_rows]
+    print(f"{args.conversations} conversations x {args.messages} messages of {args.words} words")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, make_engine in (("before: regular FTS5", legacy_database), ("after: external content", init_database)):
+            db_path = Path(tmp) / f"{make_engine.__name__}.db"
+            engine = make_engine(str(db_path))
+            writer = BulkWriter(engine)
+            print(label)
+            timed("ingest", len(message_rows), lambda: (writer.upsert_conversations(conversation_rows),
+                                                         writer.upsert_messages(message_rows)))
+            print(f"  {'file size':28s} {file_mb(engine, db_path):7.1f} MB")
+            timed("rewrite messages", len(rewritten), lambda: writer.upsert_messages(rewritten))
+            timed("retag every conversation", len(retagged),
+                  lambda: writer.upsert_conversations(retagged, columns=["tags"]))
+
+        db_path = Path(tmp) / "legacy_database.db"
+        start = time.perf_counter()
+        engine = init_database(str(db_path))
+        print(f"migrate before -> after in place: {time.perf_counter() - start:.2f} s, "
+              f"{file_mb(engine, db_path):.1f} MB before VACUUM")
+        dispose_engines()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Claude.ai fetch throughput: requests-in-threads vs the aiohttp transport.
+
+Starts the fake claude.ai API (benchmarks/fake_claude_api.py) in a child
+process, then fetches conversations through RateLimitedSession with many
+requests in flight, once with a ``requests.Session`` (run via
+``asyncio.to_thread``, as the server used to) and once with
+AsyncHTTPTransport. Rate limiting is set high enough not to interfere.
+
+Reports throughput, latency percentiles and the peak number of threads.
+
+Usage: python benchmarks/bench_http_transport.py [--requests 1000] [--concurrency 64]
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import requests
+
+from src.utils.http_client import AsyncHTTPTransport, HTTPClientConfig
+from src.utils.rate_limiter import RateLimiter, RateLimitConfig, RateLimitedSession
+from fake_claude_api import serve_in_subprocess
+
+
+async def run_workload(session, base_url: str, total: int, concurrency: int, conversations: int) -> dict:
+    limiter = RateLimiter(RateLimitConfig(requests_per_second=1e6, burst_size=10 ** 6))
+    client = RateLimitedSession(session, limiter)
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    peak_threads = threading.active_count()
+    done = asyncio.Event()
+
+    async def sample_threads():
+        nonlocal peak_threads
+        while not done.is_set():
+            peak_threads = max(peak_threads, threading.active_count())
+            await asyncio.sleep(0.005)
+
+    async def fetch(i: int):
+        url = f"{base_url}/api/organizations/org/chat_conversations/conv-{i % conversations:06d}"
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.get(url, timeout=30)
+            response.json()
+            latencies.append(time.perf_counter() - start)
+
+    sampler = asyncio.create_task(sample_threads())
+    start = time.perf_counter()
+    await asyncio.gather(*(fetch(i) for i in range(total)))
+    wall = time.perf_counter() - start
+    done.set()
+    await sampler
+    await client.close()
+
+    return {"wall": wall, "latencies": latencies, "peak_threads": peak_threads}
+
+
+def percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def report(label: str, result: dict):
+    latencies = result["latencies"]
+    print(
+        f"{label:38s} {len(latencies) / result['wall']:7.0f} req/s  "
+        f"p50 {statistics.median(latencies) * 1000:7.1f} ms  "
+        f"p99 {percentile(latencies, 99) * 1000:7.1f} ms  "
+        f"peak threads {result['peak_threads']}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the claude.ai HTTP transports")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--conversations", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Fake server latency")
+    args = parser.parse_args()
+
+    with serve_in_subprocess("--conversations", str(args.conversations),
+                             "--latency-ms", str(args.latency_ms)) as base_url:
+        print(f"{args.requests} requests, {args.concurrency} in flight, "
+              f"server latency {args.latency_ms:.0f} ms")
+
+        for label, factory in (
+            ("before: requests.Session in threads", requests.Session),
+            ("after: aiohttp transport", lambda: AsyncHTTPTransport(HTTPClientConfig(
+                max_connections=args.concurrency, max_connections_per_host=args.concurrency
+            ))),
+        ):
+            result = asyncio.run(run_workload(
+                factory(), base_url, args.requests, args.concurrency, args.conversations
+            ))
+            report(label, result)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Migration throughput on a synthetic export corpus.
+
+Writes a corpus of exported conversations, half as flat
+``<id>.json`` files and half as bridge ``<id>/metadata.json`` +
+``messages.json`` directories, then migrates it into fresh databases:
+
+  * before: files parsed one by one in the calling process, BulkWriter
+    commits every 500 rows while the FTS triggers index each row (the old
+    DataMigrator path)
+  * after: DataMigrator, parsing and encoding rows on a process pool,
+    1000-conversation transactions, with the FTS triggers left in place
+    so the database stays searchable and writable by the server
+
+Both runs end with searchable FTS tables. A second DataMigrator run over
+the same corpus shows the cost of resuming past checkpointed sources.
+
+Usage: python benchmarks/bench_migration.py [--conversations 50000] [--messages 6] [--workers 4]
+"""
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import text
+
+from deployment.scripts.migrate_data import DataMigrator
+from src.models.bulk import BulkWriter, chunked
+from src.models.conversation import init_database
+from src.models.database import dispose_engines
+from src.models.migration import discover_sources, parse_sources
+from synthetic import random_text
+
+
+def write_corpus(directory: Path, conversations: int, messages: int, words: int, seed: int = 42):
+    rng = random.Random(seed)
+    for i in range(conversations):
+        conv_id = f"conv-{i:06d}"
+        metadata = {"uuid": conv_id, "name": f"Conversation {i} {random_text(rng, 4)}",
+                    "created_at": "2025-01-01T00:00:00Z", "updated_at": "2025-01-02T00:00:00Z",
+                    "model": "claude"}
+        message_list = [
+            {"uuid": f"{conv_id}-{j}", "sender": "human" if j % 2 == 0 else "assistant",
+             "text": random_text(rng, words), "index": j, "created_at": "2025-01-01T00:00:00Z"}
+            for j in range(messages)
+        ]
+        if i % 2:
+            conv_dir = directory / conv_id
+            conv_dir.mkdir()
+            (conv_dir / "metadata.json").write_text(json.dumps(metadata))
+            (conv_dir / "messages.json").write_text(json.dumps(
+                {"conversation_id": conv_id, "message_count": messages, "messages": message_list}
+            ))
+        else:
+            (directory / f"{conv_id}.json").write_text(json.dumps({**metadata, "messages": message_list}))
+
+
+def serial_migrate(json_dir: Path, db_path: Path) -> int:
+    """Old path: parse in-process, chunked BulkWriter commits, FTS triggers live"""
+    engine = init_database(str(db_path))
+    writer = BulkWriter(engine)
+    migrated = 0
+    for batch in chunked(discover_sources(json_dir), 200):
+        parsed = parse_sources(batch)
+        writer.upsert_conversations(parsed["conversations"], update_existing=False)
+        writer.upsert_messages(parsed["messages"])
+        migrated += len(parsed["conversations"])
+    return migrated
+
+
+def fts_rows(db_path: Path) -> int:
+    engine = init_database(str(db_path))
+    with engine.connect() as conn:
+        return conn.execute(text("SELECT count(*) FROM messages_fts")).scalar()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark JSON export migration throughput")
+    parser.add_argument("--conversations", type=int, default=50000)
+    parser.add_argument("--messages", type=int, default=6, help="Messages per conversation")
+    parser.add_argument("--words", type=int, default=60, help="Words per message")
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus = Path(tmp) / "export"
+        corpus.mkdir()
+        start = time.perf_counter()
+        write_corpus(corpus, args.conversations, args.messages, args.words)
+        print(f"{args.conversations} conversations x {args.messages} messages written "
+              f"in {time.perf_counter() - start:.1f} s")
+
+        start = time.perf_counter()
+        migrated = serial_migrate(corpus, Path(tmp) / "before.db")
+        elapsed = time.perf_counter() - start
+        print(f"{'before: serial, live triggers':34s} {elapsed:7.2f} s  {migrated / elapsed:8.0f} conv/s  "
+              f"fts rows {fts_rows(Path(tmp) / 'before.db')}")
+        dispose_engines()
+
+        db_path = Path(tmp) / "after.db"
+        for label in (f"after: {args.workers} workers, live triggers", "after: resume, nothing left"):
+            start = time.perf_counter()
+            stats = DataMigrator(str(corpus), str(db_path), workers=args.workers).migrate()
+            elapsed = time.perf_counter() - start
+            print(f"{label:34s} {elapsed:7.2f} s  {stats['migrated'] / elapsed:8.0f} conv/s  "
+                  f"fts rows {fts_rows(db_path)}")
+        dispose_engines()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Request queue dispatch latency: 100 ms polling vs the event-driven worker.
+
+Measures the time from ``enqueue()`` to the callback starting, per
+priority, in two scenarios:
+
+  * idle: single requests submitted to an empty queue
+  * loaded: a steady stream of LOW background requests keeps every slot
+    busy while CRITICAL/HIGH/NORMAL requests arrive on top
+
+The "before" queue mirrors the old worker, which slept 100 ms whenever
+the queue was empty or all slots were taken. The "after" queue is
+RequestQueue as it is now.
+
+Usage: python benchmarks/bench_request_queue.py [--requests 200] [--concurrency 4]
+"""
+
+import argparse
+import asyncio
+import heapq
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.utils.request_queue import RequestPriority, RequestQueue
+
+
+class PollingRequestQueue(RequestQueue):
+    """The old worker loop: poll every 100 ms for work and free slots."""
+
+    async def _worker(self):
+        while not self._shutdown:
+            if len(self._active_requests) >= self.max_concurrent:
+                await asyncio.sleep(0.1)
+                continue
+            async with self._lock:
+                request = heapq.heappop(self._queue) if self._queue else None
+                if request is not None:
+                    self._active_requests[request.id] = request
+            if request is None:
+                await asyncio.sleep(0.1)
+                continue
+            asyncio.create_task(self._process_request(request))
+        while self._active_requests:
+            await asyncio.sleep(0.1)
+
+    async def stop(self):
+        self._shutdown = True
+        if self._worker_task:
+            await self._worker_task
+
+
+async def timed_enqueue(queue: RequestQueue, priority: RequestPriority, work: float, latencies: dict):
+    submitted = time.perf_counter()
+
+    async def callback():
+        latencies[priority.name].append(time.perf_counter() - submitted)
+        await asyncio.sleep(work)
+
+    await queue.enqueue(callback, priority=priority)
+
+
+async def run_idle(factory, requests: int) -> dict:
+    queue = factory()
+    await queue.start()
+    latencies = {p.name: [] for p in RequestPriority}
+    for i in range(requests):
+        priority = list(RequestPriority)[i % len(RequestPriority)]
+        await timed_enqueue(queue, priority, 0, latencies)
+        # Let the worker go back to waiting on an empty queue
+        await asyncio.sleep(random.uniform(0, 0.02))
+    await queue.stop()
+    return latencies
+
+
+async def run_loaded(factory, requests: int, concurrency: int, work: float) -> dict:
+    queue = factory()
+    await queue.start()
+    latencies = {p.name: [] for p in RequestPriority}
+    stop = asyncio.Event()
+
+    async def background():
+        # Keep a backlog of LOW requests so every slot stays busy
+        pending = set()
+        while not stop.is_set():
+            while len(pending) < concurrency * 2:
+                task = asyncio.create_task(timed_enqueue(queue, RequestPriority.LOW, work, latencies))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+            await asyncio.sleep(work / 2)
+        await asyncio.gather(*pending)
+
+    loader = asyncio.create_task(background())
+    foreground = [RequestPriority.CRITICAL, RequestPriority.HIGH, RequestPriority.NORMAL]
+    tasks = []
+    for i in range(requests):
+        tasks.append(asyncio.create_task(timed_enqueue(queue, foreground[i % 3], work, latencies)))
+        await asyncio.sleep(random.uniform(0, work * 2))
+    await asyncio.gather(*tasks)
+    stop.set()
+    await loader
+    await queue.stop()
+    return latencies
+
+
+def percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def report(label: str, latencies: dict):
+    print(label)
+    for name, values in latencies.items():
+        if not values:
+            continue
+        print(
+            f"  {name:8s} n={len(values):5d}  "
+            f"p50 {statistics.median(values) * 1000:7.2f} ms  "
+            f"p99 {percentile(values, 99) * 1000:7.2f} ms"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark request queue enqueue-to-start latency")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--work-ms", type=float, default=10.0, help="Duration of each request")
+    args = parser.parse_args()
+    work = args.work_ms / 1000
+
+    for label, queue_class in (("before: 100 ms polling", PollingRequestQueue),
+                               ("after: event-driven", RequestQueue)):
+        factory = lambda: queue_class(max_concurrent=args.concurrency)
+        random.seed(11)
+        report(f"{label}, idle queue", asyncio.run(run_idle(factory, args.requests)))
+        random.seed(11)
+        report(f"{label}, {args.concurrency} slots busy with LOW work",
+               asyncio.run(run_loaded(factory, args.requests, args.concurrency, work)))
+
+
+if __name__ == "__main__":
+    main()
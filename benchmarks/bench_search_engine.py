@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Search latency: per-caller engines vs the shared engine registry.
+
+Builds a synthetic database, then runs a mixed search workload (FTS5
+conversation and message queries, plus ``get_search_stats``) from a few
+threads, the way tool handlers hit search through the executor.
+
+The "before" setup mirrors the old code: TextSearch owns a plain
+``create_engine`` with SQLite defaults, and search stats build a new
+engine on every call. The "after" setup uses TextSearch and
+UnifiedSearchEngine as they are now, backed by the registry engine with
+the PRAGMA profile applied to every pooled connection.
+
+Usage: python benchmarks/bench_search_engine.py [--conversations 3000]
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import create_engine, text
+
+from src.models.database import dispose_engines
+from src.search.search_engine import UnifiedSearchEngine
+from src.search.text_search import TextSearch
+from synthetic import WORDS, populate
+
+
+class LegacySearch:
+    """The old wiring: a private default engine plus an engine per stats call."""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.text_search = TextSearch.__new__(TextSearch)
+        self.text_search.engine = create_engine(f'sqlite:///{db_path}')
+
+    def get_search_stats(self):
+        engine = create_engine(f'sqlite:///{self.db_path}')
+        with engine.connect() as conn:
+            for table in ("conversations", "messages", "conversations_fts", "messages_fts"):
+                conn.execute(text(f"SELECT COUNT(*) FROM {table}")).scalar()
+
+
+class RegistrySearch:
+    """The current wiring through the shared engine registry."""
+
+    def __init__(self, db_path: str):
+        self.engine = UnifiedSearchEngine(db_path)
+        self.text_search = self.engine.text_search
+
+    def get_search_stats(self):
+        self.engine.get_search_stats()
+
+
+def run_workload(search, queries: list, threads: int, stats_every: int) -> dict:
+    latencies = {"search_conversations": [], "search_messages": [], "get_search_stats": []}
+
+    def call(i: int, query: str):
+        start = time.perf_counter()
+        if i % stats_every == 0:
+            kind = "get_search_stats"
+            search.get_search_stats()
+        elif i % 2:
+            kind = "search_conversations"
+            search.text_search.search_conversations(query, limit=20)
+        else:
+            kind = "search_messages"
+            search.text_search.search_messages(query, limit=50)
+        latencies[kind].append(time.perf_counter() - start)
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(call, range(len(queries)), queries))
+    return latencies
+
+
+def percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def report(label: str, latencies: dict, wall: float):
+    total = sum(len(values) for values in latencies.values())
+    print(f"{label}  ({total / wall:.0f} calls/s)")
+    for kind, values in latencies.items():
+        print(
+            f"  {kind:20s} n={len(values):4d}  "
+            f"p50 {statistics.median(values) * 1000:7.2f} ms  "
+            f"p99 {percentile(values, 99) * 1000:7.2f} ms"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark search latency per engine setup")
+    parser.add_argument("--conversations", type=int, default=3000)
+    parser.add_argument("--messages", type=int, default=10, help="Messages per conversation")
+    parser.add_argument("--calls", type=int, default=600)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--stats-every", type=int, default=10, help="Every Nth call is get_search_stats")
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    queries = [" ".join(rng.sample(WORDS, 2)) for _ in range(args.calls)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = str(Path(tmp) / "bench.db")
+        populate(db_path, args.conversations, args.messages)
+        dispose_engines()
+        print(f"Database: {args.conversations} conversations x {args.messages} messages, "
+              f"{args.threads} threads")
+
+        for label, factory in (("before: per-caller engines, default PRAGMAs", LegacySearch),
+                               ("after: shared engine registry", RegistrySearch)):
+            search = factory(db_path)
+            start = time.perf_counter()
+            latencies = run_workload(search, queries, args.threads, args.stats_every)
+            report(label, latencies, time.perf_counter() - start)
+            dispose_engines()
+
+
+if __name__ == "__main__":
+    main()
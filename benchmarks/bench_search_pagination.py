@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+FTS search pages: OFFSET with inline snippets vs two-phase keyset pages.
+
+Builds a synthetic database and times message searches for page 1 and
+page 50 (``--page-size`` rows each):
+
+  * offset: the old query, joining messages and conversations and
+    computing snippet() for every match, then ``LIMIT :limit OFFSET :offset``
+  * keyset: TextSearch.search_messages_page, which ranks rowids by bm25()
+    after the cursor's (score, rowid), then hydrates rows and snippets for
+    the page only. Page 50 is fetched with the cursor returned by page 49.
+
+Usage: python benchmarks/bench_search_pagination.py [--conversations 3000] [--messages 20]
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import text
+
+from src.models.database import dispose_engines
+from src.search.text_search import TextSearch
+from synthetic import WORDS, populate
+
+OFFSET_QUERY = """
+    SELECT
+        m.id, m.conversation_id, m.role, m.created_at, m."index",
+        c.title as conversation_title,
+        snippet(messages_fts, 2, '<mark>', '</mark>', '...', 32) as snippet,
+        rank as score
+    FROM messages_fts
+    JOIN messages m ON m.rowid = messages_fts.rowid
+    JOIN conversations c ON m.conversation_id = c.id
+    WHERE messages_fts MATCH :query
+    ORDER BY rank LIMIT :limit OFFSET :offset
+"""
+
+
+def offset_page(search: TextSearch, query: str, page: int, size: int):
+    with search.engine.connect() as conn:
+        return conn.execute(text(OFFSET_QUERY), {"query": query, "limit": size,
+                                                 "offset": (page - 1) * size}).fetchall()
+
+
+def keyset_cursor(search: TextSearch, query: str, page: int, size: int):
+    """The cursor for ``page``, found by walking the pages before it"""
+    cursor = None
+    for _ in range(page - 1):
+        cursor = search.search_messages_page(query, limit=size, cursor=cursor)["next_cursor"]
+    return cursor
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark deep FTS search pages")
+    parser.add_argument("--conversations", type=int, default=3000)
+    parser.add_argument("--messages", type=int, default=20, help="Messages per conversation")
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--terms", type=int, default=2, help="Terms OR'ed together per query")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = str(Path(tmp) / "conversations.db")
+        populate(db_path, args.conversations, args.messages)
+        search = TextSearch(db_path)
+
+        # OR queries, so there are enough matches for 50 pages
+        rng = random.Random(3)
+        queries = [" OR ".join(rng.sample(WORDS, args.terms)) for _ in range(args.queries)]
+        with search.engine.connect() as conn:
+            matches = statistics.median(conn.execute(
+                text("SELECT count(*) FROM messages_fts WHERE messages_fts MATCH :q"), {"q": q}
+            ).scalar() for q in queries)
+        print(f"{args.conversations * args.messages} messages, {args.queries} queries, "
+              f"median {matches:.0f} matches, {args.page_size} rows per page")
+        print(f"{'mode':8s} {'page':>5s} {'p50 ms':>9s} {'p95 ms':>9s}")
+
+        for page in (1, 50):
+            offset, keyset = [], []
+            for query in queries:
+                cursor = keyset_cursor(search, query, page, args.page_size)
+                assert page == 1 or cursor, f"fewer than {page} pages for {query!r}"
+                offset.append(timed(lambda: offset_page(search, query, page, args.page_size)))
+                keyset.append(timed(lambda: search.search_messages_page(query, limit=args.page_size,
+                                                                         cursor=cursor)))
+            for label, latencies in (("offset", offset), ("keyset", keyset)):
+                latencies.sort()
+                print(f"{label:8s} {page:5d} {statistics.median(latencies):9.2f} "
+                      f"{latencies[int(len(latencies) * 0.95) - 1]:9.2f}")
+        dispose_engines()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark for the MCP server.
+
+Measures two things, each over several fresh interpreter processes:
+
+  * import time of ``src.direct_api_server`` and which heavy optional
+    dependencies (torch, sentence_transformers, faiss, reportlab,
+    playwright) got imported as a side effect
+  * wall time from spawning the stdio server to receiving the response to
+    its first ``tools/list`` request
+
+Usage: python benchmarks/bench_startup.py [--runs 5]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+HEAVY_MODULES = ["torch", "sentence_transformers", "faiss", "reportlab", "playwright"]
+
+IMPORT_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import src.direct_api_server
+elapsed = time.perf_counter() - start
+heavy = [m for m in {heavy!r} if m in sys.modules]
+print(json.dumps({{"seconds": elapsed, "heavy": heavy}}))
+"""
+
+
+def _env(data_dir: str) -> dict:
+    env = dict(os.environ)
+    env["MCP_DATA_DIR"] = data_dir
+    env["PYTHONPATH"] = str(REPO_ROOT)
+    return env
+
+
+def measure_import(data_dir: str) -> dict:
+    """Import the server module in a fresh interpreter."""
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_PROBE.format(heavy=HEAVY_MODULES)],
+        cwd=REPO_ROOT,
+        env=_env(data_dir),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def _send(proc: subprocess.Popen, message: dict) -> None:
+    proc.stdin.write(json.dumps(message) + "\n")
+    proc.stdin.flush()
+
+
+def _read_response(proc: subprocess.Popen, request_id: int) -> dict:
+    while True:
+        line = proc.stdout.readline()
+        if not line:
+            raise RuntimeError("server exited before responding")
+        message = json.loads(line)
+        if message.get("id") == request_id:
+            return message
+
+
+def measure_first_list_tools(data_dir: str) -> dict:
+    """Spawn the stdio server and time initialize + first tools/list."""
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "src.direct_api_server"],
+        cwd=REPO_ROOT,
+        env=_env(data_dir),
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+    )
+    try:
+        _send(proc, {
+            "jsonrpc": "2.0",
+            "id": 1,
+            "method": "initialize",
+            "params": {
+                "protocolVersion": "2024-11-05",
+                "capabilities": {},
+                "clientInfo": {"name": "bench_startup", "version": "1.0"},
+            },
+        })
+        _read_response(proc, 1)
+        initialized = time.perf_counter() - start
+
+        _send(proc, {"jsonrpc": "2.0", "method": "notifications/initialized"})
+        _send(proc, {"jsonrpc": "2.0", "id": 2, "method": "tools/list"})
+        response = _read_response(proc, 2)
+        listed = time.perf_counter() - start
+
+        return {
+            "initialize_seconds": initialized,
+            "list_tools_seconds": listed,
+            "tool_count": len(response["result"]["tools"]),
+        }
+    finally:
+        proc.kill()
+        proc.wait()
+
+
+def _summary(values: list) -> str:
+    return (
+        f"median {statistics.median(values) * 1000:8.1f} ms   "
+        f"min {min(values) * 1000:8.1f} ms   max {max(values) * 1000:8.1f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark MCP server startup")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh processes per measurement")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        imports = [measure_import(data_dir) for _ in range(args.runs)]
+        startups = [measure_first_list_tools(data_dir) for _ in range(args.runs)]
+
+    print(f"Startup benchmark ({args.runs} runs, python {sys.version.split()[0]})")
+    print(f"  import src.direct_api_server : {_summary([r['seconds'] for r in imports])}")
+    print(f"  spawn -> initialize response : {_summary([r['initialize_seconds'] for r in startups])}")
+    print(f"  spawn -> first tools/list    : {_summary([r['list_tools_seconds'] for r in startups])}")
+    print(f"  tools listed                 : {startups[0]['tool_count']}")
+    heavy = sorted({m for r in imports for m in r["heavy"]})
+    print(f"  heavy modules imported       : {', '.join(heavy) if heavy else 'none'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Conversation sync: full list rewrite vs incremental delta sync.
+
+Starts the fake claude.ai API with a large account, then compares:
+
+  * before: fetch the whole ``chat_conversations`` list and update every
+    row one ORM lookup at a time (the old ``_sync_conversations_to_db``)
+  * after: ConversationSyncEngine, once for the first full sync and then
+    incrementally after a handful of conversations change
+
+Usage: python benchmarks/bench_sync.py [--conversations 5000] [--changed 25]
+"""
+
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import aiohttp
+
+from src.models.conversation import Conversation, init_database
+from src.models.bulk import parse_api_datetime
+from src.models.store import ConversationStore
+from src.sync import ConversationSyncEngine
+from src.utils.http_client import AsyncHTTPTransport
+from src.utils.rate_limiter import RateLimiter, RateLimitConfig, RateLimitedSession
+from fake_claude_api import serve_in_subprocess
+
+ORG = "org"
+
+
+async def legacy_sync(client, store: ConversationStore, api_base: str) -> int:
+    """The old path: one full listing, then one lookup and write per row."""
+    response = await client.get(f"{api_base}/organizations/{ORG}/chat_conversations", timeout=60)
+    conversations = response.json()
+
+    async with store.Session() as session:
+        for conv_data in conversations:
+            conv = await session.get(Conversation, conv_data["uuid"])
+            if conv:
+                conv.title = conv_data.get("name", "Untitled")
+                conv.updated_at = parse_api_datetime(conv_data.get("updated_at"))
+                conv.model = conv_data.get("model", "unknown")
+                conv.message_count = conv_data.get("message_count", 0)
+            else:
+                session.add(Conversation(
+                    id=conv_data["uuid"],
+                    title=conv_data.get("name", "Untitled"),
+                    created_at=parse_api_datetime(conv_data.get("created_at")),
+                    updated_at=parse_api_datetime(conv_data.get("updated_at")),
+                    model=conv_data.get("model", "unknown"),
+                    message_count=conv_data.get("message_count", 0),
+                ))
+        await session.commit()
+    return len(conversations)
+
+
+async def touch(base_url: str, count: int):
+    async with aiohttp.ClientSession() as http:
+        async with http.post(f"{base_url}/__touch", params={"count": count}) as response:
+            await response.read()
+
+
+async def run(base_url: str, tmp: str, changed: int, page_size: int):
+    api_base = f"{base_url}/api"
+    client = RateLimitedSession(
+        AsyncHTTPTransport(),
+        RateLimiter(RateLimitConfig(requests_per_second=1000, burst_size=1000))
+    )
+
+    # Before: every sync rewrites every row
+    db_path = str(Path(tmp) / "legacy.db")
+    init_database(db_path)
+    store = ConversationStore(db_path)
+    for label in ("first sync", f"after {changed} changes"):
+        if label != "first sync":
+            await touch(base_url, changed)
+        start = time.perf_counter()
+        rows = await legacy_sync(client, store, api_base)
+        print(f"before  {label:20s} {time.perf_counter() - start:7.2f} s  "
+              f"({rows} rows written)")
+    await store.close()
+
+    # After: watermark + content hash
+    db_path = str(Path(tmp) / "delta.db")
+    init_database(db_path)
+    store = ConversationStore(db_path)
+    engine = ConversationSyncEngine(client, store, page_size=page_size, api_base=api_base)
+    for label in ("first sync", f"after {changed} changes", "no changes"):
+        if label.startswith("after"):
+            await touch(base_url, changed)
+        start = time.perf_counter()
+        result = await engine.sync(ORG, headers={})
+        print(f"after   {label:20s} {time.perf_counter() - start:7.2f} s  "
+              f"({result['pages']} pages, {result['fetched']} fetched, "
+              f"{result['inserted'] + result['updated']} rows written)")
+    await store.close()
+    await client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark full vs incremental conversation sync")
+    parser.add_argument("--conversations", type=int, default=5000)
+    parser.add_argument("--changed", type=int, default=25, help="Conversations updated between syncs")
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="Fake server latency per request")
+    args = parser.parse_args()
+
+    with serve_in_subprocess("--conversations", str(args.conversations),
+                             "--latency-ms", str(args.latency_ms)) as base_url, \
+            tempfile.TemporaryDirectory() as tmp:
+        print(f"{args.conversations} conversations, server latency {args.latency_ms:.0f} ms")
+        asyncio.run(run(base_url, tmp, args.changed, args.page_size))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the claude.ai conversation API, for benchmarks.
+
+Serves synthetic data on the two endpoints the server uses:
+
+  GET /api/organizations/{org_id}/chat_conversations
+  GET /api/organizations/{org_id}/chat_conversations/{conversation_id}
+
+with a configurable per-request latency. The listing is ordered newest
+``updated_at`` first and honours ``limit``/``offset``.
+
+``POST /__touch?count=N`` bumps ``updated_at`` on N conversations, to
+simulate activity between syncs.
+
+Usage: python benchmarks/fake_claude_api.py [--port 8765] [--latency-ms 20]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import socket
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from aiohttp import web
+
+
+def make_conversations(count: int) -> list:
+    base = datetime(2025, 1, 1)
+    return [
+        {
+            "uuid": f"conv-{i:06d}",
+            "name": f"Conversation {i}",
+            "created_at": (base + timedelta(minutes=i)).isoformat() + "Z",
+            "updated_at": (base + timedelta(minutes=i, seconds=30)).isoformat() + "Z",
+            "model": f"model-{i % 3}",
+            "message_count": 0,
+            "is_starred": i % 10 == 0,
+        }
+        for i in range(count)
+    ]
+
+
+def make_messages(conversation_id: str, count: int, words: int) -> list:
+    body = " ".join(f"word{j % 97}" for j in range(words))
+    return [
+        {
+            "uuid": f"{conversation_id}-msg-{j}",
+            "sender": "human" if j % 2 == 0 else "assistant",
+            "text": body,
+            "index": j,
+            "created_at": "2025-01-01T00:00:00Z",
+        }
+        for j in range(count)
+    ]
+
+
+def create_app(conversations: int = 500, messages: int = 20, words: int = 200,
+               latency: float = 0.02) -> web.Application:
+    listing = make_conversations(conversations)
+    by_id = {conv["uuid"]: conv for conv in listing}
+    clock = {"now": datetime(2025, 6, 1)}
+
+    def reorder():
+        listing.sort(key=lambda conv: conv["updated_at"], reverse=True)
+
+    reorder()
+
+    async def touch(request: web.Request) -> web.Response:
+        count = int(request.query.get("count", 1))
+        step = max(1, len(listing) // max(count, 1))
+        touched = listing[::step][:count]
+        for conv in touched:
+            clock["now"] += timedelta(seconds=1)
+            conv["updated_at"] = clock["now"].isoformat() + "Z"
+        reorder()
+        return web.json_response([conv["uuid"] for conv in touched])
+
+    async def list_conversations(request: web.Request) -> web.Response:
+        await asyncio.sleep(latency)
+        limit = int(request.query.get("limit", len(listing)))
+        offset = int(request.query.get("offset", 0))
+        return web.json_response(listing[offset:offset + limit])
+
+    async def get_conversation(request: web.Request) -> web.Response:
+        await asyncio.sleep(latency)
+        conv = by_id.get(request.match_info["conversation_id"])
+        if conv is None:
+            return web.json_response({"error": "not found"}, status=404)
+        return web.json_response({
+            **conv,
+            "chat_messages": make_messages(conv["uuid"], messages, words),
+        })
+
+    app = web.Application()
+    app.router.add_post("/__touch", touch)
+    app.router.add_get("/api/organizations/{org_id}/chat_conversations", list_conversations)
+    app.router.add_get(
+        "/api/organizations/{org_id}/chat_conversations/{conversation_id}", get_conversation
+    )
+    return app
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextlib.contextmanager
+def serve_in_subprocess(*args: str, port: int = 0):
+    """Run the fake API in a child process; yields its base URL."""
+    port = port or free_port()
+    proc = subprocess.Popen(
+        [sys.executable, str(Path(__file__).resolve()), "--port", str(port), *args],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = time.monotonic() + 10
+        while True:
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+                break
+            except OSError:
+                if time.monotonic() > deadline or proc.poll() is not None:
+                    raise RuntimeError("fake claude.ai API failed to start")
+                time.sleep(0.05)
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake claude.ai conversation API")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--conversations", type=int, default=500)
+    parser.add_argument("--messages", type=int, default=20, help="Messages per conversation")
+    parser.add_argument("--words", type=int, default=200, help="Words per message")
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    args = parser.parse_args()
+
+    web.run_app(
+        create_app(args.conversations, args.messages, args.words, args.latency_ms / 1000),
+        host="127.0.0.1", port=args.port, print=None,
+    )
+
+
+if __name__ == "__main__":
+    main()
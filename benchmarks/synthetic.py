@@ -0,0 +1,45 @@
+"""
+Synthetic conversation databases shared by the benchmarks.
+"""
+
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import insert
+
+from src.models.conversation import Conversation, Message, init_database
+
+# A large vocabulary keeps FTS queries selective, like real conversations
+WORDS = [f"term{i}" for i in range(5000)]
+
+
+def random_text(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def populate(db_path: str, conversations: int, messages_per_conversation: int,
+             words_per_message: int = 200, seed: int = 42) -> list:
+    """Fill a fresh database with synthetic data and return conversation ids."""
+    rng = random.Random(seed)
+    engine = init_database(db_path)
+    ids = [f"conv-{i:06d}" for i in range(conversations)]
+
+    with engine.begin() as conn:
+        conn.execute(insert(Conversation), [
+            {"id": conv_id, "title": f"Conversation {i} {random_text(rng, 4)}",
+             "model": f"model-{i % 3}", "message_count": messages_per_conversation,
+             "tags": [], "extra_data": {}, "search_vector": random_text(rng, 50)}
+            for i, conv_id in enumerate(ids)
+        ])
+        conn.execute(insert(Message), [
+            {"id": f"{conv_id}-{j}", "conversation_id": conv_id,
+             "role": "user" if j % 2 == 0 else "assistant",
+             "content": random_text(rng, words_per_message),
+             "index": j, "extra_data": {}}
+            for conv_id in ids
+            for j in range(messages_per_conversation)
+        ])
+    return ids
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Maintenance for compressed content storage (MCP_CONTENT_COMPRESSION).
+
+  train       Train a zstd dictionary on a sample of stored messages, for
+              MCP_ZSTD_DICTIONARY
+  recompress  Rewrite existing message content and conversation search
+              text in the configured mode (new writes already use it)
+
+The FTS tables index the decompressed text, which doesn't change, so
+recompress runs with the FTS triggers dropped; run it while nothing else
+writes to the database.
+"""
+
+import sys
+from pathlib import Path
+import logging
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from sqlalchemy import bindparam, func, literal_column, select, update
+
+from src.models.compression import get_codec
+from src.models.conversation import (
+    Conversation, Message, create_fts_sources, create_fts_triggers, drop_fts_triggers, init_database
+)
+
+# Setup logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def train_dictionary(db_path: str, output: str, size: int = 112640, samples: int = 20000) -> int:
+    """Train a zstd dictionary on up to ``samples`` random messages; returns its size"""
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError("Training a dictionary requires the 'zstandard' package")
+    engine = init_database(db_path)
+    with engine.connect() as conn:
+        texts = conn.scalars(
+            select(Message.content).order_by(func.random()).limit(samples)
+        ).all()
+    if not texts:
+        raise ValueError("No messages to train a dictionary on")
+
+    dictionary = zstandard.train_dictionary(size, [text.encode('utf-8') for text in texts])
+    Path(output).parent.mkdir(parents=True, exist_ok=True)
+    Path(output).write_bytes(dictionary.as_bytes())
+    logger.info(f"Trained a {len(dictionary.as_bytes())} byte dictionary on {len(texts)} messages: {output}")
+    return len(dictionary.as_bytes())
+
+
+def _recompress_column(engine, table, column, batch_size: int) -> int:
+    rowid = literal_column('rowid')
+    last, rewritten = 0, 0
+    while True:
+        with engine.begin() as conn:
+            rows = conn.execute(
+                select(rowid, table.c[column]).where(rowid > last).order_by(rowid).limit(batch_size)
+            ).all()
+            if not rows:
+                return rewritten
+            # Values are read decompressed and bound through CompressedText again
+            values = [{'row_id': row[0], column: row[1]} for row in rows if row[1] is not None]
+            if values:
+                conn.execute(update(table).where(rowid == bindparam('row_id')), values)
+            rewritten += len(rows)
+            last = rows[-1][0]
+        logger.info(f"{table.name}.{column}: {rewritten} rows rewritten")
+
+
+def recompress(db_path: str, batch_size: int = 2000, vacuum: bool = False) -> int:
+    """Rewrite stored text in the configured compression mode; returns rows rewritten"""
+    engine = init_database(db_path)
+    logger.info(f"Recompressing with codec: {get_codec().codec or 'off'}")
+
+    with engine.begin() as conn:
+        drop_fts_triggers(conn)
+    try:
+        rewritten = _recompress_column(engine, Message.__table__, 'content', batch_size)
+        rewritten += _recompress_column(engine, Conversation.__table__, 'search_vector', batch_size)
+    finally:
+        with engine.begin() as conn:
+            # The FTS schema only calls mcp_decompress while compressed values remain
+            create_fts_sources(conn)
+            create_fts_triggers(conn)
+
+    if vacuum:
+        logger.info("Vacuuming to release freed pages...")
+        with engine.connect() as conn:
+            conn.exec_driver_sql("VACUUM")
+    return rewritten
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Compressed content storage maintenance")
+    parser.add_argument("--db-path", default="data/db/conversations.db", help="Path to SQLite database")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    train = commands.add_parser("train", help="Train a zstd dictionary on stored messages")
+    train.add_argument("--output", default="data/db/content.zdict", help="Dictionary file to write")
+    train.add_argument("--size", type=int, default=112640, help="Dictionary size in bytes")
+    train.add_argument("--samples", type=int, default=20000, help="Messages to sample")
+
+    rewrite = commands.add_parser("recompress", help="Rewrite stored text in the configured mode")
+    rewrite.add_argument("--batch-size", type=int, default=2000)
+    rewrite.add_argument("--vacuum", action="store_true", help="VACUUM afterwards to shrink the file")
+
+    args = parser.parse_args()
+    if args.command == "train":
+        train_dictionary(args.db_path, args.output, args.size, args.samples)
+    else:
+        recompress(args.db_path, args.batch_size, args.vacuum)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,21 +1,33 @@
 #!/usr/bin/env python3
 """
 Migration script to convert JSON conversation files to SQLite database
+
+Re-running it resumes an interrupted migration.
 """
 
-import json
 import os
 import sys
+import time
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
 import logging
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from sqlalchemy import create_engine, text
+from sqlalchemy import bindparam, select, text
+from sqlalchemy.dialects.sqlite import insert, pysqlite
 from sqlalchemy.orm import sessionmaker
-from src.models.conversation import Base, Conversation, Message
+from src.models.bulk import chunked, conversation_upsert, message_upsert
+from src.models.conversation import (
+    Conversation, Message, MigrationCheckpoint, fts_in_sync, init_database
+)
+from src.models.database import retry_when_busy
+from src.models.fts_rebuild import FTSRebuilder
+from src.models.migration import MIGRATED, TABLES, discover_sources, encode_sources
 
 # Setup logging
 logging.basicConfig(
@@ -24,147 +36,262 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+checkpoints_table = MigrationCheckpoint.__table__
+messages_table = Message.__table__
+
+# The engine's dialect with named instead of positional (qmark) parameters,
+# so encoded rows bind by column name
+NAMED_PARAMS = pysqlite.dialect(paramstyle="named")
+
+delete_stale_messages = messages_table.delete().where(
+    messages_table.c.conversation_id == bindparam("conversation_id"),
+    messages_table.c["index"] >= bindparam("index")
+)
+
 
 class DataMigrator:
-    def __init__(self, json_dir: str = "extracted_messages", db_path: str = "data/db/conversations.db"):
+    """
+    Migrate exported conversation JSON (flat files and bridge directories).
+
+    Sources are parsed on a process pool, ``batch_size`` per task, and
+    written ``transaction_size`` conversations per transaction. The FTS
+    triggers stay in place, so the database can be in use meanwhile: rows
+    are searchable as soon as their transaction commits, and the server's
+    own writes keep being indexed.
+
+    Each transaction also records its sources in ``migration_checkpoints``
+    with their mtime and content hash. A source whose mtime is unchanged is
+    not read again, so an interrupted run resumes where it stopped; one
+    whose content was already migrated (touched, renamed, or copied) is
+    read but not written. Changed sources update their conversation.
+    """
+
+    def __init__(
+        self,
+        json_dir: str = "extracted_messages",
+        db_path: str = "data/db/conversations.db",
+        batch_size: int = 200,
+        transaction_size: int = 1000,
+        workers: Optional[int] = None
+    ):
         self.json_dir = Path(json_dir)
         self.db_path = Path(db_path)
+        self.batch_size = batch_size  # Sources per parse task
+        # Conversations per write transaction; other writers wait for one
+        self.transaction_size = transaction_size
+        self.workers = workers if workers is not None else min(4, os.cpu_count() or 1)
         
         # Ensure database directory exists
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         
-        # Setup database
-        self.engine = create_engine(f'sqlite:///{self.db_path}')
-        Base.metadata.create_all(self.engine)
+        # Setup database (tables, FTS tables and triggers)
+        self.engine = init_database(str(self.db_path))
         self.Session = sessionmaker(bind=self.engine)
+        self._migrated_ids: set = set()
     
-    def migrate(self):
-        """Migrate all JSON files to database"""
-        session = self.Session()
+    def migrate(self) -> Dict[str, Any]:
+        """Migrate all exported conversations to the database; returns run statistics"""
+        started = time.perf_counter()
+        sources = discover_sources(self.json_dir)
+        stats = {
+            "sources": len(sources),
+            "migrated": 0,
+            "messages": 0,
+            "skipped": 0,
+            "resumed": 0,
+            "errors": 0,
+            "fts_rebuilt": False,
+        }
         
+        if not sources:
+            logger.info("No JSON files found to migrate")
+        else:
+            logger.info(f"Found {len(sources)} conversations to migrate")
+        
+        # Checkpoints and already-migrated content in one query each
+        with self.engine.connect() as conn:
+            done = dict(conn.execute(select(checkpoints_table.c.source, checkpoints_table.c.mtime)).all())
+            migrated = set(conn.execute(
+                select(checkpoints_table.c.conversation_id, checkpoints_table.c.content_hash)
+                .where(checkpoints_table.c.status == MIGRATED, checkpoints_table.c.content_hash.isnot(None))
+            ).all())
+            # Rows written while the triggers were dropped (by an earlier
+            # version of this script) are missing from the index
+            fts_stale = not fts_in_sync(conn)
+        # Conversations already migrated from some export: a new version
+        # of one replaces its messages
+        self._migrated_ids = {conversation_id for conversation_id, _ in migrated}
+        
+        pending = []
+        for source in sources:
+            if done.get(source.key) == source.mtime:
+                stats["resumed"] += 1
+            else:
+                pending.append(source)
+        
+        if pending:
+            batch = self._new_batch()
+            for parsed in self._parse(pending):
+                self._skip_migrated(parsed, migrated, stats)
+                for name in TABLES:
+                    columns, rows = parsed[name]
+                    if rows:
+                        batch[name] = (columns, batch[name][1])
+                        batch[name][1].extend(rows)
+                batch["failed"].extend(parsed["failed"])
+                batch["skipped"] += parsed["skipped"]
+                if len(batch["checkpoints"][1]) >= self.transaction_size:
+                    self._write_batch(batch, stats)
+                    batch = self._new_batch()
+                    logger.info(f"Progress: {stats['migrated'] + stats['errors']}/{len(pending)} processed")
+            self._write_batch(batch, stats)
+        
+        if fts_stale:
+            # In chunks, so other writers aren't locked out for the whole rebuild
+            logger.info("Rebuilding full-text search tables...")
+            FTSRebuilder(self.engine).rebuild(restart=True)
+            stats["fts_rebuilt"] = True
+        
+        # Create indexes for better performance
+        session = self.Session()
         try:
-            # Get all JSON files
-            json_files = list(self.json_dir.glob("*.json"))
-            
-            if not json_files:
-                logger.info("No JSON files found to migrate")
-                return
-            
-            logger.info(f"Found {len(json_files)} conversations to migrate")
-            
-            # Track progress
-            migrated = 0
-            skipped = 0
-            errors = 0
-            
-            for json_file in json_files:
-                try:
-                    # Check if already migrated
-                    conv_id = json_file.stem
-                    existing = session.query(Conversation).filter_by(id=conv_id).first()
-                    
-                    if existing:
-                        logger.debug(f"Skipping {json_file.name} - already migrated")
-                        skipped += 1
-                        continue
-                    
-                    # Load JSON data
-                    with open(json_file, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                    
-                    # Create conversation
-                    conversation = self._create_conversation(data)
-                    session.add(conversation)
-                    
-                    # Create messages
-                    for msg_data in data.get('messages', []):
-                        message = self._create_message(msg_data, conv_id)
-                        if message:
-                            session.add(message)
-                    
-                    # Commit after each conversation
-                    session.commit()
-                    migrated += 1
-                    
-                    if migrated % 10 == 0:
-                        logger.info(f"Progress: {migrated}/{len(json_files)} migrated")
-                
-                except Exception as e:
-                    logger.error(f"Error migrating {json_file.name}: {e}")
-                    session.rollback()
-                    errors += 1
-            
-            # Final report
-            logger.info(f"\nMigration complete:")
-            logger.info(f"  Migrated: {migrated}")
-            logger.info(f"  Skipped: {skipped}")
-            logger.info(f"  Errors: {errors}")
-            logger.info(f"  Total: {len(json_files)}")
-            
-            # Create indexes for better performance
             self._create_indexes(session)
-            
         finally:
             session.close()
+        
+        stats["seconds"] = round(time.perf_counter() - started, 3)
+        stats["conversations_per_second"] = round(stats["migrated"] / max(stats["seconds"], 1e-9), 1)
+        
+        # Final report
+        logger.info(f"\nMigration complete:")
+        logger.info(f"  Migrated: {stats['migrated']} ({stats['messages']} messages)")
+        logger.info(f"  Skipped: {stats['skipped']}")
+        logger.info(f"  Resumed past: {stats['resumed']}")
+        logger.info(f"  Errors: {stats['errors']}")
+        logger.info(f"  Total: {len(sources)}")
+        return stats
     
-    def _create_conversation(self, data: dict) -> Conversation:
-        """Create Conversation object from JSON data"""
-        return Conversation(
-            id=data.get('uuid', data.get('id')),
-            title=data.get('name', data.get('title', 'Untitled')),
-            created_at=self._parse_datetime(data.get('created_at')),
-            updated_at=self._parse_datetime(data.get('updated_at')),
-            extracted_at=datetime.utcnow(),
-            model=data.get('model', 'unknown'),
-            message_count=len(data.get('messages', [])),
-            tags=data.get('tags', []),
-            metadata={
-                'original_file': data.get('original_file'),
-                'extracted_by': data.get('extracted_by', 'migration')
-            }
-        )
+    def _parse(self, sources: List) -> Iterator[Dict[str, Any]]:
+        """Encoded rows per batch of sources, from a process pool when it pays off"""
+        batches = list(chunked(sources, self.batch_size))
+        if self.workers <= 1 or len(batches) <= 1:
+            for batch in batches:
+                yield encode_sources(batch)
+            return
+        
+        # spawn, not fork: the caller may be the server with live threads
+        with ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn")
+        ) as pool:
+            # Keep a bounded number of batches in flight so parsed rows don't pile up
+            in_flight = deque()
+            for batch in batches:
+                in_flight.append(pool.submit(encode_sources, batch))
+                if len(in_flight) >= 2 * self.workers:
+                    yield in_flight.popleft().result()
+            while in_flight:
+                yield in_flight.popleft().result()
     
-    def _create_message(self, msg_data: dict, conversation_id: str) -> Message:
-        """Create Message object from JSON data"""
-        try:
-            return Message(
-                id=msg_data.get('uuid', msg_data.get('id')),
-                conversation_id=conversation_id,
-                role=msg_data.get('sender', msg_data.get('role', 'unknown')),
-                content=msg_data.get('text', msg_data.get('content', '')),
-                created_at=self._parse_datetime(msg_data.get('created_at')),
-                index=msg_data.get('index', 0),
-                metadata={
-                    'attachments': msg_data.get('attachments', []),
-                    'citations': msg_data.get('citations', [])
-                }
+    @staticmethod
+    def _skip_migrated(parsed: Dict[str, Any], migrated: set, stats: Dict[str, Any]):
+        """
+        Drop the rows of sources whose content was already migrated.
+
+        Their checkpoints are still written, so the next run doesn't read
+        them again.
+        """
+        columns, checkpoints = parsed["checkpoints"]
+        conversation_id = columns.index("conversation_id")
+        content_hash = columns.index("content_hash")
+        keys = [
+            (checkpoint[conversation_id], checkpoint[content_hash])
+            for checkpoint in checkpoints if checkpoint[content_hash] is not None
+        ]
+        skipped = [key for key in keys if key in migrated]
+        migrated.update(keys)
+        skip = {conv_id for conv_id, _ in skipped}
+        stats["skipped"] += len(skipped)
+        parsed["skipped"] = len(skipped)
+        if not skip:
+            return
+        for name, id_column in (("conversations", "id"), ("messages", "conversation_id")):
+            columns, rows = parsed[name]
+            if rows:
+                position = columns.index(id_column)
+                parsed[name] = (columns, [row for row in rows if row[position] not in skip])
+    
+    @staticmethod
+    def _new_batch() -> Dict[str, Any]:
+        return {**{name: ((), []) for name in TABLES}, "failed": [], "skipped": 0}
+    
+    def _statement(self, name: str, columns) -> str:
+        """Driver SQL for the upsert of ``name``, with a named parameter per column"""
+        if name == "conversations":
+            # Changed exports update their row; unchanged ones leave it alone
+            stmt = conversation_upsert([column for column in columns if column != 'id'])
+        elif name == "messages":
+            stmt = message_upsert()
+        else:
+            stmt = insert(checkpoints_table)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=['source'],
+                set_={column: stmt.excluded[column] for column in columns if column != 'source'}
             )
-        except Exception as e:
-            logger.warning(f"Error creating message: {e}")
-            return None
+        # Named parameters bind by column name, whatever order SQLAlchemy
+        # renders them in
+        return str(stmt.compile(dialect=NAMED_PARAMS, column_keys=list(columns)))
+
+    def _stale_messages(self, batch: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Per re-migrated conversation, the first message index past its new messages.
+
+        Messages removed from a changed export are deleted from there on.
+        Conversations migrated for the first time keep any messages other
+        writers stored.
+        """
+        columns, rows = batch["conversations"]
+        if not rows:
+            return []
+        position = columns.index("id")
+        next_index = {row[position]: 0 for row in rows if row[position] in self._migrated_ids}
+        columns, rows = batch["messages"]
+        if next_index and rows:
+            conversation_id, index = columns.index("conversation_id"), columns.index("index")
+            for row in rows:
+                if row[conversation_id] in next_index:
+                    next_index[row[conversation_id]] = max(next_index[row[conversation_id]], row[index] + 1)
+        return [{"conversation_id": conv_id, "index": index} for conv_id, index in next_index.items()]
     
-    def _parse_datetime(self, dt_str: str) -> datetime:
-        """Parse datetime string to datetime object"""
-        if not dt_str:
-            return datetime.utcnow()
-        
-        # Try different datetime formats
-        formats = [
-            '%Y-%m-%dT%H:%M:%S.%fZ',
-            '%Y-%m-%dT%H:%M:%SZ',
-            '%Y-%m-%d %H:%M:%S',
-            '%Y-%m-%d'
-        ]
-        
-        for fmt in formats:
-            try:
-                return datetime.strptime(dt_str, fmt)
-            except:
-                continue
+    def _write_batch(self, batch: Dict[str, Any], stats: Dict[str, Any]):
+        """Write encoded rows and their checkpoints in one transaction"""
+        checkpoints = batch["checkpoints"][1]
+        if not checkpoints:
+            return
+        stale = self._stale_messages(batch)
+
+        def write():
+            with self.engine.begin() as conn:
+                for name in TABLES:
+                    columns, rows = batch[name]
+                    if rows:
+                        conn.exec_driver_sql(
+                            self._statement(name, columns), [dict(zip(columns, row)) for row in rows]
+                        )
+                if stale:
+                    conn.execute(delete_stale_messages, stale)
+
+        retry_when_busy(write)
+        columns, rows = batch["conversations"]
+        if rows:
+            position = columns.index("id")
+            self._migrated_ids.update(row[position] for row in rows)
         
-        # If all fail, return current time
-        logger.warning(f"Could not parse datetime: {dt_str}")
-        return datetime.utcnow()
+        for source, error in batch["failed"]:
+            logger.error(f"Error migrating {source}: {error}")
+        stats["errors"] += len(batch["failed"])
+        stats["migrated"] += len(checkpoints) - len(batch["failed"]) - batch["skipped"]
+        stats["messages"] += len(batch["messages"][1])
     
     def _create_indexes(self, session):
         """Create database indexes for better performance"""
@@ -219,11 +346,12 @@ def main():
     parser.add_argument("--json-dir", default="extracted_messages", help="Directory containing JSON files")
     parser.add_argument("--db-path", default="data/db/conversations.db", help="Path to SQLite database")
     parser.add_argument("--verify", action="store_true", help="Verify migration after completion")
+    parser.add_argument("--workers", type=int, default=None, help="Parser processes (1 parses in-process)")
     
     args = parser.parse_args()
     
     # Run migration
-    migrator = DataMigrator(args.json_dir, args.db_path)
+    migrator = DataMigrator(args.json_dir, args.db_path, workers=args.workers)
     migrator.migrate()
     
     if args.verify:
@@ -4,6 +4,7 @@
 import asyncio
 import json
 import logging
+import os
 import time
 from datetime import datetime
 from pathlib import Path
@@ -17,6 +18,9 @@ import aiohttp_cors
 # Add parent directory to path to import rate limiter
 sys.path.append(str(Path(__file__).parent.parent))
 from src.utils.rate_limiter import RateLimiter, RateLimitConfig
+from src.utils.rate_limit_backends import create_rate_limit_backend
+from src.models.bulk import BulkWriter, export_conversation_row, export_message_rows
+from src.models.conversation import init_database
 
 # Configure logging
 logging.basicConfig(
@@ -33,12 +37,17 @@ STORAGE_DIR.mkdir(exist_ok=True)
 class BridgeServer:
     """HTTP server that receives messages from the browser extension."""
     
-    def __init__(self, host: str = "localhost", port: int = 8765):
+    def __init__(self, host: str = "localhost", port: int = 8765, db_path: Optional[str] = None):
         self.host = host
         self.port = port
         self.app = web.Application()
         self.conversations: Dict[str, Any] = {}
         
+        # Extracted conversations are also written to the shared database
+        self.db_path = Path(db_path or os.getenv('MCP_DB_PATH', 'data/db/conversations.db'))
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.writer = BulkWriter(init_database(str(self.db_path)))
+        
         # Initialize rate limiter with custom config for bridge server
         rate_config = RateLimitConfig(
             requests_per_second=3.0,  # 3 requests per second
@@ -46,12 +55,18 @@ class BridgeServer:
             retry_after_header_respect=True,
             max_retries=5
         )
-        self.rate_limiter = RateLimiter(rate_config)
+        # Shares its budget with MCP server processes when RATE_LIMIT_BACKEND is set
+        self.rate_limiter = RateLimiter(rate_config, backend=create_rate_limit_backend())
         
         self._setup_routes()
         self._setup_cors()
         self._setup_middleware()
+        self.app.on_cleanup.append(self._close_rate_limiter)
         
+    async def _close_rate_limiter(self, app: web.Application):
+        """Close the shared rate limit backend on shutdown."""
+        await self.rate_limiter.close()
+    
     def _setup_routes(self):
         """Set up HTTP routes."""
         self.app.router.add_post('/api/conversation', self.handle_conversation)
@@ -159,8 +174,9 @@ class BridgeServer:
                 'extracted_at': datetime.now().isoformat()
             }
             
-            # Save to file
+            # Save to file and database
             await self._save_conversation(conv_id, self.conversations[conv_id])
+            await asyncio.to_thread(self._store_conversation, conv_id, self.conversations[conv_id])
             
             logger.info(f"Received conversation: {conv_id} - {data.get('title')}")
             
@@ -201,6 +217,7 @@ class BridgeServer:
             
             # Save complete conversation with messages
             await self._save_conversation(conv_id, self.conversations[conv_id], include_messages=True)
+            await asyncio.to_thread(self._store_conversation, conv_id, self.conversations[conv_id])
             
             logger.info(f"Received {len(messages)} messages for conversation: {conv_id}")
             
@@ -278,6 +295,19 @@ class BridgeServer:
             'exists': False
         }, status=404)
     
+    def _store_conversation(self, conv_id: str, data: Dict[str, Any]):
+        """Upsert a conversation (and its messages, if any) into the database."""
+        try:
+            row = {**export_conversation_row(data, extracted_by='extension'), 'id': conv_id}
+            # Columns the extension knows about; tags and search data stay as they are
+            self.writer.upsert_conversations(
+                [row], columns=['title', 'created_at', 'updated_at', 'extracted_at', 'message_count', 'extra_data']
+            )
+            if 'messages' in data:
+                self.writer.upsert_messages(export_message_rows(data, conv_id))
+        except Exception as e:
+            logger.error(f"Error storing conversation {conv_id} in database: {e}")
+    
     async def _save_conversation(self, conv_id: str, data: Dict[str, Any], include_messages: bool = False):
         """Save conversation to disk."""
         try:
@@ -1,9 +1,15 @@
-# src/__init__.py
 """MCP Claude Context Server - Extract conversations from Claude.ai"""
 
 __version__ = "0.5.0"
 __author__ = "Hamza Amjad"
 
-from .direct_api_server import DirectAPIClaudeContextServer, main
+__all__ = ["DirectAPIClaudeContextServer", "main", "__version__"]
 
-__all__ = ["DirectAPIClaudeContextServer", "main", "__version__"]
\ No newline at end of file
+
+def __getattr__(name):
+    # Importing the server loads the MCP SDK, SQLAlchemy and friends; defer it
+    # so that importing a submodule (e.g. src.utils) stays cheap
+    if name in ("DirectAPIClaudeContextServer", "main"):
+        from . import direct_api_server
+        return getattr(direct_api_server, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
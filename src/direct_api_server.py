@@ -6,6 +6,7 @@ from typing import Any, Dict, List, Optional, Tuple
 import asyncio
 import json
 import requests
+import threading
 from datetime import datetime, timedelta
 import csv
 import os
@@ -23,17 +24,21 @@ from mcp.types import (
     ServerCapabilities,
 )
 
-# Database imports
-from sqlalchemy import create_engine, text
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-
 # Import our modules
-from src.models.conversation import Base, Conversation, Message, init_database
-from src.exporters import ObsidianExporter, PDFExporter, NotionExporter
+from src.models.conversation import init_database
+from src.models.store import ConversationStore
+from src.exporters import ObsidianExporter, NotionExporter
+from src.exporters.obsidian_exporter import export_bulk_to_vault
 from src.search import UnifiedSearchEngine
+from src.sync import ConversationSyncEngine, ConversationHydrator, SyncError
 from src.utils.rate_limiter import RateLimiter, RateLimitConfig, RateLimitedSession
+from src.utils.rate_limit_backends import create_rate_limit_backend
+from src.utils.resilience import Resilience, ResilienceConfig
+from src.utils.response_cache import create_response_cache
+from src.utils.session_health import SessionHealth
+from src.utils.http_client import AsyncHTTPTransport, HTTPError
 from src.utils.request_queue import RequestQueue, RequestPriority, RequestQueueManager
+from src.utils.executor import TaskExecutor, ExecutorConfig
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -54,16 +59,49 @@ class DirectAPIClaudeContextServer:
             burst_size=int(os.getenv('RATE_LIMIT_BURST_SIZE', '10')),
             retry_after_header_respect=True,
             backoff_base=2.0,
-            max_retries=5
+            max_retries=5,
+            # AIMD: find the real server limit from 429 feedback
+            adaptive=os.getenv('RATE_LIMIT_ADAPTIVE', 'false').lower() in ('1', 'true', 'yes'),
+            min_requests_per_second=float(os.getenv('RATE_LIMIT_MIN_PER_SECOND', '0.5')),
+            max_requests_per_second=float(os.getenv('RATE_LIMIT_MAX_PER_SECOND', '20.0'))
         )
-        self.rate_limiter = RateLimiter(rate_limit_config)
+        # RATE_LIMIT_BACKEND=sqlite/redis shares one budget between server processes
+        self.rate_limiter = RateLimiter(rate_limit_config, backend=create_rate_limit_backend())
         
-        # Initialize session with rate limiting
-        self.session = requests.Session()
-        self.rate_limited_session = RateLimitedSession(self.session, self.rate_limiter)
+        # Initialize session with rate limiting. The aiohttp transport keeps a
+        # pooled keep-alive connection set on the event loop; MCP_HTTP_TRANSPORT=requests
+        # falls back to a requests.Session run in worker threads.
+        if os.getenv('MCP_HTTP_TRANSPORT', 'aiohttp').lower() == 'requests':
+            self.session = requests.Session()
+        else:
+            self.session = AsyncHTTPTransport()
+        # Transient failures are retried within a budget; a per-endpoint circuit
+        # breaker fails fast while claude.ai is degraded
+        resilience = Resilience(ResilienceConfig(
+            retry_budget_ratio=float(os.getenv('MCP_RETRY_BUDGET_RATIO', '0.2')),
+            failure_threshold=int(os.getenv('MCP_CIRCUIT_FAILURE_THRESHOLD', '5')),
+            recovery_timeout=float(os.getenv('MCP_CIRCUIT_RECOVERY_SECONDS', '30'))
+        ))
+        # GET responses are cached on disk and revalidated with ETag/Last-Modified
+        self.rate_limited_session = RateLimitedSession(
+            self.session, self.rate_limiter, resilience, cache=create_response_cache()
+        )
         
         # Initialize request queue manager
-        self.queue_manager = RequestQueueManager(default_max_concurrent=3)
+        self.queue_manager = RequestQueueManager(
+            default_max_concurrent=3,
+            max_size=int(os.getenv('MCP_QUEUE_MAX_SIZE', '1000')),
+            overflow=os.getenv('MCP_QUEUE_OVERFLOW', 'block'),
+            # LOW requests climb a priority level per interval so they can't starve
+            aging_interval=float(os.getenv('MCP_QUEUE_AGING_SECONDS', '30'))
+        )
+        
+        # Thread/process pools for blocking and CPU-heavy tool work
+        self.executor = TaskExecutor(ExecutorConfig(
+            thread_workers=int(os.getenv('MCP_THREAD_WORKERS', str(ExecutorConfig().thread_workers))),
+            process_workers=int(os.getenv('MCP_PROCESS_WORKERS', str(ExecutorConfig().process_workers))),
+            enable_process_pool=os.getenv('MCP_PROCESS_POOL', 'true').lower() in ('1', 'true', 'yes')
+        ))
         
         # Paths - use environment variables or user directories for uvx compatibility
         base_dir = Path(os.getenv('MCP_DATA_DIR', Path.home() / '.mcp-claude-context'))
@@ -73,32 +111,86 @@ class DirectAPIClaudeContextServer:
         self.session_key_file = base_dir / "config" / "session_key.json"
         self.db_path = Path(os.getenv('MCP_DB_PATH', str(base_dir / "data" / "db" / "conversations.db")))
         
-        # Session management
-        self.last_session_check = None
-        self.session_check_interval = 300  # Check every 5 minutes
+        # Session management: validity is inferred from real responses, and an
+        # idle session key is probed in the background instead of inline
+        saved = self._load_session_key()
+        self.session_health = SessionHealth(
+            probe=self._session_status,
+            persist=self._save_session_key,
+            idle_interval=float(os.getenv('MCP_SESSION_CHECK_INTERVAL', '300')),
+            idle_limit=float(os.getenv('MCP_SESSION_CHECK_IDLE_LIMIT', '3600')),
+            saved=(saved.get('session_key'), saved.get('org_id')) if saved else None
+        )
+        self.rate_limited_session.on_response = self.session_health.observe
         
         # Initialize database
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         self.engine = init_database(str(self.db_path))
-        self.Session = sessionmaker(bind=self.engine)
         
-        # Initialize search engine with proper index path
+        # All tool handlers read and write through the async store
+        self.store = ConversationStore(str(self.db_path))
+        
+        # Incremental conversation sync (per-org updated_at watermarks)
+        self.sync_engine = ConversationSyncEngine(
+            self.rate_limited_session,
+            self.store,
+            page_size=int(os.getenv('MCP_SYNC_PAGE_SIZE', '100'))
+        )
+        
+        # Background message fetching on the low-priority "hydrate" queue
+        self.hydrator = ConversationHydrator(
+            self.rate_limited_session,
+            self.store,
+            self.queue_manager,
+            batch_size=int(os.getenv('MCP_HYDRATE_BATCH_SIZE', '50')),
+            concurrency=int(os.getenv('MCP_HYDRATE_CONCURRENCY', '4'))
+        )
+        
+        # Initialize search engine with proper index path. Backends load lazily
+        # (or in the background from start()) so startup stays fast.
         index_path = base_dir / "search_index"
         self.search_engine = UnifiedSearchEngine(str(self.db_path), index_path=str(index_path))
+        self.search_warmup = os.getenv('MCP_SEARCH_WARMUP', 'true').lower() in ('1', 'true', 'yes')
+        self._warmup_task: Optional[asyncio.Task] = None
+        # Background search index rebuild (rebuild_search_index tool)
+        self._rebuild_task: Optional[asyncio.Task] = None
+        self._rebuild_cancel = threading.Event()
+        self._rebuild_job: Optional[Dict[str, Any]] = None
         
         # Initialize exporters
+        # PDF and Obsidian rendering run in worker processes, so the server only
+        # keeps their output locations (and never imports reportlab itself)
         self.obsidian_exporter = ObsidianExporter()
-        self.pdf_exporter = PDFExporter()
+        self.pdf_output_dir = Path("exports/pdf")
         self.notion_exporter = None  # Will be initialized if API key is provided
         
     async def start(self):
         """Start the server and its components."""
         await self.queue_manager.start()
+        
+        # Warm search backends off the event loop; tools that don't need
+        # them answer immediately, and search tools load on demand if needed
+        if self.search_warmup and self._warmup_task is None:
+            self._warmup_task = asyncio.create_task(
+                self.executor.run_blocking(self.search_engine.warm_up)
+            )
+        
         logger.info("DirectAPIClaudeContextServer started")
         
     async def stop(self):
         """Stop the server and cleanup."""
+        if self._warmup_task and not self._warmup_task.done():
+            # The worker thread can't be interrupted; just stop waiting on it
+            self._warmup_task.cancel()
+        # A text index rebuild stops after its current chunk and resumes next start
+        self._rebuild_cancel.set()
+        await self.hydrator.close()
         await self.queue_manager.stop()
+        await self.store.close()
+        await self.session_health.close()
+        await self.rate_limited_session.close()
+        await self.rate_limiter.close()
+        self.executor.shutdown(wait=False)
         logger.info("DirectAPIClaudeContextServer stopped")
         
     def _setup_handlers(self):
@@ -139,6 +231,62 @@ class DirectAPIClaudeContextServer:
                         "required": ["session_key", "org_id"]
                     }
                 ),
+                Tool(
+                    name="sync_conversations",
+                    description="Incrementally sync the conversation list to the database and report what changed",
+                    inputSchema={
+                        "type": "object",
+                        "properties": {
+                            "session_key": {
+                                "type": "string",
+                                "description": "Claude.ai session key (required)"
+                            },
+                            "org_id": {
+                                "type": "string",
+                                "description": "Organization ID (required)"
+                            },
+                            "full": {
+                                "type": "boolean",
+                                "description": "Ignore the last sync watermark and compare every conversation",
+                                "default": False
+                            }
+                        },
+                        "required": ["session_key", "org_id"]
+                    }
+                ),
+                Tool(
+                    name="hydrate_conversations",
+                    description="Fetch full message history for synced conversations in the background (start, check status, or cancel)",
+                    inputSchema={
+                        "type": "object",
+                        "properties": {
+                            "action": {
+                                "type": "string",
+                                "enum": ["start", "status", "cancel"],
+                                "default": "start",
+                                "description": "Start a job, report progress, or cancel the running job"
+                            },
+                            "session_key": {
+                                "type": "string",
+                                "description": "Claude.ai session key (required to start)"
+                            },
+                            "org_id": {
+                                "type": "string",
+                                "description": "Organization ID (required to start)"
+                            },
+                            "conversation_ids": {
+                                "type": "array",
+                                "items": {"type": "string"},
+                                "description": "Only hydrate these conversations (default: all pending)"
+                            },
+                            "limit": {
+                                "type": "integer",
+                                "description": "Maximum conversations to hydrate in this job",
+                                "minimum": 1
+                            }
+                        }
+                    }
+                ),
                 Tool(
                     name="get_conversation",
                     description="Get a specific conversation with all messages",
@@ -178,6 +326,17 @@ class DirectAPIClaudeContextServer:
                             "query": {
                                 "type": "string",
                                 "description": "Search query"
+                            },
+                            "limit": {
+                                "type": "integer",
+                                "description": "Maximum number of results to return",
+                                "minimum": 1,
+                                "maximum": 100,
+                                "default": 50
+                            },
+                            "cursor": {
+                                "type": "string",
+                                "description": "next_cursor from the previous page, to fetch the page after it"
                             }
                         },
                         "required": ["session_key", "org_id", "query"]
@@ -252,6 +411,10 @@ class DirectAPIClaudeContextServer:
                                 "minimum": 1,
                                 "maximum": 100,
                                 "default": 20
+                            },
+                            "cursor": {
+                                "type": "string",
+                                "description": "next_cursor from the previous page, to fetch the page after it"
                             }
                         },
                         "required": ["query"]
@@ -375,10 +538,26 @@ class DirectAPIClaudeContextServer:
                 ),
                 Tool(
                     name="rebuild_search_index",
-                    description="Rebuild search indexes for better performance",
+                    description="Rebuild search indexes in the background (start, check status, or cancel); searches keep working meanwhile",
                     inputSchema={
                         "type": "object",
                         "properties": {
+                            "action": {
+                                "type": "string",
+                                "enum": ["start", "status", "cancel"],
+                                "default": "start",
+                                "description": "Start a rebuild, report progress, or cancel the running rebuild (a text rebuild resumes on the next start, a semantic one starts over)"
+                            },
+                            "batch_size": {
+                                "type": "integer",
+                                "default": 1000,
+                                "description": "Rows indexed per transaction"
+                            },
+                            "restart": {
+                                "type": "boolean",
+                                "default": False,
+                                "description": "Discard an interrupted text index rebuild instead of resuming it"
+                            },
                             "index_type": {
                                 "type": "string",
                                 "enum": ["text", "semantic", "both"],
@@ -390,7 +569,7 @@ class DirectAPIClaudeContextServer:
                 ),
                 Tool(
                     name="get_rate_limit_metrics",
-                    description="Get rate limiting metrics and API usage statistics",
+                    description="Get rate limiting metrics and API usage statistics, including per-endpoint wait time and latency percentiles",
                     inputSchema={
                         "type": "object",
                         "properties": {
@@ -415,6 +594,20 @@ class DirectAPIClaudeContextServer:
                         arguments.get("limit", 50),
                         arguments.get("sync_to_db", True)
                     )
+                elif name == "sync_conversations":
+                    result = await self._sync_conversations(
+                        arguments.get("session_key"),
+                        arguments.get("org_id"),
+                        arguments.get("full", False)
+                    )
+                elif name == "hydrate_conversations":
+                    result = await self._hydrate_conversations(
+                        arguments.get("action", "start"),
+                        arguments.get("session_key"),
+                        arguments.get("org_id"),
+                        arguments.get("conversation_ids"),
+                        arguments.get("limit")
+                    )
                 elif name == "get_conversation":
                     result = await self._get_conversation(
                         arguments.get("session_key"),
@@ -425,7 +618,9 @@ class DirectAPIClaudeContextServer:
                     result = await self._search_conversations(
                         arguments.get("session_key"),
                         arguments.get("org_id"),
-                        arguments.get("query")
+                        arguments.get("query"),
+                        arguments.get("limit", 50),
+                        arguments.get("cursor")
                     )
                 elif name == "export_conversations":
                     result = await self._export_conversations(
@@ -443,7 +638,8 @@ class DirectAPIClaudeContextServer:
                     result = await self._search_messages(
                         arguments.get("query"),
                         arguments.get("case_sensitive", False),
-                        arguments.get("limit", 20)
+                        arguments.get("limit", 20),
+                        arguments.get("cursor")
                     )
                 elif name == "update_session":
                     result = await self._update_session(
@@ -478,7 +674,10 @@ class DirectAPIClaudeContextServer:
                     )
                 elif name == "rebuild_search_index":
                     result = await self._rebuild_search_index(
-                        arguments.get("index_type", "both")
+                        arguments.get("action", "start"),
+                        arguments.get("index_type", "both"),
+                        arguments.get("batch_size", 1000),
+                        arguments.get("restart", False)
                     )
                 elif name == "get_rate_limit_metrics":
                     result = await self._get_rate_limit_metrics(
@@ -499,23 +698,18 @@ class DirectAPIClaudeContextServer:
         @self.server.list_resources()
         async def list_resources() -> List[Resource]:
             """List available conversation resources."""
-            resources = []
-            
             # Get conversations from database
-            session = self.Session()
-            try:
-                conversations = session.query(Conversation).limit(100).all()
-                for conv in conversations:
-                    resources.append(Resource(
-                        uri=f"conversation://{conv.id}",
-                        name=conv.title,
-                        description=f"Created: {conv.created_at}",
-                        mimeType="application/json"
-                    ))
-            finally:
-                session.close()
+            conversations = await self.store.list_conversations(limit=100)
             
-            return resources
+            return [
+                Resource(
+                    uri=f"conversation://{conv['id']}",
+                    name=conv['title'],
+                    description=f"Created: {conv['created_at']}",
+                    mimeType="application/json"
+                )
+                for conv in conversations
+            ]
         
         @self.server.read_resource()
         async def read_resource(uri: str) -> str:
@@ -528,27 +722,15 @@ class DirectAPIClaudeContextServer:
                 
             conv_id = uri.replace("conversation://", "")
             
-            # Get from database
-            session = self.Session()
-            try:
-                conv = session.query(Conversation).filter_by(id=conv_id).first()
-                if not conv:
-                    raise ErrorData(
-                        code=INVALID_PARAMS,
-                        message=f"Conversation {conv_id} not found"
-                    )
-                
-                # Get messages
-                messages = session.query(Message).filter_by(
-                    conversation_id=conv_id
-                ).order_by(Message.index).all()
-                
-                result = conv.to_dict()
-                result['messages'] = [msg.to_dict() for msg in messages]
-                
-                return json.dumps(result, indent=2)
-            finally:
-                session.close()
+            # Get from database, with messages
+            result = await self.store.get_conversation(conv_id)
+            if result is None:
+                raise ErrorData(
+                    code=INVALID_PARAMS,
+                    message=f"Conversation {conv_id} not found"
+                )
+            
+            return json.dumps(result, indent=2)
     
     def _get_headers(self, session_key: str) -> Dict[str, str]:
         """Get request headers with authentication."""
@@ -586,41 +768,30 @@ class DirectAPIClaudeContextServer:
             logger.error(f"Failed to load session key: {e}")
         return None
     
+    async def _session_status(self, session_key: str, org_id: str) -> int:
+        """Status code of a minimal authenticated API call."""
+        url = f'https://claude.ai/api/organizations/{org_id}/chat_conversations?limit=1'
+        response = await self.rate_limited_session.get(
+            url, headers=self._get_headers(session_key), timeout=10, cache_ttl=0
+        )
+        return response.status_code
+    
     async def _verify_session(self, session_key: str, org_id: str) -> bool:
         """Verify if session key is still valid."""
         try:
-            # Try a simple API call
-            url = f'https://claude.ai/api/organizations/{org_id}/chat_conversations?limit=1'
-            headers = self._get_headers(session_key)
-            
-            response = await self.rate_limited_session.get(
-                url, headers=headers, timeout=10
-            )
-            
-            return response.status_code == 200
+            return await self._session_status(session_key, org_id) == 200
         except Exception as e:
             logger.error(f"Session verification failed: {e}")
             return False
     
     async def _check_and_refresh_session(self, session_key: str, org_id: str) -> tuple[str, str]:
-        """Check session validity and refresh if needed."""
-        current_time = datetime.now()
-        
-        # Check if we need to verify session
-        if self.last_session_check is None or \
-           (current_time - self.last_session_check).total_seconds() > self.session_check_interval:
-            
-            logger.info("Checking session validity...")
-            if await self._verify_session(session_key, org_id):
-                self.last_session_check = current_time
-                self._save_session_key(session_key, org_id)
-                return session_key, org_id
-            else:
-                logger.warning("Session key expired or invalid")
-                # In a real implementation, you might prompt for new credentials
-                # For now, we'll just return the existing ones
-                return session_key, org_id
+        """
+        Track the credentials a tool call uses.
         
+        Never makes a request: the session's validity is learned from the
+        call's own response (and checked in the background when idle).
+        """
+        self.session_health.track(session_key, org_id)
         return session_key, org_id
     
     async def _list_conversations(
@@ -639,46 +810,51 @@ class DirectAPIClaudeContextServer:
         url = f'https://claude.ai/api/organizations/{org_id}/chat_conversations'
         headers = self._get_headers(session_key)
         
+        # The listing is parsed as it arrives: only the first ``limit``
+        # conversations are kept, and they reach the database in batches
+        count = 0
+        listed = []
+        batch = []
         try:
-            response = await self.rate_limited_session.get(
-                url, headers=headers, timeout=30
-            )
-            
-            if response.status_code == 200:
-                conversations = response.json()
+            async for conv in self.rate_limited_session.iter_json_array(url, headers=headers, timeout=30):
+                count += 1
+                if count > limit:
+                    continue
                 
                 # Cache conversations
-                for conv in conversations[:limit]:
-                    self.conversations_cache[conv['uuid']] = conv
+                self.conversations_cache[conv['uuid']] = conv
+                listed.append({
+                    "id": conv['uuid'],
+                    "name": conv.get('name', 'Untitled'),
+                    "created_at": conv.get('created_at'),
+                    "updated_at": conv.get('updated_at'),
+                    "message_count": conv.get('message_count', 0),
+                    "model": conv.get('model'),
+                    "is_starred": conv.get('is_starred', False)
+                })
                 
                 # Sync to database if requested
                 if sync_to_db:
-                    await self._sync_conversations_to_db(conversations[:limit])
-                
-                # Format response
-                return {
-                    "status": "success",
-                    "count": len(conversations),
-                    "conversations": [
-                        {
-                            "id": conv['uuid'],
-                            "name": conv.get('name', 'Untitled'),
-                            "created_at": conv.get('created_at'),
-                            "updated_at": conv.get('updated_at'),
-                            "message_count": conv.get('message_count', 0),
-                            "model": conv.get('model'),
-                            "is_starred": conv.get('is_starred', False)
-                        }
-                        for conv in conversations[:limit]
-                    ]
-                }
-            else:
-                return {
-                    "status": "error",
-                    "error": f"API returned status {response.status_code}",
-                    "details": response.text
-                }
-                
+                    batch.append(conv)
+                    if len(batch) >= self.store.chunk_size:
+                        await self._sync_conversations_to_db(batch)
+                        batch = []
+            
+            if batch:
+                await self._sync_conversations_to_db(batch)
+            
+            return {
+                "status": "success",
+                "count": count,
+                "conversations": listed
+            }
+        
+        except HTTPError as e:
+            return {
+                "status": "error",
+                "error": str(e),
+                "details": e.response.text
+            }
         except Exception as e:
             logger.error(f"Failed to list conversations: {e}")
             return {
@@ -686,77 +862,101 @@ class DirectAPIClaudeContextServer:
                 "error": str(e)
             }
     
+    async def _sync_conversations(self, session_key: str, org_id: str, full: bool = False) -> Dict[str, Any]:
+        """Delta-sync the conversation list using the per-org watermark."""
+        logger.info(f"Syncing conversations for org {org_id} ({'full' if full else 'incremental'})")
+        
+        session_key, org_id = await self._check_and_refresh_session(session_key, org_id)
+        
+        try:
+            result = await self.sync_engine.sync(org_id, self._get_headers(session_key), full=full)
+            return {"status": "success", **result}
+        except SyncError as e:
+            return {
+                "status": "error",
+                "error": str(e),
+                "details": e.details
+            }
+        except Exception as e:
+            logger.error(f"Failed to sync conversations: {e}")
+            return {
+                "status": "error",
+                "error": str(e)
+            }
+    
+    async def _hydrate_conversations(
+        self,
+        action: str,
+        session_key: Optional[str],
+        org_id: Optional[str],
+        conversation_ids: Optional[List[str]] = None,
+        limit: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Start, report on, or cancel background message hydration."""
+        try:
+            if action == "status":
+                return {"status": "success", **await self.hydrator.status()}
+            if action == "cancel":
+                return {"status": "success", **await self.hydrator.cancel()}
+            if action != "start":
+                return {"status": "error", "error": f"Unknown action: {action}"}
+            
+            if not session_key or not org_id:
+                return {"status": "error", "error": "session_key and org_id are required to start"}
+            
+            session_key, org_id = await self._check_and_refresh_session(session_key, org_id)
+            result = await self.hydrator.start(
+                org_id, self._get_headers(session_key), conversation_ids, limit
+            )
+            return {"status": "success", **result}
+        except Exception as e:
+            logger.error(f"Hydration {action} failed: {e}")
+            return {
+                "status": "error",
+                "error": str(e)
+            }
+    
     async def _sync_conversations_to_db(self, conversations: List[Dict]) -> None:
         """Sync conversations to database."""
-        session = self.Session()
         try:
-            for conv_data in conversations:
-                # Check if conversation exists
-                conv = session.query(Conversation).filter_by(
-                    id=conv_data['uuid']
-                ).first()
-                
-                if conv:
-                    # Update existing
-                    conv.title = conv_data.get('name', 'Untitled')
-                    conv.updated_at = datetime.fromisoformat(
-                        conv_data['updated_at'].replace('Z', '+00:00')
-                    ) if conv_data.get('updated_at') else datetime.now()
-                    conv.model = conv_data.get('model', 'unknown')
-                    conv.message_count = conv_data.get('message_count', 0)
-                else:
-                    # Create new
-                    conv = Conversation(
-                        id=conv_data['uuid'],
-                        title=conv_data.get('name', 'Untitled'),
-                        created_at=datetime.fromisoformat(
-                            conv_data['created_at'].replace('Z', '+00:00')
-                        ) if conv_data.get('created_at') else datetime.now(),
-                        updated_at=datetime.fromisoformat(
-                            conv_data['updated_at'].replace('Z', '+00:00')
-                        ) if conv_data.get('updated_at') else datetime.now(),
-                        model=conv_data.get('model', 'unknown'),
-                        message_count=conv_data.get('message_count', 0),
-                        metadata={
-                            'is_starred': conv_data.get('is_starred', False),
-                            'settings': conv_data.get('settings', {})
-                        }
-                    )
-                    session.add(conv)
-            
-            session.commit()
-            logger.info(f"Synced {len(conversations)} conversations to database")
+            counts = await self.store.sync_conversations(conversations)
+            logger.info(
+                f"Synced {len(conversations)} conversations to database "
+                f"({counts['inserted']} new, {counts['updated']} updated, {counts['unchanged']} unchanged)"
+            )
         except Exception as e:
             logger.error(f"Error syncing to database: {e}")
-            session.rollback()
-        finally:
-            session.close()
     
     async def _get_conversation(self, session_key: str, org_id: str, conversation_id: str) -> Dict[str, Any]:
         """Get a specific conversation."""
         logger.info(f"Getting conversation {conversation_id}")
         
         # First, check database
-        session = self.Session()
+        result = await self.store.get_conversation(conversation_id)
+        if result is not None:
+            return {
+                "status": "success",
+                "source": "database",
+                "conversation": result
+            }
+        
+        # Not in the database: fetch it with its messages, ahead of any
+        # queued background hydration
+        session_key, org_id = await self._check_and_refresh_session(session_key, org_id)
         try:
-            conv = session.query(Conversation).filter_by(id=conversation_id).first()
-            if conv:
-                messages = session.query(Message).filter_by(
-                    conversation_id=conversation_id
-                ).order_by(Message.index).all()
-                
-                result = conv.to_dict()
-                result['messages'] = [msg.to_dict() for msg in messages]
-                
+            result = await self.hydrator.hydrate_one(
+                org_id, self._get_headers(session_key), conversation_id
+            )
+            if result is not None:
                 return {
                     "status": "success",
-                    "source": "database",
+                    "source": "api",
                     "conversation": result
                 }
-        finally:
-            session.close()
+        except Exception as e:
+            logger.error(f"Failed to fetch conversation {conversation_id}: {e}")
         
-        # If not in database, check cache
+        # Fall back to listing metadata cached by list_conversations
         if conversation_id in self.conversations_cache:
             return {
                 "status": "success",
@@ -764,35 +964,43 @@ class DirectAPIClaudeContextServer:
                 "conversation": self.conversations_cache[conversation_id]
             }
         
-        # If not cached, try to fetch conversations first
-        await self._list_conversations(session_key, org_id)
-        
-        if conversation_id in self.conversations_cache:
-            return {
-                "status": "success",
-                "source": "api",
-                "conversation": self.conversations_cache[conversation_id]
-            }
-        else:
-            return {
-                "status": "error",
-                "error": f"Conversation {conversation_id} not found"
-            }
+        return {
+            "status": "error",
+            "error": f"Conversation {conversation_id} not found"
+        }
     
-    async def _search_conversations(self, session_key: str, org_id: str, query: str) -> Dict[str, Any]:
+    async def _search_conversations(
+        self,
+        session_key: str,
+        org_id: str,
+        query: str,
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> Dict[str, Any]:
         """Search conversations by keyword."""
         logger.info(f"Searching conversations for: {query}")
         
         # Use database search
-        results = self.search_engine.text_search.search_conversations(query, limit=50)
+        try:
+            # The backend is resolved in the worker too: first use loads it
+            page = await self.executor.run_blocking(
+                lambda: self.search_engine.text_search.search_conversations_page(query, limit, cursor)
+            )
+        except ValueError as e:
+            return {
+                "status": "error",
+                "error": str(e)
+            }
         
-        if results:
+        # A cursor continues a database search, even onto an empty page
+        if page["results"] or cursor:
             return {
                 "status": "success",
                 "source": "database",
                 "query": query,
-                "count": len(results),
-                "results": results
+                "count": len(page["results"]),
+                "results": page["results"],
+                "next_cursor": page["next_cursor"]
             }
         
         # Fallback to cache search
@@ -838,22 +1046,9 @@ class DirectAPIClaudeContextServer:
         
         if conversation_ids:
             # Export specific conversations
-            session = self.Session()
-            try:
-                for conv_id in conversation_ids:
-                    conv = session.query(Conversation).filter_by(id=conv_id).first()
-                    if conv:
-                        conv_data = conv.to_dict()
-                        
-                        if include_messages:
-                            messages = session.query(Message).filter_by(
-                                conversation_id=conv_id
-                            ).order_by(Message.index).all()
-                            conv_data['messages'] = [msg.to_dict() for msg in messages]
-                        
-                        conversations_to_export.append(conv_data)
-            finally:
-                session.close()
+            conversations_to_export = await self.store.get_conversations(
+                conversation_ids, include_messages=include_messages
+            )
         else:
             # Export all from cache or database
             if not self.conversations_cache:
@@ -916,39 +1111,39 @@ class DirectAPIClaudeContextServer:
                         writer.writerow(row)
                         
             elif format == "obsidian":
-                # Use Obsidian exporter
-                results = []
-                for conv in conversations_to_export:
-                    if include_messages and 'messages' in conv:
-                        filepath = self.obsidian_exporter.export_conversation(
-                            conv, conv['messages']
-                        )
-                        results.append(filepath)
+                # Render in a worker process
+                results = await self.executor.run_cpu(
+                    export_bulk_to_vault,
+                    str(self.obsidian_exporter.vault_path),
+                    self._exportable(conversations_to_export, include_messages)
+                )
                 
                 return {
                     "status": "success",
                     "format": "obsidian",
-                    "exported_count": len(results),
+                    "exported_count": len(results['success']),
                     "vault_path": str(self.obsidian_exporter.vault_path),
-                    "files": results
+                    "files": results['success'],
+                    "errors": results['failed']
                 }
                 
             elif format == "pdf":
-                # Use PDF exporter
-                results = []
-                for conv in conversations_to_export:
-                    if include_messages and 'messages' in conv:
-                        filepath = self.pdf_exporter.export_conversation(
-                            conv, conv['messages']
-                        )
-                        results.append(filepath)
+                # Render in a worker process (imports reportlab there)
+                from src.exporters.pdf_exporter import render_bulk_to_pdf
+                
+                results = await self.executor.run_cpu(
+                    render_bulk_to_pdf,
+                    str(self.pdf_output_dir),
+                    self._exportable(conversations_to_export, include_messages)
+                )
                 
                 return {
                     "status": "success",
                     "format": "pdf",
-                    "exported_count": len(results),
-                    "output_dir": str(self.pdf_exporter.output_dir),
-                    "files": results
+                    "exported_count": len(results['success']),
+                    "output_dir": str(self.pdf_output_dir),
+                    "files": results['success'],
+                    "errors": results['failed']
                 }
             
             else:
@@ -978,6 +1173,16 @@ class DirectAPIClaudeContextServer:
                 "error": str(e)
             }
     
+    def _exportable(self, conversations: List[Dict], include_messages: bool) -> List[Dict]:
+        """Shape conversations for the exporters' export_bulk, skipping those without messages."""
+        if not include_messages:
+            return []
+        return [
+            {'conversation': conv, 'messages': conv['messages']}
+            for conv in conversations
+            if 'messages' in conv
+        ]
+    
     def _format_file_size(self, size_bytes: int) -> str:
         """Format file size in human-readable format."""
         for unit in ['B', 'KB', 'MB', 'GB']:
@@ -991,29 +1196,22 @@ class DirectAPIClaudeContextServer:
         logger.info(f"Getting messages for conversation {conversation_id}")
         
         # Check database first
-        session = self.Session()
-        try:
-            messages = session.query(Message).filter_by(
-                conversation_id=conversation_id
-            ).order_by(Message.index).all()
+        messages = await self.store.get_messages(conversation_id)
+        if messages:
+            conv = await self.store.get_conversation(conversation_id, include_messages=False)
             
-            if messages:
-                conv = session.query(Conversation).filter_by(id=conversation_id).first()
-                
-                return {
-                    "status": "success",
-                    "source": "database",
-                    "conversation": {
-                        "id": conversation_id,
-                        "title": conv.title if conv else "Untitled",
-                        "created_at": conv.created_at.isoformat() if conv else None,
-                        "updated_at": conv.updated_at.isoformat() if conv else None,
-                        "message_count": len(messages),
-                        "messages": [msg.to_dict() for msg in messages]
-                    }
+            return {
+                "status": "success",
+                "source": "database",
+                "conversation": {
+                    "id": conversation_id,
+                    "title": conv['title'] if conv else "Untitled",
+                    "created_at": conv['created_at'] if conv else None,
+                    "updated_at": conv['updated_at'] if conv else None,
+                    "message_count": len(messages),
+                    "messages": messages
                 }
-        finally:
-            session.close()
+            }
         
         # Check cache
         if conversation_id in self.messages_cache:
@@ -1095,7 +1293,13 @@ class DirectAPIClaudeContextServer:
                 "error": str(e)
             }
     
-    async def _search_messages(self, query: str, case_sensitive: bool = False, limit: int = 20) -> Dict[str, Any]:
+    async def _search_messages(
+        self,
+        query: str,
+        case_sensitive: bool = False,
+        limit: int = 20,
+        cursor: Optional[str] = None
+    ) -> Dict[str, Any]:
         """Search through message content using database."""
         logger.info(f"Searching for '{query}' in messages")
         
@@ -1107,15 +1311,24 @@ class DirectAPIClaudeContextServer:
         
         # Use database search
         try:
-            results = self.search_engine.text_search.search_messages(query, limit=limit)
+            page = await self.executor.run_blocking(
+                lambda: self.search_engine.text_search.search_messages_page(query, None, limit, cursor)
+            )
             
             return {
                 "status": "success",
                 "source": "database",
                 "query": query,
                 "case_sensitive": case_sensitive,
-                "total_results": len(results),
-                "results": results
+                "total_results": len(page["results"]),
+                "results": page["results"],
+                "next_cursor": page["next_cursor"]
+            }
+        except ValueError as e:
+            # A bad cursor; the file search has no pages to continue
+            return {
+                "status": "error",
+                "error": str(e)
             }
         except Exception as e:
             logger.error(f"Database search failed: {e}")
@@ -1206,11 +1419,9 @@ class DirectAPIClaudeContextServer:
         logger.info("Updating session credentials")
         
         try:
-            # Verify the new credentials
+            # Verify the new credentials; once valid they are saved (if changed)
+            self.session_health.track(session_key, org_id)
             if await self._verify_session(session_key, org_id):
-                # Save to file
-                self._save_session_key(session_key, org_id)
-                self.last_session_check = datetime.now()
                 
                 # Clear caches to force refresh with new credentials
                 self.conversations_cache.clear()
@@ -1246,50 +1457,35 @@ class DirectAPIClaudeContextServer:
         if vault_path:
             self.obsidian_exporter = ObsidianExporter(vault_path)
         
-        results = []
-        failed = []
+        # Get conversations and messages from database
+        conversations = await self.store.get_conversations(conversation_ids, include_messages=True)
         
-        session = self.Session()
-        try:
-            for conv_id in conversation_ids:
-                try:
-                    # Get conversation and messages from database
-                    conv = session.query(Conversation).filter_by(id=conv_id).first()
-                    if not conv:
-                        failed.append({
-                            'conversation_id': conv_id,
-                            'error': 'Conversation not found'
-                        })
-                        continue
-                    
-                    messages = session.query(Message).filter_by(
-                        conversation_id=conv_id
-                    ).order_by(Message.index).all()
-                    
-                    # Export
-                    filepath = self.obsidian_exporter.export_conversation(
-                        conv.to_dict(),
-                        [msg.to_dict() for msg in messages]
-                    )
-                    results.append(filepath)
-                    
-                except Exception as e:
-                    failed.append({
-                        'conversation_id': conv_id,
-                        'error': str(e)
-                    })
-            
-            return {
-                "status": "success",
-                "exported": len(results),
-                "failed": len(failed),
-                "vault_path": str(self.obsidian_exporter.vault_path),
-                "files": results,
-                "errors": failed
-            }
-            
-        finally:
-            session.close()
+        found = {conv['id'] for conv in conversations}
+        failed = [
+            {'conversation_id': conv_id, 'error': 'Conversation not found'}
+            for conv_id in conversation_ids
+            if conv_id not in found
+        ]
+        
+        # Render in a worker process
+        results = await self.executor.run_cpu(
+            export_bulk_to_vault,
+            str(self.obsidian_exporter.vault_path),
+            [
+                {'conversation': conv, 'messages': conv.pop('messages', [])}
+                for conv in conversations
+            ]
+        )
+        failed.extend(results['failed'])
+        
+        return {
+            "status": "success",
+            "exported": len(results['success']),
+            "failed": len(failed),
+            "vault_path": str(self.obsidian_exporter.vault_path),
+            "files": results['success'],
+            "errors": failed
+        }
     
     async def _semantic_search(
         self,
@@ -1300,7 +1496,11 @@ class DirectAPIClaudeContextServer:
         """Search using semantic similarity."""
         logger.info(f"Performing {search_type} search for: {query}")
         
-        results = self.search_engine.search(
+        # Query encoding runs on the thread pool (torch releases the GIL, and
+        # the model can't be shared with worker processes). The first call
+        # may also have to wait for the semantic backend to finish loading.
+        results = await self.executor.run_blocking(
+            self.search_engine.search,
             query=query,
             search_type=search_type,
             target='both',
@@ -1311,7 +1511,8 @@ class DirectAPIClaudeContextServer:
             "status": "success",
             "query": query,
             "search_type": search_type,
-            "results": results
+            "results": results,
+            "search_status": self.search_engine.get_status()
         }
     
     async def _bulk_operations(
@@ -1331,27 +1532,12 @@ class DirectAPIClaudeContextServer:
             "details": []
         }
         
-        session = self.Session()
         try:
             if operation == "tag":
                 tags = params.get("tags", [])
-                for conv_id in conversation_ids:
-                    try:
-                        conv = session.query(Conversation).filter_by(id=conv_id).first()
-                        if conv:
-                            current_tags = conv.tags or []
-                            conv.tags = list(set(current_tags + tags))
-                            results["processed"] += 1
-                        else:
-                            results["failed"] += 1
-                    except Exception as e:
-                        results["failed"] += 1
-                        results["details"].append({
-                            "id": conv_id,
-                            "error": str(e)
-                        })
-                
-                session.commit()
+                missing = await self.store.add_tags(conversation_ids, tags)
+                results["processed"] = len(conversation_ids) - len(missing)
+                results["failed"] = len(missing)
                 
             elif operation == "export":
                 format = params.get("format", "json")
@@ -1362,57 +1548,19 @@ class DirectAPIClaudeContextServer:
                 return export_result
                 
             elif operation == "delete":
-                for conv_id in conversation_ids:
-                    try:
-                        # Delete messages first
-                        session.query(Message).filter_by(
-                            conversation_id=conv_id
-                        ).delete()
-                        
-                        # Delete conversation
-                        session.query(Conversation).filter_by(
-                            id=conv_id
-                        ).delete()
-                        
-                        results["processed"] += 1
-                    except Exception as e:
-                        results["failed"] += 1
-                        results["details"].append({
-                            "id": conv_id,
-                            "error": str(e)
-                        })
-                
-                session.commit()
+                await self.store.delete_conversations(conversation_ids)
+                results["processed"] = len(conversation_ids)
                 
             elif operation == "analyze":
                 # Analyze conversations
-                total_messages = 0
-                total_chars = 0
-                models = {}
-                
-                for conv_id in conversation_ids:
-                    try:
-                        messages = session.query(Message).filter_by(
-                            conversation_id=conv_id
-                        ).all()
-                        
-                        total_messages += len(messages)
-                        total_chars += sum(len(msg.content) for msg in messages)
-                        
-                        conv = session.query(Conversation).filter_by(id=conv_id).first()
-                        if conv:
-                            model = conv.model or "unknown"
-                            models[model] = models.get(model, 0) + 1
-                        
-                        results["processed"] += 1
-                    except Exception as e:
-                        results["failed"] += 1
+                analysis = await self.store.analyze_conversations(conversation_ids)
+                results["processed"] = len(conversation_ids)
                 
                 results["analysis"] = {
-                    "total_messages": total_messages,
-                    "total_characters": total_chars,
-                    "average_messages_per_conversation": total_messages / len(conversation_ids) if conversation_ids else 0,
-                    "models_used": models
+                    "total_messages": analysis["total_messages"],
+                    "total_characters": analysis["total_characters"],
+                    "average_messages_per_conversation": analysis["total_messages"] / len(conversation_ids) if conversation_ids else 0,
+                    "models_used": analysis["models_used"]
                 }
             
             else:
@@ -1425,8 +1573,6 @@ class DirectAPIClaudeContextServer:
             logger.error(f"Bulk operation failed: {e}")
             results["status"] = "error"
             results["error"] = str(e)
-        finally:
-            session.close()
         
         return results
     
@@ -1434,7 +1580,6 @@ class DirectAPIClaudeContextServer:
         """Get conversation analytics."""
         logger.info(f"Getting analytics for time range: {time_range}")
         
-        session = self.Session()
         try:
             # Calculate date filter
             now = datetime.now()
@@ -1449,51 +1594,18 @@ class DirectAPIClaudeContextServer:
             else:
                 start_date = None
             
-            # Build query
-            query = session.query(Conversation)
-            if start_date:
-                query = query.filter(Conversation.created_at >= start_date)
-            
-            conversations = query.all()
-            
-            # Calculate statistics
-            total_conversations = len(conversations)
-            total_messages = sum(conv.message_count for conv in conversations)
-            
-            # Model distribution
-            model_dist = {}
-            for conv in conversations:
-                model = conv.model or "unknown"
-                model_dist[model] = model_dist.get(model, 0) + 1
-            
-            # Time distribution
-            daily_dist = {}
-            for conv in conversations:
-                date_key = conv.created_at.strftime("%Y-%m-%d")
-                daily_dist[date_key] = daily_dist.get(date_key, 0) + 1
-            
-            # Message statistics
-            message_counts = [conv.message_count for conv in conversations]
-            avg_messages = sum(message_counts) / len(message_counts) if message_counts else 0
-            max_messages = max(message_counts) if message_counts else 0
-            min_messages = min(message_counts) if message_counts else 0
+            # Aggregates are computed in SQL by the store
+            statistics = await self.store.get_statistics(start_date)
             
             # Search statistics
-            search_stats = self.search_engine.get_search_stats()
+            statistics["search_capabilities"] = await self.executor.run_blocking(
+                self.search_engine.get_search_stats
+            )
             
             return {
                 "status": "success",
                 "time_range": time_range,
-                "statistics": {
-                    "total_conversations": total_conversations,
-                    "total_messages": total_messages,
-                    "average_messages_per_conversation": avg_messages,
-                    "max_messages_in_conversation": max_messages,
-                    "min_messages_in_conversation": min_messages,
-                    "model_distribution": model_dist,
-                    "daily_distribution": daily_dist,
-                    "search_capabilities": search_stats
-                }
+                "statistics": statistics
             }
             
         except Exception as e:
@@ -1502,8 +1614,6 @@ class DirectAPIClaudeContextServer:
                 "status": "error",
                 "error": str(e)
             }
-        finally:
-            session.close()
     
     async def _migrate_to_database(self, verify: bool = True) -> Dict[str, Any]:
         """Migrate JSON files to database."""
@@ -1512,20 +1622,26 @@ class DirectAPIClaudeContextServer:
         # Import and run migration
         from deployment.scripts.migrate_data import DataMigrator
         
-        try:
+        def run_migration() -> Dict[str, Any]:
             migrator = DataMigrator(
                 json_dir=str(self.extracted_messages_dir),
                 db_path=str(self.db_path)
             )
             
-            migrator.migrate()
+            stats = migrator.migrate()
             
             if verify:
                 migrator.verify_migration()
+            return stats
+        
+        try:
+            # Parsing runs on the migrator's own process pool; writes block a worker thread
+            stats = await self.executor.run_blocking(run_migration)
             
             return {
                 "status": "success",
-                "message": "Migration completed successfully"
+                "message": "Migration completed successfully",
+                "stats": stats
             }
             
         except Exception as e:
@@ -1535,32 +1651,109 @@ class DirectAPIClaudeContextServer:
                 "error": str(e)
             }
     
-    async def _rebuild_search_index(self, index_type: str = "both") -> Dict[str, Any]:
-        """Rebuild search indexes."""
-        logger.info(f"Rebuilding {index_type} search index")
+    async def _rebuild_search_index(
+        self,
+        action: str = "start",
+        index_type: str = "both",
+        batch_size: int = 1000,
+        restart: bool = False
+    ) -> Dict[str, Any]:
+        """Start, report on, or cancel a background search index rebuild."""
+        try:
+            running = self._rebuild_task is not None and not self._rebuild_task.done()
+            if action == "cancel":
+                if running:
+                    # The text rebuild stops after its current chunk, the
+                    # semantic build after the batch it is encoding
+                    self._rebuild_cancel.set()
+                    await asyncio.wait({self._rebuild_task}, timeout=5)
+                return {"status": "success", **await self._rebuild_status()}
+            if action == "status":
+                return {"status": "success", **await self._rebuild_status()}
+            if action != "start":
+                return {"status": "error", "error": f"Unknown action: {action}"}
+            if index_type not in ["text", "semantic", "both"]:
+                return {"status": "error", "error": f"Unknown index_type: {index_type}"}
+            
+            if not running:
+                logger.info(f"Rebuilding {index_type} search index")
+                self._rebuild_cancel = threading.Event()
+                self._rebuild_job = {
+                    "index_type": index_type,
+                    "status": "running",
+                    "phase": None,
+                    "progress": None,
+                    "result": None,
+                    "error": None,
+                    "started_at": datetime.now().isoformat(),
+                    "finished_at": None
+                }
+                self._rebuild_task = asyncio.create_task(
+                    self._run_index_rebuild(self._rebuild_job, index_type, batch_size, restart)
+                )
+            return {"status": "success", **await self._rebuild_status()}
+            
+        except Exception as e:
+            logger.error(f"Index rebuild {action} failed: {e}")
+            return {
+                "status": "error",
+                "error": str(e)
+            }
+    
+    async def _rebuild_status(self) -> Dict[str, Any]:
+        """The current (or last) rebuild and any interrupted text index rebuild."""
+        unfinished = await self.executor.run_blocking(
+            lambda: self.search_engine.text_search.rebuild_status()
+        )
+        return {"job": self._rebuild_job, "unfinished": unfinished}
+    
+    async def _run_index_rebuild(self, job: Dict[str, Any], index_type: str, batch_size: int, restart: bool):
+        """Background rebuild; writes its progress and outcome into ``job``."""
+        cancel_event = self._rebuild_cancel
+        
+        def record_progress(progress: Dict[str, Any]):
+            job["progress"] = progress
         
         try:
             if index_type in ["text", "both"]:
-                self.search_engine.text_search.rebuild_search_index()
+                # Chunked: searches and writes carry on while it runs
+                job["phase"] = "text"
+                job["result"] = await self.executor.run_blocking(
+                    lambda: self.search_engine.text_search.rebuild_search_index(
+                        batch_size=batch_size,
+                        restart=restart,
+                        progress=record_progress,
+                        cancel_event=cancel_event
+                    )
+                )
+                if job["result"]["status"] == "cancelled":
+                    job["status"] = "cancelled"
+                    return
                 
             if index_type in ["semantic", "both"]:
-                self.search_engine.semantic_search.build_indexes()
+                # Built into new indexes; a cancelled build keeps the old ones
+                job["phase"] = "semantic"
+                built = await self.executor.run_blocking(
+                    lambda: self.search_engine.semantic_search.build_indexes(cancel_event=cancel_event)
+                )
+                if not built:
+                    job["status"] = "cancelled"
+                    return
             
             # Optimize after rebuild
-            self.search_engine.optimize_indexes()
+            job["phase"] = "optimize"
+            await self.executor.run_blocking(self.search_engine.optimize_indexes)
             
-            return {
-                "status": "success",
-                "message": f"Search index ({index_type}) rebuilt successfully",
-                "stats": self.search_engine.get_search_stats()
-            }
+            job["stats"] = await self.executor.run_blocking(self.search_engine.get_search_stats)
+            job["status"] = "completed"
             
         except Exception as e:
             logger.error(f"Index rebuild failed: {e}")
-            return {
-                "status": "error",
-                "error": str(e)
-            }
+            job["status"] = "failed"
+            job["error"] = str(e)
+        finally:
+            job["finished_at"] = datetime.now().isoformat()
+            logger.info(f"Search index ({index_type}) rebuild {job['status']}")
     
     async def _get_rate_limit_metrics(self, endpoint: Optional[str] = None) -> Dict[str, Any]:
         """Get rate limiting metrics and API usage statistics."""
@@ -1573,6 +1766,9 @@ class DirectAPIClaudeContextServer:
             # Get queue metrics
             queue_metrics = self.queue_manager.get_all_metrics()
             
+            # Get executor metrics
+            executor_metrics = self.executor.get_metrics()
+            
             # Build response
             result = {
                 "status": "success",
@@ -1580,8 +1776,20 @@ class DirectAPIClaudeContextServer:
                 "rate_limit_config": {
                     "requests_per_second": self.rate_limiter.config.requests_per_second,
                     "burst_size": self.rate_limiter.config.burst_size,
-                    "max_retries": self.rate_limiter.config.max_retries
-                }
+                    "max_retries": self.rate_limiter.config.max_retries,
+                    "adaptive": self.rate_limiter.config.adaptive,
+                    "backend": self.rate_limiter.backend.name if self.rate_limiter.backend else "memory",
+                    "current_requests_per_second": self.rate_limiter.get_rates()
+                },
+                "executor": executor_metrics,
+                "http": self.rate_limited_session.get_transport_metrics(),
+                "resilience": self.rate_limited_session.resilience.get_metrics(),
+                "coalescing": self.rate_limited_session.singleflight.get_metrics(),
+                "session": self.session_health.get_status(),
+                "response_cache": (
+                    await self.rate_limited_session.cache.get_metrics()
+                    if self.rate_limited_session.cache else {"enabled": False}
+                )
             }
             
             if endpoint:
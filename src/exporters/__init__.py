@@ -1,7 +1,14 @@
 """Export modules for different output formats"""
 
 from .obsidian_exporter import ObsidianExporter
-from .pdf_exporter import PDFExporter
 from .notion_exporter import NotionExporter
 
 __all__ = ['ObsidianExporter', 'PDFExporter', 'NotionExporter']
+
+
+def __getattr__(name):
+    # PDFExporter pulls in reportlab, so it is only imported on first use
+    if name == 'PDFExporter':
+        from .pdf_exporter import PDFExporter
+        return PDFExporter
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
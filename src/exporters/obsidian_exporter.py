@@ -57,7 +57,7 @@ class ObsidianExporter:
         
         return str(filepath)
     
-    def export_bulk(self, conversations: List[Dict]) -> Dict[str, List[str]]:
+    def export_bulk(self, conversations: List[Dict], create_index: bool = True) -> Dict[str, List[str]]:
         """Export multiple conversations"""
         results = {
             'success': [],
@@ -78,7 +78,8 @@ class ObsidianExporter:
                 })
         
         # Create index
-        self._create_index(results['success'])
+        if create_index:
+            self._create_index(results['success'])
         
         return results
     
@@ -415,3 +416,17 @@ class ObsidianExporter:
                 return datetime.strptime(dt_str, '%Y-%m-%d %H:%M:%S')
             except:
                 return datetime.now()
+
+
+def export_bulk_to_vault(
+    vault_path: Optional[str],
+    conversations: List[Dict],
+    create_index: bool = False
+) -> Dict[str, List]:
+    """
+    Export conversations to a vault in one call.
+    
+    Module-level so it can run in a worker process; conversations are
+    dicts with 'conversation' and 'messages' keys, as for export_bulk.
+    """
+    return ObsidianExporter(vault_path).export_bulk(conversations, create_index=create_index)
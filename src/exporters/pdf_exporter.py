@@ -470,3 +470,13 @@ class PDFExporter:
                 return datetime.strptime(dt_str, '%Y-%m-%d %H:%M:%S')
             except:
                 return datetime.now()
+
+
+def render_bulk_to_pdf(output_dir: Optional[str], conversations: List[Dict]) -> Dict[str, List]:
+    """
+    Render conversations to PDF in one call.
+    
+    Module-level so it can run in a worker process; conversations are
+    dicts with 'conversation' and 'messages' keys, as for export_bulk.
+    """
+    return PDFExporter(output_dir).export_bulk(conversations)
@@ -1,15 +1,19 @@
 """Playwright-based web extraction for Claude.ai conversations."""
 
+from __future__ import annotations
+
 import asyncio
 import logging
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, TYPE_CHECKING
 from urllib.parse import urlparse
 import json
 
-from playwright.async_api import async_playwright, Browser, Page, TimeoutError as PlaywrightTimeout
 from pydantic import HttpUrl
 
+if TYPE_CHECKING:
+    from playwright.async_api import Browser, Page
+
 from ..models import (
     Conversation,
     ConversationMessage,
@@ -44,6 +48,8 @@ class ClaudeWebExtractor:
         
     async def initialize(self):
         """Initialize Playwright browser."""
+        from playwright.async_api import async_playwright
+        
         self.playwright = await async_playwright().start()
         self.browser = await self.playwright.chromium.launch(
             headless=self.config.headless
@@ -93,6 +99,8 @@ class ClaudeWebExtractor:
     @with_retry(max_retries=3, initial_delay=2.0)
     async def extract_conversation(self, conversation_url: str) -> ExtractionResult:
         """Extract a specific conversation from Claude.ai."""
+        from playwright.async_api import TimeoutError as PlaywrightTimeout
+        
         try:
             # Sanitize URL
             conversation_url = sanitize_url(conversation_url)
@@ -207,6 +215,8 @@ class ClaudeWebExtractor:
     @with_retry(max_retries=3, initial_delay=2.0)
     async def list_conversations(self, limit: int = 20) -> List[ConversationSummary]:
         """List available conversations from Claude.ai."""
+        from playwright.async_api import TimeoutError as PlaywrightTimeout
+        
         try:
             page = await self._create_page()
             
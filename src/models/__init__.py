@@ -1,5 +1,5 @@
 """Database models for MCP Claude Context Server"""
 
-from .conversation import Base, Conversation, Message
+from .conversation import Base, Conversation, Message, SyncState
 
-__all__ = ['Base', 'Conversation', 'Message']
+__all__ = ['Base', 'Conversation', 'Message', 'SyncState']
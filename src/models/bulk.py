@@ -0,0 +1,260 @@
+"""
+Bulk write path for conversations and messages.
+
+Every ingest path (Claude.ai API sync and hydration, JSON migration, the
+browser-extension bridge) turns its input into plain row dicts with the
+functions below and writes them with SQLite ``INSERT ... ON CONFLICT DO
+UPDATE`` statements executed as executemany in chunked transactions.
+
+Upserts only touch a row when something changed (content hash for API
+conversations, the refreshed columns for exported ones, content/role/
+position for messages), so re-ingesting the same data doesn't rewrite
+rows or fire the FTS update triggers.
+"""
+
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+from datetime import datetime
+import logging
+
+from sqlalchemy import delete, or_
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.engine import Engine
+
+from .conversation import Conversation, Message, conversation_content_hash
+from .database import retry_when_busy
+
+logger = logging.getLogger(__name__)
+
+conversations_table = Conversation.__table__
+messages_table = Message.__table__
+
+# Conversation columns refreshed from the API listing; local-only columns
+# (tags, search_vector, embedding, hydrated_hash) are left alone
+API_CONVERSATION_COLUMNS = ('title', 'created_at', 'updated_at', 'model', 'message_count',
+                            'extra_data', 'content_hash')
+MESSAGE_COLUMNS = ('conversation_id', 'role', 'content', 'created_at', 'index', 'extra_data')
+# Set on every read of an export, so a different value alone isn't a change
+VOLATILE_CONVERSATION_COLUMNS = ('extracted_at',)
+
+
+# Row builders
+
+def parse_api_datetime(value: Optional[str]) -> datetime:
+    """Parse an ISO timestamp from the Claude.ai API, defaulting to now"""
+    if not value:
+        return datetime.now()
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+
+def parse_export_datetime(value: Optional[str]) -> datetime:
+    """Parse a timestamp from exported JSON, defaulting to now (UTC)"""
+    if not value:
+        return datetime.utcnow()
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        pass
+    for fmt in ('%Y-%m-%dT%H:%M:%S.%fZ', '%Y-%m-%dT%H:%M:%SZ', '%Y-%m-%d %H:%M:%S', '%Y-%m-%d'):
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    logger.warning(f"Could not parse datetime: {value}")
+    return datetime.utcnow()
+
+
+def api_conversation_row(conv_data: Dict) -> Dict[str, Any]:
+    """Conversation row from a chat_conversations payload"""
+    return {
+        'id': conv_data['uuid'],
+        'title': conv_data.get('name', 'Untitled'),
+        'created_at': parse_api_datetime(conv_data.get('created_at')),
+        'updated_at': parse_api_datetime(conv_data.get('updated_at')),
+        'model': conv_data.get('model', 'unknown'),
+        'message_count': conv_data.get('message_count', 0),
+        'extra_data': {
+            'is_starred': conv_data.get('is_starred', False),
+            'settings': conv_data.get('settings', {})
+        },
+        'content_hash': conversation_content_hash(conv_data)
+    }
+
+
+def _api_message_text(message: Dict) -> str:
+    """Text of an API chat message (plain ``text`` or content blocks)"""
+    if message.get('text'):
+        return message['text']
+    return '\n\n'.join(
+        block.get('text', '') for block in message.get('content') or []
+        if block.get('type') == 'text'
+    )
+
+
+def api_message_rows(conversation: Dict) -> List[Dict[str, Any]]:
+    """Message rows from a chat_conversations/{id} payload"""
+    conversation_id = conversation['uuid']
+    rows = []
+    for position, message in enumerate(conversation.get('chat_messages') or []):
+        sender = message.get('sender', 'unknown')
+        index = message.get('index', position)
+        rows.append({
+            'id': message.get('uuid') or f"{conversation_id}-{index}",
+            'conversation_id': conversation_id,
+            'role': 'user' if sender == 'human' else sender,
+            'content': _api_message_text(message),
+            'created_at': parse_api_datetime(message.get('created_at')),
+            'index': index,
+            'extra_data': {
+                'parent_message_uuid': message.get('parent_message_uuid'),
+                'attachments': len(message.get('attachments') or []) + len(message.get('files') or [])
+            }
+        })
+    return rows
+
+
+def export_conversation_row(data: Dict, extracted_by: str = 'migration') -> Dict[str, Any]:
+    """Conversation row from exported JSON (migration files, extension bridge)"""
+    return {
+        'id': data.get('uuid', data.get('id')),
+        'title': data.get('name', data.get('title', 'Untitled')),
+        'created_at': parse_export_datetime(data.get('created_at')),
+        'updated_at': parse_export_datetime(data.get('updated_at')),
+        'extracted_at': datetime.utcnow(),
+        'model': data.get('model', 'unknown'),
+        'message_count': len(data.get('messages', [])) or data.get('message_count', 0),
+        'tags': data.get('tags', []),
+        'extra_data': {
+            'original_file': data.get('original_file'),
+            'extracted_by': data.get('extracted_by', extracted_by)
+        }
+    }
+
+
+def export_message_rows(data: Dict, conversation_id: str) -> List[Dict[str, Any]]:
+    """Message rows from exported JSON (migration files, extension bridge)"""
+    rows = []
+    for position, msg_data in enumerate(data.get('messages', [])):
+        index = msg_data.get('index', position)
+        rows.append({
+            'id': msg_data.get('uuid', msg_data.get('id')) or f"{conversation_id}-{index}",
+            'conversation_id': conversation_id,
+            'role': msg_data.get('sender', msg_data.get('role', 'unknown')),
+            'content': msg_data.get('text', msg_data.get('content', '')) or '',
+            'created_at': parse_export_datetime(msg_data.get('created_at')),
+            'index': index,
+            'extra_data': {
+                'attachments': msg_data.get('attachments', []),
+                'citations': msg_data.get('citations', [])
+            }
+        })
+    return rows
+
+
+# Statements
+
+def conversation_upsert(columns: Sequence[str] = API_CONVERSATION_COLUMNS, update_existing: bool = True):
+    """
+    INSERT ... ON CONFLICT(id) for conversations.
+
+    Existing rows are updated only when their content hash differs or, for
+    rows without a hash (exports), when one of ``columns`` does; with
+    ``update_existing=False`` they are left untouched.
+    """
+    stmt = insert(conversations_table)
+    if not update_existing:
+        return stmt.on_conflict_do_nothing(index_elements=['id'])
+
+    set_ = {column: stmt.excluded[column] for column in columns}
+    where = None
+    if 'content_hash' in columns:
+        where = or_(
+            conversations_table.c.content_hash.is_(None),
+            conversations_table.c.content_hash != stmt.excluded.content_hash
+        )
+    else:
+        compared = [column for column in columns if column not in VOLATILE_CONVERSATION_COLUMNS]
+        if compared:
+            where = or_(*(
+                conversations_table.c[column].is_distinct_from(stmt.excluded[column]) for column in compared
+            ))
+    return stmt.on_conflict_do_update(index_elements=['id'], set_=set_, where=where)
+
+
+def message_upsert():
+    """INSERT ... ON CONFLICT(id) for messages, updating only changed rows"""
+    stmt = insert(messages_table)
+    return stmt.on_conflict_do_update(
+        index_elements=['id'],
+        set_={column: stmt.excluded[column] for column in MESSAGE_COLUMNS},
+        where=or_(
+            messages_table.c.content != stmt.excluded.content,
+            messages_table.c.role != stmt.excluded.role,
+            messages_table.c['index'] != stmt.excluded['index'],
+            messages_table.c.conversation_id != stmt.excluded.conversation_id
+        )
+    )
+
+
+def chunked(rows: Iterable[Dict], size: int) -> Iterator[List[Dict]]:
+    """Split rows into lists of at most ``size``"""
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class BulkWriter:
+    """Chunked executemany upserts on a (sync) engine"""
+
+    def __init__(self, engine: Engine, chunk_size: int = 500):
+        self.engine = engine
+        self.chunk_size = chunk_size
+
+    def _execute(self, stmt, rows: Iterable[Dict]) -> int:
+        written = 0
+        for chunk in chunked(rows, self.chunk_size):
+            written += retry_when_busy(lambda: self._execute_chunk(stmt, chunk))
+        return written
+
+    def _execute_chunk(self, stmt, chunk: List[Dict]) -> int:
+        with self.engine.begin() as conn:
+            return max(conn.execute(stmt, chunk).rowcount, 0)
+
+    def upsert_conversations(
+        self,
+        rows: Iterable[Dict],
+        columns: Optional[Sequence[str]] = None,
+        update_existing: bool = True
+    ) -> int:
+        """
+        Upsert conversation rows; returns rows inserted or changed.
+
+        ``columns`` are the ones refreshed on conflict, by default every
+        non-key column in the first row.
+        """
+        rows = list(rows)
+        if not rows:
+            return 0
+        columns = columns or [column for column in rows[0] if column != 'id']
+        return self._execute(conversation_upsert(columns, update_existing), rows)
+
+    def upsert_messages(self, rows: Iterable[Dict]) -> int:
+        """Upsert message rows; returns rows inserted or changed."""
+        return self._execute(message_upsert(), rows)
+
+    def replace_messages(self, conversation_ids: Sequence[str], rows: Iterable[Dict]) -> int:
+        """Delete the messages of ``conversation_ids`` and insert ``rows`` in one transaction."""
+        rows = list(rows)
+
+        def replace():
+            with self.engine.begin() as conn:
+                conn.execute(delete(messages_table).where(messages_table.c.conversation_id.in_(conversation_ids)))
+                for chunk in chunked(rows, self.chunk_size):
+                    conn.execute(insert(messages_table), chunk)
+
+        retry_when_busy(replace)
+        return len(rows)
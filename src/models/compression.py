@@ -0,0 +1,188 @@
+"""
+Optional compressed storage for long text columns.
+
+``Message.content`` and ``Conversation.search_vector`` use CompressedText.
+With ``MCP_CONTENT_COMPRESSION`` set to ``zlib`` or ``zstd``, values of at
+least ``MCP_COMPRESS_MIN_BYTES`` are written as a BLOB: one codec byte
+followed by the compressed UTF-8 text. zstd can use a shared dictionary
+trained on the database's own messages (``MCP_ZSTD_DICTIONARY``, see
+``deployment/scripts/compress_content.py``), which is what makes short
+and medium messages worth compressing.
+
+Reads don't depend on the setting: plain TEXT values are returned as
+they are and BLOBs are decoded by their codec byte, so a database can
+mix rows written in any mode. Raw SQL on the read paths calls
+``mcp_decompress(column)``, which every pooled connection registers
+through the engine registry's connect event. The FTS views and triggers
+only call it while compression is on or compressed values remain, so
+other connections (the sqlite3 CLI, backup tools) can write otherwise.
+"""
+
+import os
+import threading
+import zlib
+from typing import Optional, Union
+
+from sqlalchemy import Table, Text
+from sqlalchemy.types import TypeDecorator
+
+ZLIB = b'\x01'
+ZSTD = b'\x02'
+
+CODECS = ('zlib', 'zstd')
+
+_codec: Optional['ContentCodec'] = None
+_codec_lock = threading.Lock()
+
+
+def _zstd():
+    """Import zstandard on first use; it is only needed for the zstd codec"""
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError("MCP_CONTENT_COMPRESSION=zstd requires the 'zstandard' package")
+    return zstandard
+
+
+class ContentCodec:
+    """Compression settings for CompressedText columns"""
+
+    def __init__(
+        self,
+        codec: Optional[str] = None,
+        level: Optional[int] = None,
+        min_bytes: int = 256,
+        dictionary_path: Optional[str] = None
+    ):
+        if codec not in (None,) + CODECS:
+            raise ValueError(f"Unknown content compression codec: {codec}")
+        self.codec = codec
+        self.level = level if level is not None else (6 if codec == 'zlib' else 3)
+        self.min_bytes = min_bytes
+        self.dictionary_path = dictionary_path
+        self._dictionary = None
+        self._local = threading.local()
+
+    @classmethod
+    def from_env(cls) -> 'ContentCodec':
+        codec = os.getenv('MCP_CONTENT_COMPRESSION', 'off').strip().lower()
+        level = os.getenv('MCP_CONTENT_COMPRESSION_LEVEL')
+        return cls(
+            codec=None if codec in ('', 'off', 'none', 'false') else codec,
+            level=int(level) if level else None,
+            min_bytes=int(os.getenv('MCP_COMPRESS_MIN_BYTES', '256')),
+            dictionary_path=os.getenv('MCP_ZSTD_DICTIONARY') or None
+        )
+
+    @property
+    def dictionary(self):
+        """The zstd dictionary, loaded once, or None"""
+        if self._dictionary is None and self.dictionary_path:
+            with open(self.dictionary_path, 'rb') as f:
+                self._dictionary = _zstd().ZstdCompressionDict(f.read())
+        return self._dictionary
+
+    def _zstd_compressor(self):
+        # zstd contexts aren't thread-safe: one per thread
+        compressor = getattr(self._local, 'compressor', None)
+        if compressor is None:
+            compressor = _zstd().ZstdCompressor(level=self.level, dict_data=self.dictionary)
+            self._local.compressor = compressor
+        return compressor
+
+    def _zstd_decompressor(self):
+        decompressor = getattr(self._local, 'decompressor', None)
+        if decompressor is None:
+            decompressor = _zstd().ZstdDecompressor(dict_data=self.dictionary)
+            self._local.decompressor = decompressor
+        return decompressor
+
+    def compress(self, value: Optional[str]) -> Union[str, bytes, None]:
+        """Value to store: the text itself, or a codec-tagged BLOB when that is smaller"""
+        if value is None or self.codec is None:
+            return value
+        raw = value.encode('utf-8')
+        if len(raw) < self.min_bytes:
+            return value
+        if self.codec == 'zlib':
+            packed = ZLIB + zlib.compress(raw, self.level)
+        else:
+            packed = ZSTD + self._zstd_compressor().compress(raw)
+        return packed if len(packed) < len(raw) else value
+
+    def decompress(self, value: Union[str, bytes, None]) -> Optional[str]:
+        """Text of a stored value, whatever mode it was written in"""
+        if value is None or isinstance(value, str):
+            return value
+        value = bytes(value)
+        marker, payload = value[:1], value[1:]
+        if marker == ZLIB:
+            return zlib.decompress(payload).decode('utf-8')
+        if marker == ZSTD:
+            return self._zstd_decompressor().decompress(payload).decode('utf-8')
+        # A BLOB written by something else: best effort as UTF-8 text
+        return value.decode('utf-8', errors='replace')
+
+
+def get_codec() -> ContentCodec:
+    """The process-wide codec, configured from the environment on first use"""
+    global _codec
+    if _codec is None:
+        with _codec_lock:
+            if _codec is None:
+                _codec = ContentCodec.from_env()
+    return _codec
+
+
+def reset_codec():
+    """Forget the process-wide codec so the environment is read again"""
+    global _codec
+    with _codec_lock:
+        _codec = None
+
+
+def compress_text(value: Optional[str]) -> Union[str, bytes, None]:
+    return get_codec().compress(value)
+
+
+def decompress_text(value: Union[str, bytes, None]) -> Optional[str]:
+    return get_codec().decompress(value)
+
+
+def register_sql_functions(dbapi_connection):
+    """Register ``mcp_decompress(value)`` on a raw DB-API connection"""
+    dbapi_connection.create_function('mcp_decompress', 1, decompress_text, deterministic=True)
+
+
+class CompressedText(TypeDecorator):
+    """Text column stored compressed when content compression is enabled"""
+
+    impl = Text
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return compress_text(value)
+
+    def process_result_value(self, value, dialect):
+        return decompress_text(value)
+
+
+def select_list(table: Table, alias: Optional[str] = None) -> str:
+    """
+    Column list for raw SQL SELECTs of ``table``.
+
+    CompressedText columns are wrapped in ``mcp_decompress`` so raw reads
+    return text like ORM reads do.
+    """
+    prefix = f"{alias}." if alias else ''
+    columns = []
+    for column in table.c:
+        if column.name == 'rid':
+            # Internal rowid alias
+            continue
+        name = f'"{column.name}"' if column.name == 'index' else column.name
+        if isinstance(column.type, CompressedText):
+            columns.append(f"mcp_decompress({prefix}{name}) AS {name}")
+        else:
+            columns.append(f"{prefix}{name}")
+    return ", ".join(columns)
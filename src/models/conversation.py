@@ -2,11 +2,21 @@
 SQLAlchemy models for conversation data storage
 """
 
-from sqlalchemy import create_engine, Column, String, DateTime, Text, JSON, Integer, Float, Index, text
+from sqlalchemy import Column, String, DateTime, Text, JSON, Integer, Float, Index, MetaData, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
+from sqlalchemy.schema import CreateTable
 from sqlalchemy.sql import func
 import datetime
+import hashlib
+import json
+import logging
+import re
+
+from .compression import CompressedText, get_codec
+from .database import get_engine
+
+logger = logging.getLogger(__name__)
 
 Base = declarative_base()
 
@@ -15,8 +25,12 @@ class Conversation(Base):
     """Model for storing conversation metadata"""
     __tablename__ = 'conversations'
     
-    # Primary key
-    id = Column(String, primary_key=True)
+    # Rowid alias (INTEGER PRIMARY KEY), which the FTS index is keyed on;
+    # unlike an implicit rowid, VACUUM never renumbers it
+    rid = Column(Integer, primary_key=True)
+    
+    # Identity of the row for the ORM and upserts
+    id = Column(String, nullable=False, unique=True)
     
     # Basic metadata
     title = Column(String, nullable=False, default='Untitled')
@@ -33,15 +47,21 @@ class Conversation(Base):
     extra_data = Column(JSON, default=dict)  # Renamed from metadata to avoid SQLAlchemy conflict
     
     # Search optimization
-    search_vector = Column(Text)  # For full-text search
+    search_vector = Column(CompressedText)  # For full-text search
     embedding = Column(JSON)      # For semantic search vectors
     
+    # Sync state: hash of the API fields we store, to skip unchanged rows,
+    # and the content_hash the messages were last fetched at
+    content_hash = Column(String(64))
+    hydrated_hash = Column(String(64))
+    
     # Indexes for performance
     __table_args__ = (
         Index('idx_conversations_created_at', 'created_at'),
         Index('idx_conversations_updated_at', 'updated_at'),
         Index('idx_conversations_model', 'model'),
     )
+    __mapper_args__ = {'primary_key': [id]}
     
     def to_dict(self):
         """Convert conversation to dictionary"""
@@ -62,15 +82,18 @@ class Message(Base):
     """Model for storing individual messages"""
     __tablename__ = 'messages'
     
-    # Primary key
-    id = Column(String, primary_key=True)
+    # Rowid alias the FTS index is keyed on (see Conversation.rid)
+    rid = Column(Integer, primary_key=True)
+    
+    # Identity of the row for the ORM and upserts
+    id = Column(String, nullable=False, unique=True)
     
     # Foreign key to conversation
     conversation_id = Column(String, nullable=False)
     
     # Message details
     role = Column(String, nullable=False)  # 'user', 'assistant', 'system'
-    content = Column(Text, nullable=False)
+    content = Column(CompressedText, nullable=False)
     created_at = Column(DateTime)
     index = Column(Integer, default=0)  # Position in conversation
     
@@ -88,6 +111,7 @@ class Message(Base):
         Index('idx_messages_role', 'role'),
         Index('idx_messages_conversation_index', 'conversation_id', 'index'),
     )
+    __mapper_args__ = {'primary_key': [id]}
     
     def to_dict(self):
         """Convert message to dictionary"""
@@ -118,88 +142,441 @@ class SearchCache(Base):
     )
 
 
-# Database initialization helper
-def init_database(db_path: str = "data/db/conversations.db"):
-    """Initialize database with tables and indexes"""
-    engine = create_engine(f'sqlite:///{db_path}')
+class SyncState(Base):
+    """Model for per-organization incremental sync watermarks"""
+    __tablename__ = 'sync_state'
     
-    # Create tables
-    Base.metadata.create_all(engine)
+    org_id = Column(String, primary_key=True)
+    watermark = Column(String)  # Newest API updated_at seen, as returned
+    last_sync_at = Column(DateTime)
+    last_full_sync_at = Column(DateTime)
+    last_result = Column(JSON, default=dict)
+
+
+class MigrationCheckpoint(Base):
+    """Model for JSON export sources already migrated (or that failed)"""
+    __tablename__ = 'migration_checkpoints'
     
-    # Enable SQLite optimizations
-    with engine.connect() as conn:
-        conn.execute(text("PRAGMA journal_mode=WAL"))  # Write-Ahead Logging
-        conn.execute(text("PRAGMA synchronous=NORMAL"))  # Faster writes
-        conn.execute(text("PRAGMA cache_size=10000"))  # Larger cache
-        conn.execute(text("PRAGMA temp_store=MEMORY"))  # Use memory for temp tables
-        
-        # Create FTS5 virtual table for full-text search
-        conn.execute(text("""
-            CREATE VIRTUAL TABLE IF NOT EXISTS conversations_fts USING fts5(
-                id UNINDEXED,
-                title,
-                content,
-                tokenize='porter unicode61'
-            )
-        """))
-        
-        conn.execute(text("""
-            CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5(
-                id UNINDEXED,
-                conversation_id UNINDEXED,
-                content,
-                tokenize='porter unicode61'
-            )
-        """))
-        
-        # Create triggers to keep FTS tables in sync
-        conn.execute(text("""
-            CREATE TRIGGER IF NOT EXISTS conversations_ai AFTER INSERT ON conversations
+    source = Column(String, primary_key=True)  # Path relative to the export directory
+    conversation_id = Column(String)
+    mtime = Column(Float)  # Source modification time when it was read
+    content_hash = Column(String(64))  # SHA-256 of the source's JSON files
+    status = Column(String)  # 'migrated' or 'failed'
+    error = Column(Text)
+    migrated_at = Column(DateTime, default=datetime.datetime.utcnow)
+
+
+class FTSRebuildState(Base):
+    """Model for an FTS index being rebuilt into its shadow table"""
+    __tablename__ = 'fts_rebuild_state'
+    
+    name = Column(String, primary_key=True)  # FTS table, e.g. 'messages_fts'
+    watermark = Column(Integer, nullable=False, default=0)  # Source rowids up to here are indexed
+    indexed = Column(Integer, nullable=False, default=0)
+    total = Column(Integer)  # Source rows when the rebuild (re)started
+    started_at = Column(DateTime, default=datetime.datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.datetime.utcnow)
+
+
+# Fields from the chat_conversations listing that end up in the database
+HASHED_CONVERSATION_FIELDS = (
+    'name', 'created_at', 'updated_at', 'model', 'message_count', 'is_starred', 'settings'
+)
+
+
+def conversation_content_hash(conv_data: dict) -> str:
+    """Stable hash of the stored fields of an API conversation payload"""
+    payload = {field: conv_data.get(field) for field in HASHED_CONVERSATION_FIELDS}
+    encoded = json.dumps(payload, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+# Columns introduced after a database was first created, by table
+_ADDED_COLUMNS = {
+    'conversations': ('content_hash', 'hydrated_hash'),
+    'migration_checkpoints': ('content_hash',),
+}
+
+
+def _add_missing_columns(conn):
+    """Add columns introduced after a database was first created"""
+    for table, columns in _ADDED_COLUMNS.items():
+        existing = {row[1] for row in conn.execute(text(f"PRAGMA table_info({table})"))}
+        for column in columns:
+            if column not in existing:
+                conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} VARCHAR(64)"))
+
+
+def _add_stable_rowids(conn):
+    """
+    Rebuild conversations and messages tables created without ``rid``.
+
+    Each row keeps its implicit rowid as ``rid``, so the FTS indexes stay
+    valid. The FTS triggers and source views go with the old tables (and
+    so does a rebuild in progress); init_database creates them again.
+    """
+    for table in (Conversation.__table__, Message.__table__):
+        existing = [row[1] for row in conn.execute(text(f"PRAGMA table_info({table.name})"))]
+        if 'rid' in existing:
+            continue
+        logger.info(f"Adding a stable rowid to {table.name}...")
+        drop_fts_triggers(conn)
+        for name in FTS_TABLES:
+            drop_fts_shadow(conn, name)
+        for name in FTS_SOURCES:
+            conn.execute(text(f"DROP VIEW IF EXISTS {name}"))
+
+        columns = ', '.join(f'"{column.name}"' for column in table.c if column.name in existing)
+        conn.execute(text(f"DROP TABLE IF EXISTS {table.name}_new"))
+        conn.execute(CreateTable(table.to_metadata(MetaData(), name=f"{table.name}_new")))
+        conn.execute(text(
+            f"INSERT INTO {table.name}_new(rid, {columns}) SELECT rowid, {columns} FROM {table.name}"
+        ))
+        conn.execute(text(f"DROP TABLE {table.name}"))
+        conn.execute(text(f"ALTER TABLE {table.name}_new RENAME TO {table.name}"))
+        for index in table.indexes:
+            index.create(conn)
+
+
+# The FTS5 tables are external-content tables: they store only the index
+# and read column values (for snippets, rebuilds) from these views, which
+# expose each row's rid and its decompressed text. The views and triggers
+# below are templates: while no compressed values can be stored, they are
+# created without mcp_decompress (see _fts_sql), so connections that don't
+# register it (sqlite3 CLI, backup tools) can still write.
+FTS_SOURCES = {
+    'conversations_fts_source': """
+        CREATE VIEW IF NOT EXISTS conversations_fts_source AS
+        SELECT rid, id, title, mcp_decompress(search_vector) AS content
+        FROM conversations
+    """,
+    'messages_fts_source': """
+        CREATE VIEW IF NOT EXISTS messages_fts_source AS
+        SELECT rid, id, conversation_id, mcp_decompress(content) AS content
+        FROM messages
+    """,
+}
+
+FTS_TABLES = {
+    'conversations_fts': """
+        CREATE VIRTUAL TABLE IF NOT EXISTS {name} USING fts5(
+            id UNINDEXED,
+            title,
+            content,
+            content='conversations_fts_source',
+            content_rowid='rid',
+            tokenize='porter unicode61'
+        )
+    """,
+    'messages_fts': """
+        CREATE VIRTUAL TABLE IF NOT EXISTS {name} USING fts5(
+            id UNINDEXED,
+            conversation_id UNINDEXED,
+            content,
+            content='messages_fts_source',
+            content_rowid='rid',
+            tokenize='porter unicode61'
+        )
+    """,
+}
+
+# Triggers that keep the FTS tables in sync with conversations and messages.
+# External-content FTS5 can't UPDATE: a change is a 'delete' of the values
+# that were indexed followed by an insert of the new ones.
+FTS_TRIGGERS = {
+    'conversations_ai': """
+        CREATE TRIGGER IF NOT EXISTS conversations_ai AFTER INSERT ON conversations
+        BEGIN
+            INSERT INTO conversations_fts(rowid, id, title, content)
+            VALUES (new.rowid, new.id, new.title, mcp_decompress(new.search_vector));
+        END
+    """,
+    'conversations_au': """
+        CREATE TRIGGER IF NOT EXISTS conversations_au AFTER UPDATE OF id, title, search_vector ON conversations
+        BEGIN
+            INSERT INTO conversations_fts(conversations_fts, rowid, id, title, content)
+            VALUES ('delete', old.rowid, old.id, old.title, mcp_decompress(old.search_vector));
+            INSERT INTO conversations_fts(rowid, id, title, content)
+            VALUES (new.rowid, new.id, new.title, mcp_decompress(new.search_vector));
+        END
+    """,
+    'conversations_ad': """
+        CREATE TRIGGER IF NOT EXISTS conversations_ad AFTER DELETE ON conversations
+        BEGIN
+            INSERT INTO conversations_fts(conversations_fts, rowid, id, title, content)
+            VALUES ('delete', old.rowid, old.id, old.title, mcp_decompress(old.search_vector));
+        END
+    """,
+    'messages_ai': """
+        CREATE TRIGGER IF NOT EXISTS messages_ai AFTER INSERT ON messages
+        BEGIN
+            INSERT INTO messages_fts(rowid, id, conversation_id, content)
+            VALUES (new.rowid, new.id, new.conversation_id, mcp_decompress(new.content));
+        END
+    """,
+    'messages_au': """
+        CREATE TRIGGER IF NOT EXISTS messages_au AFTER UPDATE OF id, conversation_id, content ON messages
+        BEGIN
+            INSERT INTO messages_fts(messages_fts, rowid, id, conversation_id, content)
+            VALUES ('delete', old.rowid, old.id, old.conversation_id, mcp_decompress(old.content));
+            INSERT INTO messages_fts(rowid, id, conversation_id, content)
+            VALUES (new.rowid, new.id, new.conversation_id, mcp_decompress(new.content));
+        END
+    """,
+    'messages_ad': """
+        CREATE TRIGGER IF NOT EXISTS messages_ad AFTER DELETE ON messages
+        BEGIN
+            INSERT INTO messages_fts(messages_fts, rowid, id, conversation_id, content)
+            VALUES ('delete', old.rowid, old.id, old.conversation_id, mcp_decompress(old.content));
+        END
+    """,
+}
+
+# While an FTS table is rebuilt into {name}_new in rowid order, these
+# mirror writes into the new table for the rows it already covers (rowid
+# at or below the watermark in fts_rebuild_state); later chunks pick up
+# the rest.
+_COVERED = "{row}.rowid <= (SELECT watermark FROM fts_rebuild_state WHERE name = '{name}')"
+
+FTS_SHADOW_TRIGGERS = {
+    'conversations_fts': {
+        'conversations_fts_new_ai': f"""
+            CREATE TRIGGER IF NOT EXISTS conversations_fts_new_ai AFTER INSERT ON conversations
             BEGIN
-                INSERT INTO conversations_fts(id, title, content)
-                VALUES (new.id, new.title, new.search_vector);
+                INSERT INTO conversations_fts_new(rowid, id, title, content)
+                SELECT new.rowid, new.id, new.title, mcp_decompress(new.search_vector)
+                WHERE {_COVERED.format(row='new', name='conversations_fts')};
             END
-        """))
-        
-        conn.execute(text("""
-            CREATE TRIGGER IF NOT EXISTS conversations_au AFTER UPDATE ON conversations
+        """,
+        'conversations_fts_new_au': f"""
+            CREATE TRIGGER IF NOT EXISTS conversations_fts_new_au AFTER UPDATE OF id, title, search_vector ON conversations
             BEGIN
-                UPDATE conversations_fts 
-                SET title = new.title, content = new.search_vector
-                WHERE id = new.id;
+                INSERT INTO conversations_fts_new(conversations_fts_new, rowid, id, title, content)
+                SELECT 'delete', old.rowid, old.id, old.title, mcp_decompress(old.search_vector)
+                WHERE {_COVERED.format(row='old', name='conversations_fts')};
+                INSERT INTO conversations_fts_new(rowid, id, title, content)
+                SELECT new.rowid, new.id, new.title, mcp_decompress(new.search_vector)
+                WHERE {_COVERED.format(row='new', name='conversations_fts')};
             END
-        """))
-        
-        conn.execute(text("""
-            CREATE TRIGGER IF NOT EXISTS conversations_ad AFTER DELETE ON conversations
+        """,
+        'conversations_fts_new_ad': f"""
+            CREATE TRIGGER IF NOT EXISTS conversations_fts_new_ad AFTER DELETE ON conversations
             BEGIN
-                DELETE FROM conversations_fts WHERE id = old.id;
+                INSERT INTO conversations_fts_new(conversations_fts_new, rowid, id, title, content)
+                SELECT 'delete', old.rowid, old.id, old.title, mcp_decompress(old.search_vector)
+                WHERE {_COVERED.format(row='old', name='conversations_fts')};
             END
-        """))
-        
-        conn.execute(text("""
-            CREATE TRIGGER IF NOT EXISTS messages_ai AFTER INSERT ON messages
+        """,
+    },
+    'messages_fts': {
+        'messages_fts_new_ai': f"""
+            CREATE TRIGGER IF NOT EXISTS messages_fts_new_ai AFTER INSERT ON messages
             BEGIN
-                INSERT INTO messages_fts(id, conversation_id, content)
-                VALUES (new.id, new.conversation_id, new.content);
+                INSERT INTO messages_fts_new(rowid, id, conversation_id, content)
+                SELECT new.rowid, new.id, new.conversation_id, mcp_decompress(new.content)
+                WHERE {_COVERED.format(row='new', name='messages_fts')};
             END
-        """))
-        
-        conn.execute(text("""
-            CREATE TRIGGER IF NOT EXISTS messages_au AFTER UPDATE ON messages
+        """,
+        'messages_fts_new_au': f"""
+            CREATE TRIGGER IF NOT EXISTS messages_fts_new_au AFTER UPDATE OF id, conversation_id, content ON messages
             BEGIN
-                UPDATE messages_fts 
-                SET content = new.content
-                WHERE id = new.id;
+                INSERT INTO messages_fts_new(messages_fts_new, rowid, id, conversation_id, content)
+                SELECT 'delete', old.rowid, old.id, old.conversation_id, mcp_decompress(old.content)
+                WHERE {_COVERED.format(row='old', name='messages_fts')};
+                INSERT INTO messages_fts_new(rowid, id, conversation_id, content)
+                SELECT new.rowid, new.id, new.conversation_id, mcp_decompress(new.content)
+                WHERE {_COVERED.format(row='new', name='messages_fts')};
             END
-        """))
-        
-        conn.execute(text("""
-            CREATE TRIGGER IF NOT EXISTS messages_ad AFTER DELETE ON messages
+        """,
+        'messages_fts_new_ad': f"""
+            CREATE TRIGGER IF NOT EXISTS messages_fts_new_ad AFTER DELETE ON messages
             BEGIN
-                DELETE FROM messages_fts WHERE id = old.id;
+                INSERT INTO messages_fts_new(messages_fts_new, rowid, id, conversation_id, content)
+                SELECT 'delete', old.rowid, old.id, old.conversation_id, mcp_decompress(old.content)
+                WHERE {_COVERED.format(row='old', name='messages_fts')};
             END
-        """))
+        """,
+    },
+}
+
+
+_DECOMPRESS_CALL = re.compile(r"mcp_decompress\(([\w.]+)\)")
+
+
+def _fts_sql(ddl: str, decompress: bool) -> str:
+    """FTS view or trigger DDL, with the mcp_decompress calls dropped unless ``decompress``"""
+    return ddl if decompress else _DECOMPRESS_CALL.sub(r"\1", ddl)
+
+
+def fts_decompresses(conn) -> bool:
+    """Whether the FTS source views (and so the triggers) read text through mcp_decompress"""
+    sql = conn.execute(text("SELECT sql FROM sqlite_master WHERE name = 'messages_fts_source'")).scalar()
+    return sql is not None and 'mcp_decompress' in sql
+
+
+def _stores_compressed(conn) -> bool:
+    """Whether compressed values can be in the database, so the FTS schema must decompress"""
+    if get_codec().codec is not None:
+        return True
+    sql = conn.execute(text("SELECT sql FROM sqlite_master WHERE name = 'messages_fts_source'")).scalar()
+    if sql is not None and 'mcp_decompress' not in sql:
+        return False
+    # Compression was on before (or the views predate this check): keep
+    # decompressing until no compressed values are left
+    return bool(conn.execute(text("""
+        SELECT EXISTS (SELECT 1 FROM messages WHERE typeof(content) = 'blob')
+            OR EXISTS (SELECT 1 FROM conversations WHERE typeof(search_vector) = 'blob')
+    """)).scalar())
+
+
+def create_fts_sources(conn):
+    """Create the FTS source views, replacing them if compression was turned on or off"""
+    decompress = _stores_compressed(conn)
+    existing = dict(conn.execute(text("SELECT name, sql FROM sqlite_master WHERE type = 'view'")).all())
+    replaced = False
+    for name, ddl in FTS_SOURCES.items():
+        if name in existing and ('mcp_decompress' in existing[name]) != decompress:
+            conn.execute(text(f"DROP VIEW {name}"))
+            replaced = True
+        conn.execute(text(_fts_sql(ddl, decompress)))
+    # The triggers must decompress exactly when the views do
+    if replaced and fts_triggers_present(conn):
+        create_fts_triggers(conn)
+
+
+def create_fts_tables(conn):
+    """Create the FTS source views and external-content FTS5 tables that don't exist yet"""
+    create_fts_sources(conn)
+    for name, ddl in FTS_TABLES.items():
+        conn.execute(text(ddl.format(name=name)))
+
+
+def _migrate_fts_tables(conn):
+    """
+    Move FTS tables created before external content over to it.
+
+    Each new table is built next to the old one, which keeps serving
+    readers until it is dropped and the new one renamed in its place, all
+    in the caller's transaction.
+    """
+    tables = dict(conn.execute(text(
+        "SELECT name, sql FROM sqlite_master WHERE type = 'table' AND name IN ('conversations_fts', 'messages_fts')"
+    )).all())
+    legacy = [name for name, sql in tables.items() if 'content_rowid' not in sql]
+    if not legacy:
+        return
+
+    drop_fts_triggers(conn)
+    for name in legacy:
+        drop_fts_shadow(conn, name)
+    create_fts_sources(conn)
+    for name in legacy:
+        logger.info(f"Migrating {name} to an external-content FTS5 table...")
+        conn.execute(text(FTS_TABLES[name].format(name=f"{name}_new")))
+        conn.execute(text(f"INSERT INTO {name}_new({name}_new) VALUES('rebuild')"))
+        conn.execute(text(f"DROP TABLE {name}"))
+        conn.execute(text(f"ALTER TABLE {name}_new RENAME TO {name}"))
+
+
+def _trigger_body(sql: str) -> str:
+    """Trigger definition from AFTER on, whitespace-normalized, for comparison"""
+    return ' '.join(sql[sql.index('AFTER'):].split())
+
+
+def create_fts_triggers(conn):
+    """Create missing FTS sync triggers and replace outdated definitions"""
+    decompress = fts_decompresses(conn)
+    existing = dict(conn.execute(text("SELECT name, sql FROM sqlite_master WHERE type = 'trigger'")).all())
+    # Mirror triggers of a rebuild in progress follow the same definitions
+    shadow = {name: ddl for triggers in FTS_SHADOW_TRIGGERS.values() for name, ddl in triggers.items()
+              if name in existing}
+    for name, ddl in {**FTS_TRIGGERS, **shadow}.items():
+        ddl = _fts_sql(ddl, decompress)
+        if name in existing and _trigger_body(existing[name]) != _trigger_body(ddl):
+            conn.execute(text(f"DROP TRIGGER {name}"))
+        conn.execute(text(ddl))
+
+
+def drop_fts_triggers(conn):
+    """Drop the FTS sync triggers, e.g. for a bulk load followed by rebuild_fts"""
+    for name in FTS_TRIGGERS:
+        conn.execute(text(f"DROP TRIGGER IF EXISTS {name}"))
+
+
+def fts_triggers_present(conn) -> bool:
+    """Whether every FTS sync trigger exists"""
+    names = set(conn.scalars(text("SELECT name FROM sqlite_master WHERE type = 'trigger'")))
+    return set(FTS_TRIGGERS) <= names
+
+
+def fts_in_sync(conn) -> bool:
+    """Whether both FTS indexes hold as many rows as their source tables (one snapshot)"""
+    return bool(conn.execute(text("""
+        SELECT (SELECT count(*) FROM conversations) = (SELECT count(*) FROM conversations_fts_docsize)
+           AND (SELECT count(*) FROM messages) = (SELECT count(*) FROM messages_fts_docsize)
+    """)).scalar())
+
+
+def rebuild_fts(conn):
+    """Rebuild both FTS indexes from their source views"""
+    for name in FTS_TABLES:
+        conn.execute(text(f"INSERT INTO {name}({name}) VALUES('rebuild')"))
+
+
+def create_fts_shadow(conn, name: str, total: int):
+    """Start rebuilding FTS table ``name``: an empty {name}_new, watermark 0 and its mirror triggers"""
+    drop_fts_shadow(conn, name)
+    conn.execute(text(FTS_TABLES[name].format(name=f"{name}_new")))
+    conn.execute(FTSRebuildState.__table__.insert().values(name=name, watermark=0, indexed=0, total=total))
+    decompress = fts_decompresses(conn)
+    for ddl in FTS_SHADOW_TRIGGERS[name].values():
+        conn.execute(text(_fts_sql(ddl, decompress)))
+
+
+def drop_fts_shadow(conn, name: str):
+    """Abandon a rebuild of FTS table ``name``, if one is in progress"""
+    conn.execute(FTSRebuildState.__table__.delete().where(FTSRebuildState.name == name))
+    for trigger in FTS_SHADOW_TRIGGERS[name]:
+        conn.execute(text(f"DROP TRIGGER IF EXISTS {trigger}"))
+    conn.execute(text(f"DROP TABLE IF EXISTS {name}_new"))
+
+
+def swap_fts_shadow(conn, name: str):
+    """Replace FTS table ``name`` with its finished rebuild, in the caller's transaction"""
+    for trigger in FTS_SHADOW_TRIGGERS[name]:
+        conn.execute(text(f"DROP TRIGGER {trigger}"))
+    # RENAME checks every trigger in the schema, and the sync triggers of
+    # the source table reference the table about to be dropped
+    source_triggers = [trigger for trigger in FTS_TRIGGERS if trigger.startswith(name[:-len('fts')])]
+    for trigger in source_triggers:
+        conn.execute(text(f"DROP TRIGGER {trigger}"))
+    conn.execute(text(f"DROP TABLE {name}"))
+    conn.execute(text(f"ALTER TABLE {name}_new RENAME TO {name}"))
+    decompress = fts_decompresses(conn)
+    for trigger in source_triggers:
+        conn.execute(text(_fts_sql(FTS_TRIGGERS[trigger], decompress)))
+    conn.execute(FTSRebuildState.__table__.delete().where(FTSRebuildState.name == name))
+
+
+# Database initialization helper
+def init_database(db_path: str = "data/db/conversations.db"):
+    """Initialize database with tables and indexes"""
+    # Shared engine; SQLite PRAGMAs are applied to every pooled connection
+    engine = get_engine(db_path)
+    
+    # Create tables
+    Base.metadata.create_all(engine)
+    
+    with engine.connect() as conn:
+        _add_missing_columns(conn)
+        _add_stable_rowids(conn)
+        
+        # FTS5 tables for full-text search, migrated to external content if needed
+        _migrate_fts_tables(conn)
+        create_fts_tables(conn)
+        
+        # Create triggers to keep FTS tables in sync
+        create_fts_triggers(conn)
         
         conn.commit()
     
@@ -0,0 +1,171 @@
+"""
+Shared SQLAlchemy engines for the SQLite conversation database.
+
+Every component that talks to a database file (models, search, the async
+store, migrations) gets its engine from here, so there is one pooled
+engine per path instead of one per caller or per call. Each new pooled
+connection gets the tuned PRAGMA profile below through a connect event;
+PRAGMAs like cache_size, mmap_size and busy_timeout are per-connection
+and would otherwise only apply to whichever connection happened to run
+them. The same event registers the SQL functions raw queries use
+(``mcp_decompress``, also used by the FTS triggers when content is
+compressed).
+
+busy_timeout doesn't cover every lock conflict: a connection that has to
+reload the schema (after an FTS shadow table is created or swapped in)
+or whose snapshot went stale while it waited gets SQLITE_BUSY at once.
+Write transactions go through ``retry_when_busy`` /
+``retry_when_busy_async``, which run them again after a short backoff.
+"""
+
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Optional, TypeVar, Union
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine
+
+from .compression import register_sql_functions
+
+T = TypeVar('T')
+
+# Attempts, and the backoff before the first retry (doubling each time)
+BUSY_RETRIES = 6
+BUSY_BACKOFF = 0.02
+
+
+def default_pragmas() -> Dict[str, Union[str, int]]:
+    """PRAGMA profile applied to every pooled connection (env-overridable)."""
+    return {
+        'journal_mode': 'WAL',                # Write-Ahead Logging
+        'synchronous': 'NORMAL',              # Faster writes, safe with WAL
+        'temp_store': 'MEMORY',               # Use memory for temp tables
+        # Negative cache_size is in KiB: 64 MiB page cache per connection
+        'cache_size': int(os.getenv('MCP_SQLITE_CACHE_SIZE', '-65536')),
+        # Memory-map up to 256 MiB of the database file for reads
+        'mmap_size': int(os.getenv('MCP_SQLITE_MMAP_SIZE', str(256 * 1024 * 1024))),
+        # Wait for writers instead of failing with "database is locked"
+        'busy_timeout': int(os.getenv('MCP_SQLITE_BUSY_TIMEOUT', '5000')),
+    }
+
+
+def apply_pragmas(dbapi_connection, pragmas: Optional[Dict[str, Union[str, int]]] = None):
+    """Run the PRAGMA profile on a raw DB-API connection."""
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in (pragmas or default_pragmas()).items():
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+
+def is_busy(error: BaseException) -> bool:
+    """Whether a (SQLAlchemy-wrapped) sqlite3 error is SQLITE_BUSY or one of its extended codes."""
+    orig = getattr(error, 'orig', error)
+    if not isinstance(orig, sqlite3.OperationalError):
+        return False
+    code = getattr(orig, 'sqlite_errorcode', None)
+    if code is not None:
+        return code & 0xff == sqlite3.SQLITE_BUSY
+    return 'database is locked' in str(orig)
+
+
+def retry_when_busy(transaction: Callable[[], T], attempts: int = BUSY_RETRIES) -> T:
+    """Run ``transaction()`` (a whole transaction, rolled back on error), retrying on SQLITE_BUSY."""
+    for attempt in range(attempts):
+        try:
+            return transaction()
+        except OperationalError as e:
+            if not is_busy(e) or attempt == attempts - 1:
+                raise
+            time.sleep(BUSY_BACKOFF * 2 ** attempt)
+
+
+async def retry_when_busy_async(transaction: Callable[[], Awaitable[T]], attempts: int = BUSY_RETRIES) -> T:
+    """Async ``retry_when_busy`` for transactions on the aiosqlite engine."""
+    for attempt in range(attempts):
+        try:
+            return await transaction()
+        except OperationalError as e:
+            if not is_busy(e) or attempt == attempts - 1:
+                raise
+            await asyncio.sleep(BUSY_BACKOFF * 2 ** attempt)
+
+
+class EngineRegistry:
+    """Process-wide cache of sync and async engines keyed by database path."""
+
+    def __init__(self):
+        self._engines: Dict[str, Engine] = {}
+        self._async_engines: Dict[str, AsyncEngine] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(db_path: Union[str, Path]) -> str:
+        return str(Path(db_path).expanduser().resolve())
+
+    def get_engine(self, db_path: Union[str, Path]) -> Engine:
+        """Get (or create) the pooled sync engine for a database file."""
+        key = self._key(db_path)
+        with self._lock:
+            engine = self._engines.get(key)
+            if engine is None:
+                engine = create_engine(f'sqlite:///{key}')
+                event.listen(engine, 'connect', self._on_connect)
+                self._engines[key] = engine
+            return engine
+
+    def get_async_engine(self, db_path: Union[str, Path]) -> AsyncEngine:
+        """Get (or create) the pooled aiosqlite engine for a database file."""
+        key = self._key(db_path)
+        with self._lock:
+            engine = self._async_engines.get(key)
+            if engine is None:
+                engine = create_async_engine(f'sqlite+aiosqlite:///{key}')
+                event.listen(engine.sync_engine, 'connect', self._on_connect)
+                self._async_engines[key] = engine
+            return engine
+
+    @staticmethod
+    def _on_connect(dbapi_connection, connection_record):
+        apply_pragmas(dbapi_connection)
+        register_sql_functions(dbapi_connection)
+
+    def dispose(self, db_path: Optional[Union[str, Path]] = None):
+        """
+        Close pooled connections and forget engines (all, or one path).
+
+        Async engines are dropped without awaiting dispose(); use
+        ``await engine.dispose()`` first where the loop is available.
+        """
+        with self._lock:
+            keys = [self._key(db_path)] if db_path else list(set(self._engines) | set(self._async_engines))
+            for key in keys:
+                engine = self._engines.pop(key, None)
+                if engine is not None:
+                    engine.dispose()
+                self._async_engines.pop(key, None)
+
+
+_registry = EngineRegistry()
+
+
+def get_engine(db_path: Union[str, Path]) -> Engine:
+    """Shared sync engine for ``db_path``."""
+    return _registry.get_engine(db_path)
+
+
+def get_async_engine(db_path: Union[str, Path]) -> AsyncEngine:
+    """Shared async (aiosqlite) engine for ``db_path``."""
+    return _registry.get_async_engine(db_path)
+
+
+def dispose_engines(db_path: Optional[Union[str, Path]] = None):
+    """Dispose shared engines (all, or the one for ``db_path``)."""
+    _registry.dispose(db_path)
@@ -0,0 +1,193 @@
+"""
+Online, resumable rebuild of the FTS indexes.
+
+The FTS5 'rebuild' command re-indexes a whole table in one statement and
+holds the write lock until it is done. FTSRebuilder instead builds
+``{name}_new`` next to the live table, in rowid order, one short
+transaction per chunk, and swaps it in at the end:
+
+* searches keep reading the live table until the swap
+* writers wait for at most one chunk; creating and swapping the shadow
+  table change the schema, and a writer that reloads it while a chunk
+  holds the lock fails at once instead of waiting, so writers retry
+  (``retry_when_busy``)
+* triggers mirror writes to rows the new table already covers (rowid at
+  or below the watermark), so it is current when it is swapped in
+* the watermark is committed with each chunk in ``fts_rebuild_state``, so
+  a cancelled or interrupted rebuild continues where it stopped
+"""
+
+from typing import Any, Callable, Dict, Iterable, Optional
+import datetime
+import logging
+import threading
+import time
+
+from sqlalchemy import select, text, update
+from sqlalchemy.engine import Engine
+
+from .conversation import (
+    FTS_TABLES, FTSRebuildState, create_fts_shadow, drop_fts_shadow, swap_fts_shadow
+)
+
+logger = logging.getLogger(__name__)
+
+state_table = FTSRebuildState.__table__
+
+# Columns of each FTS table, read from its source view
+FTS_COLUMNS = {
+    'conversations_fts': ('id', 'title', 'content'),
+    'messages_fts': ('id', 'conversation_id', 'content'),
+}
+
+
+class FTSRebuilder:
+    """Rebuilds FTS tables into shadow tables in committed chunks"""
+
+    def __init__(
+        self,
+        engine: Engine,
+        batch_size: int = 1000,
+        pause: float = 0.05,
+        progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+        cancel_event: Optional[threading.Event] = None
+    ):
+        """
+        Args:
+            engine: Engine of the conversation database
+            batch_size: Source rows indexed per transaction
+            pause: Seconds to sleep between chunks, so waiting writers get the lock
+            progress: Called with the table's progress after every chunk
+            cancel_event: Set it to stop after the current chunk; the rebuild
+                resumes from there next time
+        """
+        self.engine = engine
+        self.batch_size = batch_size
+        self.pause = pause
+        self.progress = progress
+        self.cancel_event = cancel_event or threading.Event()
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        """Rebuilds in progress (or interrupted), by FTS table"""
+        with self.engine.connect() as conn:
+            rows = conn.execute(select(state_table)).mappings().all()
+        return {row['name']: _progress(row) for row in rows}
+
+    def discard(self, tables: Optional[Iterable[str]] = None):
+        """Drop in-progress rebuilds; the live tables are untouched"""
+        with self.engine.begin() as conn:
+            for name in tables or FTS_TABLES:
+                drop_fts_shadow(conn, name)
+
+    def rebuild(self, tables: Optional[Iterable[str]] = None, restart: bool = False) -> Dict[str, Any]:
+        """
+        Rebuild FTS tables, resuming any rebuild left unfinished.
+
+        Args:
+            tables: FTS tables to rebuild (default: those with an unfinished
+                rebuild if there are any, otherwise all)
+            restart: Start over instead of resuming
+
+        Returns:
+            ``status`` ('completed' or 'cancelled') and per-table progress
+        """
+        if tables is None:
+            # Finish an interrupted run before starting a new one
+            unfinished = [name for name in FTS_TABLES if name in self.status()]
+            tables = unfinished if unfinished and not restart else list(FTS_TABLES)
+        results = {}
+        for name in tables:
+            if name not in FTS_TABLES:
+                raise ValueError(f"Unknown FTS table: {name}")
+            results[name] = self._rebuild_table(name, restart)
+            if results[name]['status'] == 'cancelled':
+                return {'status': 'cancelled', 'tables': results}
+        return {'status': 'completed', 'tables': results}
+
+    def _start(self, name: str, restart: bool) -> Dict[str, Any]:
+        with self.engine.begin() as conn:
+            state = conn.execute(
+                select(state_table).where(state_table.c.name == name)
+            ).mappings().first()
+            shadow = conn.execute(
+                text("SELECT count(*) FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                {"name": f"{name}_new"}
+            ).scalar()
+            if state is not None and shadow and not restart:
+                logger.info(f"Resuming rebuild of {name} after rowid {state['watermark']}")
+                return dict(state)
+
+            total = conn.execute(text(f"SELECT count(*) FROM {name}_source")).scalar()
+            create_fts_shadow(conn, name, total)
+            logger.info(f"Rebuilding {name} into {name}_new ({total} rows)")
+            return conn.execute(
+                select(state_table).where(state_table.c.name == name)
+            ).mappings().one()
+
+    def _rebuild_table(self, name: str, restart: bool) -> Dict[str, Any]:
+        state = dict(self._start(name, restart))
+        columns = ', '.join(FTS_COLUMNS[name])
+        started = time.perf_counter()
+
+        while True:
+            if self.cancel_event.is_set():
+                logger.info(f"Rebuild of {name} cancelled at rowid {state['watermark']}")
+                return {**_progress(state), 'status': 'cancelled'}
+
+            with self.engine.begin() as conn:
+                # Take the write lock first, so no row can appear inside
+                # the chunk's bounds between reading and indexing them
+                now = datetime.datetime.utcnow()
+                conn.execute(update(state_table).where(state_table.c.name == name).values(updated_at=now))
+                high, rows = conn.execute(
+                    text(f"""
+                        SELECT max(rid), count(*) FROM (
+                            SELECT rid FROM {name}_source WHERE rid > :watermark ORDER BY rid LIMIT :limit
+                        )
+                    """),
+                    {"watermark": state['watermark'], "limit": self.batch_size}
+                ).one()
+                if rows:
+                    conn.execute(
+                        text(f"""
+                            INSERT INTO {name}_new(rowid, {columns})
+                            SELECT rid, {columns} FROM {name}_source
+                            WHERE rid > :watermark AND rid <= :high
+                        """),
+                        {"watermark": state['watermark'], "high": high}
+                    )
+                    conn.execute(
+                        update(state_table).where(state_table.c.name == name).values(
+                            watermark=high, indexed=state_table.c.indexed + rows
+                        )
+                    )
+                    state.update(watermark=high, indexed=state['indexed'] + rows)
+                # A short chunk reached the end; swap while still holding the
+                # lock, or ongoing writes would keep adding rows to catch up on
+                done = rows < self.batch_size
+                if done:
+                    swap_fts_shadow(conn, name)
+
+            if self.progress:
+                self.progress({'table': name, **_progress(state)})
+            logger.info(f"{name}: {state['indexed']}/{state['total']} rows indexed")
+            # Also after the swap, so writers reloading the schema get the
+            # lock before the next table's first chunk
+            if self.pause:
+                time.sleep(self.pause)
+            if done:
+                break
+
+        elapsed = time.perf_counter() - started
+        logger.info(f"Rebuilt {name} in {elapsed:.1f}s and swapped it in")
+        return {**_progress(state), 'status': 'completed', 'elapsed_seconds': round(elapsed, 1)}
+
+
+def _progress(state) -> Dict[str, Any]:
+    total = state['total'] or 0
+    return {
+        'indexed': state['indexed'],
+        'total': total,
+        'watermark': state['watermark'],
+        'percent': round(min(100.0, 100.0 * state['indexed'] / total), 1) if total else 100.0,
+    }
@@ -0,0 +1,204 @@
+"""
+Discovery and parsing of exported conversation JSON for migration.
+
+Exports come in two layouts, and a directory may mix both:
+
+  * flat: ``<dir>/<conversation_id>.json``, one conversation with its
+    ``messages`` per file (extract scripts)
+  * bridge: ``<dir>/<conversation_id>/metadata.json`` and/or
+    ``messages.json`` (browser-extension bridge storage)
+
+``parse_sources`` turns a batch of sources into conversation, message and
+checkpoint rows. ``encode_sources`` also applies the SQLAlchemy bind
+processors (JSON columns, datetimes) so rows reach the database as
+driver-ready tuples: both are module-level and take plain picklable
+arguments so DataMigrator can run them on a process pool, leaving only
+the sqlite executemany to the parent.
+"""
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import Table
+from sqlalchemy.dialects.sqlite import pysqlite
+
+from .bulk import conversations_table, export_conversation_row, export_message_rows, messages_table
+from .conversation import MigrationCheckpoint
+
+MIGRATED = 'migrated'
+FAILED = 'failed'
+
+TABLES = {
+    'conversations': conversations_table,
+    'messages': messages_table,
+    'checkpoints': MigrationCheckpoint.__table__,
+}
+
+# The dialect of the engine registry's sqlite engines (default JSON serializer)
+_DIALECT = pysqlite.dialect()
+
+# Bind processors by (table, column): DB-API conversions for JSON, dates,
+# compressed text; None where the value passes through unchanged
+_BIND_PROCESSORS: Dict[Tuple[str, str], Optional[Callable[[Any], Any]]] = {}
+
+
+def _bind_processor(table: Table, name: str) -> Optional[Callable[[Any], Any]]:
+    key = (table.name, name)
+    if key not in _BIND_PROCESSORS:
+        column_type = table.c[name].type
+        _BIND_PROCESSORS[key] = column_type.dialect_impl(_DIALECT).bind_processor(_DIALECT)
+    return _BIND_PROCESSORS[key]
+
+
+@dataclass(frozen=True)
+class ExportSource:
+    """One exported conversation: a JSON file or a bridge directory"""
+    key: str  # Path relative to the export directory, the checkpoint key
+    path: str
+    conversation_id: str
+    mtime: float
+    layout: str  # 'flat' or 'bridge'
+
+
+def discover_sources(json_dir: Path) -> List[ExportSource]:
+    """Exported conversations under ``json_dir`` in both layouts, sorted by key"""
+    json_dir = Path(json_dir)
+    if not json_dir.is_dir():
+        return []
+
+    sources = []
+    with os.scandir(json_dir) as entries:
+        for entry in entries:
+            if entry.is_file() and entry.name.endswith('.json'):
+                sources.append(ExportSource(
+                    key=entry.name,
+                    path=entry.path,
+                    conversation_id=entry.name[:-len('.json')],
+                    mtime=entry.stat().st_mtime,
+                    layout='flat'
+                ))
+            elif entry.is_dir():
+                mtimes = [
+                    os.stat(path).st_mtime
+                    for path in (os.path.join(entry.path, 'metadata.json'), os.path.join(entry.path, 'messages.json'))
+                    if os.path.exists(path)
+                ]
+                if not mtimes:
+                    continue
+                sources.append(ExportSource(
+                    key=entry.name + '/',
+                    path=entry.path,
+                    conversation_id=entry.name,
+                    mtime=max(mtimes),
+                    layout='bridge'
+                ))
+    sources.sort(key=lambda source: source.key)
+    return sources
+
+
+def _read_json(path, digest=None) -> Any:
+    with open(path, 'rb') as f:
+        raw = f.read()
+    if digest is not None:
+        digest.update(raw)
+    return json.loads(raw)
+
+
+def load_source(source: ExportSource, digest=None) -> Dict[str, Any]:
+    """
+    Export JSON of a source, bridge directories merged into the flat shape.
+
+    The raw bytes of every file read are fed to ``digest`` (a hashlib
+    object), if given.
+    """
+    if source.layout == 'flat':
+        return _read_json(source.path, digest)
+
+    directory = Path(source.path)
+    data: Dict[str, Any] = {}
+    metadata = directory / 'metadata.json'
+    if metadata.exists():
+        data.update(_read_json(metadata, digest))
+    messages = directory / 'messages.json'
+    if messages.exists():
+        data['messages'] = _read_json(messages, digest).get('messages', [])
+    # The bridge keys conversations by directory name, as it does in the database
+    data['uuid'] = source.conversation_id
+    data.setdefault('extracted_by', 'extension')
+    return data
+
+
+def parse_sources(sources: List[ExportSource]) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Rows for a batch of sources.
+
+    Returns ``conversations``, ``messages`` and ``checkpoints`` lists; a
+    source that can't be read or parsed gets a failed checkpoint instead
+    of rows. Checkpoints carry the conversation id parsed from the source
+    and the hash of its files.
+    """
+    conversations, messages, checkpoints = [], [], []
+    for source in sources:
+        checkpoint = {
+            'source': source.key,
+            'conversation_id': source.conversation_id,
+            'mtime': source.mtime,
+            'content_hash': None,
+            'status': MIGRATED,
+            'error': None,
+            'migrated_at': datetime.utcnow()
+        }
+        try:
+            digest = hashlib.sha256()
+            data = load_source(source, digest)
+            conversation = export_conversation_row(data)
+            if not conversation['id']:
+                raise ValueError("Conversation has no uuid/id")
+            rows = export_message_rows(data, conversation['id'])
+        except Exception as e:
+            checkpoint.update(status=FAILED, error=f"{type(e).__name__}: {e}")
+        else:
+            checkpoint.update(conversation_id=conversation['id'], content_hash=digest.hexdigest())
+            conversations.append(conversation)
+            messages.extend(rows)
+        checkpoints.append(checkpoint)
+    return {'conversations': conversations, 'messages': messages, 'checkpoints': checkpoints}
+
+
+def encode_rows(table: Table, rows: List[Dict[str, Any]]) -> Tuple[Tuple[str, ...], List[tuple]]:
+    """
+    Rows as driver-ready tuples plus their column names, in table order.
+
+    Every row must have the same keys, as the row builders guarantee.
+    """
+    if not rows:
+        return (), []
+    columns = tuple(column.name for column in table.c if column.name in rows[0])
+    processors = [_bind_processor(table, name) for name in columns]
+    encoded = []
+    for row in rows:
+        encoded.append(tuple(
+            process(row[name]) if process else row[name]
+            for name, process in zip(columns, processors)
+        ))
+    return columns, encoded
+
+
+def encode_sources(sources: List[ExportSource]) -> Dict[str, Any]:
+    """
+    ``parse_sources`` with every row list run through ``encode_rows``.
+
+    Failed sources are also listed under ``failed`` as (key, error) pairs.
+    """
+    parsed = parse_sources(sources)
+    encoded: Dict[str, Any] = {name: encode_rows(TABLES[name], rows) for name, rows in parsed.items()}
+    encoded['failed'] = [
+        (checkpoint['source'], checkpoint['error'])
+        for checkpoint in parsed['checkpoints'] if checkpoint['status'] == FAILED
+    ]
+    return encoded
@@ -0,0 +1,388 @@
+"""
+Async data-access layer for conversation storage.
+
+All MCP tool handlers go through ConversationStore so database work runs
+on aiosqlite's worker threads instead of blocking the event loop. Write
+transactions are retried when SQLite reports the database busy (see
+``retry_when_busy_async``).
+"""
+
+from typing import Any, Dict, Iterable, List, Optional
+from datetime import datetime
+import logging
+
+from sqlalchemy import select, delete, insert, update, func, or_, bindparam
+from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncEngine
+
+from .bulk import api_conversation_row, api_message_rows, chunked, conversation_upsert
+from .conversation import Conversation, Message, SyncState
+from .database import dispose_engines, get_async_engine, retry_when_busy_async
+
+logger = logging.getLogger(__name__)
+
+
+class ConversationStore:
+    """Async repository for conversations and messages"""
+
+    def __init__(
+        self,
+        db_path: str = "data/db/conversations.db",
+        engine: Optional[AsyncEngine] = None,
+        chunk_size: int = 500
+    ):
+        self.db_path = db_path
+        # An engine passed in is disposed by whoever created it
+        self._owns_engine = engine is None
+        self.engine = engine or get_async_engine(db_path)
+        self.chunk_size = chunk_size
+        self.Session = async_sessionmaker(self.engine, expire_on_commit=False)
+
+    async def close(self):
+        """
+        Dispose of pooled connections of the shared engine for ``db_path``.
+
+        The registry forgets the engine too, so later stores and tools get
+        a fresh one; an engine passed to the constructor is left alone.
+        """
+        if not self._owns_engine:
+            return
+        await self.engine.dispose()
+        dispose_engines(self.db_path)
+
+    # Reads
+
+    async def list_conversations(self, limit: int = 100) -> List[Dict[str, Any]]:
+        """List conversation metadata"""
+        async with self.Session() as session:
+            result = await session.execute(select(Conversation).limit(limit))
+            return [conv.to_dict() for conv in result.scalars()]
+
+    async def get_conversation(
+        self,
+        conversation_id: str,
+        include_messages: bool = True
+    ) -> Optional[Dict[str, Any]]:
+        """Get a conversation as a dict, optionally with its messages"""
+        async with self.Session() as session:
+            conv = await session.get(Conversation, conversation_id)
+            if conv is None:
+                return None
+
+            result = conv.to_dict()
+            if include_messages:
+                result['messages'] = await self._get_messages(session, conversation_id)
+            return result
+
+    async def get_conversations(
+        self,
+        conversation_ids: Iterable[str],
+        include_messages: bool = False
+    ) -> List[Dict[str, Any]]:
+        """Get several conversations, preserving the requested order"""
+        ids = list(conversation_ids)
+        if not ids:
+            return []
+
+        async with self.Session() as session:
+            result = await session.execute(
+                select(Conversation).where(Conversation.id.in_(ids))
+            )
+            found = {conv.id: conv.to_dict() for conv in result.scalars()}
+
+            if include_messages and found:
+                messages = await session.execute(
+                    select(Message)
+                    .where(Message.conversation_id.in_(list(found)))
+                    .order_by(Message.conversation_id, Message.index)
+                )
+                for conv in found.values():
+                    conv['messages'] = []
+                for msg in messages.scalars():
+                    found[msg.conversation_id]['messages'].append(msg.to_dict())
+
+            return [found[conv_id] for conv_id in ids if conv_id in found]
+
+    async def get_messages(self, conversation_id: str) -> List[Dict[str, Any]]:
+        """Get a conversation's messages in order"""
+        async with self.Session() as session:
+            return await self._get_messages(session, conversation_id)
+
+    async def _get_messages(self, session, conversation_id: str) -> List[Dict[str, Any]]:
+        result = await session.execute(
+            select(Message)
+            .where(Message.conversation_id == conversation_id)
+            .order_by(Message.index)
+        )
+        return [msg.to_dict() for msg in result.scalars()]
+
+    # Writes
+
+    async def sync_conversations(self, conversations: List[Dict]) -> Dict[str, int]:
+        """
+        Insert or update conversation metadata from the Claude.ai API.
+
+        Rows whose stored content hash matches the payload are not written,
+        so unchanged conversations don't fire the FTS update triggers.
+        Returns inserted/updated/unchanged counts.
+        """
+        if not conversations:
+            return {'inserted': 0, 'updated': 0, 'unchanged': 0}
+
+        async def write():
+            async with self.Session() as session:
+                counts = await self._sync_conversations(session, conversations)
+                await session.commit()
+            return counts
+
+        return await retry_when_busy_async(write)
+
+    async def _sync_conversations(
+        self,
+        session,
+        conversations: List[Dict],
+        update_existing: bool = True
+    ) -> Dict[str, int]:
+        counts = {'inserted': 0, 'updated': 0, 'unchanged': 0}
+        # The last payload wins if the API repeats a conversation
+        rows = {conv_data['uuid']: api_conversation_row(conv_data) for conv_data in conversations}
+
+        result = await session.execute(
+            select(Conversation.id, Conversation.content_hash).where(Conversation.id.in_(list(rows)))
+        )
+        existing = dict(result.all())
+
+        changed = []
+        for conv_id, row in rows.items():
+            if conv_id not in existing:
+                counts['inserted'] += 1
+                changed.append(row)
+            elif update_existing and existing[conv_id] != row['content_hash']:
+                counts['updated'] += 1
+                changed.append(row)
+            else:
+                counts['unchanged'] += 1
+
+        stmt = conversation_upsert(update_existing=update_existing)
+        for chunk in chunked(changed, self.chunk_size):
+            await session.execute(stmt, chunk)
+
+        return counts
+
+    # Sync state
+
+    async def get_sync_state(self, org_id: str) -> Optional[Dict[str, Any]]:
+        """Get the incremental sync watermark for an organization"""
+        async with self.Session() as session:
+            state = await session.get(SyncState, org_id)
+            if state is None:
+                return None
+            return {
+                'org_id': state.org_id,
+                'watermark': state.watermark,
+                'last_sync_at': state.last_sync_at.isoformat() if state.last_sync_at else None,
+                'last_full_sync_at': state.last_full_sync_at.isoformat() if state.last_full_sync_at else None,
+                'last_result': state.last_result or {}
+            }
+
+    async def save_sync_state(
+        self,
+        org_id: str,
+        watermark: Optional[str],
+        full: bool,
+        last_result: Dict[str, Any]
+    ) -> None:
+        """Record a finished sync for an organization"""
+        now = datetime.now()
+
+        async def write():
+            async with self.Session() as session:
+                state = await session.get(SyncState, org_id)
+                if state is None:
+                    state = SyncState(org_id=org_id)
+                    session.add(state)
+                state.watermark = watermark
+                state.last_sync_at = now
+                if full:
+                    state.last_full_sync_at = now
+                state.last_result = last_result
+                await session.commit()
+
+        await retry_when_busy_async(write)
+
+    # Message hydration
+
+    def _needs_hydration(self):
+        # Messages are stale when never fetched or fetched for an older version
+        return or_(
+            Conversation.hydrated_hash.is_(None),
+            Conversation.hydrated_hash != func.coalesce(Conversation.content_hash, '')
+        )
+
+    async def get_hydration_candidates(
+        self,
+        conversation_ids: Optional[Iterable[str]] = None,
+        limit: Optional[int] = None
+    ) -> List[str]:
+        """Ids of conversations whose messages need fetching, most recent first"""
+        query = (
+            select(Conversation.id)
+            .where(self._needs_hydration())
+            .order_by(Conversation.updated_at.desc())
+        )
+        if conversation_ids is not None:
+            query = query.where(Conversation.id.in_(list(conversation_ids)))
+        if limit:
+            query = query.limit(limit)
+
+        async with self.Session() as session:
+            result = await session.execute(query)
+            return list(result.scalars())
+
+    async def count_hydration_pending(self) -> int:
+        """Number of conversations whose messages need fetching"""
+        async with self.Session() as session:
+            result = await session.execute(
+                select(func.count(Conversation.id)).where(self._needs_hydration())
+            )
+            return result.scalar()
+
+    async def save_hydrated_conversations(self, conversations: List[Dict]) -> int:
+        """
+        Store full chat_conversations/{id} payloads in one transaction.
+
+        Inserts conversations that aren't stored yet, replaces their
+        messages (the FTS triggers index them) and marks them hydrated at
+        their current content hash. Existing metadata is left to the
+        listing sync, whose payload the content hash is computed from.
+        Returns the number of messages written.
+        """
+        if not conversations:
+            return 0
+
+        rows = [row for conv_data in conversations for row in api_message_rows(conv_data)]
+        ids = [conv_data['uuid'] for conv_data in conversations]
+        counts = {conv_id: 0 for conv_id in ids}
+        for row in rows:
+            counts[row['conversation_id']] += 1
+
+        table = Conversation.__table__
+        mark_hydrated = (
+            update(table)
+            .where(table.c.id == bindparam('conv_id'))
+            .values(
+                message_count=bindparam('count'),
+                hydrated_hash=func.coalesce(table.c.content_hash, '')
+            )
+        )
+
+        async def write():
+            async with self.Session() as session:
+                await self._sync_conversations(session, conversations, update_existing=False)
+
+                await session.execute(delete(Message).where(Message.conversation_id.in_(ids)))
+                for chunk in chunked(rows, self.chunk_size):
+                    await session.execute(insert(Message.__table__), chunk)
+
+                await session.execute(
+                    mark_hydrated,
+                    [{'conv_id': conv_id, 'count': count} for conv_id, count in counts.items()]
+                )
+                await session.commit()
+
+        await retry_when_busy_async(write)
+        return len(rows)
+
+    async def add_tags(self, conversation_ids: List[str], tags: List[str]) -> List[str]:
+        """Add tags to conversations. Returns the ids that were not found."""
+        async def write():
+            async with self.Session() as session:
+                result = await session.execute(
+                    select(Conversation).where(Conversation.id.in_(conversation_ids))
+                )
+                found = set()
+                for conv in result.scalars():
+                    conv.tags = list(set((conv.tags or []) + tags))
+                    found.add(conv.id)
+
+                await session.commit()
+            return found
+
+        found = await retry_when_busy_async(write)
+        return [conv_id for conv_id in conversation_ids if conv_id not in found]
+
+    async def delete_conversations(self, conversation_ids: List[str]) -> None:
+        """Delete conversations and their messages"""
+        async def write():
+            async with self.Session() as session:
+                await session.execute(
+                    delete(Message).where(Message.conversation_id.in_(conversation_ids))
+                )
+                await session.execute(
+                    delete(Conversation).where(Conversation.id.in_(conversation_ids))
+                )
+                await session.commit()
+
+        await retry_when_busy_async(write)
+
+    # Aggregates
+
+    async def analyze_conversations(self, conversation_ids: List[str]) -> Dict[str, Any]:
+        """Message and model statistics for a set of conversations"""
+        async with self.Session() as session:
+            totals = (await session.execute(
+                select(func.count(Message.id), func.coalesce(func.sum(func.length(func.mcp_decompress(Message.content))), 0))
+                .where(Message.conversation_id.in_(conversation_ids))
+            )).one()
+
+            models = await session.execute(
+                select(func.coalesce(Conversation.model, 'unknown'), func.count())
+                .where(Conversation.id.in_(conversation_ids))
+                .group_by(func.coalesce(Conversation.model, 'unknown'))
+            )
+
+            return {
+                'total_messages': totals[0],
+                'total_characters': totals[1],
+                'models_used': dict(models.all())
+            }
+
+    async def get_statistics(self, start_date: Optional[datetime] = None) -> Dict[str, Any]:
+        """Conversation statistics, optionally limited to those created since start_date"""
+        def since(query):
+            if start_date:
+                return query.where(Conversation.created_at >= start_date)
+            return query
+
+        async with self.Session() as session:
+            totals = (await session.execute(since(select(
+                func.count(Conversation.id),
+                func.coalesce(func.sum(Conversation.message_count), 0),
+                func.max(Conversation.message_count),
+                func.min(Conversation.message_count),
+            )))).one()
+
+            model_col = func.coalesce(Conversation.model, 'unknown')
+            models = await session.execute(
+                since(select(model_col, func.count())).group_by(model_col)
+            )
+
+            day_col = func.date(Conversation.created_at)
+            days = await session.execute(
+                since(select(day_col, func.count()))
+                .where(Conversation.created_at.is_not(None))
+                .group_by(day_col)
+                .order_by(day_col)
+            )
+
+            total_conversations, total_messages, max_messages, min_messages = totals
+            return {
+                'total_conversations': total_conversations,
+                'total_messages': total_messages,
+                'average_messages_per_conversation': (
+                    total_messages / total_conversations if total_conversations else 0
+                ),
+                'max_messages_in_conversation': max_messages or 0,
+                'min_messages_in_conversation': min_messages or 0,
+                'model_distribution': dict(models.all()),
+                'daily_distribution': dict(days.all())
+            }
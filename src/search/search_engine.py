@@ -2,16 +2,34 @@
 Unified search engine combining text and semantic search
 """
 
-from typing import List, Dict, Optional, Tuple, Literal
+from typing import List, Dict, Optional, Tuple, Literal, Iterable
 from .text_search import TextSearch
 from .semantic_search import SemanticSearch
+from ..models.database import get_engine
+from sqlalchemy import text
+import threading
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
+# Warm-up states reported by UnifiedSearchEngine.get_status()
+BACKEND_PENDING = 'pending'
+BACKEND_LOADING = 'loading'
+BACKEND_READY = 'ready'
+BACKEND_FAILED = 'failed'
+
 
 class UnifiedSearchEngine:
-    """Combines text and semantic search for comprehensive results"""
+    """Combines text and semantic search for comprehensive results
+    
+    Backends are built lazily: constructing the engine is cheap, and the
+    text (FTS5) and semantic (SentenceTransformer + FAISS) backends are
+    created on first use or by an explicit warm_up() call, which the MCP
+    server runs in the background so startup never waits on model loading.
+    """
+    
+    BACKENDS = ('text', 'semantic')
     
     def __init__(
         self,
@@ -19,9 +37,87 @@ class UnifiedSearchEngine:
         semantic_model: str = 'all-MiniLM-L6-v2',
         index_path: Optional[str] = None
     ):
-        self.text_search = TextSearch(db_path)
-        self.semantic_search = SemanticSearch(semantic_model, index_path=index_path, db_path=db_path)
         self.db_path = db_path
+        self.semantic_model = semantic_model
+        self.index_path = index_path
+        
+        self._text_search: Optional[TextSearch] = None
+        self._semantic_search: Optional[SemanticSearch] = None
+        
+        # One lock per backend so a slow semantic load never blocks text search
+        self._locks = {name: threading.Lock() for name in self.BACKENDS}
+        self._status = {
+            name: {'state': BACKEND_PENDING, 'error': None, 'load_seconds': None}
+            for name in self.BACKENDS
+        }
+    
+    @property
+    def text_search(self) -> TextSearch:
+        """Text search backend, created on first access"""
+        if self._text_search is None:
+            self._text_search = self._load_backend(
+                'text', lambda: TextSearch(self.db_path)
+            )
+        return self._text_search
+    
+    @property
+    def semantic_search(self) -> SemanticSearch:
+        """Semantic search backend, created on first access"""
+        if self._semantic_search is None:
+            self._semantic_search = self._load_backend(
+                'semantic',
+                lambda: SemanticSearch(
+                    self.semantic_model, index_path=self.index_path, db_path=self.db_path
+                )
+            )
+        return self._semantic_search
+    
+    def _load_backend(self, name: str, factory):
+        """Build a backend exactly once, recording its warm-up status"""
+        with self._locks[name]:
+            existing = getattr(self, f'_{name}_search')
+            if existing is not None:
+                return existing
+            
+            status = self._status[name]
+            status.update(state=BACKEND_LOADING, error=None)
+            started = time.perf_counter()
+            
+            try:
+                backend = factory()
+            except Exception as e:
+                status.update(state=BACKEND_FAILED, error=str(e))
+                logger.error(f"Failed to load {name} search backend: {e}")
+                raise
+            
+            status.update(
+                state=BACKEND_READY,
+                load_seconds=round(time.perf_counter() - started, 3)
+            )
+            logger.info(f"{name.capitalize()} search backend ready in {status['load_seconds']}s")
+            return backend
+    
+    def warm_up(self, backends: Optional[Iterable[str]] = None):
+        """
+        Load search backends ahead of first use.
+        
+        Blocking; intended to run in a worker thread. Failures are recorded
+        in the status and do not propagate, so a missing optional dependency
+        only disables the affected backend.
+        """
+        for name in backends or self.BACKENDS:
+            try:
+                getattr(self, f'{name}_search')
+            except Exception:
+                pass
+    
+    def is_ready(self, backend: str) -> bool:
+        """Whether a backend has finished loading"""
+        return self._status[backend]['state'] == BACKEND_READY
+    
+    def get_status(self) -> Dict[str, Dict]:
+        """Warm-up progress for each backend"""
+        return {name: dict(status) for name, status in self._status.items()}
     
     def search(
         self,
@@ -199,10 +295,7 @@ class UnifiedSearchEngine:
         
         if method in ['tags', 'both']:
             # Get conversation tags
-            from sqlalchemy import create_engine, text
-            engine = create_engine(f'sqlite:///{self.db_path}')
-            
-            with engine.connect() as conn:
+            with get_engine(self.db_path).connect() as conn:
                 # Get tags for the source conversation
                 source_result = conn.execute(
                     text("SELECT tags FROM conversations WHERE id = :id"),
@@ -250,12 +343,13 @@ class UnifiedSearchEngine:
     def get_search_stats(self) -> Dict:
         """Get statistics about search capabilities"""
         
-        semantic_stats = self.semantic_search.get_embedding_stats()
-        
-        from sqlalchemy import create_engine, text
-        engine = create_engine(f'sqlite:///{self.db_path}')
+        # Don't force a model load just to report statistics
+        if self.is_ready('semantic'):
+            semantic_stats = self.semantic_search.get_embedding_stats()
+        else:
+            semantic_stats = {'status': self._status['semantic']['state']}
         
-        with engine.connect() as conn:
+        with get_engine(self.db_path).connect() as conn:
             conv_count = conn.execute(
                 text("SELECT COUNT(*) FROM conversations")
             ).scalar()
@@ -264,13 +358,14 @@ class UnifiedSearchEngine:
                 text("SELECT COUNT(*) FROM messages")
             ).scalar()
             
-            # Check FTS tables
+            # Check FTS tables: one docsize row per indexed row (counting the
+            # external-content tables themselves would scan their sources)
             fts_conv_count = conn.execute(
-                text("SELECT COUNT(*) FROM conversations_fts")
+                text("SELECT COUNT(*) FROM conversations_fts_docsize")
             ).scalar()
             
             fts_msg_count = conn.execute(
-                text("SELECT COUNT(*) FROM messages_fts")
+                text("SELECT COUNT(*) FROM messages_fts_docsize")
             ).scalar()
         
         return {
@@ -283,7 +378,8 @@ class UnifiedSearchEngine:
                 'messages_indexed': fts_msg_count,
                 'engine': 'SQLite FTS5'
             },
-            'semantic_search': semantic_stats
+            'semantic_search': semantic_stats,
+            'backends': self.get_status()
         }
     
     def rebuild_indexes(self):
@@ -306,6 +402,7 @@ class UnifiedSearchEngine:
         self.text_search.optimize_index()
         
         # Semantic search optimization happens during save
-        self.semantic_search.save_indexes()
+        if self.is_ready('semantic'):
+            self.semantic_search.save_indexes()
         
         logger.info("Search indexes optimized")
@@ -3,19 +3,25 @@ Semantic search implementation using sentence transformers
 """
 
 from typing import List, Dict, Optional, Tuple
-import numpy as np
-from sentence_transformers import SentenceTransformer
-import faiss
 import json
 import pickle
+import threading
 from pathlib import Path
 import logging
-from sqlalchemy import create_engine, text
+from sqlalchemy import text
 from sqlalchemy.orm import Session
 
+from ..models.database import get_engine
+
 logger = logging.getLogger(__name__)
 
 
+def _faiss():
+    """Import FAISS on first use; it is only needed once indexes are touched"""
+    import faiss
+    return faiss
+
+
 class SemanticSearch:
     """Semantic search using sentence transformers and FAISS"""
     
@@ -25,6 +31,10 @@ class SemanticSearch:
         index_path: Optional[str] = None,
         db_path: str = "data/db/conversations.db"
     ):
+        # Imported here: sentence_transformers pulls in torch, which takes
+        # seconds to import and is only needed once semantic search is used
+        from sentence_transformers import SentenceTransformer
+        
         self.model = SentenceTransformer(model_name)
         self.embedding_dim = self.model.get_sentence_embedding_dimension()
         
@@ -33,7 +43,7 @@ class SemanticSearch:
         self.index_path.mkdir(parents=True, exist_ok=True)
         
         # Database connection
-        self.engine = create_engine(f'sqlite:///{db_path}')
+        self.engine = get_engine(db_path)
         
         # FAISS indexes
         self.conversation_index = None
@@ -56,6 +66,7 @@ class SemanticSearch:
         if all(f.exists() for f in [conv_index_file, msg_index_file, conv_map_file, msg_map_file]):
             # Load existing indexes
             logger.info("Loading existing semantic search indexes...")
+            faiss = _faiss()
             self.conversation_index = faiss.read_index(str(conv_index_file))
             self.message_index = faiss.read_index(str(msg_index_file))
             
@@ -67,73 +78,75 @@ class SemanticSearch:
         else:
             # Create new indexes
             logger.info("Creating new semantic search indexes...")
+            faiss = _faiss()
             self.conversation_index = faiss.IndexFlatL2(self.embedding_dim)
             self.message_index = faiss.IndexFlatL2(self.embedding_dim)
             self.build_indexes()
     
-    def build_indexes(self):
-        """Build semantic search indexes from database"""
+    def build_indexes(self, cancel_event: Optional[threading.Event] = None, batch_size: int = 1000) -> bool:
+        """
+        Build semantic search indexes from database
+
+        Embeddings go into new indexes that replace the current ones once
+        complete. Setting ``cancel_event`` stops the build after the batch
+        being encoded and keeps the current indexes; returns False then.
+        """
         logger.info("Building semantic search indexes...")
+        faiss = _faiss()
+        conversation_index = faiss.IndexFlatL2(self.embedding_dim)
+        message_index = faiss.IndexFlatL2(self.embedding_dim)
+        conversation_id_map = []
+        message_id_map = []
+        
+        def encode_into(index, texts: List[str]) -> bool:
+            for i in range(0, len(texts), batch_size):
+                if cancel_event is not None and cancel_event.is_set():
+                    logger.info(f"Semantic index build cancelled after {i}/{len(texts)} texts")
+                    return False
+                embeddings = self.model.encode(texts[i:i + batch_size], show_progress_bar=True)
+                index.add(embeddings.astype('float32'))
+            return True
         
         with self.engine.connect() as conn:
             # Index conversations
             conv_results = conn.execute(
-                text("SELECT id, title, search_vector FROM conversations")
+                text("SELECT id, title, mcp_decompress(search_vector) FROM conversations")
             ).fetchall()
             
-            if conv_results:
-                conv_texts = []
-                conv_ids = []
-                
-                for row in conv_results:
-                    conv_ids.append(row[0])
-                    # Combine title and search vector for embedding
-                    combined_text = f"{row[1]} {row[2] or ''}"
-                    conv_texts.append(combined_text)
-                
-                # Create embeddings
-                conv_embeddings = self.model.encode(conv_texts, show_progress_bar=True)
-                
-                # Add to index
-                self.conversation_index.add(conv_embeddings.astype('float32'))
-                self.conversation_id_map = conv_ids
+            # Combine title and search vector for embedding
+            conv_texts = [f"{row[1]} {row[2] or ''}" for row in conv_results]
+            conversation_id_map = [row[0] for row in conv_results]
+            if not encode_into(conversation_index, conv_texts):
+                return False
             
             # Index messages
             msg_results = conn.execute(
                 text("""
-                    SELECT m.id, m.conversation_id, m.content, c.title
+                    SELECT m.id, m.conversation_id, mcp_decompress(m.content), c.title
                     FROM messages m
                     JOIN conversations c ON m.conversation_id = c.id
                 """)
             ).fetchall()
             
-            if msg_results:
-                msg_texts = []
-                msg_data = []
-                
-                for row in msg_results:
-                    msg_data.append({
-                        'id': row[0],
-                        'conversation_id': row[1],
-                        'conversation_title': row[3]
-                    })
-                    msg_texts.append(row[2])
-                
-                # Create embeddings in batches
-                batch_size = 1000
-                for i in range(0, len(msg_texts), batch_size):
-                    batch_texts = msg_texts[i:i+batch_size]
-                    batch_embeddings = self.model.encode(batch_texts, show_progress_bar=True)
-                    self.message_index.add(batch_embeddings.astype('float32'))
-                
-                self.message_id_map = msg_data
+            msg_texts = [row[2] for row in msg_results]
+            message_id_map = [
+                {'id': row[0], 'conversation_id': row[1], 'conversation_title': row[3]}
+                for row in msg_results
+            ]
+            if not encode_into(message_index, msg_texts):
+                return False
+        
+        self.conversation_index, self.conversation_id_map = conversation_index, conversation_id_map
+        self.message_index, self.message_id_map = message_index, message_id_map
         
         # Save indexes
         self.save_indexes()
         logger.info("Semantic search indexes built successfully")
+        return True
     
     def save_indexes(self):
         """Save indexes to disk"""
+        faiss = _faiss()
         faiss.write_index(self.conversation_index, str(self.index_path / "conversation_index.faiss"))
         faiss.write_index(self.message_index, str(self.index_path / "message_index.faiss"))
         
@@ -2,66 +2,105 @@
 Text search implementation using SQLite FTS5
 """
 
-from typing import List, Dict, Optional, Tuple
-from sqlalchemy import create_engine, text
+from typing import Callable, List, Dict, Optional, Tuple
+from sqlalchemy import bindparam, text
 from sqlalchemy.orm import Session
+import base64
+import hashlib
+import json
 import logging
+import threading
+
+from ..models.database import get_engine
+from ..models.compression import select_list
+from ..models.conversation import Conversation, create_fts_tables
+from ..models.fts_rebuild import FTSRebuilder
 
 logger = logging.getLogger(__name__)
 
 
+def _fingerprint(table: str, query: str, params: Dict) -> str:
+    """Ties a cursor to the search it came from"""
+    key = json.dumps([table, query, params.get("conversation_id")])
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()[:16]
+
+
+def _encode_cursor(score: float, rowid: int, fingerprint: str) -> str:
+    """Opaque cursor for the page after the row with ``score`` and ``rowid``"""
+    payload = json.dumps([score, rowid, fingerprint], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def _decode_cursor(cursor: str, fingerprint: str) -> Tuple[float, int]:
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        score, rowid, issued_for = json.loads(base64.urlsafe_b64decode(padded))
+        score, rowid = float(score), int(rowid)
+    except (ValueError, TypeError):
+        raise ValueError("Invalid search cursor")
+    if issued_for != fingerprint:
+        raise ValueError("Search cursor belongs to a different query")
+    return score, rowid
+
+
+def _in_rank_order(rows, ranked: Dict[int, float]) -> List[Dict]:
+    """Hydrated rows in ranking order, with their scores"""
+    by_rowid = {row.rid: row for row in rows}
+    results = []
+    for rowid, score in ranked.items():
+        if rowid in by_rowid:
+            result = dict(by_rowid[rowid]._mapping)
+            del result['rid']
+            result['score'] = score
+            results.append(result)
+    return results
+
+
 class TextSearch:
     """Full-text search using SQLite FTS5"""
     
     def __init__(self, db_path: str = "data/db/conversations.db"):
-        self.engine = create_engine(f'sqlite:///{db_path}')
+        self.engine = get_engine(db_path)
         self._ensure_fts_tables()
     
     def _ensure_fts_tables(self):
         """Ensure FTS5 tables exist"""
+        # These should already be created by the database init
         with self.engine.connect() as conn:
-            # Check if FTS tables exist
-            result = conn.execute(
-                text("SELECT name FROM sqlite_master WHERE type='table' AND name LIKE '%_fts'")
-            )
-            
-            if not result.fetchall():
-                logger.info("Creating FTS5 tables...")
-                # These should already be created by the database init
-                # but we'll ensure they exist
-                conn.execute(text("""
-                    CREATE VIRTUAL TABLE IF NOT EXISTS conversations_fts USING fts5(
-                        id UNINDEXED,
-                        title,
-                        content,
-                        tokenize='porter unicode61'
-                    )
-                """))
-                
-                conn.execute(text("""
-                    CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5(
-                        id UNINDEXED,
-                        conversation_id UNINDEXED,
-                        content,
-                        tokenize='porter unicode61'
-                    )
-                """))
-                
-                conn.commit()
+            create_fts_tables(conn)
+            conn.commit()
     
     def search_conversations(
         self, 
         query: str, 
         limit: int = 20,
-        offset: int = 0
+        cursor: Optional[str] = None
     ) -> List[Dict]:
         """Search conversations by title and content"""
+        return self.search_conversations_page(query, limit, cursor)['results']
+    
+    def search_conversations_page(
+        self,
+        query: str,
+        limit: int = 20,
+        cursor: Optional[str] = None
+    ) -> Dict:
+        """
+        One page of conversation matches, best first.
         
+        Returns ``results`` and ``next_cursor``, which fetches the next
+        page when passed back as ``cursor`` (None on the last page).
+        """
         with self.engine.connect() as conn:
-            # Search in conversations
-            results = conn.execute(
+            ranked, next_cursor = self._rank(conn, 'conversations_fts', query, limit, cursor)
+            if not ranked:
+                return {'results': [], 'next_cursor': None}
+            
+            # Snippets only for the rows on this page
+            rows = conn.execute(
                 text("""
                     SELECT 
+                        conversations_fts.rowid AS rid,
                         c.id,
                         c.title,
                         c.created_at,
@@ -69,56 +108,116 @@ class TextSearch:
                         c.model,
                         c.message_count,
                         c.tags,
-                        snippet(conversations_fts, 2, '<mark>', '</mark>', '...', 32) as snippet,
-                        rank as score
+                        snippet(conversations_fts, 2, '<mark>', '</mark>', '...', 32) as snippet
                     FROM conversations_fts
-                    JOIN conversations c ON conversations_fts.id = c.id
+                    JOIN conversations c ON c.rowid = conversations_fts.rowid
                     WHERE conversations_fts MATCH :query
-                    ORDER BY rank
-                    LIMIT :limit OFFSET :offset
-                """),
-                {"query": query, "limit": limit, "offset": offset}
+                    AND conversations_fts.rowid IN :rowids
+                """).bindparams(bindparam('rowids', expanding=True)),
+                {"query": query, "rowids": list(ranked)}
             ).fetchall()
             
-            return [dict(row._mapping) for row in results]
+            return {'results': _in_rank_order(rows, ranked), 'next_cursor': next_cursor}
     
     def search_messages(
         self, 
         query: str, 
         conversation_id: Optional[str] = None,
         limit: int = 50,
-        offset: int = 0
+        cursor: Optional[str] = None
     ) -> List[Dict]:
         """Search messages by content"""
+        return self.search_messages_page(query, conversation_id, limit, cursor)['results']
+    
+    def search_messages_page(
+        self,
+        query: str,
+        conversation_id: Optional[str] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> Dict:
+        """
+        One page of message matches, best first.
         
+        Returns ``results`` and ``next_cursor``, which fetches the next
+        page when passed back as ``cursor`` (None on the last page).
+        """
         with self.engine.connect() as conn:
-            base_query = """
-                SELECT 
-                    m.id,
-                    m.conversation_id,
-                    m.role,
-                    m.created_at,
-                    m."index",
-                    c.title as conversation_title,
-                    snippet(messages_fts, 2, '<mark>', '</mark>', '...', 32) as snippet,
-                    rank as score
-                FROM messages_fts
-                JOIN messages m ON messages_fts.id = m.id
-                JOIN conversations c ON m.conversation_id = c.id
-                WHERE messages_fts MATCH :query
-            """
-            
-            params = {"query": query, "limit": limit, "offset": offset}
-            
+            scope, params = "", {}
             if conversation_id:
-                base_query += " AND m.conversation_id = :conversation_id"
+                scope = "AND rowid IN (SELECT rowid FROM messages WHERE conversation_id = :conversation_id)"
                 params["conversation_id"] = conversation_id
             
-            base_query += " ORDER BY rank LIMIT :limit OFFSET :offset"
+            ranked, next_cursor = self._rank(conn, 'messages_fts', query, limit, cursor, scope, params)
+            if not ranked:
+                return {'results': [], 'next_cursor': None}
             
-            results = conn.execute(text(base_query), params).fetchall()
+            # Snippets only for the rows on this page
+            rows = conn.execute(
+                text("""
+                    SELECT 
+                        messages_fts.rowid AS rid,
+                        m.id,
+                        m.conversation_id,
+                        m.role,
+                        m.created_at,
+                        m."index",
+                        c.title as conversation_title,
+                        snippet(messages_fts, 2, '<mark>', '</mark>', '...', 32) as snippet
+                    FROM messages_fts
+                    JOIN messages m ON m.rowid = messages_fts.rowid
+                    LEFT JOIN conversations c ON m.conversation_id = c.id
+                    WHERE messages_fts MATCH :query
+                    AND messages_fts.rowid IN :rowids
+                """).bindparams(bindparam('rowids', expanding=True)),
+                {"query": query, "rowids": list(ranked)}
+            ).fetchall()
             
-            return [dict(row._mapping) for row in results]
+            return {'results': _in_rank_order(rows, ranked), 'next_cursor': next_cursor}
+    
+    def _rank(
+        self,
+        conn,
+        table: str,
+        query: str,
+        limit: int,
+        cursor: Optional[str],
+        scope: str = "",
+        params: Optional[Dict] = None
+    ) -> Tuple[Dict[int, float], Optional[str]]:
+        """
+        First phase of a search: rowids and bm25 scores of one page.
+        
+        Pages are keyed on (score, rowid) instead of OFFSET, so a deep page
+        costs the same as the first. Only this phase touches every match,
+        and it reads nothing but the index.
+        """
+        params = {"query": query, "limit": limit + 1, **(params or {})}
+        fingerprint = _fingerprint(table, query, params)
+        after = ""
+        if cursor:
+            params["after_score"], params["after_rowid"] = _decode_cursor(cursor, fingerprint)
+            after = "WHERE score > :after_score OR (score = :after_score AND rid > :after_rowid)"
+        
+        rows = conn.execute(
+            text(f"""
+                SELECT rid, score FROM (
+                    SELECT rowid AS rid, bm25({table}) AS score
+                    FROM {table}
+                    WHERE {table} MATCH :query {scope}
+                )
+                {after}
+                ORDER BY score, rid
+                LIMIT :limit
+            """),
+            params
+        ).fetchall()
+        
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = _encode_cursor(rows[-1].score, rows[-1].rid, fingerprint)
+        return {row.rid: row.score for row in rows}, next_cursor
     
     def get_search_suggestions(self, prefix: str, limit: int = 10) -> List[str]:
         """Get search suggestions based on prefix"""
@@ -153,7 +252,7 @@ class TextSearch:
         """Search conversations within a date range"""
         
         with self.engine.connect() as conn:
-            sql_parts = ["SELECT * FROM conversations WHERE 1=1"]
+            sql_parts = [f"SELECT {select_list(Conversation.__table__)} FROM conversations WHERE 1=1"]
             params = {"limit": limit}
             
             if start_date:
@@ -167,8 +266,8 @@ class TextSearch:
             if query:
                 # Join with FTS table for text search
                 sql_parts = [
-                    "SELECT c.* FROM conversations c",
-                    "JOIN conversations_fts ON c.id = conversations_fts.id",
+                    f"SELECT {select_list(Conversation.__table__, 'c')} FROM conversations c",
+                    "JOIN conversations_fts ON conversations_fts.rowid = c.rowid",
                     "WHERE conversations_fts MATCH :query"
                 ]
                 params["query"] = query
@@ -201,7 +300,7 @@ class TextSearch:
                     SELECT 
                         id,
                         role,
-                        content,
+                        mcp_decompress(content) AS content,
                         created_at,
                         "index"
                     FROM messages
@@ -220,7 +319,7 @@ class TextSearch:
             
             # Get conversation details
             conv_result = conn.execute(
-                text("SELECT * FROM conversations WHERE id = :id"),
+                text(f"SELECT {select_list(Conversation.__table__)} FROM conversations WHERE id = :id"),
                 {"id": conversation_id}
             ).fetchone()
             
@@ -230,32 +329,33 @@ class TextSearch:
                 "target_index": message_index
             }
     
-    def rebuild_search_index(self):
-        """Rebuild the FTS index from scratch"""
+    def rebuild_search_index(
+        self,
+        batch_size: int = 1000,
+        restart: bool = False,
+        progress: Optional[Callable[[Dict], None]] = None,
+        cancel_event: Optional[threading.Event] = None
+    ) -> Dict:
+        """
+        Rebuild the FTS indexes into shadow tables, in committed chunks.
+
+        Searches keep using the current index until each new one is
+        swapped in. Setting ``cancel_event`` stops after the current
+        chunk; calling again resumes unless ``restart`` is set.
+        """
         logger.info("Rebuilding search index...")
         
-        with self.engine.connect() as conn:
-            # Clear existing FTS data
-            conn.execute(text("DELETE FROM conversations_fts"))
-            conn.execute(text("DELETE FROM messages_fts"))
-            
-            # Rebuild conversations index
-            conn.execute(text("""
-                INSERT INTO conversations_fts (id, title, content)
-                SELECT id, title, search_vector
-                FROM conversations
-            """))
-            
-            # Rebuild messages index
-            conn.execute(text("""
-                INSERT INTO messages_fts (id, conversation_id, content)
-                SELECT id, conversation_id, content
-                FROM messages
-            """))
-            
-            conn.commit()
-            
-        logger.info("Search index rebuilt successfully")
+        rebuilder = FTSRebuilder(
+            self.engine, batch_size=batch_size, progress=progress, cancel_event=cancel_event
+        )
+        result = rebuilder.rebuild(restart=restart)
+        
+        logger.info(f"Search index rebuild {result['status']}")
+        return result
+    
+    def rebuild_status(self) -> Dict:
+        """Progress of FTS rebuilds that are running or were interrupted"""
+        return FTSRebuilder(self.engine).status()
     
     def optimize_index(self):
         """Optimize the FTS index for better performance"""
@@ -0,0 +1,6 @@
+"""Incremental synchronization of Claude.ai data into the local database"""
+
+from .sync_engine import ConversationSyncEngine, SyncError
+from .hydrator import ConversationHydrator, HydrationJob
+
+__all__ = ['ConversationSyncEngine', 'SyncError', 'ConversationHydrator', 'HydrationJob']
@@ -0,0 +1,272 @@
+"""
+Bulk message hydration.
+
+The conversation listing only carries metadata. The hydrator fetches full
+``chat_conversations/{id}`` payloads concurrently through the request
+queue (and so the rate limiter) and writes their messages in batches.
+
+Progress lives in the database: a conversation is hydrated once its
+``hydrated_hash`` matches its ``content_hash``. Starting a job after an
+interruption (or after a listing sync picked up changes) fetches only
+what is still pending.
+"""
+
+from typing import Any, Dict, List, Optional
+from dataclasses import dataclass, field
+import asyncio
+import logging
+import time
+import uuid
+
+from ..models.store import ConversationStore
+from ..utils.request_queue import RequestPriority, RequestQueueManager
+from .sync_engine import SyncError
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class HydrationJob:
+    """Progress of one hydration run."""
+    org_id: str
+    total: int
+    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    status: str = 'running'
+    fetched: int = 0
+    written: int = 0
+    messages_written: int = 0
+    failed: int = 0
+    errors: List[Dict[str, str]] = field(default_factory=list)
+    error: Optional[str] = None
+    started_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+
+    def record_failure(self, conversation_id: str, error: str):
+        self.failed += 1
+        # Keep the most recent few for status reports
+        self.errors = (self.errors + [{'conversation_id': conversation_id, 'error': error}])[-10:]
+
+    def to_dict(self) -> Dict[str, Any]:
+        elapsed = (self.finished_at or time.time()) - self.started_at
+        done = self.written + self.failed
+        rate = self.written / elapsed if elapsed > 0 else 0.0
+        remaining = self.total - done
+        return {
+            'job_id': self.id,
+            'org_id': self.org_id,
+            'status': self.status,
+            'total': self.total,
+            'fetched': self.fetched,
+            'written': self.written,
+            'messages_written': self.messages_written,
+            'failed': self.failed,
+            'percent': round(100.0 * done / self.total, 1) if self.total else 100.0,
+            'conversations_per_second': round(rate, 2),
+            'eta_seconds': round(remaining / rate, 1) if rate and self.status == 'running' else None,
+            'elapsed_seconds': round(elapsed, 1),
+            'errors': self.errors,
+            'error': self.error
+        }
+
+
+class ConversationHydrator:
+    """Fetches full conversations through the request queue and stores their messages"""
+
+    def __init__(
+        self,
+        session,
+        store: ConversationStore,
+        queue_manager: RequestQueueManager,
+        batch_size: int = 50,
+        concurrency: int = 4,
+        queue_name: str = 'hydrate',
+        api_base: str = 'https://claude.ai/api',
+        flush_interval: float = 2.0
+    ):
+        """
+        Args:
+            session: RateLimitedSession used for API calls
+            store: Destination ConversationStore
+            queue_manager: Queue manager the fetches are scheduled on
+            batch_size: Conversations written per transaction
+            concurrency: Concurrent fetches on the hydration queue
+            queue_name: Name of the hydration queue
+            api_base: Base URL of the Claude.ai API
+            flush_interval: Seconds before a partial batch is written anyway
+        """
+        self.session = session
+        self.store = store
+        self.queue_manager = queue_manager
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.queue_name = queue_name
+        self.api_base = api_base.rstrip('/')
+        self.flush_interval = flush_interval
+
+        self._job: Optional[HydrationJob] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def fetch_conversation(self, org_id: str, headers: Dict[str, str], conversation_id: str) -> Dict:
+        """Fetch one conversation with its messages"""
+        url = f'{self.api_base}/organizations/{org_id}/chat_conversations/{conversation_id}'
+        response = await self.session.get(
+            url,
+            headers=headers,
+            params={'tree': 'True', 'rendering_mode': 'messages'},
+            # Stored state depends on it: only trust revalidated responses
+            cache_ttl=0,
+            timeout=60
+        )
+        if response.status_code != 200:
+            raise SyncError(
+                f"API returned status {response.status_code} for {conversation_id}",
+                status_code=response.status_code,
+                details=response.text
+            )
+        return response.json()
+
+    async def hydrate_one(self, org_id: str, headers: Dict[str, str], conversation_id: str) -> Optional[Dict]:
+        """Fetch and store a single conversation ahead of any background work"""
+        payload = await self.queue_manager.enqueue(
+            self.fetch_conversation, org_id, headers, conversation_id,
+            queue_name=self.queue_name,
+            priority=RequestPriority.CRITICAL
+        )
+        await self.store.save_hydrated_conversations([payload])
+        return await self.store.get_conversation(conversation_id)
+
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(
+        self,
+        org_id: str,
+        headers: Dict[str, str],
+        conversation_ids: Optional[List[str]] = None,
+        limit: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Start a background job for every conversation still pending"""
+        if self.is_running():
+            return await self.status()
+
+        pending = await self.store.get_hydration_candidates(conversation_ids, limit)
+        self._job = HydrationJob(org_id=org_id, total=len(pending))
+        # Make sure the queue exists with the hydration concurrency
+        self.queue_manager.get_queue(self.queue_name, max_concurrent=self.concurrency)
+        self._task = asyncio.create_task(self._run(self._job, headers, pending))
+        logger.info(f"Hydration job {self._job.id} started for {len(pending)} conversations")
+        return await self.status()
+
+    async def status(self) -> Dict[str, Any]:
+        """Progress of the current (or last) job and what is left overall"""
+        return {
+            'job': self._job.to_dict() if self._job else None,
+            'pending_in_database': await self.store.count_hydration_pending()
+        }
+
+    async def cancel(self) -> Dict[str, Any]:
+        """Stop the running job; fetched conversations are still written"""
+        if self.is_running():
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        return await self.status()
+
+    async def close(self):
+        await self.cancel()
+
+    async def _run(self, job: HydrationJob, headers: Dict[str, str], conversation_ids: List[str]):
+        results: asyncio.Queue = asyncio.Queue()
+        writer = asyncio.create_task(self._write_batches(job, results))
+        # Keep the queue fed without materializing a future per conversation
+        in_flight = asyncio.Semaphore(self.concurrency * 2)
+        fetches = set()
+
+        try:
+            for conversation_id in conversation_ids:
+                await in_flight.acquire()
+                if job.error:
+                    in_flight.release()
+                    break
+                task = asyncio.create_task(
+                    self._fetch_into(job, headers, conversation_id, results, in_flight)
+                )
+                fetches.add(task)
+                task.add_done_callback(fetches.discard)
+
+            if fetches:
+                await asyncio.gather(*fetches)
+            job.status = 'failed' if job.error else 'completed'
+        except asyncio.CancelledError:
+            for task in list(fetches):
+                task.cancel()
+            await asyncio.gather(*fetches, return_exceptions=True)
+            job.status = 'cancelled'
+        except Exception as e:
+            logger.error(f"Hydration job {job.id} failed: {e}")
+            job.error = str(e)
+            job.status = 'failed'
+        finally:
+            # Write whatever was fetched before stopping
+            await results.put(None)
+            await writer
+            job.finished_at = time.time()
+            logger.info(f"Hydration job {job.id} {job.status}: {job.written}/{job.total} written")
+
+    async def _fetch_into(
+        self,
+        job: HydrationJob,
+        headers: Dict[str, str],
+        conversation_id: str,
+        results: asyncio.Queue,
+        in_flight: asyncio.Semaphore
+    ):
+        try:
+            payload = await self.queue_manager.enqueue(
+                self.fetch_conversation, job.org_id, headers, conversation_id,
+                queue_name=self.queue_name,
+                priority=RequestPriority.LOW
+            )
+            job.fetched += 1
+            await results.put(payload)
+        except SyncError as e:
+            job.record_failure(conversation_id, str(e))
+            if e.status_code in (401, 403):
+                # No point fetching the rest with a rejected session
+                job.error = "Session key rejected by the API"
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            job.record_failure(conversation_id, str(e))
+        finally:
+            in_flight.release()
+
+    async def _write_batches(self, job: HydrationJob, results: asyncio.Queue):
+        batch: List[Dict] = []
+
+        async def flush():
+            nonlocal batch
+            if not batch:
+                return
+            pending, batch = batch, []
+            try:
+                job.messages_written += await self.store.save_hydrated_conversations(pending)
+                job.written += len(pending)
+            except Exception as e:
+                logger.error(f"Failed to write hydrated batch: {e}")
+                for payload in pending:
+                    job.record_failure(payload.get('uuid', 'unknown'), str(e))
+
+        while True:
+            try:
+                payload = await asyncio.wait_for(results.get(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                await flush()
+                continue
+
+            if payload is None:
+                break
+            batch.append(payload)
+            if len(batch) >= self.batch_size:
+                await flush()
+
+        await flush()
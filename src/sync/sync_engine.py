@@ -0,0 +1,153 @@
+"""
+Incremental delta sync of the conversation list.
+
+The chat_conversations listing is returned newest-updated first. Each
+organization keeps a watermark (the newest ``updated_at`` seen by the last
+sync); an incremental sync pages through the listing only until it
+reaches conversations older than the watermark. Conversations updated at
+the watermark itself are compared again, since another one may have been
+updated in the same instant after the last sync read the listing; the
+store skips writes for rows whose content hash hasn't changed.
+"""
+
+from typing import Any, Dict, List, Optional
+from datetime import datetime, timezone
+import logging
+import time
+
+from ..models.store import ConversationStore
+
+logger = logging.getLogger(__name__)
+
+
+class SyncError(Exception):
+    """The Claude.ai API returned an error during sync"""
+
+    def __init__(self, message: str, status_code: Optional[int] = None, details: str = ''):
+        super().__init__(message)
+        self.status_code = status_code
+        self.details = details
+
+
+def _parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """Parse an API timestamp as an aware UTC datetime"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+class ConversationSyncEngine:
+    """Delta sync of conversation metadata from the Claude.ai API"""
+
+    def __init__(
+        self,
+        session,
+        store: ConversationStore,
+        page_size: int = 100,
+        api_base: str = 'https://claude.ai/api'
+    ):
+        """
+        Args:
+            session: RateLimitedSession used for API calls
+            store: Destination ConversationStore
+            page_size: Conversations requested per listing page
+            api_base: Base URL of the Claude.ai API
+        """
+        self.session = session
+        self.store = store
+        self.page_size = page_size
+        self.api_base = api_base.rstrip('/')
+
+    async def _fetch_page(self, org_id: str, headers: Dict[str, str], offset: int) -> List[Dict]:
+        url = f'{self.api_base}/organizations/{org_id}/chat_conversations'
+        response = await self.session.get(
+            url,
+            headers=headers,
+            params={'limit': self.page_size, 'offset': offset},
+            # Stored state depends on it: only trust revalidated responses
+            cache_ttl=0,
+            timeout=30
+        )
+        if response.status_code != 200:
+            raise SyncError(
+                f"API returned status {response.status_code}",
+                status_code=response.status_code,
+                details=response.text
+            )
+        return response.json()
+
+    async def sync(self, org_id: str, headers: Dict[str, str], full: bool = False) -> Dict[str, Any]:
+        """
+        Sync an organization's conversation list into the store.
+
+        Args:
+            org_id: Organization ID
+            headers: Authenticated request headers
+            full: Ignore the watermark and compare every conversation
+
+        Returns:
+            Delta counts and the old and new watermark
+        """
+        started = time.monotonic()
+        state = await self.store.get_sync_state(org_id)
+        previous = state['watermark'] if state else None
+        watermark = None if full else _parse_timestamp(previous)
+
+        counts = {'pages': 0, 'fetched': 0, 'changed_since_watermark': 0,
+                  'inserted': 0, 'updated': 0, 'unchanged': 0}
+        newest, newest_raw = _parse_timestamp(previous), previous
+        seen = set()
+        offset = 0
+
+        while True:
+            page = await self._fetch_page(org_id, headers, offset)
+            counts['pages'] += 1
+
+            # Guard against an API that ignores limit/offset and repeats itself
+            page = [conv for conv in page if conv['uuid'] not in seen]
+            if not page:
+                break
+            seen.update(conv['uuid'] for conv in page)
+            counts['fetched'] += len(page)
+
+            candidates = []
+            reached_watermark = False
+            for conv in page:
+                updated = _parse_timestamp(conv.get('updated_at'))
+                if updated and (newest is None or updated > newest):
+                    newest, newest_raw = updated, conv.get('updated_at')
+                if watermark and updated and updated < watermark:
+                    reached_watermark = True
+                    continue
+                candidates.append(conv)
+
+            counts['changed_since_watermark'] += len(candidates)
+            written = await self.store.sync_conversations(candidates)
+            for key, value in written.items():
+                counts[key] += value
+
+            if reached_watermark or len(page) < self.page_size:
+                break
+            offset += self.page_size
+
+        result = {
+            'org_id': org_id,
+            'mode': 'incremental' if watermark else 'full',
+            **counts,
+            'watermark': {'previous': previous, 'current': newest_raw},
+            'duration_seconds': round(time.monotonic() - started, 3)
+        }
+        await self.store.save_sync_state(org_id, newest_raw, full=watermark is None, last_result=counts)
+
+        logger.info(
+            f"Synced org {org_id} ({result['mode']}): {counts['inserted']} new, "
+            f"{counts['updated']} updated, {counts['unchanged']} unchanged "
+            f"from {counts['fetched']} fetched in {counts['pages']} pages"
+        )
+        return result
@@ -0,0 +1,151 @@
+"""
+Managed executors for blocking and CPU-bound work.
+
+Tool handlers run on the asyncio event loop, so anything that blocks
+(sqlite FTS rebuilds, file exports, model inference) or burns CPU (PDF
+rendering, markdown regex passes) is dispatched here instead:
+
+- a thread pool for I/O-ish work and for libraries that release the GIL
+- a process pool for pure-Python CPU-heavy work
+
+Functions sent to the process pool must be picklable (module-level) and
+take picklable arguments.
+"""
+
+import asyncio
+import os
+import time
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Any, Callable, Dict, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ExecutorConfig:
+    """Configuration for the task executor."""
+    thread_workers: int = field(default_factory=lambda: min(8, (os.cpu_count() or 1) + 4))
+    process_workers: int = field(default_factory=lambda: min(4, os.cpu_count() or 1))
+    enable_process_pool: bool = True
+
+
+class _PoolStats:
+    """In-flight and completion counters for one pool."""
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self.in_flight = 0
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.busy_seconds = 0.0
+        self.started_at = time.monotonic()
+
+    def snapshot(self) -> Dict[str, Any]:
+        # Pools run tasks FIFO, so anything beyond the worker count is queued
+        active = min(self.in_flight, self.workers)
+        elapsed = max(time.monotonic() - self.started_at, 1e-9)
+        return {
+            "workers": self.workers,
+            "active": active,
+            "queue_depth": max(0, self.in_flight - self.workers),
+            "utilization": active / self.workers if self.workers else 0.0,
+            "average_utilization": min(1.0, self.busy_seconds / (elapsed * self.workers)),
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+        }
+
+
+class TaskExecutor:
+    """
+    Thread and process pools shared by all tool handlers.
+    """
+
+    def __init__(self, config: Optional[ExecutorConfig] = None):
+        self.config = config or ExecutorConfig()
+        self._thread_pool = ThreadPoolExecutor(
+            max_workers=self.config.thread_workers,
+            thread_name_prefix="mcp-worker"
+        )
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._stats = {
+            "thread": _PoolStats(self.config.thread_workers),
+            "process": _PoolStats(self.config.process_workers),
+        }
+
+    def _get_process_pool(self) -> Optional[ProcessPoolExecutor]:
+        """Create the process pool on first use; workers spawn on demand."""
+        if not self.config.enable_process_pool:
+            return None
+
+        if self._process_pool is None:
+            # spawn, not fork: the parent has live threads (sqlite, executors)
+            self._process_pool = ProcessPoolExecutor(
+                max_workers=self.config.process_workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._process_pool
+
+    async def _run(self, pool_name: str, pool, func: Callable, *args, **kwargs) -> Any:
+        stats = self._stats[pool_name]
+        stats.in_flight += 1
+        stats.submitted += 1
+        started = time.monotonic()
+
+        try:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(pool, partial(func, *args, **kwargs))
+            stats.completed += 1
+            return result
+        except Exception:
+            stats.failed += 1
+            raise
+        finally:
+            stats.in_flight -= 1
+            stats.busy_seconds += time.monotonic() - started
+
+    async def run_blocking(self, func: Callable, *args, **kwargs) -> Any:
+        """Run a blocking call on the thread pool."""
+        return await self._run("thread", self._thread_pool, func, *args, **kwargs)
+
+    async def run_cpu(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        Run a CPU-bound call on the process pool.
+
+        Falls back to the thread pool when the process pool is disabled or
+        has broken (e.g. a worker was killed).
+        """
+        pool = self._get_process_pool()
+        if pool is None:
+            return await self.run_blocking(func, *args, **kwargs)
+
+        try:
+            return await self._run("process", pool, func, *args, **kwargs)
+        except BrokenProcessPool:
+            logger.error("Process pool broke; recreating it and retrying on threads")
+            self._process_pool = None
+            pool.shutdown(wait=False, cancel_futures=True)
+            return await self.run_blocking(func, *args, **kwargs)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Queue depth and utilization for each pool."""
+        metrics = {"thread_pool": self._stats["thread"].snapshot()}
+        if self.config.enable_process_pool:
+            metrics["process_pool"] = {
+                **self._stats["process"].snapshot(),
+                "started": self._process_pool is not None,
+            }
+        return metrics
+
+    def shutdown(self, wait: bool = True):
+        """Shut down both pools, cancelling queued work."""
+        self._thread_pool.shutdown(wait=wait, cancel_futures=True)
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=wait, cancel_futures=True)
+            self._process_pool = None
@@ -0,0 +1,178 @@
+"""
+Native async HTTP transport for Claude.ai API calls.
+
+RateLimitedSession used to push every call through ``asyncio.to_thread``
+with a synchronous ``requests.Session``, so each in-flight request held
+a default-executor thread. AsyncHTTPTransport talks aiohttp directly on
+the event loop with a bounded, keep-alive connection pool and exposes a
+small requests-like response object so callers don't change.
+
+aiohttp speaks HTTP/1.1 only; connection reuse comes from keep-alive and
+the per-host pool limit.
+"""
+
+import json as jsonlib
+import os
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, Optional
+
+import aiohttp
+from multidict import CIMultiDictProxy
+
+
+@dataclass
+class HTTPClientConfig:
+    """Connection pool and timeout settings for the async transport."""
+    max_connections: int = field(default_factory=lambda: int(os.getenv('MCP_HTTP_MAX_CONNECTIONS', '20')))
+    max_connections_per_host: int = field(default_factory=lambda: int(os.getenv('MCP_HTTP_MAX_PER_HOST', '10')))
+    keepalive_timeout: float = field(default_factory=lambda: float(os.getenv('MCP_HTTP_KEEPALIVE', '30')))
+    connect_timeout: float = 10.0
+    default_timeout: float = 30.0
+    dns_cache_ttl: int = 300
+
+
+class HTTPError(Exception):
+    """Raised by HTTPResponse.raise_for_status for 4xx/5xx responses."""
+
+    def __init__(self, message: str, response: 'HTTPResponse'):
+        super().__init__(message)
+        self.response = response
+
+
+class HTTPResponse:
+    """Fully-read response with the parts of the requests API we use."""
+
+    def __init__(self, status_code: int, headers: CIMultiDictProxy, url: str, content: bytes,
+                 encoding: Optional[str] = None):
+        self.status_code = status_code
+        self.headers = headers
+        self.url = url
+        self.content = content
+        self.encoding = encoding or 'utf-8'
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code < 400
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding, errors='replace')
+
+    def json(self) -> Any:
+        return jsonlib.loads(self.content)
+
+    def raise_for_status(self) -> None:
+        if not self.ok:
+            raise HTTPError(f"{self.status_code} error for url: {self.url}", self)
+
+
+class StreamingResponse:
+    """Response whose body is read incrementally."""
+
+    def __init__(self, response: aiohttp.ClientResponse):
+        self._response = response
+        self.status_code = response.status
+        self.headers = response.headers
+        self.url = str(response.url)
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code < 400
+
+    async def iter_chunks(self, chunk_size: int = 64 * 1024) -> AsyncIterator[bytes]:
+        """Yield the body in chunks of at most ``chunk_size`` bytes."""
+        async for chunk in self._response.content.iter_chunked(chunk_size):
+            yield chunk
+
+    async def read(self) -> HTTPResponse:
+        """Read the rest of the body into a regular HTTPResponse."""
+        content = await self._response.read()
+        return HTTPResponse(self.status_code, self.headers, self.url, content,
+                            self._response.get_encoding())
+
+    def raise_for_status(self) -> None:
+        if not self.ok:
+            raise HTTPError(f"{self.status_code} error for url: {self.url}", self)
+
+
+class AsyncHTTPTransport:
+    """
+    aiohttp client session with a bounded connection pool.
+
+    The underlying ClientSession is created on first use so it binds to
+    the running event loop rather than whichever loop built the server.
+    """
+
+    def __init__(self, config: Optional[HTTPClientConfig] = None):
+        self.config = config or HTTPClientConfig()
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.config.max_connections,
+                limit_per_host=self.config.max_connections_per_host,
+                keepalive_timeout=self.config.keepalive_timeout,
+                ttl_dns_cache=self.config.dns_cache_ttl,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(
+                    total=self.config.default_timeout,
+                    connect=self.config.connect_timeout
+                ),
+            )
+        return self._session
+
+    @staticmethod
+    def _request_kwargs(kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """Translate requests-style keyword arguments to aiohttp ones."""
+        timeout = kwargs.pop('timeout', None)
+        if timeout is not None:
+            kwargs['timeout'] = aiohttp.ClientTimeout(total=timeout)
+        # requests' verify=False is aiohttp's ssl=False
+        if kwargs.pop('verify', True) is False:
+            kwargs['ssl'] = False
+        return kwargs
+
+    async def request(self, method: str, url: str, **kwargs) -> HTTPResponse:
+        """Send a request and read the whole body."""
+        session = self._get_session()
+        async with session.request(method, url, **self._request_kwargs(kwargs)) as response:
+            content = await response.read()
+            return HTTPResponse(response.status, response.headers, str(response.url), content,
+                                response.get_encoding() if content else None)
+
+    @asynccontextmanager
+    async def stream(self, method: str, url: str, **kwargs) -> AsyncIterator[StreamingResponse]:
+        """Send a request and yield a response whose body is read on demand."""
+        session = self._get_session()
+        async with session.request(method, url, **self._request_kwargs(kwargs)) as response:
+            yield StreamingResponse(response)
+
+    async def get(self, url: str, **kwargs) -> HTTPResponse:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> HTTPResponse:
+        return await self.request("POST", url, **kwargs)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Connection pool limits and current usage."""
+        metrics = {
+            "transport": "aiohttp",
+            "max_connections": self.config.max_connections,
+            "max_connections_per_host": self.config.max_connections_per_host,
+        }
+        if self._session is not None and not self._session.closed:
+            connector = self._session.connector
+            metrics["acquired_connections"] = len(getattr(connector, '_acquired', ()))
+            metrics["idle_connections"] = sum(
+                len(conns) for conns in getattr(connector, '_conns', {}).values()
+            )
+        return metrics
+
+    async def close(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
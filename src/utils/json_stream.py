@@ -0,0 +1,146 @@
+"""
+Incremental parsing of large JSON arrays.
+
+The conversation listing is one JSON array that can run to megabytes for
+large accounts. JSONArrayParser takes the body chunk by chunk and returns
+each array element as soon as it is complete (``json.JSONDecoder
+.raw_decode`` on a rolling text buffer), so callers can hand records to
+the database in batches without holding the raw body and the decoded
+list at once.
+
+The array may be the document itself or, with ``key``, a member of a
+top-level object (``chat_messages`` of a conversation payload); the
+object's other members are collected in ``fields``. Input is assumed to
+be well-formed JSON from the API: separators are skipped, not validated.
+"""
+
+import codecs
+import json
+from typing import Any, AsyncIterable, AsyncIterator, Dict, List, Optional
+
+_WHITESPACE = ' \t\n\r'
+_NUMBER_START = '-0123456789'
+
+
+class JSONArrayParser:
+    """Yields the elements of a JSON array from a body fed in chunks."""
+
+    def __init__(self, key: Optional[str] = None):
+        self.key = key
+        self.fields: Dict[str, Any] = {}
+        self.count = 0
+        self._decoder = json.JSONDecoder()
+        self._utf8 = codecs.getincrementaldecoder('utf-8')()
+        self._buffer = ''
+        self._pos = 0
+        self._state = 'start'
+        self._member: Optional[str] = None
+        # An unfinished value is re-parsed only once the buffer has doubled
+        # past it, keeping a huge element linear instead of quadratic
+        self._retry_at = 0
+
+    def feed(self, data: bytes) -> List[Any]:
+        """Add a chunk of the body; returns the elements it completed."""
+        self._append(self._utf8.decode(data))
+        if len(self._buffer) < self._retry_at:
+            return []
+        return self._parse(final=False)
+
+    def close(self) -> List[Any]:
+        """End of body; returns the remaining elements."""
+        self._append(self._utf8.decode(b'', final=True))
+        items = self._parse(final=True)
+        if self._state != 'done':
+            raise ValueError("JSON document ended before the array was closed")
+        return items
+
+    async def parse(self, chunks: AsyncIterable[bytes]) -> AsyncIterator[Any]:
+        """Elements of the array in ``chunks``, one at a time."""
+        async for chunk in chunks:
+            for item in self.feed(chunk):
+                yield item
+        for item in self.close():
+            yield item
+
+    def _append(self, text: str):
+        # Drop what has been consumed so the buffer only holds the unfinished tail
+        self._retry_at = max(0, self._retry_at - self._pos)
+        self._buffer = self._buffer[self._pos:] + text
+        self._pos = 0
+
+    def _decode(self, pos: int, final: bool):
+        """Value starting at ``pos`` and its end, or (None, None) if it is incomplete."""
+        buffer = self._buffer
+        try:
+            value, end = self._decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            if final:
+                raise
+            self._retry_at = pos + 2 * (len(buffer) - pos)
+            return None, None
+        if end == len(buffer) and not final and buffer[pos] in _NUMBER_START:
+            # The number may continue in the next chunk
+            return None, None
+        self._retry_at = 0
+        return value, end
+
+    def _parse(self, final: bool) -> List[Any]:
+        items = []
+        buffer = self._buffer
+        while True:
+            pos = self._pos
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            self._pos = pos
+            if pos >= len(buffer):
+                return items
+
+            char = buffer[pos]
+            state = self._state
+            if state == 'start':
+                expected = '{' if self.key else '['
+                if char != expected:
+                    raise ValueError(f"Expected '{expected}' at the start of the JSON document")
+                self._state = 'member' if self.key else 'item'
+                self._pos = pos + 1
+            elif state == 'member':
+                if char == '}':
+                    self._state = 'done'
+                    self._pos = pos + 1
+                elif char in ',:':
+                    self._pos = pos + 1
+                else:
+                    name, end = self._decode(pos, final)
+                    if end is None:
+                        return items
+                    self._member = name
+                    self._state = 'value'
+                    self._pos = end
+            elif state == 'value':
+                if char == ':':
+                    self._pos = pos + 1
+                elif char == '[' and self._member == self.key:
+                    self._state = 'item'
+                    self._pos = pos + 1
+                else:
+                    value, end = self._decode(pos, final)
+                    if end is None:
+                        return items
+                    self.fields[self._member] = value
+                    self._state = 'member'
+                    self._pos = end
+            elif state == 'item':
+                if char == ']':
+                    self._state = 'member' if self.key else 'done'
+                    self._pos = pos + 1
+                elif char == ',':
+                    self._pos = pos + 1
+                else:
+                    value, end = self._decode(pos, final)
+                    if end is None:
+                        return items
+                    items.append(value)
+                    self.count += 1
+                    self._pos = end
+            else:
+                raise ValueError("Extra data after the JSON document")
@@ -0,0 +1,104 @@
+"""
+Fixed-memory metrics for hot paths.
+
+SlidingWindowCounter counts events over a trailing window in per-second
+buckets, and LatencyHistogram records durations into log-spaced buckets
+for percentile estimates. Recording is O(1) and neither structure grows
+with traffic, so they are cheap enough to update on every request.
+"""
+
+import bisect
+import math
+import time
+from typing import Any, Dict, List, Optional
+
+
+class SlidingWindowCounter:
+    """Event count over the last ``window`` seconds, as a ring of buckets."""
+
+    __slots__ = ('window', 'resolution', '_counts', '_stamps')
+
+    def __init__(self, window: float = 60.0, resolution: float = 1.0):
+        self.window = window
+        self.resolution = resolution
+        size = max(1, math.ceil(window / resolution))
+        self._counts = [0] * size
+        # Slot number each bucket was last written in; stale buckets are reset
+        self._stamps = [-1] * size
+
+    def add(self, count: int = 1, now: Optional[float] = None):
+        slot = int((time.monotonic() if now is None else now) / self.resolution)
+        index = slot % len(self._counts)
+        if self._stamps[index] != slot:
+            self._stamps[index] = slot
+            self._counts[index] = 0
+        self._counts[index] += count
+
+    def total(self, now: Optional[float] = None) -> int:
+        slot = int((time.monotonic() if now is None else now) / self.resolution)
+        oldest = slot - len(self._counts)
+        return sum(
+            count for count, stamp in zip(self._counts, self._stamps)
+            if stamp > oldest
+        )
+
+
+def _log_bounds(low: float, high: float, factor: float) -> List[float]:
+    bounds = [low]
+    while bounds[-1] < high:
+        bounds.append(bounds[-1] * factor)
+    return bounds
+
+
+class LatencyHistogram:
+    """
+    Durations in log-spaced buckets (100 µs to ~10 min, 10% apart).
+
+    Percentiles are read off the bucket boundaries, so they are accurate
+    to within one bucket (about 10%).
+    """
+
+    BOUNDS = _log_bounds(0.0001, 600.0, 1.1)
+
+    __slots__ = ('_counts', 'count', 'sum', 'max')
+
+    def __init__(self):
+        # One extra bucket for values past the last bound
+        self._counts = [0] * (len(self.BOUNDS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float):
+        self._counts[bisect.bisect_left(self.BOUNDS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, pct: float) -> float:
+        """Upper bound of the bucket holding the ``pct``th percentile, in seconds."""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(pct / 100 * self.count))
+        seen = 0
+        for index, count in enumerate(self._counts):
+            seen += count
+            if seen >= rank:
+                if index >= len(self.BOUNDS):
+                    return self.max
+                return min(self.BOUNDS[index], self.max)
+        return self.max
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Count plus mean/p50/p95/p99/max in milliseconds."""
+        if not self.count:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "mean_ms": round(self.sum / self.count * 1000, 2),
+            "p50_ms": round(self.percentile(50) * 1000, 2),
+            "p95_ms": round(self.percentile(95) * 1000, 2),
+            "p99_ms": round(self.percentile(99) * 1000, 2),
+            "max_ms": round(self.max * 1000, 2),
+        }
@@ -0,0 +1,253 @@
+"""
+Shared state backends for the rate limiter.
+
+By default each RateLimiter keeps its GCRA state in memory, so every
+process (one MCP server per client, the extension bridge) gets its own
+budget. A shared backend stores each endpoint's theoretical arrival time
+(and Retry-After pause) where all local processes see it:
+
+- ``sqlite``: a small database file updated in ``BEGIN IMMEDIATE``
+  transactions, serialized across processes with a lock file
+- ``redis``: a Lua script per operation, timed by the Redis server clock
+
+Reservations are atomic in both, so processes draw from one budget.
+Times are wall-clock seconds because monotonic clocks aren't comparable
+across processes. Select one with ``RATE_LIMIT_BACKEND``.
+"""
+
+import asyncio
+import contextlib
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Tuple
+import logging
+
+try:
+    import fcntl
+except ImportError:  # Windows: rely on SQLite's busy timeout alone
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+def gcra_reserve(tat: Optional[float], now: float, tokens: int, rate: float) -> float:
+    """New theoretical arrival time after reserving ``tokens`` at ``rate``."""
+    return max(tat if tat is not None else now, now) + tokens / rate
+
+
+class RateLimitBackend:
+    """
+    Interface of a shared rate limit state store.
+
+    ``reserve`` returns ``(wait, backlog)``: seconds until the caller may
+    go, and how far the endpoint's arrival time is ahead of now.
+    """
+
+    name = "base"
+
+    async def reserve(self, key: str, tokens: int, rate: float, capacity: float) -> Tuple[float, float]:
+        raise NotImplementedError
+
+    async def release(self, key: str, tokens: int, rate: float) -> None:
+        raise NotImplementedError
+
+    async def pause(self, key: str, seconds: float, rate: float, capacity: float) -> None:
+        raise NotImplementedError
+
+    async def pause_remaining(self, key: str) -> float:
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        pass
+
+    @staticmethod
+    def _wait(backlog: float, rate: float, capacity: float) -> float:
+        return max(0.0, backlog - capacity / rate)
+
+
+class SQLiteRateLimitBackend(RateLimitBackend):
+    """GCRA state in a SQLite file shared by local processes."""
+
+    name = "sqlite"
+
+    def __init__(self, path: str, busy_timeout: float = 5.0):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # One connection per backend; calls run in worker threads one at a time
+        self._conn = sqlite3.connect(
+            str(self.path), timeout=busy_timeout, isolation_level=None, check_same_thread=False
+        )
+        self._lock = threading.Lock()
+        # SQLite's busy handler polls with growing sleeps; a blocking flock
+        # hands the lock straight to the next waiter instead
+        self._lock_file = open(f"{self.path}.lock", "a+") if fcntl else None
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS rate_limit_state ("
+                "key TEXT PRIMARY KEY, tat REAL NOT NULL, paused_until REAL NOT NULL DEFAULT 0)"
+            )
+
+    @contextlib.contextmanager
+    def _process_lock(self):
+        if self._lock_file is None:
+            yield
+            return
+        fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+
+    def _update(self, key: str, update) -> Tuple[float, float]:
+        """Run ``update(tat, paused_until, now)`` in a write transaction and store its result."""
+        with self._lock, self._process_lock():
+            conn = self._conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT tat, paused_until FROM rate_limit_state WHERE key = ?", (key,)
+                ).fetchone()
+                now = time.time()
+                tat, paused_until = update(row[0] if row else None, row[1] if row else 0.0, now)
+                conn.execute(
+                    "INSERT INTO rate_limit_state (key, tat, paused_until) VALUES (?, ?, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET tat = excluded.tat, paused_until = excluded.paused_until",
+                    (key, tat, paused_until)
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return tat - now, paused_until - now
+
+    async def reserve(self, key: str, tokens: int, rate: float, capacity: float) -> Tuple[float, float]:
+        backlog, _ = await asyncio.to_thread(
+            self._update, key,
+            lambda tat, paused_until, now: (gcra_reserve(tat, now, tokens, rate), paused_until)
+        )
+        return self._wait(backlog, rate, capacity), backlog
+
+    async def release(self, key: str, tokens: int, rate: float) -> None:
+        await asyncio.to_thread(
+            self._update, key,
+            lambda tat, paused_until, now: (max(now, (tat or now) - tokens / rate), paused_until)
+        )
+
+    async def pause(self, key: str, seconds: float, rate: float, capacity: float) -> None:
+        def update(tat, paused_until, now):
+            paused_until = max(paused_until, now + seconds)
+            # Resume at the normal spacing rather than with a full burst
+            return max(tat or now, paused_until + (capacity - 1) / rate), paused_until
+
+        await asyncio.to_thread(self._update, key, update)
+
+    def _pause_remaining(self, key: str) -> float:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT paused_until FROM rate_limit_state WHERE key = ?", (key,)
+            ).fetchone()
+        return (row[0] if row else 0.0) - time.time()
+
+    async def pause_remaining(self, key: str) -> float:
+        return await asyncio.to_thread(self._pause_remaining, key)
+
+    async def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+            if self._lock_file is not None:
+                self._lock_file.close()
+
+
+# Redis scripts: KEYS[1] is the endpoint hash, times come from the server clock
+_REDIS_NOW = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+"""
+
+_REDIS_RESERVE = _REDIS_NOW + """
+local tat = math.max(tonumber(redis.call('HGET', KEYS[1], 'tat') or now), now)
+tat = tat + tonumber(ARGV[1]) / tonumber(ARGV[2])
+redis.call('HSET', KEYS[1], 'tat', tostring(tat))
+redis.call('EXPIRE', KEYS[1], math.ceil(tat - now) + 3600)
+return tostring(tat - now)
+"""
+
+_REDIS_RELEASE = _REDIS_NOW + """
+local tat = tonumber(redis.call('HGET', KEYS[1], 'tat') or now)
+redis.call('HSET', KEYS[1], 'tat', tostring(math.max(now, tat - tonumber(ARGV[1]) / tonumber(ARGV[2]))))
+return 1
+"""
+
+_REDIS_PAUSE = _REDIS_NOW + """
+local paused_until = math.max(tonumber(redis.call('HGET', KEYS[1], 'paused_until') or 0), now + tonumber(ARGV[1]))
+local tat = tonumber(redis.call('HGET', KEYS[1], 'tat') or now)
+tat = math.max(tat, paused_until + (tonumber(ARGV[3]) - 1) / tonumber(ARGV[2]))
+redis.call('HSET', KEYS[1], 'tat', tostring(tat), 'paused_until', tostring(paused_until))
+redis.call('EXPIRE', KEYS[1], math.ceil(tat - now) + 3600)
+return 1
+"""
+
+_REDIS_PAUSE_REMAINING = _REDIS_NOW + """
+return tostring(tonumber(redis.call('HGET', KEYS[1], 'paused_until') or 0) - now)
+"""
+
+
+class RedisRateLimitBackend(RateLimitBackend):
+    """GCRA state in Redis, for processes on more than one machine."""
+
+    name = "redis"
+
+    def __init__(self, url: str, prefix: str = "mcp-claude-context:ratelimit:"):
+        try:
+            import redis.asyncio as redis
+        except ImportError:
+            raise ImportError("The redis rate limit backend requires the 'redis' package")
+
+        self.prefix = prefix
+        self._client = redis.from_url(url)
+        self._reserve = self._client.register_script(_REDIS_RESERVE)
+        self._release = self._client.register_script(_REDIS_RELEASE)
+        self._pause = self._client.register_script(_REDIS_PAUSE)
+        self._pause_remaining = self._client.register_script(_REDIS_PAUSE_REMAINING)
+
+    async def reserve(self, key: str, tokens: int, rate: float, capacity: float) -> Tuple[float, float]:
+        backlog = float(await self._reserve(keys=[self.prefix + key], args=[tokens, rate]))
+        return self._wait(backlog, rate, capacity), backlog
+
+    async def release(self, key: str, tokens: int, rate: float) -> None:
+        await self._release(keys=[self.prefix + key], args=[tokens, rate])
+
+    async def pause(self, key: str, seconds: float, rate: float, capacity: float) -> None:
+        await self._pause(keys=[self.prefix + key], args=[seconds, rate, capacity])
+
+    async def pause_remaining(self, key: str) -> float:
+        return float(await self._pause_remaining(keys=[self.prefix + key]))
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+def create_rate_limit_backend(name: Optional[str] = None) -> Optional[RateLimitBackend]:
+    """
+    Backend named by ``name`` or ``RATE_LIMIT_BACKEND``.
+
+    Returns None for ``memory`` (per-process state, the default).
+    """
+    name = (name or os.getenv('RATE_LIMIT_BACKEND', 'memory')).lower()
+    if name == 'memory':
+        return None
+    if name == 'sqlite':
+        data_dir = Path(os.getenv('MCP_DATA_DIR', Path.home() / '.mcp-claude-context'))
+        path = os.getenv('RATE_LIMIT_SQLITE_PATH', str(data_dir / 'rate_limits.db'))
+        logger.info(f"Rate limit state shared through SQLite at {path}")
+        return SQLiteRateLimitBackend(path)
+    if name == 'redis':
+        url = os.getenv('RATE_LIMIT_REDIS_URL', 'redis://localhost:6379/0')
+        logger.info(f"Rate limit state shared through Redis at {url}")
+        return RedisRateLimitBackend(url)
+    raise ValueError(f"Unknown rate limit backend: {name}")
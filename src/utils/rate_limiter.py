@@ -1,15 +1,46 @@
 """
 Rate limiting implementation for Claude.ai API requests.
 Implements token bucket algorithm with configurable limits.
+
+Buckets use GCRA (virtual scheduling): each bucket keeps a theoretical
+arrival time, and a caller reserves its slot in one step and then sleeps
+until it, without holding any lock. Waiters on one endpoint never block
+callers of another.
+
+With ``adaptive`` enabled each endpoint's rate follows AIMD: a 429 cuts
+it multiplicatively, sustained success while the bucket is the
+bottleneck raises it additively up to ``max_requests_per_second``. A
+Retry-After pauses the whole endpoint, not just the request that got it.
+
+Bucket state is per process unless a shared backend is configured (see
+``rate_limit_backends``); then every process reserves from one budget.
+
+RateLimitedSession retries transient failures under a retry budget and
+per-endpoint circuit breakers (see ``resilience``).
 """
 
 import asyncio
 import time
-from typing import Optional, Dict, Any
+from contextlib import asynccontextmanager
+from urllib.parse import urlsplit
+from typing import Optional, Dict, Any, AsyncIterator, Callable
 from dataclasses import dataclass, field
 from collections import defaultdict
 import logging
 
+from .http_client import HTTPError
+from .json_stream import JSONArrayParser
+from .metrics import LatencyHistogram, SlidingWindowCounter
+from .rate_limit_backends import RateLimitBackend
+from .resilience import (
+    RETRYABLE_STATUS_CODES,
+    CircuitBreaker,
+    Resilience,
+    is_transient_error,
+)
+from .response_cache import ResponseCache
+from .singleflight import COALESCIBLE_METHODS, SingleFlight, request_key
+
 logger = logging.getLogger(__name__)
 
 
@@ -21,45 +52,115 @@ class RateLimitConfig:
     retry_after_header_respect: bool = True
     backoff_base: float = 2.0
     max_retries: int = 5
+    # AIMD adaptation of requests_per_second from 429 feedback
+    adaptive: bool = False
+    min_requests_per_second: float = 0.5
+    max_requests_per_second: float = 20.0
+    decrease_factor: float = 0.5
+    increase_step: float = 0.5
+    increase_interval: float = 1.0
     
 
 @dataclass
 class TokenBucket:
-    """Token bucket implementation for rate limiting."""
+    """
+    Token bucket implemented as GCRA.
+    
+    ``tat`` (theoretical arrival time) is when the bucket would be full
+    again; a request fits if it doesn't push ``tat`` more than
+    ``capacity`` emission intervals past now.
+    """
     capacity: float
     refill_rate: float
-    tokens: float = field(init=False)
-    last_refill: float = field(init=False)
+    tat: float = field(default_factory=time.monotonic)
+    # Retry-After pause; bumping ``pauses`` tells sleeping waiters to re-reserve
+    paused_until: float = 0.0
+    pauses: int = 0
+    # AIMD state: last changes and successes at the current rate
+    last_increase: float = field(default_factory=time.monotonic)
+    last_decrease: float = 0.0
+    successes: int = 0
+    
+    @property
+    def emission_interval(self) -> float:
+        return 1.0 / self.refill_rate
     
-    def __post_init__(self):
-        self.tokens = self.capacity
-        self.last_refill = time.time()
+    @property
+    def tokens(self) -> float:
+        """Tokens available right now (0 while callers are queued)."""
+        backlog = max(0.0, self.tat - time.monotonic())
+        return max(0.0, self.capacity - backlog * self.refill_rate)
+    
+    def reserve(self, tokens: int = 1) -> float:
+        """
+        Reserve ``tokens`` and return how long to wait before using them.
+        
+        The reservation is made immediately; later callers queue behind it.
+        """
+        now = time.monotonic()
+        tat = max(self.tat, now) + tokens * self.emission_interval
+        self.tat = tat
+        return max(0.0, tat - self.capacity * self.emission_interval - now)
+    
+    def set_rate(self, refill_rate: float):
+        """
+        Change the rate for new reservations.
+        
+        Callers already asleep keep their slots. On a decrease the queued
+        backlog is stretched to the new spacing so the cut takes effect
+        at once; an increase isn't compressed into it, which would
+        bunch new requests up with the sleeping ones.
+        """
+        if refill_rate < self.refill_rate:
+            now = time.monotonic()
+            backlog = max(0.0, self.tat - now)
+            self.tat = now + backlog * self.refill_rate / refill_rate
+        self.refill_rate = refill_rate
+        self.successes = 0
+    
+    def pause(self, seconds: float):
+        """Hold every reservation until ``seconds`` from now."""
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+        self.pauses += 1
+        # Resume at the normal spacing rather than with a full burst
+        self.tat = max(self.tat, self.paused_until + (self.capacity - 1) * self.emission_interval)
+    
+    def release(self, tokens: int = 1):
+        """Give back a reservation that won't be used (e.g. cancelled waiter)."""
+        self.tat = max(time.monotonic(), self.tat - tokens * self.emission_interval)
     
     def consume(self, tokens: int = 1) -> tuple[bool, float]:
         """
-        Try to consume tokens from the bucket.
+        Try to consume tokens from the bucket without queueing.
         Returns (success, wait_time_if_failed).
         """
-        self._refill()
-        
-        if self.tokens >= tokens:
-            self.tokens -= tokens
-            return True, 0.0
-        
-        # Calculate wait time needed
-        tokens_needed = tokens - self.tokens
-        wait_time = tokens_needed / self.refill_rate
-        return False, wait_time
+        wait_time = self.reserve(tokens)
+        if wait_time > 0:
+            self.release(tokens)
+            return False, wait_time
+        return True, 0.0
+
+
+class EndpointMetrics:
+    """Request counters and wait/latency histograms for one endpoint."""
     
-    def _refill(self):
-        """Refill tokens based on elapsed time."""
-        now = time.time()
-        elapsed = now - self.last_refill
-        
-        # Add tokens based on refill rate
-        tokens_to_add = elapsed * self.refill_rate
-        self.tokens = min(self.capacity, self.tokens + tokens_to_add)
-        self.last_refill = now
+    __slots__ = ('total_requests', 'last_request', 'window', 'wait', 'latency')
+    
+    def __init__(self):
+        self.total_requests = 0
+        self.last_request: Optional[float] = None
+        self.window = SlidingWindowCounter(window=60.0)
+        self.wait = LatencyHistogram()
+        self.latency = LatencyHistogram()
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "total_requests": self.total_requests,
+            "last_request": self.last_request,
+            "requests_per_minute": self.window.total(),
+            "wait_time": self.wait.snapshot(),
+            "latency": self.latency.snapshot()
+        }
 
 
 class RateLimiter:
@@ -67,69 +168,161 @@ class RateLimiter:
     Rate limiter for API requests with per-endpoint limiting.
     """
     
-    def __init__(self, config: Optional[RateLimitConfig] = None):
+    def __init__(self, config: Optional[RateLimitConfig] = None, backend: Optional[RateLimitBackend] = None):
+        """
+        Args:
+            config: Rate limit settings
+            backend: Shared state backend; None keeps state in this process
+        """
         self.config = config or RateLimitConfig()
+        self.backend = backend
         self._buckets: Dict[str, TokenBucket] = defaultdict(
             lambda: TokenBucket(
                 capacity=self.config.burst_size,
                 refill_rate=self.config.requests_per_second
             )
         )
-        self._request_metrics: Dict[str, Dict[str, Any]] = defaultdict(dict)
-        self._lock = asyncio.Lock()
+        self._request_metrics: Dict[str, EndpointMetrics] = defaultdict(EndpointMetrics)
     
     async def acquire(self, endpoint: str = "default", tokens: int = 1) -> None:
         """
         Acquire permission to make a request. Blocks if rate limit exceeded.
         
+        The slot is reserved before sleeping, so concurrent callers get
+        consecutive slots and other endpoints are never held up.
+        
         Args:
             endpoint: The API endpoint or resource identifier
             tokens: Number of tokens to consume (default: 1)
         """
-        async with self._lock:
-            bucket = self._buckets[endpoint]
+        bucket = self._buckets[endpoint]
+        if self.backend is not None:
+            waited = await self._acquire_shared(endpoint, bucket, tokens)
+            self._update_metrics(endpoint, waited)
+            return
+        
+        waited = 0.0
+        while True:
+            pauses = bucket.pauses
+            wait_time = bucket.reserve(tokens)
+            if wait_time <= 0:
+                break
             
-            while True:
-                success, wait_time = bucket.consume(tokens)
-                
-                if success:
-                    # Track metrics
-                    self._update_metrics(endpoint, "acquired")
-                    logger.debug(f"Rate limit acquired for {endpoint}, tokens remaining: {bucket.tokens:.2f}")
-                    return
-                
-                # Wait before retrying
-                logger.info(f"Rate limit exceeded for {endpoint}, waiting {wait_time:.2f}s")
+            logger.info(f"Rate limit exceeded for {endpoint}, waiting {wait_time:.2f}s")
+            try:
                 await asyncio.sleep(wait_time)
-    
-    def _update_metrics(self, endpoint: str, event: str):
-        """Update request metrics for monitoring."""
-        now = time.time()
-        metrics = self._request_metrics[endpoint]
+            except asyncio.CancelledError:
+                bucket.release(tokens)
+                raise
+            waited += wait_time
+            
+            # A Retry-After that arrived while we slept voids the slot
+            if bucket.pauses == pauses or time.monotonic() >= bucket.paused_until:
+                break
         
-        if event == "acquired":
-            metrics["last_request"] = now
-            metrics["total_requests"] = metrics.get("total_requests", 0) + 1
+        # Track metrics
+        self._update_metrics(endpoint, waited)
+        logger.debug(f"Rate limit acquired for {endpoint}, tokens remaining: {bucket.tokens:.2f}")
+    
+    async def _acquire_shared(self, endpoint: str, bucket: TokenBucket, tokens: int) -> float:
+        """Reserve through the shared backend; returns the time waited."""
+        waited = 0.0
+        while True:
+            wait_time, backlog = await self.backend.reserve(endpoint, tokens, bucket.refill_rate, bucket.capacity)
+            # Mirror the shared backlog so bucket.tokens reflects every process
+            bucket.tat = time.monotonic() + backlog
+            if wait_time <= 0:
+                return waited
             
-            # Track request rate over last minute
-            minute_ago = now - 60
-            recent_requests = metrics.get("recent_requests", [])
-            recent_requests = [t for t in recent_requests if t > minute_ago]
-            recent_requests.append(now)
-            metrics["recent_requests"] = recent_requests
-            metrics["requests_per_minute"] = len(recent_requests)
+            logger.info(f"Rate limit exceeded for {endpoint}, waiting {wait_time:.2f}s")
+            try:
+                await asyncio.sleep(wait_time)
+            except asyncio.CancelledError:
+                await self.backend.release(endpoint, tokens, bucket.refill_rate)
+                raise
+            waited += wait_time
+            
+            # Another process may have hit a Retry-After while we slept
+            if await self.backend.pause_remaining(endpoint) <= 0.005:
+                return waited
+    
+    async def on_rate_limited(self, endpoint: str, retry_after: float):
+        """
+        Apply a 429 response to the endpoint.
+        
+        Pauses every caller of the endpoint (in every process, with a
+        shared backend) for ``retry_after`` seconds and, in adaptive mode,
+        cuts its rate.
+        """
+        config = self.config
+        bucket = self._buckets[endpoint]
+        bucket.pause(retry_after)
+        if self.backend is not None:
+            await self.backend.pause(endpoint, retry_after, bucket.refill_rate, bucket.capacity)
+        
+        if config.adaptive:
+            now = time.monotonic()
+            # Requests already in flight at the old rate 429 together; cut once per round
+            if now - bucket.last_decrease >= max(retry_after, config.increase_interval):
+                old_rate = bucket.refill_rate
+                bucket.set_rate(max(config.min_requests_per_second, old_rate * config.decrease_factor))
+                bucket.last_decrease = bucket.last_increase = now
+                logger.info(f"Rate for {endpoint} cut from {old_rate:.2f} to {bucket.refill_rate:.2f} req/s")
+    
+    def on_success(self, endpoint: str):
+        """
+        Additive increase once the endpoint has sustained its current rate.
+        
+        The rate goes up only after ``increase_interval`` worth of requests
+        succeeded at it, so it doesn't run ahead of traffic that can't use
+        it (or of waiters still sleeping on slots booked at the old rate).
+        """
+        config = self.config
+        if not config.adaptive:
+            return
+        bucket = self._buckets[endpoint]
+        bucket.successes += 1
+        now = time.monotonic()
+        if (now - bucket.last_increase >= config.increase_interval
+                and bucket.successes >= bucket.refill_rate * config.increase_interval
+                and bucket.refill_rate < config.max_requests_per_second):
+            bucket.set_rate(min(config.max_requests_per_second, bucket.refill_rate + config.increase_step))
+            bucket.last_increase = now
+            logger.debug(f"Rate for {endpoint} raised to {bucket.refill_rate:.2f} req/s")
+    
+    def get_rates(self) -> Dict[str, float]:
+        """Current requests/second per endpoint."""
+        return {endpoint: bucket.refill_rate for endpoint, bucket in self._buckets.items()}
+    
+    def _update_metrics(self, endpoint: str, wait_time: float):
+        """Count an acquired request and how long it waited for its slot."""
+        metrics = self._request_metrics[endpoint]
+        metrics.total_requests += 1
+        metrics.last_request = time.time()
+        metrics.window.add()
+        metrics.wait.record(wait_time)
+    
+    def record_latency(self, endpoint: str, seconds: float):
+        """Record the duration of a request made under this limiter."""
+        self._request_metrics[endpoint].latency.record(seconds)
     
     def get_metrics(self, endpoint: Optional[str] = None) -> Dict[str, Any]:
         """Get rate limiting metrics for monitoring."""
         if endpoint:
-            return dict(self._request_metrics.get(endpoint, {}))
+            metrics = self._request_metrics.get(endpoint)
+            return metrics.to_dict() if metrics else {}
         
         # Return all metrics
         return {
-            ep: dict(metrics) 
+            ep: metrics.to_dict()
             for ep, metrics in self._request_metrics.items()
         }
     
+    async def close(self):
+        """Close the shared backend, if any."""
+        if self.backend is not None:
+            await self.backend.close()
+    
     def reset(self, endpoint: Optional[str] = None):
         """Reset rate limiter state for endpoint(s)."""
         if endpoint:
@@ -145,72 +338,316 @@ class RateLimiter:
 
 class RateLimitedSession:
     """
-    Wrapper around requests.Session with built-in rate limiting.
+    Wrapper around an HTTP session with built-in rate limiting.
+    
+    ``session`` is either an async transport (``AsyncHTTPTransport``, whose
+    ``request`` is a coroutine) or a synchronous ``requests.Session``, which
+    is run in a worker thread.
     """
     
-    def __init__(self, session, rate_limiter: RateLimiter):
+    def __init__(
+        self,
+        session,
+        rate_limiter: RateLimiter,
+        resilience: Optional[Resilience] = None,
+        coalesce: bool = True,
+        cache: Optional[ResponseCache] = None,
+        on_response: Optional[Callable[[Optional[Dict[str, str]], int], None]] = None
+    ):
         self.session = session
         self.rate_limiter = rate_limiter
-        self._retry_count = defaultdict(int)
+        self.resilience = resilience or Resilience()
+        # Concurrent identical GETs share one request (see ``singleflight``)
+        self.singleflight = SingleFlight() if coalesce else None
+        # Optional on-disk cache for GET responses (see ``response_cache``)
+        self.cache = cache
+        # Called with (request headers, status code) for every response received
+        self.on_response = on_response
+        self._is_async = asyncio.iscoroutinefunction(getattr(session, 'request', None))
+    
+    async def _send(self, method: str, url: str, **kwargs) -> Any:
+        if self._is_async:
+            return await self.session.request(method, url, **kwargs)
+        return await asyncio.to_thread(self.session.request, method, url, **kwargs)
     
-    async def request(self, method: str, url: str, **kwargs) -> Any:
+    async def request(self, method: str, url: str, cache_ttl: Optional[float] = None, **kwargs) -> Any:
         """
-        Make a rate-limited request with automatic retry on 429.
+        Make a rate-limited request.
+        
+        Identical GET/HEAD requests made while one is in flight share its
+        response instead of being sent again. With a response cache, GETs
+        are served from it while fresh and revalidated after that;
+        ``cache_ttl`` overrides the endpoint's TTL (0 always revalidates).
+        """
+        key = self._request_key(method, url, kwargs)
+        if key is None:
+            return await self._request(method, url, **kwargs)
+        
+        async def fetch():
+            if self.cache is None or method.upper() != 'GET':
+                return await self._request(method, url, **kwargs)
+            return await self.cache.fetch(
+                key, self._extract_endpoint(url),
+                lambda headers: self._request(method, url, **{**kwargs, 'headers': headers}),
+                headers=kwargs.get('headers'), ttl=cache_ttl
+            )
+        
+        if self.singleflight is None:
+            return await fetch()
+        return await self.singleflight.do(key, fetch)
+    
+    def _request_key(self, method: str, url: str, kwargs: Dict[str, Any]) -> Optional[tuple]:
+        """Coalescing and cache key, or None for requests that must not be shared."""
+        if self.singleflight is None and self.cache is None:
+            return None
+        if method.upper() not in COALESCIBLE_METHODS:
+            return None
+        if any(kwargs.get(name) is not None for name in ('data', 'json', 'files')):
+            return None
+        return request_key(method, url, kwargs.get('params'), kwargs.get('headers'), kwargs.get('cookies'))
+    
+    async def _request(self, method: str, url: str, **kwargs) -> Any:
+        """
+        Send one request with retries.
+        
+        429s are retried after the endpoint's Retry-After pause. Timeouts,
+        connection errors and 5xx responses are retried with full-jitter
+        backoff while the retry budget allows; once retries run out the
+        last 5xx response is returned (or the error re-raised). Raises
+        CircuitOpenError without sending while the endpoint's circuit is open.
         """
         endpoint = self._extract_endpoint(url)
-        retries = 0
+        self.resilience.budget.record_request()
+        rate_limited = 0
+        failures = 0
         
-        while retries <= self.rate_limiter.config.max_retries:
-            # Acquire rate limit token
-            await self.rate_limiter.acquire(endpoint)
-            
+        while True:
+            breaker = self.resilience.check(endpoint)
             try:
-                # Make the actual request
-                response = await asyncio.to_thread(
-                    self.session.request, method, url, **kwargs
-                )
+                # Acquire rate limit token
+                await self.rate_limiter.acquire(endpoint)
+                start = time.perf_counter()
+                response = await self._send(method, url, **kwargs)
+            except Exception as e:
+                delay = self._on_error(breaker, endpoint, e, failures)
+                if delay is None:
+                    raise
+                failures += 1
+                await asyncio.sleep(delay)
+                continue
+            except BaseException:
+                breaker.release()
+                raise
+            
+            self.rate_limiter.record_latency(endpoint, time.perf_counter() - start)
+            self._record_outcome(breaker, endpoint, response.status_code, kwargs.get('headers'))
+            
+            # Check for rate limit response
+            if response.status_code == 429:
+                if rate_limited >= self.rate_limiter.config.max_retries:
+                    logger.error(f"Max retries exceeded for {endpoint}")
+                    response.raise_for_status()
+                    return response
                 
-                # Check for rate limit response
-                if response.status_code == 429:
-                    retry_after = self._get_retry_after(response)
-                    logger.warning(f"Rate limit hit for {endpoint}, retry after {retry_after}s")
+                retry_after = self._get_retry_after(response)
+                logger.warning(f"Rate limit hit for {endpoint}, retry after {retry_after}s")
+                # Pauses the whole endpoint; acquire() waits it out
+                await self.rate_limiter.on_rate_limited(endpoint, retry_after)
+                wait_time = self._backoff(retry_after, rate_limited)
+                logger.info(f"Retrying request to {endpoint} after {wait_time}s (attempt {rate_limited + 1})")
+                await asyncio.sleep(wait_time)
+                rate_limited += 1
+                continue
+            
+            if response.status_code in RETRYABLE_STATUS_CODES:
+                delay = self.resilience.retry_delay(breaker, failures)
+                if delay is not None:
+                    logger.warning(f"{endpoint} returned {response.status_code}, retrying in {delay:.2f}s")
+                    failures += 1
+                    await asyncio.sleep(delay)
+                    continue
+            
+            return response
+    
+    @property
+    def can_stream(self) -> bool:
+        """Whether the transport can read bodies incrementally."""
+        return hasattr(self.session, 'stream')
+    
+    @asynccontextmanager
+    async def stream(self, method: str, url: str, cache_ttl: Optional[float] = None, **kwargs) -> AsyncIterator[Any]:
+        """
+        Rate-limited request whose body is read incrementally.
+        
+        Requires an async transport with a ``stream`` method. Failures
+        before the response is handed over are retried like ``request``;
+        the body of the final response is left for the caller to read, and
+        errors while reading it are not retried. GETs go through the
+        response cache like ``request``.
+        """
+        if not self.can_stream:
+            raise TypeError("Streaming requires an async HTTP transport")
+        
+        key = self._request_key(method, url, kwargs) if method.upper() == 'GET' else None
+        if self.cache is None or key is None:
+            async with self._stream(method, url, **kwargs) as response:
+                yield response
+            return
+        
+        async with self.cache.stream(
+            key, self._extract_endpoint(url),
+            lambda headers: self._stream(method, url, **{**kwargs, 'headers': headers}),
+            headers=kwargs.get('headers'), ttl=cache_ttl
+        ) as response:
+            yield response
+    
+    async def iter_json_array(self, url: str, key: Optional[str] = None, **kwargs) -> AsyncIterator[Any]:
+        """
+        Elements of the JSON array returned by a GET, parsed as the body arrives.
+        
+        ``key`` selects an array member of a top-level object instead. Raises
+        HTTPError for non-200 responses. A transport that can't stream
+        falls back to a buffered request.
+        """
+        if not self.can_stream:
+            response = await self.request("GET", url, **kwargs)
+            if response.status_code != 200:
+                raise HTTPError(f"API returned status {response.status_code}", response)
+            data = response.json()
+            for item in ((data.get(key) or []) if key else data):
+                yield item
+            return
+        
+        async with self.stream("GET", url, **kwargs) as response:
+            if response.status_code != 200:
+                body = await response.read()
+                raise HTTPError(f"API returned status {response.status_code}", body)
+            async for item in JSONArrayParser(key).parse(response.iter_chunks()):
+                yield item
+    
+    @asynccontextmanager
+    async def _stream(self, method: str, url: str, **kwargs) -> AsyncIterator[Any]:
+        endpoint = self._extract_endpoint(url)
+        self.resilience.budget.record_request()
+        rate_limited = 0
+        failures = 0
+        yielded = False
+        
+        while True:
+            breaker = self.resilience.check(endpoint)
+            delay = None
+            try:
+                await self.rate_limiter.acquire(endpoint)
+                start = time.perf_counter()
+                async with self.session.stream(method, url, **kwargs) as response:
+                    # Time to response headers; the body is read by the caller
+                    self.rate_limiter.record_latency(endpoint, time.perf_counter() - start)
+                    self._record_outcome(breaker, endpoint, response.status_code, kwargs.get('headers'))
+                    if response.status_code == 429 and rate_limited < self.rate_limiter.config.max_retries:
+                        retry_after = self._get_retry_after(response)
+                        await self.rate_limiter.on_rate_limited(endpoint, retry_after)
+                        delay = self._backoff(retry_after, rate_limited)
+                        rate_limited += 1
+                    elif response.status_code in RETRYABLE_STATUS_CODES:
+                        delay = self.resilience.retry_delay(breaker, failures)
+                        if delay is not None:
+                            failures += 1
                     
-                    if retries < self.rate_limiter.config.max_retries:
-                        # Exponential backoff
-                        backoff = self.rate_limiter.config.backoff_base ** retries
-                        wait_time = max(retry_after, backoff)
-                        
-                        logger.info(f"Retrying request to {endpoint} after {wait_time}s (attempt {retries + 1})")
-                        await asyncio.sleep(wait_time)
-                        retries += 1
-                        continue
-                    else:
-                        logger.error(f"Max retries exceeded for {endpoint}")
-                        response.raise_for_status()
-                
-                # Reset retry count on success
-                self._retry_count[endpoint] = 0
-                return response
-                
+                    if delay is None:
+                        yielded = True
+                        yield response
+                        return
+                    logger.info(f"Retrying stream to {endpoint} after {delay:.2f}s ({response.status_code})")
             except Exception as e:
-                logger.error(f"Request failed for {endpoint}: {e}")
+                if yielded:
+                    raise
+                delay = self._on_error(breaker, endpoint, e, failures)
+                if delay is None:
+                    raise
+                failures += 1
+            except BaseException:
+                if not yielded:
+                    breaker.release()
                 raise
+            
+            await asyncio.sleep(delay)
+    
+    def _record_outcome(
+        self,
+        breaker: CircuitBreaker,
+        endpoint: str,
+        status_code: int,
+        headers: Optional[Dict[str, str]] = None
+    ) -> None:
+        """Feed a response status to the circuit breaker, the rate limiter and ``on_response``."""
+        if self.on_response is not None:
+            self.on_response(headers, status_code)
+        if status_code == 429:
+            # Throttling is the rate limiter's business, not a failure
+            breaker.release()
+        elif status_code >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+            self.rate_limiter.on_success(endpoint)
+    
+    def _on_error(self, breaker: CircuitBreaker, endpoint: str, error: Exception, attempt: int) -> Optional[float]:
+        """Record a request that raised; returns the backoff if it should be retried."""
+        if not is_transient_error(error):
+            breaker.release()
+            logger.error(f"Request failed for {endpoint}: {error}")
+            return None
         
-        raise Exception(f"Max retries exceeded for {endpoint}")
+        breaker.record_failure()
+        delay = self.resilience.retry_delay(breaker, attempt)
+        if delay is None:
+            logger.error(f"Request failed for {endpoint}: {error!r}")
+        else:
+            logger.warning(f"Transient error for {endpoint} ({error!r}), retrying in {delay:.2f}s")
+        return delay
+    
+    async def close(self) -> None:
+        """Close the underlying session's connections (and the response cache)."""
+        if self.cache is not None:
+            await self.cache.close()
+        close = getattr(self.session, 'close', None)
+        if close is None:
+            return
+        if asyncio.iscoroutinefunction(close):
+            await close()
+        else:
+            close()
+    
+    def get_transport_metrics(self) -> Dict[str, Any]:
+        """Connection pool metrics, if the transport reports them."""
+        if hasattr(self.session, 'get_metrics'):
+            return self.session.get_metrics()
+        return {"transport": type(self.session).__name__}
     
     def _extract_endpoint(self, url: str) -> str:
         """Extract endpoint identifier from URL."""
-        # Simple extraction - can be enhanced based on URL patterns
-        if "conversations" in url:
-            if url.endswith("/conversations"):
-                return "list_conversations"
-            elif "/conversations/" in url:
-                return "get_conversation"
-        elif "search" in url:
+        # Match on the path so query strings and the chat_ prefix don't matter
+        path = urlsplit(url).path.rstrip("/")
+        if path.endswith("conversations"):
+            return "list_conversations"
+        if "conversations/" in path:
+            return "get_conversation"
+        if "search" in path:
             return "search"
         
         return "default"
     
+    def _backoff(self, retry_after: float, attempt: int) -> float:
+        """
+        Extra per-request wait before retrying a 429.
+        
+        In adaptive mode the endpoint pause and rate cut already space the
+        retry out; otherwise back off exponentially as before.
+        """
+        if self.rate_limiter.config.adaptive:
+            return 0.0
+        return max(retry_after, self.rate_limiter.config.backoff_base ** attempt)
+    
     def _get_retry_after(self, response) -> float:
         """Extract retry-after value from response headers."""
         if self.rate_limiter.config.retry_after_header_respect:
@@ -1,8 +1,20 @@
 """
 Priority queue system for managing API requests with different priority levels.
+
+The worker sleeps on a condition variable and is woken the moment a
+request is enqueued or an active request finishes, so dispatch never
+waits on a polling interval.
+
+Queues can be bounded (``max_size``, rejecting or blocking new work when
+full), requests can carry a deadline after which they are dropped if
+still queued, and with ``aging_interval`` a waiting request climbs one
+priority level per interval so LOW work can't starve forever. Aging stops
+at HIGH: CRITICAL requests always run first, however long the rest have
+waited.
 """
 
 import asyncio
+import itertools
 import time
 from typing import Optional, Any, Callable, Dict
 from dataclasses import dataclass, field
@@ -22,7 +34,11 @@ class RequestPriority(Enum):
     LOW = 4       # Background sync, non-urgent tasks
     
 
-@dataclass
+# Tie-breaker so requests of equal priority run in submission order
+_sequence = itertools.count()
+
+
+@dataclass(slots=True, eq=False)
 class QueuedRequest:
     """Represents a queued request with priority."""
     id: str = field(default_factory=lambda: str(uuid.uuid4()))
@@ -31,13 +47,29 @@ class QueuedRequest:
     callback: Optional[Callable] = None
     args: tuple = field(default_factory=tuple)
     kwargs: dict = field(default_factory=dict)
-    result_future: asyncio.Future = field(default_factory=asyncio.Future)
+    result_future: asyncio.Future = field(default_factory=lambda: asyncio.get_running_loop().create_future())
+    sequence: int = field(default_factory=lambda: next(_sequence))
+    deadline: Optional[float] = None
+    # Heap key, set by the queue: (priority, sequence) or, with aging,
+    # (is not CRITICAL, monotonic time at which the request counts as HIGH,
+    # sequence)
+    sort_key: tuple = ()
     
     def __lt__(self, other):
-        """Compare by priority, then by creation time."""
-        if self.priority.value == other.priority.value:
-            return self.created_at < other.created_at
-        return self.priority.value < other.priority.value
+        """Compare by queue order (priority, then submission order)."""
+        return self.sort_key < other.sort_key
+
+
+class QueueFullError(Exception):
+    """Raised by a bounded queue in ``reject`` mode when it is full."""
+
+
+class RequestExpiredError(Exception):
+    """Raised when a request's deadline passes before it is dispatched."""
+
+
+class QueueClosedError(Exception):
+    """Raised for requests made to, or left in, a queue that is shutting down."""
 
 
 class RequestQueue:
@@ -46,11 +78,35 @@ class RequestQueue:
     Ensures high-priority requests are processed first.
     """
     
-    def __init__(self, max_concurrent: int = 3):
+    def __init__(
+        self,
+        max_concurrent: int = 3,
+        max_size: Optional[int] = None,
+        overflow: str = "block",
+        aging_interval: Optional[float] = None
+    ):
+        """
+        Args:
+            max_concurrent: Requests running at once
+            max_size: Most requests waiting in the queue (None for no limit)
+            overflow: When full, ``block`` the caller until there is room
+                or ``reject`` with QueueFullError
+            aging_interval: Seconds of waiting that raise a request one
+                priority level (None disables aging)
+        """
+        if overflow not in ("block", "reject"):
+            raise ValueError(f"overflow must be 'block' or 'reject', not {overflow!r}")
         self.max_concurrent = max_concurrent
+        self.max_size = max_size
+        self.overflow = overflow
+        self.aging_interval = aging_interval
         self._queue: list[QueuedRequest] = []
         self._active_requests: Dict[str, QueuedRequest] = {}
         self._lock = asyncio.Lock()
+        # Signalled when work is queued, a slot frees up or on shutdown
+        self._condition = asyncio.Condition(self._lock)
+        # Signalled when a bounded queue has room again
+        self._not_full = asyncio.Condition(self._lock)
         self._worker_task: Optional[asyncio.Task] = None
         self._shutdown = False
         self._metrics = {
@@ -58,6 +114,9 @@ class RequestQueue:
             "processed": 0,
             "failed": 0,
             "active": 0,
+            "rejected": 0,
+            "expired": 0,
+            "abandoned": 0,
             "by_priority": {p.name: 0 for p in RequestPriority}
         }
     
@@ -69,9 +128,18 @@ class RequestQueue:
     
     async def stop(self):
         """Stop the queue worker gracefully."""
-        self._shutdown = True
+        async with self._condition:
+            self._shutdown = True
+            self._condition.notify_all()
+            self._not_full.notify_all()
         if self._worker_task:
             await self._worker_task
+        async with self._condition:
+            # Never dispatched; don't leave their callers waiting
+            for request in self._queue:
+                if not request.result_future.done():
+                    request.result_future.set_exception(QueueClosedError("Request queue stopped"))
+            self._queue.clear()
         logger.info("Request queue worker stopped")
     
     async def enqueue(
@@ -79,6 +147,7 @@ class RequestQueue:
         callback: Callable,
         *args,
         priority: RequestPriority = RequestPriority.NORMAL,
+        expires_in: Optional[float] = None,
         **kwargs
     ) -> Any:
         """
@@ -87,10 +156,17 @@ class RequestQueue:
         Args:
             callback: The async function to call
             priority: Request priority level
+            expires_in: Seconds the request may wait in the queue; if it
+                hasn't started by then it is dropped with RequestExpiredError
             *args, **kwargs: Arguments for the callback
             
         Returns:
             The result of the callback execution
+            
+        Raises:
+            QueueFullError: The queue is full and ``overflow`` is ``reject``
+            RequestExpiredError: ``expires_in`` passed before dispatch
+            QueueClosedError: The queue is stopping or stopped
         """
         request = QueuedRequest(
             priority=priority,
@@ -98,37 +174,90 @@ class RequestQueue:
             args=args,
             kwargs=kwargs
         )
+        now = time.monotonic()
+        if expires_in is not None:
+            request.deadline = now + expires_in
+        if not self.aging_interval:
+            request.sort_key = (priority.value, request.sequence)
+        elif priority is RequestPriority.CRITICAL:
+            request.sort_key = (0, now, request.sequence)
+        else:
+            request.sort_key = (1, now + (priority.value - 2) * self.aging_interval, request.sequence)
         
-        async with self._lock:
+        async with self._condition:
+            if self._shutdown:
+                raise QueueClosedError("Request queue is stopped")
+            if self.max_size is not None and len(self._queue) >= self.max_size:
+                if self.overflow == "reject":
+                    self._metrics["rejected"] += 1
+                    raise QueueFullError(f"Request queue is full ({self.max_size} waiting)")
+                await self._wait_for_room(request)
+                if self._shutdown:
+                    raise QueueClosedError("Request queue stopped while waiting for space")
             heapq.heappush(self._queue, request)
             self._metrics["queued"] += 1
             self._metrics["by_priority"][priority.name] += 1
+            self._condition.notify()
             
         logger.debug(f"Request {request.id} queued with priority {priority.name}")
         
         # Wait for the result
         try:
-            return await request.result_future
+            if request.deadline is None:
+                return await request.result_future
+            try:
+                return await asyncio.wait_for(
+                    asyncio.shield(request.result_future), request.deadline - time.monotonic()
+                )
+            except asyncio.TimeoutError:
+                if await self._discard(request, "expired"):
+                    raise RequestExpiredError(f"Request {request.id} expired after {expires_in}s in queue")
+                # Dispatched just before the deadline; let it finish
+                return await request.result_future
+        except asyncio.CancelledError:
+            await self._discard(request, "abandoned")
+            raise
+        except RequestExpiredError:
+            raise
         except Exception as e:
             logger.error(f"Request {request.id} failed: {e}")
             raise
     
+    async def _wait_for_room(self, request: QueuedRequest):
+        """Block (holding the lock on return) until the queue has room or the deadline passes."""
+        timeout = None if request.deadline is None else request.deadline - time.monotonic()
+        try:
+            await asyncio.wait_for(
+                self._not_full.wait_for(lambda: len(self._queue) < self.max_size or self._shutdown),
+                timeout
+            )
+        except asyncio.TimeoutError:
+            self._metrics["expired"] += 1
+            raise RequestExpiredError(f"Request {request.id} expired waiting for queue space")
+    
+    async def _discard(self, request: QueuedRequest, reason: str) -> bool:
+        """Remove a request that is still queued; False if it was already dispatched."""
+        async with self._condition:
+            if request.id in self._active_requests or request not in self._queue:
+                return False
+            self._queue.remove(request)
+            heapq.heapify(self._queue)
+            self._metrics[reason] += 1
+            self._not_full.notify()
+        request.result_future.cancel()
+        logger.debug(f"Request {request.id} {reason} before dispatch")
+        return True
+    
     async def _worker(self):
         """Worker coroutine that processes requests from the queue."""
         logger.info("Request queue worker starting")
         
-        while not self._shutdown:
+        while True:
             try:
-                # Check if we can process more requests
-                if len(self._active_requests) >= self.max_concurrent:
-                    await asyncio.sleep(0.1)
-                    continue
-                
-                # Get next request from queue
+                # Sleep until there is work and a free slot (or we're stopping)
                 request = await self._get_next_request()
                 if request is None:
-                    await asyncio.sleep(0.1)
-                    continue
+                    break
                 
                 # Process the request
                 asyncio.create_task(self._process_request(request))
@@ -138,25 +267,43 @@ class RequestQueue:
                 await asyncio.sleep(1)
         
         # Wait for active requests to complete
-        while self._active_requests:
-            logger.info(f"Waiting for {len(self._active_requests)} active requests to complete")
-            await asyncio.sleep(1)
+        async with self._condition:
+            if self._active_requests:
+                logger.info(f"Waiting for {len(self._active_requests)} active requests to complete")
+            await self._condition.wait_for(lambda: not self._active_requests)
         
         logger.info("Request queue worker stopped")
     
+    def _can_dispatch(self) -> bool:
+        return bool(self._queue) and len(self._active_requests) < self.max_concurrent
+    
     async def _get_next_request(self) -> Optional[QueuedRequest]:
-        """Get the next request from the priority queue."""
-        async with self._lock:
-            if not self._queue:
-                return None
+        """Wait for and pop the next request; None once the queue is shutting down."""
+        async with self._condition:
+            while True:
+                await self._condition.wait_for(lambda: self._shutdown or self._can_dispatch())
+                if self._shutdown:
+                    return None
+                
+                request = heapq.heappop(self._queue)
+                self._not_full.notify()
+                if request.result_future.done():
+                    continue
+                if request.deadline is not None and request.deadline <= time.monotonic():
+                    # Expired before its caller's timer ran; drop it here
+                    self._metrics["expired"] += 1
+                    request.result_future.set_exception(
+                        RequestExpiredError(f"Request {request.id} expired in queue")
+                    )
+                    continue
+                break
             
-            request = heapq.heappop(self._queue)
             self._active_requests[request.id] = request
             self._metrics["active"] = len(self._active_requests)
             
             # Log queue status
             wait_time = time.time() - request.created_at
-            logger.info(
+            logger.debug(
                 f"Processing request {request.id} "
                 f"(priority: {request.priority.name}, "
                 f"waited: {wait_time:.2f}s, "
@@ -167,12 +314,18 @@ class RequestQueue:
     
     async def _process_request(self, request: QueuedRequest):
         """Process a single request."""
+        if request.result_future.done():
+            # The caller stopped waiting (cancelled) while it was queued
+            await self._release(request)
+            return
+        
         try:
             # Execute the callback
             result = await request.callback(*request.args, **request.kwargs)
             
             # Set the result
-            request.result_future.set_result(result)
+            if not request.result_future.done():
+                request.result_future.set_result(result)
             
             # Update metrics
             async with self._lock:
@@ -182,7 +335,8 @@ class RequestQueue:
             
         except Exception as e:
             # Set the exception
-            request.result_future.set_exception(e)
+            if not request.result_future.done():
+                request.result_future.set_exception(e)
             
             # Update metrics
             async with self._lock:
@@ -192,14 +346,22 @@ class RequestQueue:
             
         finally:
             # Remove from active requests
-            async with self._lock:
-                self._active_requests.pop(request.id, None)
-                self._metrics["active"] = len(self._active_requests)
+            await self._release(request)
+    
+    async def _release(self, request: QueuedRequest):
+        """Free the request's slot and wake the worker."""
+        async with self._condition:
+            self._active_requests.pop(request.id, None)
+            self._metrics["active"] = len(self._active_requests)
+            self._condition.notify_all()
     
     def get_metrics(self) -> Dict[str, Any]:
         """Get queue metrics for monitoring."""
         return {
             **self._metrics,
+            "max_size": self.max_size,
+            "overflow": self.overflow,
+            "aging_interval": self.aging_interval,
             "queue_size": len(self._queue),
             "active_count": len(self._active_requests),
             "oldest_waiting": self._get_oldest_waiting_time()
@@ -226,6 +388,7 @@ class RequestQueue:
                 for request in self._queue:
                     request.result_future.cancel()
                 self._queue.clear()
+                self._not_full.notify_all()
                 logger.info("Cleared all requests from queue")
             else:
                 # Clear specific priority
@@ -241,6 +404,7 @@ class RequestQueue:
                 
                 self._queue = remaining
                 heapq.heapify(self._queue)
+                self._not_full.notify_all()
                 logger.info(f"Cleared {cleared} {priority.name} priority requests from queue")
 
 
@@ -249,8 +413,20 @@ class RequestQueueManager:
     Manager for multiple request queues (e.g., per endpoint).
     """
     
-    def __init__(self, default_max_concurrent: int = 3):
+    def __init__(
+        self,
+        default_max_concurrent: int = 3,
+        max_size: Optional[int] = None,
+        overflow: str = "block",
+        aging_interval: Optional[float] = None
+    ):
+        """
+        Args:
+            default_max_concurrent: Concurrency of queues created without one
+            max_size, overflow, aging_interval: Applied to every queue (see RequestQueue)
+        """
         self.default_max_concurrent = default_max_concurrent
+        self.queue_options = {"max_size": max_size, "overflow": overflow, "aging_interval": aging_interval}
         self._queues: Dict[str, RequestQueue] = {}
         self._started = False
     
@@ -268,10 +444,10 @@ class RequestQueueManager:
         self._started = False
         logger.info("Request queue manager stopped")
     
-    def get_queue(self, name: str = "default") -> RequestQueue:
+    def get_queue(self, name: str = "default", max_concurrent: Optional[int] = None) -> RequestQueue:
         """Get or create a queue by name."""
         if name not in self._queues:
-            queue = RequestQueue(self.default_max_concurrent)
+            queue = RequestQueue(max_concurrent or self.default_max_concurrent, **self.queue_options)
             self._queues[name] = queue
             
             if self._started:
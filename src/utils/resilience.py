@@ -0,0 +1,225 @@
+"""
+Retry and failure isolation for Claude.ai API calls.
+
+RateLimitedSession uses these to retry transient failures (timeouts,
+connection errors, 5xx responses) without making an outage worse:
+
+- full-jitter exponential backoff spreads retries out instead of
+  synchronizing them
+- a retry budget caps retries at a fraction of recent requests, so a
+  failing upstream sees at most ``1 + ratio`` times normal load
+- a per-endpoint circuit breaker fails fast after repeated failures and
+  lets a single trial request through once the recovery timeout passes
+"""
+
+import asyncio
+import random
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+import logging
+
+import aiohttp
+import requests
+
+from .metrics import SlidingWindowCounter
+
+logger = logging.getLogger(__name__)
+
+# Responses worth retrying: the server failed, not the request
+RETRYABLE_STATUS_CODES = frozenset({500, 502, 503, 504})
+
+_TRANSIENT_EXCEPTIONS = (
+    asyncio.TimeoutError,
+    TimeoutError,
+    ConnectionError,
+    aiohttp.ClientConnectionError,
+    aiohttp.ClientPayloadError,
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+)
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """Whether a request that raised ``error`` is worth retrying."""
+    return isinstance(error, _TRANSIENT_EXCEPTIONS)
+
+
+def full_jitter_backoff(attempt: int, base: float, cap: float) -> float:
+    """Random delay in [0, min(cap, base * 2**attempt)]."""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+@dataclass
+class ResilienceConfig:
+    """Retry and circuit breaker settings."""
+    max_retries: int = 3
+    backoff_base: float = 0.5
+    backoff_cap: float = 30.0
+    # Retries allowed per request in the window, plus a floor for quiet periods
+    retry_budget_ratio: float = 0.2
+    retry_budget_min_per_second: float = 0.5
+    retry_budget_window: float = 10.0
+    failure_threshold: int = 5
+    recovery_timeout: float = 30.0
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request while the endpoint's circuit is open."""
+
+    def __init__(self, endpoint: str, retry_in: float):
+        super().__init__(f"Circuit open for {endpoint}; retry in {retry_in:.1f}s")
+        self.endpoint = endpoint
+        self.retry_in = retry_in
+
+
+class RetryBudget:
+    """Caps retries at a fraction of the requests seen in a sliding window."""
+
+    def __init__(self, ratio: float = 0.2, min_per_second: float = 0.5, window: float = 10.0):
+        self.ratio = ratio
+        self.min_retries = min_per_second * window
+        self._requests = SlidingWindowCounter(window=window)
+        self._retries = SlidingWindowCounter(window=window)
+        self.exhausted = 0
+
+    def record_request(self):
+        self._requests.add()
+
+    def try_retry(self) -> bool:
+        """Spend one retry if the budget allows it."""
+        allowed = max(self.min_retries, self.ratio * self._requests.total())
+        if self._retries.total() >= allowed:
+            self.exhausted += 1
+            return False
+        self._retries.add()
+        return True
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "ratio": self.ratio,
+            "requests_in_window": self._requests.total(),
+            "retries_in_window": self._retries.total(),
+            "exhausted": self.exhausted
+        }
+
+
+class CircuitBreaker:
+    """
+    Closed -> open after ``failure_threshold`` consecutive failures; open
+    -> half-open after ``recovery_timeout``, admitting one trial request
+    whose outcome closes or re-opens the circuit.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = 5, recovery_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.trial_in_flight = False
+        self.rejected = 0
+        self.transitions: deque = deque(maxlen=10)
+
+    def _transition(self, state: str):
+        logger.warning(f"Circuit for {self.name}: {self.state} -> {state}")
+        self.transitions.append({"from": self.state, "to": state, "at": time.time()})
+        self.state = state
+
+    def retry_in(self) -> float:
+        return max(0.0, self.opened_at + self.recovery_timeout - time.monotonic())
+
+    def allow(self) -> bool:
+        """Whether a request may be sent now."""
+        if self.state == self.OPEN and self.retry_in() <= 0:
+            self._transition(self.HALF_OPEN)
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.HALF_OPEN and not self.trial_in_flight:
+            self.trial_in_flight = True
+            return True
+        self.rejected += 1
+        return False
+
+    def record_success(self):
+        self.consecutive_failures = 0
+        self.trial_in_flight = False
+        if self.state != self.CLOSED:
+            self._transition(self.CLOSED)
+
+    def release(self):
+        """End a request whose outcome says nothing about the endpoint (429, client errors)."""
+        self.trial_in_flight = False
+
+    def record_failure(self):
+        self.consecutive_failures += 1
+        self.trial_in_flight = False
+        if self.state == self.HALF_OPEN or (
+            self.state == self.CLOSED and self.consecutive_failures >= self.failure_threshold
+        ):
+            self.opened_at = time.monotonic()
+            self._transition(self.OPEN)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "retry_in": round(self.retry_in(), 1) if self.state == self.OPEN else None,
+            "rejected": self.rejected,
+            "transitions": list(self.transitions)
+        }
+
+
+class Resilience:
+    """Retry budget shared by all endpoints plus one circuit breaker per endpoint."""
+
+    def __init__(self, config: Optional[ResilienceConfig] = None):
+        self.config = config or ResilienceConfig()
+        self.budget = RetryBudget(
+            self.config.retry_budget_ratio,
+            self.config.retry_budget_min_per_second,
+            self.config.retry_budget_window
+        )
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self.retries = 0
+
+    def breaker(self, endpoint: str) -> CircuitBreaker:
+        if endpoint not in self._breakers:
+            self._breakers[endpoint] = CircuitBreaker(
+                endpoint, self.config.failure_threshold, self.config.recovery_timeout
+            )
+        return self._breakers[endpoint]
+
+    def check(self, endpoint: str) -> CircuitBreaker:
+        """Breaker for ``endpoint``; raises CircuitOpenError if it rejects the request."""
+        breaker = self.breaker(endpoint)
+        if not breaker.allow():
+            raise CircuitOpenError(endpoint, breaker.retry_in())
+        return breaker
+
+    def retry_delay(self, breaker: CircuitBreaker, attempt: int) -> Optional[float]:
+        """
+        Backoff before retry number ``attempt`` (0-based), or None when the
+        request is out of retries, the budget is spent or the circuit opened.
+        """
+        if attempt >= self.config.max_retries or breaker.state == breaker.OPEN:
+            return None
+        if not self.budget.try_retry():
+            return None
+        self.retries += 1
+        return full_jitter_backoff(attempt, self.config.backoff_base, self.config.backoff_cap)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            "retries": self.retries,
+            "retry_budget": self.budget.snapshot(),
+            "circuit_breakers": {
+                endpoint: breaker.snapshot() for endpoint, breaker in self._breakers.items()
+            }
+        }
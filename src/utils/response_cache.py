@@ -0,0 +1,431 @@
+"""
+Persistent HTTP response cache for Claude.ai GET requests.
+
+Responses are kept in a SQLite file (bodies zlib-compressed) keyed on the
+same method/URL/parameters/credentials key used for request coalescing.
+A lookup serves the stored response while it is younger than the TTL of
+its endpoint class; after that, if the server sent an ``ETag`` or
+``Last-Modified``, the request is revalidated with ``If-None-Match`` /
+``If-Modified-Since`` and a 304 refreshes the stored copy instead of
+downloading the body again. Responses without validators are only kept
+for endpoint classes with a TTL.
+
+Streamed responses go through the cache too: bodies are compressed as the
+caller reads them and cached bodies are decompressed chunk by chunk, so
+neither side holds a whole uncompressed body. Bodies larger than
+``max_body_size`` compressed bytes are not cached; a streamed body stops
+being recorded as soon as it passes the limit.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+import logging
+
+from multidict import CIMultiDict, CIMultiDictProxy
+
+from .http_client import HTTPError, HTTPResponse
+
+logger = logging.getLogger(__name__)
+
+# Not stored: the body is kept decoded, and cookies never go to disk
+_UNSTORED_HEADERS = frozenset({'content-encoding', 'content-length', 'transfer-encoding', 'set-cookie'})
+
+# Seconds a stored response is served without asking the server, per
+# RateLimitedSession endpoint class; 0 means always revalidate
+DEFAULT_TTLS = {
+    "list_conversations": 15.0,
+    "get_conversation": 0.0,
+    "search": 0.0,
+    "default": 0.0,
+}
+
+
+def parse_ttls(spec: str) -> Dict[str, float]:
+    """Parse ``endpoint=seconds,...`` (as in ``MCP_HTTP_CACHE_TTLS``) over the defaults."""
+    ttls = dict(DEFAULT_TTLS)
+    for item in filter(None, (part.strip() for part in spec.split(','))):
+        endpoint, _, seconds = item.partition('=')
+        ttls[endpoint.strip()] = float(seconds)
+    return ttls
+
+
+@dataclass
+class CachedResponse:
+    """A stored response (body still compressed) and its validators."""
+    url: str
+    status_code: int
+    headers: List[Tuple[str, str]]
+    body: bytes
+    etag: Optional[str]
+    last_modified: Optional[str]
+    stored_at: float
+
+    def age(self) -> float:
+        return time.time() - self.stored_at
+
+    def validators(self) -> Dict[str, str]:
+        """Conditional request headers for revalidation."""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+    def header_proxy(self) -> CIMultiDictProxy:
+        return CIMultiDictProxy(CIMultiDict(self.headers))
+
+    def to_response(self) -> HTTPResponse:
+        return HTTPResponse(self.status_code, self.header_proxy(), self.url, zlib.decompress(self.body))
+
+
+class CachedStream:
+    """A cached response exposed like a StreamingResponse, decompressed as it is read."""
+
+    def __init__(self, entry: CachedResponse, cache: 'ResponseCache'):
+        self._entry = entry
+        self._cache = cache
+        self.status_code = entry.status_code
+        self.headers = entry.header_proxy()
+        self.url = entry.url
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code < 400
+
+    async def iter_chunks(self, chunk_size: int = 64 * 1024) -> AsyncIterator[bytes]:
+        decompressor = zlib.decompressobj()
+        body = self._entry.body
+        for offset in range(0, len(body), chunk_size):
+            data = decompressor.decompress(body[offset:offset + chunk_size])
+            if data:
+                self._cache.bytes_saved += len(data)
+                yield data
+        data = decompressor.flush()
+        if data:
+            self._cache.bytes_saved += len(data)
+            yield data
+
+    async def read(self) -> HTTPResponse:
+        response = await asyncio.to_thread(self._entry.to_response)
+        self._cache.bytes_saved += len(response.content)
+        return response
+
+    def raise_for_status(self) -> None:
+        if not self.ok:
+            raise HTTPError(f"{self.status_code} error for url: {self.url}", self)
+
+
+class _RecordingStream:
+    """Streaming response that compresses the body as the caller reads it, up to a size limit."""
+
+    def __init__(self, response: Any, compression_level: int, max_body_size: int):
+        self._response = response
+        self._compressor = zlib.compressobj(compression_level)
+        self._parts: List[bytes] = []
+        self._size = 0
+        self._max_body_size = max_body_size
+        self.complete = False
+        self.too_large = False
+        self.status_code = response.status_code
+        self.headers = response.headers
+        self.url = response.url
+
+    @property
+    def ok(self) -> bool:
+        return self._response.ok
+
+    def _record(self, data: bytes):
+        if self.too_large:
+            return
+        compressed = self._compressor.compress(data)
+        if compressed:
+            self._parts.append(compressed)
+            self._size += len(compressed)
+            if self._size > self._max_body_size:
+                # Not worth caching; stop holding the body
+                self.too_large = True
+                self._parts = []
+                self._compressor = None
+
+    async def iter_chunks(self, chunk_size: int = 64 * 1024) -> AsyncIterator[bytes]:
+        async for chunk in self._response.iter_chunks(chunk_size):
+            self._record(chunk)
+            yield chunk
+        self.complete = True
+
+    async def read(self) -> HTTPResponse:
+        response = await self._response.read()
+        self._record(response.content)
+        self.complete = True
+        return response
+
+    def body(self) -> Optional[bytes]:
+        """The compressed body, or None if it passed the size limit."""
+        if self.too_large:
+            return None
+        body = b''.join(self._parts) + self._compressor.flush()
+        return body if len(body) <= self._max_body_size else None
+
+    def raise_for_status(self) -> None:
+        self._response.raise_for_status()
+
+
+class ResponseCache:
+    """SQLite-backed response cache with TTLs per endpoint class."""
+
+    def __init__(
+        self,
+        path: str,
+        ttls: Optional[Dict[str, float]] = None,
+        max_entries: int = 2000,
+        compression_level: int = 6,
+        max_body_size: int = 8 * 1024 * 1024
+    ):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.max_entries = max_entries
+        self.compression_level = compression_level
+        self.max_body_size = max_body_size
+
+        self._conn = sqlite3.connect(str(self.path), isolation_level=None, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, url TEXT NOT NULL, status INTEGER NOT NULL, "
+                "headers TEXT NOT NULL, body BLOB NOT NULL, etag TEXT, last_modified TEXT, "
+                "stored_at REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS ix_responses_stored_at ON responses (stored_at)")
+
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.stored = 0
+        self.too_large = 0
+        self.bytes_saved = 0
+
+    def ttl_for(self, endpoint: str) -> float:
+        return self.ttls.get(endpoint, self.ttls.get("default", 0.0))
+
+    @staticmethod
+    def _cache_key(key: Hashable) -> str:
+        return hashlib.sha256(repr(key).encode()).hexdigest()
+
+    # Storage (runs in worker threads)
+
+    def _get(self, cache_key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT url, status, headers, body, etag, last_modified, stored_at "
+                "FROM responses WHERE key = ?", (cache_key,)
+            ).fetchone()
+        if row is None:
+            return None
+        url, status, headers, body, etag, last_modified, stored_at = row
+        return CachedResponse(url, status, [tuple(pair) for pair in json.loads(headers)],
+                              body, etag, last_modified, stored_at)
+
+    def _put(self, cache_key: str, entry: CachedResponse):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, url, status, headers, body, etag, last_modified, stored_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (cache_key, entry.url, entry.status_code, json.dumps(entry.headers), entry.body,
+                 entry.etag, entry.last_modified, entry.stored_at)
+            )
+            self.stored += 1
+            if self.stored % 100 == 0:
+                # Drop the oldest entries past the limit
+                self._conn.execute(
+                    "DELETE FROM responses WHERE key IN ("
+                    "SELECT key FROM responses ORDER BY stored_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,)
+                )
+
+    def _touch(self, cache_key: str, stored_at: float):
+        with self._lock:
+            self._conn.execute("UPDATE responses SET stored_at = ? WHERE key = ?", (stored_at, cache_key))
+
+    def _count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def _clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+
+    # Lookup
+
+    async def _lookup(self, key: Hashable, endpoint: str, ttl: Optional[float]):
+        cache_key = self._cache_key(key)
+        ttl = self.ttl_for(endpoint) if ttl is None else ttl
+        entry = await asyncio.to_thread(self._get, cache_key)
+        return cache_key, ttl, entry
+
+    async def _revalidated(self, cache_key: str, entry: CachedResponse):
+        self.revalidated += 1
+        entry.stored_at = time.time()
+        await asyncio.to_thread(self._touch, cache_key, entry.stored_at)
+
+    async def fetch(
+        self,
+        key: Hashable,
+        endpoint: str,
+        send: Callable[[Dict[str, str]], Awaitable[Any]],
+        headers: Optional[Dict[str, str]] = None,
+        ttl: Optional[float] = None
+    ) -> Any:
+        """
+        Response for a GET request, from the cache when possible.
+
+        ``send(headers)`` performs the request with the given headers;
+        ``ttl`` overrides the endpoint class TTL (0 forces revalidation).
+        """
+        cache_key, ttl, entry = await self._lookup(key, endpoint, ttl)
+
+        if entry is not None and entry.age() < ttl:
+            self.hits += 1
+            response = await asyncio.to_thread(entry.to_response)
+            self.bytes_saved += len(response.content)
+            return response
+
+        validators = entry.validators() if entry is not None else {}
+        response = await send({**(headers or {}), **validators})
+
+        if response.status_code == 304 and entry is not None:
+            await self._revalidated(cache_key, entry)
+            response = await asyncio.to_thread(entry.to_response)
+            self.bytes_saved += len(response.content)
+            return response
+
+        self.misses += 1
+        if self._storable(response, ttl):
+            body = await asyncio.to_thread(zlib.compress, response.content, self.compression_level)
+            if len(body) > self.max_body_size:
+                self.too_large += 1
+            else:
+                await self._put_logged(cache_key, self._entry(response, body))
+        return response
+
+    @asynccontextmanager
+    async def stream(
+        self,
+        key: Hashable,
+        endpoint: str,
+        open_stream: Callable[[Dict[str, str]], Any],
+        headers: Optional[Dict[str, str]] = None,
+        ttl: Optional[float] = None
+    ) -> AsyncIterator[Any]:
+        """
+        Like ``fetch`` for streaming responses.
+
+        ``open_stream(headers)`` returns an async context manager yielding
+        a StreamingResponse. Cached bodies are decompressed chunk by chunk,
+        and a fresh body is stored only if the caller reads all of it.
+        """
+        cache_key, ttl, entry = await self._lookup(key, endpoint, ttl)
+
+        if entry is not None and entry.age() < ttl:
+            self.hits += 1
+            yield CachedStream(entry, self)
+            return
+
+        validators = entry.validators() if entry is not None else {}
+        async with open_stream({**(headers or {}), **validators}) as response:
+            if response.status_code == 304 and entry is not None:
+                await self._revalidated(cache_key, entry)
+                yield CachedStream(entry, self)
+                return
+
+            self.misses += 1
+            if not self._storable(response, ttl):
+                yield response
+                return
+
+            recording = _RecordingStream(response, self.compression_level, self.max_body_size)
+            yield recording
+
+        if recording.complete:
+            body = recording.body()
+            if body is None:
+                self.too_large += 1
+                return
+            await self._put_logged(cache_key, self._entry(response, body))
+
+    @staticmethod
+    def _storable(response: Any, ttl: float) -> bool:
+        if response.status_code != 200:
+            return False
+        if 'no-store' in response.headers.get('Cache-Control', '').lower():
+            return False
+        # Without validators it could never be served again once the TTL passes
+        return ttl > 0 or bool(response.headers.get('ETag') or response.headers.get('Last-Modified'))
+
+    @staticmethod
+    def _entry(response: Any, body: bytes) -> CachedResponse:
+        return CachedResponse(
+            str(response.url), response.status_code,
+            [(name, value) for name, value in response.headers.items()
+             if name.lower() not in _UNSTORED_HEADERS],
+            body, response.headers.get('ETag'), response.headers.get('Last-Modified'), time.time()
+        )
+
+    async def _put_logged(self, cache_key: str, entry: CachedResponse):
+        try:
+            await asyncio.to_thread(self._put, cache_key, entry)
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to cache response for {entry.url}: {e}")
+
+    async def clear(self) -> None:
+        await asyncio.to_thread(self._clear)
+
+    async def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    async def get_metrics(self) -> Dict[str, Any]:
+        lookups = self.hits + self.revalidated + self.misses
+        return {
+            "entries": await asyncio.to_thread(self._count),
+            "hits": self.hits,
+            "revalidated": self.revalidated,
+            "misses": self.misses,
+            "hit_ratio": round((self.hits + self.revalidated) / lookups, 3) if lookups else 0.0,
+            "too_large": self.too_large,
+            "bytes_saved": self.bytes_saved,
+            "ttls": self.ttls
+        }
+
+
+def create_response_cache() -> Optional[ResponseCache]:
+    """
+    Cache under ``MCP_DATA_DIR/http_cache`` unless ``MCP_HTTP_CACHE`` is off.
+
+    ``MCP_HTTP_CACHE_TTLS`` overrides endpoint TTLs, e.g.
+    ``list_conversations=60,get_conversation=30``, and
+    ``MCP_HTTP_CACHE_MAX_BODY`` the largest compressed body stored, in bytes.
+    """
+    if os.getenv('MCP_HTTP_CACHE', 'true').lower() not in ('1', 'true', 'yes'):
+        return None
+    data_dir = Path(os.getenv('MCP_DATA_DIR', Path.home() / '.mcp-claude-context'))
+    return ResponseCache(
+        str(data_dir / 'http_cache' / 'responses.db'),
+        ttls=parse_ttls(os.getenv('MCP_HTTP_CACHE_TTLS', '')),
+        max_body_size=int(os.getenv('MCP_HTTP_CACHE_MAX_BODY', str(8 * 1024 * 1024)))
+    )
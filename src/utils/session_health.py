@@ -0,0 +1,162 @@
+"""
+Passive session key health tracking.
+
+Tool calls used to verify the session key with an extra API request
+whenever the check interval had passed, in line with the real request.
+SessionHealth instead learns from the responses the server gets anyway:
+RateLimitedSession reports every response status, a 2xx/3xx for the
+current session key marks it valid and a 401/403 marks it invalid. Only
+when no request has used the key for ``idle_interval`` does a background
+task probe it, so tool calls never wait on a verification round-trip.
+Probing stops once nothing has used the key for ``idle_limit`` and starts
+again with the next tool call.
+
+Credentials are persisted, in a worker thread, when a key first proves
+valid, not on every check.
+"""
+
+import asyncio
+import re
+import time
+from typing import Any, Awaitable, Callable, Dict, Mapping, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+_SESSION_COOKIE = re.compile(r'(?:^|;)\s*sessionKey=([^;]+)')
+
+UNKNOWN = 'unknown'
+VALID = 'valid'
+INVALID = 'invalid'
+
+
+def session_key_from_headers(headers: Optional[Mapping[str, str]]) -> Optional[str]:
+    """Session key sent in a request's Cookie header, if any."""
+    for name, value in (headers or {}).items():
+        if name.lower() == 'cookie':
+            match = _SESSION_COOKIE.search(value)
+            if match:
+                return match.group(1).strip()
+    return None
+
+
+class SessionHealth:
+    """Validity of the session key in use, inferred from real API responses."""
+
+    def __init__(
+        self,
+        probe: Callable[[str, str], Awaitable[int]],
+        persist: Callable[[str, str], None],
+        idle_interval: float = 300.0,
+        idle_limit: float = 3600.0,
+        saved: Optional[Tuple[str, str]] = None
+    ):
+        """
+        Args:
+            probe: Sends a cheap authenticated request, returns its status code
+            persist: Saves credentials that proved valid (blocking; run in a thread)
+            idle_interval: Seconds without traffic before a background probe
+            idle_limit: Seconds without real requests after which probing stops
+            saved: Credentials already persisted, so they aren't written again
+        """
+        self.probe = probe
+        self.persist = persist
+        self.idle_interval = idle_interval
+        self.idle_limit = idle_limit
+        self._saved = saved
+
+        self.session_key: Optional[str] = None
+        self.org_id: Optional[str] = None
+        self.status = UNKNOWN
+        self.last_status_code: Optional[int] = None
+        self.last_valid_at: Optional[float] = None
+        self.probes = 0
+        self._last_seen = time.monotonic()
+        self._last_request = self._last_seen
+        self._task: Optional[asyncio.Task] = None
+        self._save_task: Optional[asyncio.Task] = None
+
+    def track(self, session_key: str, org_id: str) -> None:
+        """Note the credentials a tool call is about to use; never blocks."""
+        if (session_key, org_id) != (self.session_key, self.org_id):
+            self.session_key, self.org_id = session_key, org_id
+            self.status = UNKNOWN
+            self.last_status_code = None
+        self._last_request = time.monotonic()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._probe_when_idle())
+
+    def observe(self, headers: Optional[Mapping[str, str]], status_code: int) -> None:
+        """Response hook for RateLimitedSession: learn from a request's status."""
+        if self.session_key is None or session_key_from_headers(headers) != self.session_key:
+            return
+        self._last_request = time.monotonic()
+        self.record(status_code)
+
+    def record(self, status_code: int) -> None:
+        """Update the current key's status from a response to a request that used it."""
+        self._last_seen = time.monotonic()
+        if status_code in (401, 403):
+            if self.status != INVALID:
+                logger.warning(f"Session key rejected by the API ({status_code}); update it with update_session")
+            self.status = INVALID
+            self.last_status_code = status_code
+        elif 200 <= status_code < 400:
+            self.status = VALID
+            self.last_status_code = status_code
+            self.last_valid_at = time.time()
+            self._save_if_changed()
+
+    def _save_if_changed(self):
+        credentials = (self.session_key, self.org_id)
+        if credentials != self._saved:
+            self._saved = credentials
+            self._save_task = asyncio.create_task(self._save(credentials))
+
+    async def _save(self, credentials: Tuple[str, str]):
+        try:
+            await asyncio.to_thread(self.persist, *credentials)
+        except Exception as e:
+            logger.warning(f"Failed to save session key: {e}")
+            if self._saved == credentials:
+                # Try again on the next valid response
+                self._saved = None
+
+    async def _probe_when_idle(self):
+        while True:
+            if time.monotonic() - self._last_request >= self.idle_limit:
+                logger.debug("Session unused; background checks paused until the next tool call")
+                return
+            idle = time.monotonic() - self._last_seen
+            if idle < self.idle_interval:
+                await asyncio.sleep(self.idle_interval - idle)
+                continue
+
+            # A rejected key stays rejected until new credentials are tracked
+            if self.session_key and self.status != INVALID:
+                self.probes += 1
+                try:
+                    self.record(await self.probe(self.session_key, self.org_id))
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.info(f"Background session check failed: {e}")
+            self._last_seen = time.monotonic()
+
+    async def close(self) -> None:
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        if self._save_task is not None:
+            await self._save_task
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            "status": self.status,
+            "org_id": self.org_id,
+            "last_status_code": self.last_status_code,
+            "last_valid_at": self.last_valid_at,
+            "idle_seconds": round(time.monotonic() - self._last_seen, 1),
+            "background_probes": self.probes,
+            "probing": self._task is not None and not self._task.done()
+        }
@@ -0,0 +1,107 @@
+"""
+Request coalescing for identical concurrent API calls.
+
+Tool calls often arrive together and ask claude.ai for the same thing:
+several session checks at start-up, two clients opening the same
+conversation. SingleFlight runs the first call for a key and hands its
+result (or exception) to every caller that asks for the same key while it
+is in flight, so the burst costs one rate limit token and one round trip.
+
+Only idempotent requests without a body are coalesced; the key covers
+method, URL, query parameters and credentials, so callers with different
+session keys never share a response.
+"""
+
+import asyncio
+import hashlib
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, Mapping, Optional, Tuple, TypeVar
+import logging
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+# Methods whose concurrent duplicates can safely share one response
+COALESCIBLE_METHODS = frozenset({'GET', 'HEAD'})
+AUTH_HEADERS = frozenset({'cookie', 'authorization'})
+
+
+def request_key(
+    method: str,
+    url: str,
+    params: Any = None,
+    headers: Optional[Mapping[str, str]] = None,
+    cookies: Optional[Mapping[str, str]] = None
+) -> Tuple[str, str, Tuple, str]:
+    """Coalescing key for a request; credentials are hashed rather than kept."""
+    if isinstance(params, Mapping):
+        params = tuple(sorted((str(k), str(v)) for k, v in params.items()))
+    elif params is not None:
+        params = tuple(params)
+
+    auth = sorted(
+        (name.lower(), value) for name, value in (headers or {}).items()
+        if name.lower() in AUTH_HEADERS
+    )
+    auth.extend(sorted((cookies or {}).items()))
+    digest = hashlib.sha256(repr(auth).encode()).hexdigest() if auth else ''
+    return method.upper(), url, params or (), digest
+
+
+@dataclass
+class _Flight:
+    task: asyncio.Task
+    waiters: int = 0
+
+
+class SingleFlight:
+    """Shares the result of an in-flight call with concurrent callers of the same key."""
+
+    def __init__(self):
+        self._flights: Dict[Hashable, _Flight] = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Await ``fn()``, or the call already running for ``key``.
+
+        A caller that is cancelled only stops waiting; the shared call is
+        cancelled once nobody is waiting for it any more, and later callers
+        start a new one instead of joining it while it winds down.
+        """
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = _Flight(asyncio.ensure_future(fn()))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda task: self._finish(key, flight))
+            self.leaders += 1
+        else:
+            self.coalesced += 1
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if not flight.waiters and not flight.task.done():
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+                flight.task.cancel()
+
+    def _finish(self, key: Hashable, flight: _Flight):
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        # Consume the exception if every waiter was cancelled before it arrived
+        if not flight.task.cancelled():
+            flight.task.exception()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        total = self.leaders + self.coalesced
+        return {
+            "in_flight": len(self._flights),
+            "requests": self.leaders,
+            "coalesced": self.coalesced,
+            "coalesced_ratio": round(self.coalesced / total, 3) if total else 0.0
+        }
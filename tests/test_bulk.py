@@ -0,0 +1,91 @@
+"""Tests for the bulk upsert layer."""
+
+import pytest
+from sqlalchemy import select
+
+from src.models.bulk import (
+    BulkWriter, api_conversation_row, api_message_rows, export_conversation_row, messages_table
+)
+from src.models.conversation import Conversation, init_database
+from src.models.database import dispose_engines
+
+
+def payload(uuid="conv-1", name="First", text="hello"):
+    return {
+        "uuid": uuid,
+        "name": name,
+        "created_at": "2025-01-01T00:00:00Z",
+        "updated_at": "2025-01-02T00:00:00Z",
+        "model": "claude",
+        "message_count": 2,
+        "is_starred": True,
+        "chat_messages": [
+            {"uuid": f"{uuid}-0", "sender": "human", "text": text, "index": 0},
+            {"uuid": f"{uuid}-1", "sender": "assistant", "text": "hi", "index": 1},
+        ],
+    }
+
+
+@pytest.fixture
+def engine(tmp_path):
+    yield init_database(str(tmp_path / "conversations.db"))
+    dispose_engines()
+
+
+def test_conversation_upsert_skips_unchanged_rows(engine):
+    writer = BulkWriter(engine, chunk_size=1)
+    rows = [api_conversation_row(payload("conv-1")), api_conversation_row(payload("conv-2"))]
+
+    assert writer.upsert_conversations(rows) == 2
+    assert writer.upsert_conversations(rows) == 0
+
+    changed = api_conversation_row(payload("conv-1", name="Renamed"))
+    assert writer.upsert_conversations([changed, rows[1]]) == 1
+
+    with engine.connect() as conn:
+        stored = conn.execute(
+            select(Conversation.title, Conversation.extra_data).where(Conversation.id == "conv-1")
+        ).one()
+    assert stored.title == "Renamed"
+    assert stored.extra_data["is_starred"] is True
+
+
+def test_export_rows_without_a_hash_skip_unchanged_rows(engine):
+    writer = BulkWriter(engine)
+    export = {"uuid": "conv-1", "name": "First", "created_at": "2025-01-01T00:00:00Z",
+              "updated_at": "2025-01-02T00:00:00Z", "tags": ["a"], "messages": [{}, {}]}
+
+    assert writer.upsert_conversations([export_conversation_row(export)]) == 1
+    # extracted_at differs on every read; that alone isn't a change
+    assert writer.upsert_conversations([export_conversation_row(export)]) == 0
+    assert writer.upsert_conversations([export_conversation_row({**export, "tags": ["a", "b"]})]) == 1
+    assert writer.upsert_conversations([{"id": "conv-1", "tags": ["a", "b"]}]) == 0
+
+    with engine.connect() as conn:
+        assert conn.execute(select(Conversation.tags)).scalar() == ["a", "b"]
+
+
+def test_message_upsert_updates_only_changed_messages(engine):
+    writer = BulkWriter(engine)
+    writer.upsert_conversations([api_conversation_row(payload())])
+
+    assert writer.upsert_messages(api_message_rows(payload())) == 2
+    assert writer.upsert_messages(api_message_rows(payload())) == 0
+    assert writer.upsert_messages(api_message_rows(payload(text="edited"))) == 1
+
+    with engine.connect() as conn:
+        rows = conn.execute(
+            select(messages_table.c.role, messages_table.c.content).order_by(messages_table.c['index'])
+        ).all()
+    assert [tuple(row) for row in rows] == [("user", "edited"), ("assistant", "hi")]
+
+
+def test_insert_only_leaves_existing_rows(engine):
+    writer = BulkWriter(engine)
+    writer.upsert_conversations([api_conversation_row(payload())])
+
+    renamed = api_conversation_row(payload(name="Renamed"))
+    assert writer.upsert_conversations([renamed], update_existing=False) == 0
+
+    with engine.connect() as conn:
+        assert conn.execute(select(Conversation.title)).scalar() == "First"
@@ -0,0 +1,172 @@
+"""Tests for compressed content storage."""
+
+import sqlite3
+
+import pytest
+from sqlalchemy import select, text
+from sqlalchemy.orm import Session
+
+from deployment.scripts.compress_content import recompress, train_dictionary
+from src.models.bulk import BulkWriter
+from src.models.compression import reset_codec
+from src.models.conversation import Message, init_database
+from src.models.database import dispose_engines
+from src.models.store import ConversationStore
+from src.search.text_search import TextSearch
+
+LONG = " ".join(f"sentence {i} about sqlite compression and search" for i in range(60))
+
+
+def use_codec(monkeypatch, codec, **env):
+    monkeypatch.setenv("MCP_CONTENT_COMPRESSION", codec)
+    for name, value in env.items():
+        monkeypatch.setenv(name, str(value))
+    reset_codec()
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    yield str(tmp_path / "conversations.db")
+    dispose_engines()
+    reset_codec()
+
+
+def write(engine, conv_id, content, search_vector=None):
+    writer = BulkWriter(engine)
+    writer.upsert_conversations([{"id": conv_id, "title": f"Title {conv_id}", "search_vector": search_vector}])
+    writer.upsert_messages([{"id": f"{conv_id}-0", "conversation_id": conv_id, "role": "assistant",
+                             "content": content, "created_at": None, "index": 0, "extra_data": {}}])
+
+
+def stored_type(engine, message_id):
+    with engine.connect() as conn:
+        return conn.execute(text("SELECT typeof(content) FROM messages WHERE id = :id"), {"id": message_id}).scalar()
+
+
+def test_modes_mix_and_read_paths_decompress(db_path, monkeypatch):
+    engine = init_database(db_path)
+    write(engine, "plain", LONG)
+
+    # Turning compression on takes effect at the next start
+    use_codec(monkeypatch, "zlib")
+    init_database(db_path)
+    write(engine, "packed", LONG + " zebra", search_vector=LONG)
+    write(engine, "short", "too short to compress")
+
+    assert stored_type(engine, "plain-0") == "text"
+    assert stored_type(engine, "packed-0") == "blob"
+    assert stored_type(engine, "short-0") == "text"
+    with engine.connect() as conn:
+        size = conn.execute(text("SELECT length(content) FROM messages WHERE id = 'packed-0'")).scalar()
+    assert size < len(LONG) / 4
+
+    with Session(engine) as session:
+        messages = {m.id: m.to_dict()["content"] for m in session.scalars(select(Message))}
+    with engine.connect() as conn:
+        # FTS was fed the decompressed text by the triggers
+        hits = conn.execute(text("SELECT id FROM messages_fts WHERE messages_fts MATCH 'zebra'")).scalars().all()
+        conv_hits = conn.execute(text("SELECT id FROM conversations_fts WHERE conversations_fts MATCH 'sentence'")).scalars().all()
+    assert messages["plain-0"] == LONG and messages["packed-0"] == LONG + " zebra"
+    assert hits == ["packed-0"]
+    assert conv_hits == ["packed"]
+
+    search = TextSearch(db_path)
+    context = search.get_conversation_context("packed", 0)
+    assert context["messages"][0]["content"] == LONG + " zebra"
+    assert context["conversation"]["search_vector"] == LONG
+    assert [row["id"] for row in search.search_messages("zebra")] == ["packed-0"]
+
+    search.rebuild_search_index()
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT count(*) FROM messages_fts WHERE messages_fts MATCH 'sentence'")).scalar() == 2
+
+
+@pytest.mark.asyncio
+async def test_analyze_counts_decompressed_characters(db_path, monkeypatch):
+    use_codec(monkeypatch, "zlib")
+    write(init_database(db_path), "packed", LONG)
+
+    store = ConversationStore(db_path)
+    try:
+        stats = await store.analyze_conversations(["packed"])
+    finally:
+        await store.close()
+    assert stats["total_characters"] == len(LONG)
+
+
+def test_outdated_triggers_are_replaced(db_path):
+    engine = init_database(db_path)
+    with engine.begin() as conn:
+        conn.execute(text("DROP TRIGGER messages_ai"))
+        conn.execute(text("""
+            CREATE TRIGGER messages_ai AFTER INSERT ON messages
+            BEGIN
+                INSERT INTO messages_fts(id, conversation_id, content)
+                VALUES (new.id, new.conversation_id, new.content);
+            END
+        """))
+
+    init_database(db_path)
+    with engine.connect() as conn:
+        sql = conn.execute(text("SELECT sql FROM sqlite_master WHERE name = 'messages_ai'")).scalar()
+    assert "messages_fts(rowid, id, conversation_id, content)" in sql
+
+
+def test_schema_needs_mcp_decompress_only_for_compressed_content(db_path, monkeypatch):
+    engine = init_database(db_path)
+    write(engine, "plain", LONG)
+
+    def plain_connection_writes():
+        conn = sqlite3.connect(db_path)
+        try:
+            conn.execute("UPDATE messages SET content = content || ' zebra' WHERE id = 'plain-0'")
+            conn.execute("UPDATE conversations SET title = 'Renamed' WHERE id = 'plain'")
+            conn.execute("SELECT count(*) FROM messages_fts_source").fetchone()
+            conn.commit()
+        finally:
+            conn.close()
+
+    # Without compression, connections that don't register mcp_decompress can write
+    plain_connection_writes()
+    assert [row["id"] for row in TextSearch(db_path).search_messages("zebra")] == ["plain-0"]
+
+    use_codec(monkeypatch, "zlib")
+    init_database(db_path)
+    write(engine, "packed", LONG)
+    with pytest.raises(sqlite3.OperationalError, match="mcp_decompress"):
+        plain_connection_writes()
+
+    # Compressed values keep the schema decompressing after compression is
+    # turned off, until recompress has rewritten them as text
+    use_codec(monkeypatch, "off")
+    init_database(db_path)
+    with pytest.raises(sqlite3.OperationalError, match="mcp_decompress"):
+        plain_connection_writes()
+    recompress(db_path)
+    plain_connection_writes()
+    with engine.connect() as conn:
+        conn.execute(text("INSERT INTO messages_fts(messages_fts, rank) VALUES('integrity-check', 1)"))
+
+
+def test_zstd_dictionary_and_recompress(db_path, tmp_path, monkeypatch):
+    pytest.importorskip("zstandard")
+    engine = init_database(db_path)
+    for i in range(300):
+        write(engine, f"conv-{i}", f"Message {i}. " + LONG[:400 + i])
+
+    dictionary = tmp_path / "content.zdict"
+    train_dictionary(db_path, str(dictionary), size=16384)
+    use_codec(monkeypatch, "zstd", MCP_ZSTD_DICTIONARY=dictionary, MCP_COMPRESS_MIN_BYTES=64)
+
+    recompress(db_path, batch_size=64)
+
+    assert stored_type(engine, "conv-7-0") == "blob"
+    with engine.connect() as conn:
+        stored, original = conn.execute(text(
+            "SELECT sum(length(content)), sum(length(mcp_decompress(content))) FROM messages"
+        )).one()
+        hits = conn.execute(text("SELECT count(*) FROM messages_fts WHERE messages_fts MATCH 'compression'")).scalar()
+        content = conn.execute(select(Message.content).where(Message.id == "conv-7-0")).scalar()
+    assert stored < original / 5
+    assert hits == 300
+    assert content == "Message 7. " + LONG[:407]
@@ -0,0 +1,96 @@
+"""Tests for the shared engine registry."""
+
+import sqlite3
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from src.models.database import EngineRegistry, is_busy, retry_when_busy, retry_when_busy_async
+
+
+@pytest.fixture
+def registry():
+    registry = EngineRegistry()
+    yield registry
+    registry.dispose()
+
+
+def test_one_engine_per_path(registry, tmp_path):
+    db_path = tmp_path / "conversations.db"
+
+    assert registry.get_engine(db_path) is registry.get_engine(str(db_path))
+    assert registry.get_engine(db_path) is not registry.get_engine(tmp_path / "other.db")
+
+
+def test_pragmas_apply_to_every_pooled_connection(registry, tmp_path, monkeypatch):
+    monkeypatch.setenv("MCP_SQLITE_BUSY_TIMEOUT", "1234")
+    engine = registry.get_engine(tmp_path / "conversations.db")
+
+    # Hold one connection open so the second comes from a fresh checkout
+    with engine.connect() as first, engine.connect() as second:
+        for conn in (first, second):
+            assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+            assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 1234
+            assert conn.execute(text("PRAGMA cache_size")).scalar() == -65536
+
+
+@pytest.mark.asyncio
+async def test_async_engine_gets_pragmas(registry, tmp_path):
+    engine = registry.get_async_engine(tmp_path / "conversations.db")
+    try:
+        async with engine.connect() as conn:
+            assert (await conn.execute(text("PRAGMA synchronous"))).scalar() == 1  # NORMAL
+            assert (await conn.execute(text("PRAGMA temp_store"))).scalar() == 2  # MEMORY
+    finally:
+        await engine.dispose()
+
+
+def busy(name="SQLITE_BUSY_SNAPSHOT", code=517):
+    error = sqlite3.OperationalError("database is locked")
+    error.sqlite_errorcode, error.sqlite_errorname = code, name
+    return OperationalError("INSERT", {}, error)
+
+
+def test_busy_transactions_are_retried():
+    attempts = []
+
+    def transaction():
+        attempts.append(True)
+        if len(attempts) < 3:
+            raise busy()
+        return "committed"
+
+    assert is_busy(busy()) and is_busy(busy("SQLITE_BUSY", 5))
+    assert retry_when_busy(transaction) == "committed"
+    assert len(attempts) == 3
+
+    # Other errors aren't retried, and the last busy error is raised
+    def broken():
+        attempts.append(True)
+        raise OperationalError("INSERT", {}, sqlite3.OperationalError("no such table: nowhere"))
+
+    attempts.clear()
+    with pytest.raises(OperationalError, match="no such table"):
+        retry_when_busy(broken)
+    assert len(attempts) == 1
+
+    def always_busy():
+        raise busy()
+
+    with pytest.raises(OperationalError, match="locked"):
+        retry_when_busy(always_busy, attempts=2)
+
+
+@pytest.mark.asyncio
+async def test_busy_async_transactions_are_retried():
+    attempts = []
+
+    async def transaction():
+        attempts.append(True)
+        if len(attempts) < 2:
+            raise busy()
+        return "committed"
+
+    assert await retry_when_busy_async(transaction) == "committed"
+    assert len(attempts) == 2
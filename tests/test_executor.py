@@ -0,0 +1,77 @@
+"""Tests for the task executor subsystem."""
+
+import asyncio
+import os
+import threading
+
+import pytest
+
+from src.utils.executor import TaskExecutor, ExecutorConfig
+
+
+def _pid_and_thread():
+    return os.getpid(), threading.current_thread().name
+
+
+def _fail():
+    raise ValueError("boom")
+
+
+@pytest.fixture
+def executor():
+    executor = TaskExecutor(ExecutorConfig(thread_workers=2, process_workers=1))
+    yield executor
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_run_blocking_uses_thread_pool(executor):
+    pid, thread = await executor.run_blocking(_pid_and_thread)
+
+    assert pid == os.getpid()
+    assert thread.startswith("mcp-worker")
+    assert executor.get_metrics()["thread_pool"]["completed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_run_cpu_uses_process_pool(executor):
+    pid, _ = await executor.run_cpu(_pid_and_thread)
+
+    assert pid != os.getpid()
+    metrics = executor.get_metrics()["process_pool"]
+    assert metrics["started"] is True
+    assert metrics["completed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_run_cpu_falls_back_to_threads_when_disabled():
+    executor = TaskExecutor(ExecutorConfig(thread_workers=1, enable_process_pool=False))
+    try:
+        pid, _ = await executor.run_cpu(_pid_and_thread)
+        assert pid == os.getpid()
+        assert "process_pool" not in executor.get_metrics()
+    finally:
+        executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_metrics_track_queue_depth_and_failures(executor):
+    gate = threading.Event()
+    tasks = [asyncio.create_task(executor.run_blocking(gate.wait)) for _ in range(5)]
+    await asyncio.sleep(0.05)
+
+    metrics = executor.get_metrics()["thread_pool"]
+    assert metrics["active"] == 2
+    assert metrics["queue_depth"] == 3
+    assert metrics["utilization"] == 1.0
+
+    gate.set()
+    await asyncio.gather(*tasks)
+
+    with pytest.raises(ValueError):
+        await executor.run_blocking(_fail)
+
+    metrics = executor.get_metrics()["thread_pool"]
+    assert metrics["queue_depth"] == 0
+    assert metrics["completed"] == 5
+    assert metrics["failed"] == 1
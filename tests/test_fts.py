@@ -0,0 +1,252 @@
+"""Tests for the external-content FTS5 schema."""
+
+import threading
+
+import pytest
+from sqlalchemy import text
+
+from src.models.bulk import BulkWriter
+from src.models.compression import reset_codec
+from src.models.conversation import drop_fts_triggers, init_database
+from src.models.database import dispose_engines
+from src.models.fts_rebuild import FTSRebuilder
+from src.search.text_search import TextSearch
+
+# FTS tables and triggers as databases created before external content have them
+LEGACY_FTS = [
+    "CREATE VIRTUAL TABLE conversations_fts USING fts5(id UNINDEXED, title, content, tokenize='porter unicode61')",
+    "CREATE VIRTUAL TABLE messages_fts USING fts5(id UNINDEXED, conversation_id UNINDEXED, content,"
+    " tokenize='porter unicode61')",
+    """CREATE TRIGGER messages_ai AFTER INSERT ON messages BEGIN
+        INSERT INTO messages_fts(id, conversation_id, content) VALUES (new.id, new.conversation_id, new.content);
+    END""",
+    """CREATE TRIGGER conversations_ai AFTER INSERT ON conversations BEGIN
+        INSERT INTO conversations_fts(id, title, content) VALUES (new.id, new.title, new.search_vector);
+    END""",
+]
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    yield str(tmp_path / "conversations.db")
+    dispose_engines()
+    reset_codec()
+
+
+def message(conv_id, index, content):
+    return {"id": f"{conv_id}-{index}", "conversation_id": conv_id, "role": "user",
+            "content": content, "created_at": None, "index": index, "extra_data": {}}
+
+
+def integrity_check(engine):
+    with engine.connect() as conn:
+        for table in ("conversations_fts", "messages_fts"):
+            # rank=1 also compares the index with the content tables
+            conn.execute(text(f"INSERT INTO {table}({table}, rank) VALUES('integrity-check', 1)"))
+
+
+def matches(engine, query):
+    return sorted(row["id"] for row in TextSearch(str(engine.url.database)).search_messages(query))
+
+
+def indexed(engine, query):
+    with engine.connect() as conn:
+        return conn.execute(text("SELECT count(*) FROM messages_fts WHERE messages_fts MATCH :q"), {"q": query}).scalar()
+
+
+def test_legacy_tables_are_migrated_in_place(db_path):
+    engine = init_database(db_path)
+    with engine.begin() as conn:
+        drop_fts_triggers(conn)
+        for name in ("conversations_fts", "messages_fts", "conversations_fts_source", "messages_fts_source"):
+            conn.execute(text(f"DROP {'VIEW' if name.endswith('source') else 'TABLE'} {name}"))
+        for ddl in LEGACY_FTS:
+            conn.execute(text(ddl))
+    writer = BulkWriter(engine)
+    writer.upsert_conversations([{"id": "c1", "title": "Old", "search_vector": "walrus"}])
+    writer.upsert_messages([message("c1", i, word) for i, word in enumerate(["otter", "beaver otter", "heron"])])
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT count(*) FROM messages_fts WHERE messages_fts MATCH 'otter'")).scalar() == 2
+
+    init_database(db_path)
+
+    with engine.connect() as conn:
+        sql = conn.execute(text("SELECT sql FROM sqlite_master WHERE name = 'messages_fts'")).scalar()
+        leftovers = conn.execute(text("SELECT count(*) FROM sqlite_master WHERE name LIKE '%fts_new%'")).scalar()
+    assert "content='messages_fts_source'" in sql
+    assert leftovers == 0
+    assert matches(engine, "otter") == ["c1-0", "c1-1"]
+    assert [row["id"] for row in TextSearch(db_path).search_conversations("walrus")] == ["c1"]
+    integrity_check(engine)
+
+    # The new triggers keep it in sync
+    BulkWriter(engine).upsert_messages([message("c1", 0, "kingfisher")])
+    assert matches(engine, "otter") == ["c1-1"]
+    assert matches(engine, "kingfisher") == ["c1-0"]
+    integrity_check(engine)
+
+
+def test_writes_keep_the_index_consistent(db_path, monkeypatch):
+    engine = init_database(db_path)
+    writer = BulkWriter(engine)
+    writer.upsert_conversations([{"id": "c1", "title": "Birds", "search_vector": "puffin"}])
+    writer.upsert_messages([message("c1", i, f"word{i} common") for i in range(20)])
+
+    # Compressed rows are indexed by their text, and deleted by it too
+    monkeypatch.setenv("MCP_CONTENT_COMPRESSION", "zlib")
+    monkeypatch.setenv("MCP_COMPRESS_MIN_BYTES", "1")
+    reset_codec()
+    init_database(db_path)
+    writer.upsert_messages([message("c1", i, f"changed{i} " * 20) for i in range(5)])
+    writer.replace_messages(["c1"], [message("c1", i, f"fresh{i} common") for i in range(10)])
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM messages WHERE id = 'c1-9'"))
+        conn.execute(text("UPDATE conversations SET title = 'Seabirds', tags = '[\"x\"]' WHERE id = 'c1'"))
+
+    integrity_check(engine)
+    assert matches(engine, "common") == [f"c1-{i}" for i in range(9)]
+    assert matches(engine, "changed0") == []
+    assert [row["id"] for row in TextSearch(db_path).search_conversations("seabirds")] == ["c1"]
+
+    with engine.connect() as conn:
+        indexed = conn.execute(text("SELECT count(*) FROM messages_fts_docsize")).scalar()
+        # The index holds no copy of the text
+        stored = conn.execute(text("SELECT count(*) FROM pragma_table_list WHERE name = 'messages_fts_content'")).scalar()
+    assert indexed == 9
+    assert stored == 0
+
+
+def test_rowids_survive_vacuum_and_are_added_in_place(db_path):
+    engine = init_database(db_path)
+    writer = BulkWriter(engine)
+    writer.upsert_conversations([{"id": "c1", "title": "Birds", "search_vector": "puffin"}])
+    writer.upsert_messages([message("c1", i, f"word{i} common") for i in range(30)])
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM messages WHERE id IN ('c1-0', 'c1-1', 'c1-2')"))
+    # A table created before rid existed: implicit rowids only
+    with engine.begin() as conn:
+        drop_fts_triggers(conn)
+        conn.execute(text("DROP VIEW messages_fts_source"))
+        conn.execute(text("CREATE TABLE messages_old AS SELECT * FROM messages WHERE 0"))
+        conn.execute(text("ALTER TABLE messages_old DROP COLUMN rid"))
+        columns = ", ".join(f'"{row[1]}"' for row in conn.execute(text("PRAGMA table_info(messages_old)")))
+        conn.execute(text(f"INSERT INTO messages_old(rowid, {columns}) SELECT rid, {columns} FROM messages"))
+        conn.execute(text("DROP TABLE messages"))
+        conn.execute(text("ALTER TABLE messages_old RENAME TO messages"))
+        before = dict(conn.execute(text("SELECT id, rowid FROM messages")).all())
+
+    init_database(db_path)
+    with engine.connect() as conn:
+        assert dict(conn.execute(text("SELECT id, rid FROM messages")).all()) == before
+    integrity_check(engine)
+
+    # VACUUM may renumber implicit rowids (e.g. to close the gaps left by deletes), never rid
+    with engine.connect() as conn:
+        conn.exec_driver_sql("VACUUM")
+        assert dict(conn.execute(text("SELECT id, rowid FROM messages")).all()) == before
+    integrity_check(engine)
+    assert matches(engine, "word7") == ["c1-7"]
+    writer.upsert_messages([message("c1", 30, "word7 again")])
+    assert matches(engine, "word7") == ["c1-30", "c1-7"]
+
+
+def test_chunked_rebuild_resumes_and_keeps_up_with_writes(db_path):
+    engine = init_database(db_path)
+    writer = BulkWriter(engine)
+    writer.upsert_conversations([{"id": f"c{i}", "title": f"Title {i}", "search_vector": "gannet"} for i in range(10)])
+    writer.upsert_messages([message(f"c{i % 10}", i, f"word{i} common") for i in range(100)])
+
+    cancel = threading.Event()
+    seen = []
+
+    def progress(state):
+        seen.append((state["table"], state["indexed"]))
+        if state["table"] == "messages_fts" and state["indexed"] >= 40:
+            # Searches are still served by the old index mid-rebuild
+            assert indexed(engine, "common") == 100
+            cancel.set()
+
+    result = FTSRebuilder(engine, batch_size=20, pause=0, progress=progress, cancel_event=cancel).rebuild()
+    assert result["status"] == "cancelled"
+    assert result["tables"]["conversations_fts"]["status"] == "completed"
+    assert seen[-1] == ("messages_fts", 40)
+    assert FTSRebuilder(engine).status()["messages_fts"]["watermark"] == 40
+
+    # Writes before and after the watermark, while the rebuild is paused
+    writer.upsert_messages([message("c5", 5, "kittiwake"), message("c0", 90, "fulmar"), message("c0", 500, "skua")])
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM messages WHERE id IN ('c7-7', 'c0-80')"))
+
+    result = TextSearch(db_path).rebuild_search_index(batch_size=20)
+    # Only the unfinished table is resumed
+    assert list(result["tables"]) == ["messages_fts"]
+    assert result["tables"]["messages_fts"]["indexed"] == 100
+
+    integrity_check(engine)
+    assert matches(engine, "kittiwake OR fulmar OR skua") == ["c0-500", "c0-90", "c5-5"]
+    assert indexed(engine, "common") == 96
+    assert FTSRebuilder(engine).status() == {}
+    with engine.connect() as conn:
+        leftovers = conn.execute(text("SELECT name FROM sqlite_master WHERE name LIKE '%fts_new%'")).all()
+    assert leftovers == []
+
+    # The swapped-in tables are kept in sync by the regular triggers
+    writer.upsert_messages([message("c1", 1, "shearwater")])
+    assert matches(engine, "shearwater") == ["c1-1"]
+    integrity_check(engine)
+
+
+def test_rebuild_can_restart_or_be_discarded(db_path):
+    engine = init_database(db_path)
+    writer = BulkWriter(engine)
+    writer.upsert_conversations([{"id": "c1", "title": "Petrels"}])
+    writer.upsert_messages([message("c1", i, "petrel") for i in range(30)])
+    cancel = threading.Event()
+    cancel.set()
+    FTSRebuilder(engine, cancel_event=cancel).rebuild(tables=["messages_fts"])
+    assert FTSRebuilder(engine).status()["messages_fts"]["indexed"] == 0
+
+    rebuilder = FTSRebuilder(engine, batch_size=7, pause=0)
+    rebuilder.discard()
+    assert rebuilder.status() == {}
+    result = rebuilder.rebuild(restart=True)
+    assert set(result["tables"]) == {"conversations_fts", "messages_fts"}
+    assert indexed(engine, "petrel") == 30
+    integrity_check(engine)
+
+
+def test_writers_keep_working_through_swaps(db_path):
+    engine = init_database(db_path)
+    writer = BulkWriter(engine)
+    writer.upsert_conversations([{"id": "c1", "title": "Auks"}])
+    writer.upsert_messages([message("c1", i, "auk " * 20) for i in range(2000)])
+    stop = threading.Event()
+    errors, writes = [], []
+
+    def write(first):
+        # Each schema change (shadow created, swapped in) makes this
+        # connection reload the schema, which can't wait on the lock
+        live = BulkWriter(engine)
+        for index in range(first, first + 100000):
+            if stop.is_set():
+                break
+            try:
+                live.upsert_messages([message("c1", index, "guillemot")])
+                writes.append(index)
+            except Exception as e:
+                errors.append(e)
+
+    threads = [threading.Thread(target=write, args=(first,)) for first in (10000, 200000)]
+    for thread in threads:
+        thread.start()
+    try:
+        for _ in range(5):
+            FTSRebuilder(engine, batch_size=500, pause=0.01).rebuild(restart=True)
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+    assert errors == []
+    assert indexed(engine, "guillemot") == len(writes)
+    integrity_check(engine)
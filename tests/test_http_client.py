@@ -0,0 +1,80 @@
+"""Tests for the async HTTP transport behind RateLimitedSession."""
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from src.utils.http_client import AsyncHTTPTransport, HTTPError
+from src.utils.rate_limiter import RateLimiter, RateLimitConfig, RateLimitedSession
+
+
+@pytest_asyncio.fixture
+async def api():
+    state = {"calls": 0}
+
+    async def conversations(request):
+        state["calls"] += 1
+        if request.query.get("throttle") and state["calls"] == 1:
+            return web.Response(status=429, headers={"Retry-After": "0"})
+        return web.json_response([{"uuid": "conv-1", "name": "First"}])
+
+    async def missing(request):
+        return web.Response(status=404, text="not found")
+
+    app = web.Application()
+    app.router.add_get("/api/organizations/org/chat_conversations", conversations)
+    app.router.add_get("/missing", missing)
+
+    server = TestServer(app)
+    await server.start_server()
+    yield server, state
+    await server.close()
+
+
+@pytest_asyncio.fixture
+async def session():
+    limiter = RateLimiter(RateLimitConfig(requests_per_second=1000, burst_size=1000, backoff_base=0.01))
+    session = RateLimitedSession(AsyncHTTPTransport(), limiter)
+    yield session
+    await session.close()
+
+
+@pytest.mark.asyncio
+async def test_request_returns_requests_like_response(api, session):
+    server, _ = api
+    response = await session.get(str(server.make_url("/api/organizations/org/chat_conversations")), timeout=5)
+
+    assert response.status_code == 200
+    assert response.json() == [{"uuid": "conv-1", "name": "First"}]
+    assert "conv-1" in response.text
+
+    missing = await session.get(str(server.make_url("/missing")))
+    assert missing.status_code == 404
+    with pytest.raises(HTTPError):
+        missing.raise_for_status()
+
+
+@pytest.mark.asyncio
+async def test_429_is_retried_on_async_transport(api, session):
+    server, state = api
+    response = await session.get(
+        str(server.make_url("/api/organizations/org/chat_conversations")), params={"throttle": "1"}
+    )
+
+    assert response.status_code == 200
+    assert state["calls"] == 2
+
+
+@pytest.mark.asyncio
+async def test_stream_reads_body_in_chunks(api, session):
+    server, _ = api
+    url = str(server.make_url("/api/organizations/org/chat_conversations"))
+
+    async with session.stream("GET", url) as response:
+        assert response.status_code == 200
+        chunks = [chunk async for chunk in response.iter_chunks(chunk_size=8)]
+
+    assert len(chunks) > 1
+    assert b"".join(chunks).startswith(b'[{"uuid": "conv-1"')
+    assert session.get_transport_metrics()["idle_connections"] == 1
@@ -0,0 +1,141 @@
+"""Tests for bulk message hydration."""
+
+import asyncio
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from sqlalchemy import text
+
+from src.models.conversation import init_database
+from src.models.store import ConversationStore
+from src.sync import ConversationHydrator, ConversationSyncEngine
+from src.utils.http_client import AsyncHTTPTransport
+from src.utils.rate_limiter import RateLimiter, RateLimitConfig, RateLimitedSession
+from src.utils.request_queue import RequestQueueManager
+
+CONVERSATIONS = 12
+
+
+def _conversation(i: int) -> dict:
+    return {
+        "uuid": f"conv-{i:03d}",
+        "name": f"Conversation {i}",
+        "created_at": "2025-01-01T00:00:00Z",
+        "updated_at": f"2025-01-01T00:00:{i % 60:02d}Z",
+        "model": "claude",
+    }
+
+
+@pytest_asyncio.fixture
+async def api():
+    listing = [_conversation(i) for i in reversed(range(CONVERSATIONS))]
+    state = {"delay": 0.0, "fetched": []}
+
+    async def list_conversations(request):
+        offset, limit = int(request.query["offset"]), int(request.query["limit"])
+        return web.json_response(listing[offset:offset + limit])
+
+    async def get_conversation(request):
+        conv_id = request.match_info["conversation_id"]
+        assert request.query["rendering_mode"] == "messages"
+        await asyncio.sleep(state["delay"])
+        state["fetched"].append(conv_id)
+        i = int(conv_id.split("-")[1])
+        return web.json_response({
+            **_conversation(i),
+            "chat_messages": [
+                {"uuid": f"{conv_id}-m0", "sender": "human", "text": f"question {i}", "index": 0},
+                {"uuid": f"{conv_id}-m1", "sender": "assistant", "index": 1,
+                 "content": [{"type": "text", "text": f"hydrated answer {i}"}]},
+            ],
+        })
+
+    app = web.Application()
+    app.router.add_get("/api/organizations/{org_id}/chat_conversations", list_conversations)
+    app.router.add_get("/api/organizations/{org_id}/chat_conversations/{conversation_id}", get_conversation)
+    server = TestServer(app)
+    await server.start_server()
+    yield server, state
+    await server.close()
+
+
+@pytest_asyncio.fixture
+async def hydrator(api, tmp_path):
+    server, _ = api
+    db_path = str(tmp_path / "conversations.db")
+    init_database(db_path)
+    store = ConversationStore(db_path)
+    session = RateLimitedSession(
+        AsyncHTTPTransport(), RateLimiter(RateLimitConfig(requests_per_second=1000, burst_size=1000))
+    )
+    queue_manager = RequestQueueManager()
+    await queue_manager.start()
+    api_base = str(server.make_url("/api"))
+
+    await ConversationSyncEngine(session, store, page_size=50, api_base=api_base).sync("org", headers={})
+    hydrator = ConversationHydrator(
+        session, store, queue_manager, batch_size=5, concurrency=3, api_base=api_base, flush_interval=0.1
+    )
+    yield hydrator
+    await hydrator.close()
+    await queue_manager.stop()
+    await session.close()
+    await store.close()
+
+
+async def _wait_for(hydrator):
+    while hydrator.is_running():
+        await asyncio.sleep(0.01)
+    return await hydrator.status()
+
+
+@pytest.mark.asyncio
+async def test_hydrates_messages_and_fts(hydrator):
+    started = await hydrator.start("org", headers={})
+    assert started["job"]["total"] == CONVERSATIONS
+
+    status = await _wait_for(hydrator)
+    assert status["job"]["status"] == "completed"
+    assert status["job"]["written"] == CONVERSATIONS
+    assert status["job"]["messages_written"] == 2 * CONVERSATIONS
+    assert status["pending_in_database"] == 0
+
+    conv = await hydrator.store.get_conversation("conv-003")
+    assert conv["message_count"] == 2
+    assert [m["role"] for m in conv["messages"]] == ["user", "assistant"]
+    assert conv["messages"][1]["content"] == "hydrated answer 3"
+
+    async with hydrator.store.engine.connect() as conn:
+        hits = await conn.execute(text("SELECT count(*) FROM messages_fts WHERE messages_fts MATCH 'hydrated'"))
+        assert hits.scalar() == CONVERSATIONS
+
+
+@pytest.mark.asyncio
+async def test_resume_after_cancel_fetches_only_pending(hydrator, api):
+    _, state = api
+    state["delay"] = 0.05
+
+    await hydrator.start("org", headers={})
+    while (await hydrator.status())["job"]["fetched"] < 3:
+        await asyncio.sleep(0.01)
+    cancelled = await hydrator.cancel()
+    assert cancelled["job"]["status"] == "cancelled"
+    written = cancelled["job"]["written"]
+    assert 0 < written < CONVERSATIONS
+    assert cancelled["pending_in_database"] == CONVERSATIONS - written
+
+    state["delay"] = 0.0
+    resumed = await hydrator.start("org", headers={})
+    assert resumed["job"]["total"] == CONVERSATIONS - written
+    status = await _wait_for(hydrator)
+    assert status["pending_in_database"] == 0
+
+
+@pytest.mark.asyncio
+async def test_hydrate_one_stores_unknown_conversation(hydrator):
+    conv = await hydrator.hydrate_one("org", {}, "conv-999")
+
+    assert conv["id"] == "conv-999"
+    assert len(conv["messages"]) == 2
@@ -0,0 +1,40 @@
+"""Tests that heavy optional dependencies are only imported on first use."""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).parent.parent
+
+HEAVY_MODULES = ["torch", "sentence_transformers", "faiss", "reportlab", "playwright"]
+
+
+def _modules_loaded_by(statement: str) -> list:
+    """Run an import in a fresh interpreter and report which heavy modules it loaded."""
+    probe = (
+        f"import sys, json\n{statement}\n"
+        f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", probe],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+@pytest.mark.parametrize("statement", [
+    "import src",
+    "import src.exporters",
+    "from src.exporters import ObsidianExporter",
+    "import src.search",
+    "from src.search import UnifiedSearchEngine",
+])
+def test_package_import_is_light(statement):
+    """Importing a package must not pull in torch, faiss, reportlab or playwright."""
+    assert _modules_loaded_by(statement) == []
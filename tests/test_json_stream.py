@@ -0,0 +1,165 @@
+"""Tests for incremental JSON array parsing and streamed listings."""
+
+import json
+import tracemalloc
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from src.utils.http_client import AsyncHTTPTransport, HTTPError
+from src.utils.json_stream import JSONArrayParser
+from src.utils.rate_limiter import RateLimiter, RateLimitConfig, RateLimitedSession
+from src.utils.response_cache import ResponseCache
+
+
+def parse_in_chunks(body: bytes, size: int, key=None):
+    parser = JSONArrayParser(key)
+    items = []
+    for offset in range(0, len(body), size):
+        items.extend(parser.feed(body[offset:offset + size]))
+    items.extend(parser.close())
+    return items, parser
+
+
+def test_any_chunk_boundary_gives_the_same_items():
+    data = [
+        {"uuid": "a", "name": "Übersicht ✓ 日本語", "n": -12.5e3},
+        [1, 2, [3]], "string with ] and , inside", 1234567, True, None, {},
+    ]
+    body = json.dumps(data, ensure_ascii=False, indent=1).encode()
+
+    for size in (1, 2, 3, 7, 64, len(body)):
+        items, parser = parse_in_chunks(body, size)
+        assert items == data, size
+        assert parser.count == len(data)
+
+
+def test_array_inside_an_object():
+    payload = {
+        "uuid": "conv-1",
+        "name": "Long conversation",
+        "chat_messages": [{"index": i, "text": "x" * 100} for i in range(50)],
+        "settings": {"a": [1, 2]},
+    }
+    body = json.dumps(payload).encode()
+
+    messages, parser = parse_in_chunks(body, 13, key="chat_messages")
+
+    assert messages == payload["chat_messages"]
+    assert parser.fields == {"uuid": "conv-1", "name": "Long conversation", "settings": {"a": [1, 2]}}
+
+
+def test_truncated_or_wrong_documents_raise():
+    with pytest.raises(ValueError):
+        parse_in_chunks(b'[{"a": 1}, {"b"', 4)
+    with pytest.raises(ValueError):
+        parse_in_chunks(b'{"a": 1}', 4)
+
+
+def test_large_element_is_not_reparsed_per_chunk():
+    big = {"text": "y" * 2_000_000}
+    body = json.dumps([big, 1]).encode()
+    parser = JSONArrayParser()
+    attempts = 0
+    decode = parser._decode
+
+    def counting_decode(pos, final):
+        nonlocal attempts
+        attempts += 1
+        return decode(pos, final)
+
+    parser._decode = counting_decode
+    items = []
+    for offset in range(0, len(body), 1024):
+        items.extend(parser.feed(body[offset:offset + 1024]))
+    items.extend(parser.close())
+
+    assert items == [big, 1]
+    # ~2000 chunks, but the element is retried only as the buffer doubles
+    assert attempts < 40
+
+
+CONVERSATIONS = 20_000
+
+
+async def big_listing(request):
+    response = web.StreamResponse(headers={"Content-Type": "application/json", "ETag": '"v1"'})
+    await response.prepare(request)
+    await response.write(b"[")
+    for i in range(CONVERSATIONS):
+        conv = {"uuid": f"conv-{i}", "name": f"Conversation {i}", "summary": "s" * 200}
+        await response.write((b"," if i else b"") + json.dumps(conv).encode())
+    await response.write(b"]")
+    return response
+
+
+async def forbidden(request):
+    return web.Response(status=403, text="Forbidden")
+
+
+@pytest_asyncio.fixture
+async def listing_url():
+    app = web.Application()
+    app.router.add_get("/api/organizations/org/chat_conversations", big_listing)
+    app.router.add_get("/api/missing", forbidden)
+    server = TestServer(app)
+    await server.start_server()
+    yield str(server.make_url("/api/organizations/org/chat_conversations"))
+    await server.close()
+
+
+def make_session(cache=None) -> RateLimitedSession:
+    return RateLimitedSession(
+        AsyncHTTPTransport(),
+        RateLimiter(RateLimitConfig(requests_per_second=1000, burst_size=100)),
+        cache=cache
+    )
+
+
+@pytest.mark.asyncio
+async def test_streamed_listing_memory_stays_flat(listing_url):
+    session = make_session()
+    body_size = CONVERSATIONS * 250
+    tracemalloc.start()
+    try:
+        count = 0
+        async for conv in session.iter_json_array(listing_url):
+            count += 1
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        await session.close()
+
+    assert count == CONVERSATIONS
+    # Buffered, the body and the decoded list alone would be several times this
+    assert peak < body_size / 4
+
+
+@pytest.mark.asyncio
+async def test_streamed_listing_goes_through_the_cache(listing_url, tmp_path):
+    cache = ResponseCache(str(tmp_path / "responses.db"), ttls={"list_conversations": 60})
+    session = make_session(cache)
+    try:
+        first = [conv["uuid"] async for conv in session.iter_json_array(listing_url)]
+        second = [conv["uuid"] async for conv in session.iter_json_array(listing_url)]
+    finally:
+        await session.close()
+
+    assert first == second and len(first) == CONVERSATIONS
+    assert (cache.misses, cache.hits) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_error_status_raises_with_body(listing_url):
+    session = make_session()
+    try:
+        with pytest.raises(HTTPError) as error:
+            async for _ in session.iter_json_array(listing_url.replace("organizations/org/chat_conversations", "missing")):
+                pass
+    finally:
+        await session.close()
+
+    assert "403" in str(error.value)
+    assert error.value.response.text == "Forbidden"
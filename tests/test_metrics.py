@@ -0,0 +1,46 @@
+"""Tests for the fixed-memory metrics structures."""
+
+import random
+
+import pytest
+
+from src.utils.metrics import LatencyHistogram, SlidingWindowCounter
+from src.utils.rate_limiter import RateLimiter, RateLimitConfig
+
+
+def test_sliding_window_drops_old_buckets():
+    counter = SlidingWindowCounter(window=60, resolution=1)
+    for second in range(120):
+        counter.add(now=1000 + second)
+
+    assert counter.total(now=1119) == 60
+    assert counter.total(now=1150) == 29
+    assert counter.total(now=1300) == 0
+
+
+def test_histogram_percentiles_within_a_bucket():
+    rng = random.Random(3)
+    values = sorted(rng.uniform(0.001, 0.5) for _ in range(10000))
+    histogram = LatencyHistogram()
+    for value in values:
+        histogram.record(value)
+
+    for pct in (50, 95, 99):
+        exact = values[int(pct / 100 * len(values)) - 1]
+        assert histogram.percentile(pct) == pytest.approx(exact, rel=0.1)
+    assert histogram.snapshot()["max_ms"] == pytest.approx(values[-1] * 1000, abs=0.01)
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_reports_wait_and_latency():
+    limiter = RateLimiter(RateLimitConfig(requests_per_second=100, burst_size=1))
+    for _ in range(5):
+        await limiter.acquire("search")
+    limiter.record_latency("search", 0.25)
+
+    metrics = limiter.get_metrics("search")
+    assert metrics["total_requests"] == 5
+    assert metrics["requests_per_minute"] == 5
+    assert metrics["wait_time"]["count"] == 5
+    assert metrics["wait_time"]["p99_ms"] == pytest.approx(10, rel=0.15)
+    assert metrics["latency"]["p50_ms"] == pytest.approx(250, rel=0.1)
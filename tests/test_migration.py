@@ -0,0 +1,231 @@
+"""Tests for the resumable JSON export migration."""
+
+import json
+import os
+from datetime import datetime
+
+import pytest
+from sqlalchemy import text
+
+from deployment.scripts.migrate_data import DataMigrator
+from src.models.bulk import BulkWriter
+from src.models.conversation import Conversation, drop_fts_triggers, fts_triggers_present
+from src.models.database import dispose_engines
+
+
+def write_flat(directory, conv_id, words="alpha beta"):
+    data = {
+        "uuid": conv_id,
+        "name": f"Flat {conv_id}",
+        "created_at": "2025-01-01T00:00:00Z",
+        "messages": [
+            {"uuid": f"{conv_id}-0", "sender": "human", "text": f"{words} question"},
+            {"uuid": f"{conv_id}-1", "sender": "assistant", "text": f"{words} answer"},
+        ],
+    }
+    (directory / f"{conv_id}.json").write_text(json.dumps(data))
+
+
+def write_bridge(directory, conv_id):
+    conv_dir = directory / conv_id
+    conv_dir.mkdir()
+    (conv_dir / "metadata.json").write_text(json.dumps({"id": conv_id, "title": f"Bridge {conv_id}"}))
+    (conv_dir / "messages.json").write_text(json.dumps({
+        "conversation_id": conv_id,
+        "message_count": 1,
+        "messages": [{"role": "user", "content": "gamma from the extension", "index": 0}],
+    }))
+
+
+@pytest.fixture
+def export_dir(tmp_path):
+    directory = tmp_path / "export"
+    directory.mkdir()
+    yield directory
+    dispose_engines()
+
+
+def counts(migrator):
+    with migrator.engine.connect() as conn:
+        # FTS rows counted in the index itself, not through the content tables
+        return {
+            table: conn.execute(text(f"SELECT count(*) FROM {source}")).scalar()
+            for table, source in (("conversations", "conversations"), ("messages", "messages"),
+                                  ("messages_fts", "messages_fts_docsize"),
+                                  ("conversations_fts", "conversations_fts_docsize"))
+        }
+
+
+def test_both_layouts_on_a_process_pool(export_dir, tmp_path):
+    for i in range(30):
+        write_flat(export_dir, f"flat-{i:02d}")
+    for i in range(10):
+        write_bridge(export_dir, f"bridge-{i:02d}")
+
+    migrator = DataMigrator(str(export_dir), str(tmp_path / "db" / "conversations.db"),
+                            batch_size=8, transaction_size=16, workers=2)
+    stats = migrator.migrate()
+
+    assert (stats["migrated"], stats["messages"], stats["errors"]) == (40, 70, 0)
+    assert not stats["fts_rebuilt"]
+    assert counts(migrator) == {"conversations": 40, "messages": 70, "messages_fts": 70, "conversations_fts": 40}
+
+    with migrator.engine.connect() as conn:
+        assert fts_triggers_present(conn)
+        hits = conn.execute(text("SELECT conversation_id FROM messages_fts WHERE messages_fts MATCH 'gamma'")).all()
+        title = conn.execute(text("SELECT title FROM conversations WHERE id = 'bridge-03'")).scalar()
+    assert len(hits) == 10
+    assert title == "Bridge bridge-03"
+
+    # Rows were encoded in the workers; the ORM reads them back as usual
+    with migrator.Session() as session:
+        conv = session.get(Conversation, "flat-07")
+        assert conv.created_at == datetime(2025, 1, 1)
+        assert conv.extra_data["extracted_by"] == "migration"
+        assert session.get(Conversation, "bridge-03").extra_data["extracted_by"] == "extension"
+
+
+def test_interrupted_run_resumes(export_dir, tmp_path, monkeypatch):
+    for i in range(20):
+        write_flat(export_dir, f"conv-{i:02d}")
+    db_path = str(tmp_path / "conversations.db")
+
+    migrator = DataMigrator(str(export_dir), db_path, batch_size=5, transaction_size=5, workers=1)
+    write_batch = migrator._write_batch
+    written = []
+
+    def crash_after_two(batch, stats):
+        if len(written) == 2:
+            raise KeyboardInterrupt
+        written.append(batch)
+        write_batch(batch, stats)
+
+    monkeypatch.setattr(migrator, "_write_batch", crash_after_two)
+    with pytest.raises(KeyboardInterrupt):
+        migrator.migrate()
+
+    # What was committed is already indexed
+    with migrator.engine.connect() as conn:
+        assert fts_triggers_present(conn)
+    assert counts(migrator) == {"conversations": 10, "messages": 20, "messages_fts": 20, "conversations_fts": 10}
+
+    stats = DataMigrator(str(export_dir), db_path, workers=1).migrate()
+    assert (stats["resumed"], stats["migrated"], stats["fts_rebuilt"]) == (10, 10, False)
+    assert counts(migrator) == {"conversations": 20, "messages": 40, "messages_fts": 40, "conversations_fts": 20}
+
+    # Nothing left to do
+    stats = DataMigrator(str(export_dir), db_path, workers=1).migrate()
+    assert (stats["resumed"], stats["migrated"], stats["fts_rebuilt"]) == (20, 0, False)
+
+
+def test_concurrent_writes_stay_indexed(export_dir, tmp_path, monkeypatch):
+    for i in range(10):
+        write_flat(export_dir, f"conv-{i:02d}")
+    migrator = DataMigrator(str(export_dir), str(tmp_path / "conversations.db"),
+                            batch_size=2, transaction_size=2, workers=1)
+    writer = BulkWriter(migrator.engine)
+    write_batch = migrator._write_batch
+    writes = []
+
+    def with_server_writes(batch, stats):
+        # Another process (sync, hydrator, bridge) writing between transactions
+        writes.append(batch)
+        writer.upsert_messages([{"id": f"live-{len(writes)}", "conversation_id": "conv-00", "role": "user",
+                                 "content": "walrus from the server", "created_at": None, "index": 100,
+                                 "extra_data": {}}])
+        write_batch(batch, stats)
+
+    monkeypatch.setattr(migrator, "_write_batch", with_server_writes)
+    migrator.migrate()
+
+    with migrator.engine.connect() as conn:
+        hits = conn.execute(text("SELECT count(*) FROM messages_fts WHERE messages_fts MATCH 'walrus'")).scalar()
+    assert hits == len(writes) > 1
+    assert counts(migrator)["messages_fts"] == counts(migrator)["messages"] == 20 + len(writes)
+
+
+def test_sources_are_keyed_by_parsed_uuid_and_content(export_dir, tmp_path):
+    write_flat(export_dir, "conv-a")
+    db_path = str(tmp_path / "conversations.db")
+    DataMigrator(str(export_dir), db_path, workers=1).migrate()
+
+    # Renamed and touched: read again, but nothing to write
+    renamed = export_dir / "backup-of-conv-a.json"
+    (export_dir / "conv-a.json").rename(renamed)
+    os.utime(renamed, (renamed.stat().st_atime, renamed.stat().st_mtime + 10))
+    stats = DataMigrator(str(export_dir), db_path, workers=1).migrate()
+    assert (stats["skipped"], stats["migrated"]) == (1, 0)
+
+    # Changed under a file name that is an existing id: written
+    write_flat(export_dir, "conv-b")
+    migrator = DataMigrator(str(export_dir), db_path, workers=1)
+    migrator.migrate()
+    data = json.loads(renamed.read_text())
+    data["name"] = "Renamed in the export"
+    data["messages"][0]["text"] = "edited zebra question"
+    (export_dir / "conv-b.json").write_text(json.dumps(data))
+    os.utime(export_dir / "conv-b.json", (0, renamed.stat().st_mtime + 20))
+    stats = migrator.migrate()
+    assert (stats["skipped"], stats["migrated"]) == (0, 1)
+
+    with migrator.engine.connect() as conn:
+        title = conn.execute(text("SELECT title FROM conversations WHERE id = 'conv-a'")).scalar()
+        hits = conn.execute(text("SELECT id FROM messages_fts WHERE messages_fts MATCH 'zebra'")).scalars().all()
+    assert title == "Renamed in the export"
+    assert hits == ["conv-a-0"]
+    assert counts(migrator) == {"conversations": 2, "messages": 4, "messages_fts": 4, "conversations_fts": 2}
+
+
+def test_shrunk_export_drops_removed_messages(export_dir, tmp_path):
+    write_flat(export_dir, "conv-a", words="walrus")
+    db_path = str(tmp_path / "conversations.db")
+    migrator = DataMigrator(str(export_dir), db_path, workers=1)
+    migrator.migrate()
+
+    # The export now ends after the question
+    source = export_dir / "conv-a.json"
+    data = json.loads(source.read_text())
+    del data["messages"][1:]
+    source.write_text(json.dumps(data))
+    os.utime(source, (0, source.stat().st_mtime + 10))
+    stats = migrator.migrate()
+    assert stats["migrated"] == 1
+
+    with migrator.engine.connect() as conn:
+        ids = conn.execute(text("SELECT id FROM messages_fts WHERE messages_fts MATCH 'walrus'")).scalars().all()
+    assert ids == ["conv-a-0"]
+    assert counts(migrator) == {"conversations": 1, "messages": 1, "messages_fts": 1, "conversations_fts": 1}
+
+
+def test_index_missing_rows_is_rebuilt_in_chunks(export_dir, tmp_path):
+    write_flat(export_dir, "conv-a")
+    db_path = str(tmp_path / "conversations.db")
+    migrator = DataMigrator(str(export_dir), db_path, workers=1)
+    # Rows written with the triggers dropped, as an older version of this script did
+    with migrator.engine.begin() as conn:
+        drop_fts_triggers(conn)
+    BulkWriter(migrator.engine).upsert_messages([{"id": "orphan", "conversation_id": "conv-a", "role": "user",
+                                                  "content": "unindexed", "created_at": None, "index": 9,
+                                                  "extra_data": {}}])
+
+    stats = DataMigrator(str(export_dir), db_path, workers=1).migrate()
+    assert stats["fts_rebuilt"]
+    assert counts(migrator) == {"conversations": 1, "messages": 3, "messages_fts": 3, "conversations_fts": 1}
+
+
+def test_failed_source_is_retried_only_once_changed(export_dir, tmp_path):
+    write_flat(export_dir, "good")
+    broken = export_dir / "broken.json"
+    broken.write_text("{not json")
+    db_path = str(tmp_path / "conversations.db")
+
+    stats = DataMigrator(str(export_dir), db_path, workers=1).migrate()
+    assert (stats["migrated"], stats["errors"]) == (1, 1)
+
+    stats = DataMigrator(str(export_dir), db_path, workers=1).migrate()
+    assert (stats["resumed"], stats["errors"]) == (2, 0)
+
+    write_flat(export_dir, "broken")
+    os.utime(broken, (broken.stat().st_atime, broken.stat().st_mtime + 10))
+    stats = DataMigrator(str(export_dir), db_path, workers=1).migrate()
+    assert (stats["resumed"], stats["migrated"], stats["errors"]) == (1, 1, 0)
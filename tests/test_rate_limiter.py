@@ -0,0 +1,219 @@
+"""Tests for the per-endpoint GCRA rate limiter."""
+
+import asyncio
+import multiprocessing
+import time
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from src.utils.http_client import AsyncHTTPTransport
+from src.utils.rate_limit_backends import SQLiteRateLimitBackend, create_rate_limit_backend
+from src.utils.rate_limiter import RateLimiter, RateLimitConfig, RateLimitedSession, TokenBucket
+
+
+def test_bucket_allows_burst_then_spaces_requests():
+    bucket = TokenBucket(capacity=3, refill_rate=10)
+
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+    waits = [bucket.reserve() for _ in range(3)]
+    assert waits == pytest.approx([0.1, 0.2, 0.3], abs=0.01)
+    assert bucket.tokens == 0
+
+    ok, wait = bucket.consume()
+    assert not ok and wait == pytest.approx(0.4, abs=0.01)
+
+
+@pytest.mark.asyncio
+async def test_throttled_endpoint_does_not_block_others():
+    limiter = RateLimiter(RateLimitConfig(requests_per_second=20, burst_size=5))
+    finished = {}
+
+    async def hammer(endpoint: str, count: int):
+        start = time.monotonic()
+        await asyncio.gather(*(limiter.acquire(endpoint) for _ in range(count)))
+        finished[endpoint] = time.monotonic() - start
+
+    # 45 callers over the burst on one endpoint need ~2.25 s; the others
+    # fit in their own burst plus a few intervals
+    slow = asyncio.create_task(hammer("get_conversation", 50))
+    await asyncio.sleep(0)
+    await asyncio.gather(hammer("list_conversations", 8), hammer("search", 8))
+
+    assert finished["list_conversations"] < 0.3
+    assert finished["search"] < 0.3
+    assert not slow.done()
+
+    await slow
+    assert finished["get_conversation"] == pytest.approx(45 / 20, abs=0.2)
+    assert limiter.get_metrics("get_conversation")["total_requests"] == 50
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_gives_its_slot_back():
+    limiter = RateLimiter(RateLimitConfig(requests_per_second=10, burst_size=1))
+    await limiter.acquire("default")
+
+    waiter = asyncio.create_task(limiter.acquire("default"))
+    await asyncio.sleep(0.01)
+    waiter.cancel()
+    await asyncio.gather(waiter, return_exceptions=True)
+
+    start = time.monotonic()
+    await limiter.acquire("default")
+    # Only the first request's interval is left, not two
+    assert time.monotonic() - start < 0.15
+
+
+class HiddenLimit:
+    """Server-side token bucket the client doesn't know about."""
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.accepted = 0
+        self.rejected = 0
+
+    async def handle(self, request):
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens < 1:
+            self.rejected += 1
+            return web.json_response({"error": "rate limited"}, status=429, headers={"Retry-After": "0.2"})
+        self.tokens -= 1
+        self.accepted += 1
+        return web.json_response({"ok": True})
+
+
+@pytest_asyncio.fixture
+async def limited_api():
+    limit = HiddenLimit(rate=40, burst=5)
+    app = web.Application()
+    app.router.add_get("/api/search", limit.handle)
+    server = TestServer(app)
+    await server.start_server()
+    yield server, limit
+    await server.close()
+
+
+@pytest.mark.asyncio
+async def test_adaptive_rate_converges_on_hidden_limit(limited_api):
+    server, limit = limited_api
+    limiter = RateLimiter(RateLimitConfig(
+        requests_per_second=20, burst_size=5, adaptive=True, max_requests_per_second=200,
+        increase_step=10, increase_interval=0.2, max_retries=10
+    ))
+    # Identical concurrent GETs would otherwise be coalesced into one request
+    session = RateLimitedSession(AsyncHTTPTransport(), limiter, coalesce=False)
+    url = str(server.make_url("/api/search"))
+    start = time.monotonic()
+
+    async def worker():
+        while time.monotonic() - start < 4:
+            response = await session.get(url)
+            assert response.status_code == 200
+
+    try:
+        workers = asyncio.gather(*(worker() for _ in range(8)))
+        await asyncio.sleep(2)
+        accepted_at_2s = limit.accepted
+        await workers
+    finally:
+        await session.close()
+
+    # Starts at half the hidden limit of 40 req/s and settles around it
+    steady_rate = (limit.accepted - accepted_at_2s) / (time.monotonic() - start - 2)
+    assert steady_rate > 28
+    assert limit.rejected < 0.1 * limit.accepted
+    assert 15 <= limiter.get_rates()["search"] <= 80
+
+
+@pytest.mark.asyncio
+async def test_retry_after_pauses_the_whole_endpoint():
+    limiter = RateLimiter(RateLimitConfig(requests_per_second=100, burst_size=10))
+    await limiter.acquire("get_conversation")
+
+    await limiter.on_rate_limited("get_conversation", retry_after=0.3)
+    start = time.monotonic()
+    await asyncio.gather(limiter.acquire("get_conversation"), limiter.acquire("list_conversations"))
+    await limiter.acquire("list_conversations")
+
+    assert time.monotonic() - start >= 0.29
+    assert limiter.get_metrics("list_conversations")["wait_time"]["max_ms"] < 50
+
+
+def _acquire_for(backend_path, start_at: float, duration: float, results):
+    """Child process: acquire as fast as allowed until the deadline, report timestamps."""
+    async def run():
+        backend = SQLiteRateLimitBackend(backend_path) if backend_path else None
+        limiter = RateLimiter(RateLimitConfig(requests_per_second=20, burst_size=5), backend=backend)
+        await asyncio.sleep(max(0.0, start_at - time.time()))
+        stamps = []
+
+        async def worker():
+            while time.time() < start_at + duration:
+                await limiter.acquire("get_conversation")
+                stamps.append(time.time())
+
+        await asyncio.gather(*(worker() for _ in range(4)))
+        await limiter.close()
+        return stamps
+
+    results.put(asyncio.run(run()))
+
+
+def _aggregate_acquisitions(backend_path, processes: int = 3, duration: float = 2.0) -> list:
+    ctx = multiprocessing.get_context("spawn")
+    results = ctx.Queue()
+    start_at = time.time() + 2.0
+    children = [
+        ctx.Process(target=_acquire_for, args=(backend_path, start_at, duration, results))
+        for _ in range(processes)
+    ]
+    for child in children:
+        child.start()
+    stamps = [stamp for _ in children for stamp in results.get(timeout=30)]
+    for child in children:
+        child.join()
+    return [stamp for stamp in stamps if stamp < start_at + duration]
+
+
+def test_sqlite_backend_shares_one_budget_across_processes(tmp_path):
+    shared = _aggregate_acquisitions(str(tmp_path / "rate_limits.db"))
+    separate = _aggregate_acquisitions(None)
+
+    # 20 req/s for 2 s plus one burst of 5, however many processes
+    assert 38 <= len(shared) <= 48
+    assert len(separate) >= 3 * 40
+
+
+def test_backend_from_env(tmp_path, monkeypatch):
+    assert create_rate_limit_backend("memory") is None
+
+    monkeypatch.setenv("RATE_LIMIT_SQLITE_PATH", str(tmp_path / "limits.db"))
+    backend = create_rate_limit_backend("sqlite")
+    assert isinstance(backend, SQLiteRateLimitBackend)
+    asyncio.run(backend.close())
+
+    with pytest.raises(ValueError):
+        create_rate_limit_backend("memcached")
+
+
+@pytest.mark.asyncio
+async def test_shared_pause_applies_to_other_limiters(tmp_path):
+    path = str(tmp_path / "rate_limits.db")
+    first = RateLimiter(RateLimitConfig(requests_per_second=100, burst_size=10), SQLiteRateLimitBackend(path))
+    second = RateLimiter(RateLimitConfig(requests_per_second=100, burst_size=10), SQLiteRateLimitBackend(path))
+    try:
+        await first.on_rate_limited("search", retry_after=0.3)
+        start = time.monotonic()
+        await second.acquire("search")
+        assert time.monotonic() - start >= 0.25
+    finally:
+        await first.close()
+        await second.close()
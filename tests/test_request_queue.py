@@ -0,0 +1,219 @@
+"""Tests for the event-driven request queue."""
+
+import asyncio
+import time
+
+import pytest
+import pytest_asyncio
+
+from src.utils.request_queue import (
+    QueueClosedError, QueueFullError, RequestExpiredError, RequestPriority, RequestQueue
+)
+
+
+@pytest_asyncio.fixture
+async def queue():
+    queue = RequestQueue(max_concurrent=1)
+    await queue.start()
+    yield queue
+    await queue.stop()
+
+
+@pytest.mark.asyncio
+async def test_dispatch_does_not_wait_for_a_poll(queue):
+    async def noop():
+        return "done"
+
+    start = time.perf_counter()
+    for _ in range(20):
+        assert await queue.enqueue(noop) == "done"
+    # The old worker slept 100 ms between checks of an empty queue
+    assert time.perf_counter() - start < 0.5
+
+
+@pytest.mark.asyncio
+async def test_higher_priority_runs_first_when_a_slot_frees(queue):
+    release = asyncio.Event()
+    order = []
+
+    async def blocker():
+        await release.wait()
+
+    async def record(name):
+        order.append(name)
+
+    first = asyncio.create_task(queue.enqueue(blocker))
+    await asyncio.sleep(0)
+    waiting = [
+        asyncio.create_task(queue.enqueue(record, "low-1", priority=RequestPriority.LOW)),
+        asyncio.create_task(queue.enqueue(record, "critical", priority=RequestPriority.CRITICAL)),
+        asyncio.create_task(queue.enqueue(record, "low-2", priority=RequestPriority.LOW)),
+        asyncio.create_task(queue.enqueue(record, "high", priority=RequestPriority.HIGH)),
+    ]
+    await asyncio.sleep(0.01)
+    release.set()
+    await asyncio.gather(first, *waiting)
+
+    assert order == ["critical", "high", "low-1", "low-2"]
+
+
+@pytest.mark.asyncio
+async def test_stop_waits_for_active_requests():
+    queue = RequestQueue(max_concurrent=2)
+    await queue.start()
+    finished = []
+
+    async def work():
+        await asyncio.sleep(0.05)
+        finished.append(True)
+
+    task = asyncio.create_task(queue.enqueue(work))
+    await asyncio.sleep(0.01)
+    await asyncio.wait_for(queue.stop(), timeout=1)
+
+    assert finished == [True]
+    await task
+
+
+async def _block(release: asyncio.Event):
+    await release.wait()
+
+
+async def _echo(value):
+    return value
+
+
+@pytest.mark.asyncio
+async def test_bounded_queue_rejects_when_full():
+    queue = RequestQueue(max_concurrent=1, max_size=2, overflow="reject")
+    await queue.start()
+    release = asyncio.Event()
+    running = asyncio.create_task(queue.enqueue(_block, release))
+    await asyncio.sleep(0.01)
+    waiting = [asyncio.create_task(queue.enqueue(_echo, i)) for i in range(2)]
+    await asyncio.sleep(0)
+
+    with pytest.raises(QueueFullError):
+        await queue.enqueue(_echo, "overflow")
+
+    release.set()
+    assert await asyncio.gather(*waiting) == [0, 1]
+    await running
+    assert queue.get_metrics()["rejected"] == 1
+    await queue.stop()
+
+
+@pytest.mark.asyncio
+async def test_bounded_queue_blocks_until_room():
+    queue = RequestQueue(max_concurrent=1, max_size=1, overflow="block")
+    await queue.start()
+    release = asyncio.Event()
+    running = asyncio.create_task(queue.enqueue(_block, release))
+    await asyncio.sleep(0.01)
+    first = asyncio.create_task(queue.enqueue(_echo, "first"))
+    await asyncio.sleep(0)
+    second = asyncio.create_task(queue.enqueue(_echo, "second"))
+    await asyncio.sleep(0.01)
+
+    assert not second.done() and queue.get_metrics()["queue_size"] == 1
+    release.set()
+    assert await asyncio.gather(first, second) == ["first", "second"]
+    await running
+    await queue.stop()
+
+
+@pytest.mark.asyncio
+async def test_expired_requests_are_dropped_before_dispatch(queue):
+    release = asyncio.Event()
+    ran = []
+
+    async def record():
+        ran.append(True)
+
+    running = asyncio.create_task(queue.enqueue(_block, release))
+    await asyncio.sleep(0.01)
+
+    start = time.perf_counter()
+    with pytest.raises(RequestExpiredError):
+        await queue.enqueue(record, expires_in=0.05)
+    # The caller hears back at the deadline, not when a slot frees up
+    assert time.perf_counter() - start < 0.2
+
+    release.set()
+    await running
+    assert ran == []
+    metrics = queue.get_metrics()
+    assert metrics["expired"] == 1 and metrics["queue_size"] == 0
+
+
+@pytest.mark.asyncio
+async def test_aging_lets_old_low_requests_overtake_new_high_ones():
+    queue = RequestQueue(max_concurrent=1, aging_interval=0.05)
+    await queue.start()
+    release = asyncio.Event()
+    order = []
+
+    async def record(name):
+        order.append(name)
+
+    running = asyncio.create_task(queue.enqueue(_block, release))
+    await asyncio.sleep(0.01)
+    low = asyncio.create_task(queue.enqueue(record, "low", priority=RequestPriority.LOW))
+    # Two intervals later LOW has aged to HIGH, ahead of a fresh HIGH
+    await asyncio.sleep(0.2)
+    high = asyncio.create_task(queue.enqueue(record, "high", priority=RequestPriority.HIGH))
+    await asyncio.sleep(0)
+    release.set()
+    await asyncio.gather(running, low, high)
+
+    assert order == ["low", "high"]
+    await queue.stop()
+
+
+@pytest.mark.asyncio
+async def test_critical_requests_are_not_overtaken_by_aged_ones():
+    queue = RequestQueue(max_concurrent=1, aging_interval=0.01)
+    await queue.start()
+    release = asyncio.Event()
+    order = []
+
+    async def record(name):
+        order.append(name)
+
+    running = asyncio.create_task(queue.enqueue(_block, release))
+    await asyncio.sleep(0.01)
+    low = asyncio.create_task(queue.enqueue(record, "low", priority=RequestPriority.LOW))
+    # Aged for many intervals, still behind a request made just now
+    await asyncio.sleep(0.2)
+    critical = asyncio.create_task(queue.enqueue(record, "critical", priority=RequestPriority.CRITICAL))
+    await asyncio.sleep(0)
+    release.set()
+    await asyncio.gather(running, low, critical)
+
+    assert order == ["critical", "low"]
+    await queue.stop()
+
+
+@pytest.mark.asyncio
+async def test_stopping_closes_the_queue_to_waiting_callers():
+    queue = RequestQueue(max_concurrent=1, max_size=1, overflow="block")
+    await queue.start()
+    release = asyncio.Event()
+    running = asyncio.create_task(queue.enqueue(_block, release))
+    await asyncio.sleep(0.01)
+    queued = asyncio.create_task(queue.enqueue(_echo, "queued"))
+    await asyncio.sleep(0)
+    blocked = asyncio.create_task(queue.enqueue(_echo, "blocked"))
+    await asyncio.sleep(0.01)
+
+    stopping = asyncio.create_task(queue.stop())
+    await asyncio.sleep(0.01)
+    # Woken by the shutdown, not pushed onto a queue nobody will drain
+    with pytest.raises(QueueClosedError):
+        await blocked
+    release.set()
+    await asyncio.gather(running, stopping)
+    with pytest.raises(QueueClosedError):
+        await queued
+    with pytest.raises(QueueClosedError):
+        await queue.enqueue(_echo, "late")
@@ -0,0 +1,162 @@
+"""Tests for retries, the retry budget and circuit breakers in RateLimitedSession."""
+
+import asyncio
+import time
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from src.utils.http_client import AsyncHTTPTransport
+from src.utils.rate_limiter import RateLimiter, RateLimitConfig, RateLimitedSession
+from src.utils.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    Resilience,
+    ResilienceConfig,
+    RetryBudget,
+)
+
+
+def test_breaker_opens_half_opens_and_closes():
+    breaker = CircuitBreaker("search", failure_threshold=3, recovery_timeout=0.1)
+    for _ in range(3):
+        assert breaker.allow()
+        breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+
+    time.sleep(0.11)
+    # One trial request at a time while half-open
+    assert breaker.allow()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+    time.sleep(0.11)
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert [(t["from"], t["to"]) for t in breaker.snapshot()["transitions"]] == [
+        ("closed", "open"), ("open", "half_open"), ("half_open", "open"),
+        ("open", "half_open"), ("half_open", "closed"),
+    ]
+    assert breaker.snapshot()["rejected"] == 2
+
+
+def test_budget_caps_retries_at_a_fraction_of_requests():
+    budget = RetryBudget(ratio=0.1, min_per_second=0, window=10)
+    for _ in range(50):
+        budget.record_request()
+
+    allowed = sum(budget.try_retry() for _ in range(20))
+    assert allowed == 5
+    assert budget.snapshot()["exhausted"] == 15
+
+
+class FlakyAPI:
+    """Serves scripted failures before answering normally."""
+
+    def __init__(self):
+        self.script = []
+        self.hits = 0
+
+    async def handle(self, request):
+        self.hits += 1
+        action = self.script.pop(0) if self.script else "ok"
+        if action == "slow":
+            await asyncio.sleep(1)
+        elif action != "ok":
+            return web.json_response({"error": action}, status=int(action))
+        return web.json_response({"ok": True})
+
+
+@pytest_asyncio.fixture
+async def flaky_api():
+    api = FlakyAPI()
+    app = web.Application()
+    app.router.add_get("/api/search", api.handle)
+    server = TestServer(app)
+    await server.start_server()
+    yield str(server.make_url("/api/search")), api
+    await server.close()
+
+
+def make_session(**resilience) -> RateLimitedSession:
+    limiter = RateLimiter(RateLimitConfig(requests_per_second=1000, burst_size=100))
+    config = ResilienceConfig(backoff_base=0.01, backoff_cap=0.05, **resilience)
+    return RateLimitedSession(AsyncHTTPTransport(), limiter, Resilience(config))
+
+
+@pytest.mark.asyncio
+async def test_retries_5xx_and_timeouts(flaky_api):
+    url, api = flaky_api
+    session = make_session()
+    api.script = ["503", "slow", "502"]
+    try:
+        response = await session.get(url, timeout=0.2)
+    finally:
+        await session.close()
+
+    assert response.status_code == 200
+    assert api.hits == 4
+    metrics = session.resilience.get_metrics()
+    assert metrics["retries"] == 3
+    assert metrics["circuit_breakers"]["search"]["state"] == "closed"
+
+
+@pytest.mark.asyncio
+async def test_client_errors_are_not_retried(flaky_api):
+    url, api = flaky_api
+    session = make_session()
+    api.script = ["404"]
+    try:
+        response = await session.get(url)
+    finally:
+        await session.close()
+
+    assert response.status_code == 404
+    assert api.hits == 1
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_fails_fast(flaky_api):
+    url, api = flaky_api
+    session = make_session(failure_threshold=3, recovery_timeout=60, max_retries=5)
+    api.script = ["503"] * 10
+    try:
+        response = await session.get(url)
+        # Retries stop as soon as the circuit opens; the last 503 is returned
+        assert response.status_code == 503
+        assert api.hits == 3
+
+        with pytest.raises(CircuitOpenError):
+            await session.get(url)
+        assert api.hits == 3
+    finally:
+        await session.close()
+
+    breaker = session.resilience.get_metrics()["circuit_breakers"]["search"]
+    assert breaker["state"] == "open"
+    assert breaker["transitions"][-1]["to"] == "open"
+
+
+@pytest.mark.asyncio
+async def test_budget_limits_retry_amplification(flaky_api):
+    url, api = flaky_api
+    session = make_session(
+        failure_threshold=1000, retry_budget_ratio=0.2, retry_budget_min_per_second=0
+    )
+    api.script = ["503"] * 1000
+    try:
+        responses = await asyncio.gather(*(session.get(url) for _ in range(50)))
+    finally:
+        await session.close()
+
+    assert all(response.status_code == 503 for response in responses)
+    # Without the budget each request would be tried 4 times
+    assert api.hits <= 50 * 1.2 + 1
+    assert session.resilience.get_metrics()["retry_budget"]["exhausted"] > 0
@@ -0,0 +1,181 @@
+"""Tests for the on-disk HTTP response cache."""
+
+import asyncio
+import os
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from src.utils.http_client import AsyncHTTPTransport
+from src.utils.rate_limiter import RateLimiter, RateLimitConfig, RateLimitedSession
+from src.utils.response_cache import ResponseCache, _RecordingStream, parse_ttls
+
+CONVERSATIONS = [{"uuid": f"conv-{i}", "name": f"Conversation {i}"} for i in range(200)]
+
+
+class ConversationAPI:
+    """Listing that supports ETags; single conversations send no validators."""
+
+    def __init__(self):
+        self.version = 1
+        self.full = 0
+        self.not_modified = 0
+
+    async def list_conversations(self, request):
+        etag = f'"v{self.version}"'
+        if request.headers.get("If-None-Match") == etag:
+            self.not_modified += 1
+            return web.Response(status=304, headers={"ETag": etag})
+        self.full += 1
+        return web.json_response(CONVERSATIONS, headers={"ETag": etag})
+
+    async def get_conversation(self, request):
+        self.full += 1
+        return web.json_response({"uuid": request.match_info["id"], "version": self.version})
+
+
+@pytest_asyncio.fixture
+async def conversation_api(tmp_path):
+    api = ConversationAPI()
+    app = web.Application()
+    app.router.add_get("/api/chat_conversations", api.list_conversations)
+    app.router.add_get("/api/chat_conversations/{id}", api.get_conversation)
+    server = TestServer(app)
+    await server.start_server()
+
+    def make_session(max_body_size=8 * 1024 * 1024, **ttls):
+        cache = ResponseCache(str(tmp_path / "http_cache" / "responses.db"), ttls=ttls,
+                              max_body_size=max_body_size)
+        return RateLimitedSession(
+            AsyncHTTPTransport(),
+            RateLimiter(RateLimitConfig(requests_per_second=1000, burst_size=100)),
+            cache=cache
+        )
+
+    yield make_session, str(server.make_url("/api/chat_conversations")), api
+    await server.close()
+
+
+def test_parse_ttls():
+    ttls = parse_ttls("list_conversations=60, get_conversation = 5")
+    assert ttls["list_conversations"] == 60
+    assert ttls["get_conversation"] == 5
+    assert ttls["default"] == 0
+
+
+@pytest.mark.asyncio
+async def test_fresh_hit_then_etag_revalidation(conversation_api):
+    make_session, url, api = conversation_api
+    session = make_session(list_conversations=0.2)
+    headers = {"Cookie": "sessionKey=one"}
+    try:
+        first = await session.get(url, headers=headers)
+        second = await session.get(url, headers=headers)
+        assert api.full == 1
+        assert second.json() == first.json() == CONVERSATIONS
+
+        await asyncio.sleep(0.25)
+        third = await session.get(url, headers=headers)
+        assert (api.full, api.not_modified) == (1, 1)
+        assert third.status_code == 200 and third.json() == CONVERSATIONS
+
+        api.version = 2
+        await session.get(url, headers=headers, cache_ttl=0)
+        assert api.full == 2
+
+        metrics = await session.cache.get_metrics()
+        assert (metrics["hits"], metrics["revalidated"], metrics["misses"]) == (1, 1, 2)
+        assert metrics["bytes_saved"] > 0
+    finally:
+        await session.close()
+
+
+@pytest.mark.asyncio
+async def test_cache_persists_and_is_keyed_on_credentials(conversation_api):
+    make_session, url, api = conversation_api
+    session = make_session(list_conversations=60)
+    await session.get(url, headers={"Cookie": "sessionKey=one"})
+    await session.close()
+
+    # A new process (session) reads the same file
+    session = make_session(list_conversations=60)
+    try:
+        await session.get(url, headers={"Cookie": "sessionKey=one"})
+        assert api.full == 1
+        await session.get(url, headers={"Cookie": "sessionKey=two"})
+        assert api.full == 2
+    finally:
+        await session.close()
+
+    # Keys are digests and bodies compressed
+    raw = session.cache.path.read_bytes()
+    assert b"sessionKey" not in raw
+    assert b"Conversation 199" not in raw
+
+
+@pytest.mark.asyncio
+async def test_responses_without_validators_need_a_ttl(conversation_api):
+    make_session, url, api = conversation_api
+    session = make_session()
+    try:
+        for _ in range(2):
+            await session.get(f"{url}/conv-1")
+        # get_conversation has no TTL and the server sends no ETag
+        assert api.full == 2
+    finally:
+        await session.close()
+
+    session = make_session(get_conversation=60)
+    try:
+        for _ in range(2):
+            await session.get(f"{url}/conv-1")
+        assert api.full == 3
+    finally:
+        await session.close()
+
+
+@pytest.mark.asyncio
+async def test_streamed_bodies_are_recorded_up_to_the_size_limit(conversation_api):
+    make_session, url, api = conversation_api
+    session = make_session(max_body_size=512, list_conversations=60)
+    try:
+        # The compressed listing is a few KB: passed through whole, not kept
+        async with session.stream("GET", url) as response:
+            body = b"".join([chunk async for chunk in response.iter_chunks(chunk_size=256)])
+        assert body.endswith(b'"Conversation 199"}]')
+        async with session.stream("GET", url) as response:
+            await response.read()
+        assert api.full == 2
+        assert (await session.cache.get_metrics())["too_large"] == 2
+    finally:
+        await session.close()
+
+    session = make_session(list_conversations=60)
+    try:
+        for _ in range(2):
+            async with session.stream("GET", url) as response:
+                assert b"".join([chunk async for chunk in response.iter_chunks()]) == body
+        assert api.full == 3
+    finally:
+        await session.close()
+
+
+@pytest.mark.asyncio
+async def test_recording_stops_holding_the_body_past_the_limit():
+    class Incompressible:
+        status_code, headers, url = 200, {}, "https://claude.ai/api/file"
+
+        async def iter_chunks(self, chunk_size):
+            for _ in range(64):
+                yield os.urandom(chunk_size)
+
+    recording = _RecordingStream(Incompressible(), 6, max_body_size=256 * 1024)
+    held = []
+    async for _ in recording.iter_chunks(16 * 1024):
+        held.append(sum(map(len, recording._parts)))
+
+    assert recording.complete and recording.too_large
+    assert max(held) <= 256 * 1024 + 32 * 1024
+    assert held[-1] == 0 and recording.body() is None
@@ -0,0 +1,81 @@
+"""Tests for lazy loading and warm-up of the unified search engine."""
+
+import threading
+
+import pytest
+
+from src.models.conversation import init_database
+from src.models.database import dispose_engines
+from src.search import search_engine
+from src.search.search_engine import UnifiedSearchEngine
+from src.search.text_search import TextSearch
+
+
+class SlowSemanticSearch:
+    """Stands in for the model-backed backend; loads when the test allows it."""
+
+    instances = []
+
+    def __init__(self, model_name, index_path=None, db_path=None):
+        self.loading.set()
+        assert self.release.wait(5)
+        SlowSemanticSearch.instances.append(self)
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    SlowSemanticSearch.instances = []
+    SlowSemanticSearch.loading, SlowSemanticSearch.release = threading.Event(), threading.Event()
+    monkeypatch.setattr(search_engine, "SemanticSearch", SlowSemanticSearch)
+    db_path = str(tmp_path / "conversations.db")
+    init_database(db_path)
+    yield db_path
+    dispose_engines()
+
+
+def states(engine):
+    return {name: status["state"] for name, status in engine.get_status().items()}
+
+
+def test_construction_loads_nothing(db_path):
+    engine = UnifiedSearchEngine(db_path)
+
+    assert states(engine) == {"text": "pending", "semantic": "pending"}
+    assert not SlowSemanticSearch.loading.is_set()
+    assert engine._text_search is None and engine._semantic_search is None
+
+
+def test_status_follows_loading(db_path):
+    engine = UnifiedSearchEngine(db_path)
+    assert isinstance(engine.text_search, TextSearch)
+    assert engine.is_ready("text") and not engine.is_ready("semantic")
+
+    warming = threading.Thread(target=engine.warm_up, args=(["semantic"],))
+    warming.start()
+    assert SlowSemanticSearch.loading.wait(5)
+    assert states(engine) == {"text": "ready", "semantic": "loading"}
+
+    SlowSemanticSearch.release.set()
+    warming.join()
+    status = engine.get_status()["semantic"]
+    assert status["state"] == "ready" and status["load_seconds"] >= 0
+    # Loaded once, then shared
+    assert engine.semantic_search is engine.semantic_search
+    assert len(SlowSemanticSearch.instances) == 1
+
+
+def test_warm_up_records_a_failed_backend(db_path, monkeypatch):
+    def missing_model(*args, **kwargs):
+        raise ImportError("No module named 'sentence_transformers'")
+
+    monkeypatch.setattr(search_engine, "SemanticSearch", missing_model)
+    engine = UnifiedSearchEngine(db_path)
+
+    engine.warm_up()
+
+    assert states(engine) == {"text": "ready", "semantic": "failed"}
+    assert "sentence_transformers" in engine.get_status()["semantic"]["error"]
+    # Direct use still reports the error to the caller
+    with pytest.raises(ImportError):
+        engine.semantic_search
+    assert engine.text_search.search_conversations_page("anything", 5)["results"] == []
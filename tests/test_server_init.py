@@ -0,0 +1,30 @@
+"""Tests for constructing and starting the MCP server."""
+
+import pytest
+import pytest_asyncio
+
+from src.direct_api_server import DirectAPIClaudeContextServer
+from src.models.database import dispose_engines
+
+
+@pytest_asyncio.fixture
+async def server(tmp_path, monkeypatch):
+    monkeypatch.setenv("MCP_DATA_DIR", str(tmp_path))
+    monkeypatch.setenv("MCP_SEARCH_WARMUP", "false")
+    server = DirectAPIClaudeContextServer()
+    yield server
+    dispose_engines()
+
+
+@pytest.mark.asyncio
+async def test_components_share_the_store(server, tmp_path):
+    assert server.db_path.is_relative_to(tmp_path)
+    assert server.sync_engine.store is server.store
+    assert server.hydrator.store is server.store
+    assert server.hydrator.queue_manager is server.queue_manager
+
+
+@pytest.mark.asyncio
+async def test_start_and_stop(server):
+    await server.start()
+    await server.stop()
@@ -0,0 +1,157 @@
+"""Tests for passive session key health tracking."""
+
+import asyncio
+import threading
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from src.utils.http_client import AsyncHTTPTransport
+from src.utils.rate_limiter import RateLimiter, RateLimitConfig, RateLimitedSession
+from src.utils.session_health import INVALID, UNKNOWN, VALID, SessionHealth, session_key_from_headers
+
+
+def headers(key: str):
+    return {"Cookie": f"foo=bar; sessionKey={key}", "Accept": "application/json"}
+
+
+class Recorder:
+    def __init__(self, status: int = 200):
+        self.status = status
+        self.probes = []
+        self.saved = []
+
+    async def probe(self, session_key, org_id):
+        self.probes.append(session_key)
+        return self.status
+
+    def persist(self, session_key, org_id):
+        self.saved.append((session_key, org_id))
+        self.persisted_on = threading.current_thread()
+
+
+def test_session_key_from_cookie():
+    assert session_key_from_headers(headers("sk-1")) == "sk-1"
+    assert session_key_from_headers({"cookie": "sessionKey=sk-2"}) == "sk-2"
+    assert session_key_from_headers({"Accept": "application/json"}) is None
+
+
+@pytest.mark.asyncio
+async def test_status_follows_responses_and_saves_only_on_change():
+    recorder = Recorder()
+    health = SessionHealth(recorder.probe, recorder.persist, idle_interval=60, saved=("sk-old", "org"))
+    try:
+        health.track("sk-old", "org")
+        assert health.status == UNKNOWN
+
+        for _ in range(5):
+            health.observe(headers("sk-old"), 200)
+        assert health.status == VALID
+        # Already on disk
+        assert recorder.saved == []
+
+        health.observe(headers("someone-else"), 401)
+        assert health.status == VALID
+
+        health.track("sk-new", "org")
+        health.observe(headers("sk-new"), 200)
+        health.observe(headers("sk-new"), 200)
+        await asyncio.sleep(0.01)
+        assert recorder.saved == [("sk-new", "org")]
+        # Written from the response hook, but not on the event loop
+        assert recorder.persisted_on is not threading.current_thread()
+
+        health.observe(headers("sk-new"), 403)
+        assert health.status == INVALID
+        assert health.get_status()["last_status_code"] == 403
+        assert recorder.probes == []
+    finally:
+        await health.close()
+
+
+@pytest.mark.asyncio
+async def test_idle_session_is_probed_in_the_background():
+    recorder = Recorder(status=401)
+    health = SessionHealth(recorder.probe, recorder.persist, idle_interval=0.1)
+    try:
+        health.track("sk-1", "org")
+        # Traffic keeps the probe away
+        for _ in range(3):
+            await asyncio.sleep(0.05)
+            health.observe(headers("sk-1"), 200)
+        assert recorder.probes == []
+
+        await asyncio.sleep(0.25)
+        assert recorder.probes == ["sk-1"]
+        assert health.status == INVALID
+
+        # A rejected key isn't probed again
+        await asyncio.sleep(0.25)
+        assert recorder.probes == ["sk-1"]
+    finally:
+        await health.close()
+
+
+@pytest.mark.asyncio
+async def test_probing_stops_when_idle_and_resumes_with_the_next_call():
+    recorder = Recorder()
+    health = SessionHealth(recorder.probe, recorder.persist, idle_interval=0.05, idle_limit=0.2)
+    try:
+        health.track("sk-1", "org")
+        await asyncio.sleep(0.4)
+        probes = len(recorder.probes)
+        assert 2 <= probes <= 4
+        assert not health.get_status()["probing"]
+
+        await asyncio.sleep(0.2)
+        assert len(recorder.probes) == probes
+
+        health.track("sk-1", "org")
+        assert health.get_status()["probing"]
+        await asyncio.sleep(0.1)
+        assert len(recorder.probes) > probes
+    finally:
+        await health.close()
+
+
+async def conversations(request):
+    if "sessionKey=good" not in request.headers.get("Cookie", ""):
+        return web.json_response({"error": "unauthorized"}, status=401)
+    return web.json_response([])
+
+
+@pytest_asyncio.fixture
+async def api_url():
+    app = web.Application()
+    app.router.add_get("/api/organizations/org/chat_conversations", conversations)
+    server = TestServer(app)
+    await server.start_server()
+    yield str(server.make_url("/api/organizations/org/chat_conversations"))
+    await server.close()
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_session_reports_responses(api_url):
+    recorder = Recorder()
+    health = SessionHealth(recorder.probe, recorder.persist, idle_interval=60)
+    session = RateLimitedSession(
+        AsyncHTTPTransport(),
+        RateLimiter(RateLimitConfig(requests_per_second=1000, burst_size=100)),
+        on_response=health.observe
+    )
+    try:
+        health.track("good", "org")
+        await session.get(api_url, headers=headers("good"))
+        assert health.status == VALID
+
+        health.track("bad", "org")
+        response = await session.get(api_url, headers=headers("bad"))
+        assert response.status_code == 401
+        assert health.status == INVALID
+        assert recorder.saved == [("good", "org")]
+        assert recorder.probes == []
+    finally:
+        await health.close()
+        await session.close()
@@ -0,0 +1,149 @@
+"""Tests for coalescing identical concurrent requests."""
+
+import asyncio
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from src.utils.http_client import AsyncHTTPTransport
+from src.utils.rate_limiter import RateLimiter, RateLimitConfig, RateLimitedSession
+from src.utils.singleflight import SingleFlight, request_key
+
+
+class SlowAPI:
+    """Counts requests and answers after a short delay."""
+
+    def __init__(self):
+        self.hits = 0
+
+    async def handle(self, request):
+        self.hits += 1
+        await asyncio.sleep(0.1)
+        return web.json_response({"cookie": request.headers.get("Cookie")})
+
+
+@pytest_asyncio.fixture
+async def slow_api():
+    api = SlowAPI()
+    app = web.Application()
+    app.router.add_route("*", "/api/chat_conversations", api.handle)
+    server = TestServer(app)
+    await server.start_server()
+    session = RateLimitedSession(
+        AsyncHTTPTransport(), RateLimiter(RateLimitConfig(requests_per_second=1000, burst_size=100))
+    )
+    yield session, str(server.make_url("/api/chat_conversations")), api
+    await session.close()
+    await server.close()
+
+
+def test_key_depends_on_credentials_not_other_headers():
+    base = request_key("get", "https://claude.ai/api/x", {"b": 2, "a": 1},
+                       {"Cookie": "sessionKey=one", "Accept": "application/json"})
+
+    assert base == request_key("GET", "https://claude.ai/api/x", {"a": 1, "b": 2},
+                               {"cookie": "sessionKey=one"})
+    assert base != request_key("GET", "https://claude.ai/api/x", {"a": 1, "b": 2},
+                               {"Cookie": "sessionKey=two"})
+    assert "sessionKey" not in repr(base)
+
+
+@pytest.mark.asyncio
+async def test_identical_gets_share_one_request(slow_api):
+    session, url, api = slow_api
+    headers = {"Cookie": "sessionKey=one"}
+
+    responses = await asyncio.gather(*(session.get(url, headers=headers) for _ in range(10)))
+
+    assert api.hits == 1
+    assert all(response.json() == {"cookie": "sessionKey=one"} for response in responses)
+    assert session.singleflight.get_metrics()["coalesced"] == 9
+    # Nothing is cached once the flight lands
+    await session.get(url, headers=headers)
+    assert api.hits == 2
+
+
+@pytest.mark.asyncio
+async def test_different_credentials_and_posts_are_not_shared(slow_api):
+    session, url, api = slow_api
+
+    responses = await asyncio.gather(
+        session.get(url, headers={"Cookie": "sessionKey=one"}),
+        session.get(url, headers={"Cookie": "sessionKey=two"}),
+        session.post(url, headers={"Cookie": "sessionKey=one"}),
+        session.post(url, headers={"Cookie": "sessionKey=one"}),
+    )
+
+    assert api.hits == 4
+    assert [response.json()["cookie"] for response in responses[:2]] == ["sessionKey=one", "sessionKey=two"]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_the_others():
+    flight = SingleFlight()
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return "done"
+
+    first = asyncio.create_task(flight.do("key", fetch))
+    second = asyncio.create_task(flight.do("key", fetch))
+    await asyncio.sleep(0.01)
+    first.cancel()
+
+    assert await second == "done"
+    assert first.cancelled()
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_abandoned_flight_is_cancelled():
+    flight = SingleFlight()
+    started = asyncio.Event()
+
+    async def fetch():
+        started.set()
+        await asyncio.sleep(10)
+
+    caller = asyncio.create_task(flight.do("key", fetch))
+    await started.wait()
+    caller.cancel()
+    await asyncio.gather(caller, return_exceptions=True)
+    await asyncio.sleep(0)
+
+    assert flight.get_metrics()["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_callers_do_not_join_a_flight_being_cancelled():
+    flight = SingleFlight()
+    started = asyncio.Event()
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        if calls > 1:
+            return "done"
+        started.set()
+        try:
+            await asyncio.sleep(10)
+        finally:
+            # Cleanup that outlives the cancel(), e.g. closing a connection
+            await asyncio.sleep(0.02)
+
+    caller = asyncio.create_task(flight.do("key", fetch))
+    await started.wait()
+    caller.cancel()
+    await asyncio.sleep(0)
+
+    assert await flight.do("key", fetch) == "done"
+    assert caller.cancelled()
+    assert flight.get_metrics()["requests"] == 2
+    await asyncio.sleep(0.03)
+    assert flight.get_metrics()["in_flight"] == 0
@@ -0,0 +1,141 @@
+"""Tests for the async conversation store."""
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import text
+
+from src.models.conversation import init_database
+from src.models.database import dispose_engines, get_async_engine, get_engine
+from src.models.store import ConversationStore
+
+
+def listing(i: int, name: str = None) -> dict:
+    return {
+        "uuid": f"conv-{i}",
+        "name": name or f"Conversation {i}",
+        "created_at": "2025-01-01T00:00:00Z",
+        "updated_at": f"2025-01-0{i + 1}T00:00:00Z",
+        "model": "claude",
+    }
+
+
+def hydrated(i: int, *answers: str, name: str = None) -> dict:
+    return {
+        **listing(i, name),
+        "chat_messages": [
+            {"uuid": f"conv-{i}-m{j}", "sender": "human" if j % 2 == 0 else "assistant", "index": j,
+             "content": [{"type": "text", "text": answer}]}
+            for j, answer in enumerate(answers)
+        ],
+    }
+
+
+@pytest_asyncio.fixture
+async def store(tmp_path):
+    db_path = str(tmp_path / "conversations.db")
+    engine = init_database(db_path)
+    with engine.begin() as conn:
+        # Count row writes, to tell skipped upserts from no-op ones
+        conn.execute(text("CREATE TABLE writes (id TEXT)"))
+        conn.execute(text("""
+            CREATE TRIGGER count_conversation_updates AFTER UPDATE ON conversations
+            BEGIN INSERT INTO writes VALUES (new.id); END
+        """))
+    store = ConversationStore(db_path, chunk_size=2)
+    yield store
+    await store.close()
+    dispose_engines()
+
+
+def scalar(store, sql):
+    with get_engine(store.db_path).connect() as conn:
+        return conn.execute(text(sql)).scalar()
+
+
+@pytest.mark.asyncio
+async def test_sync_counts_and_skips_unchanged_rows(store):
+    assert await store.sync_conversations([]) == {"inserted": 0, "updated": 0, "unchanged": 0}
+    assert await store.sync_conversations([listing(i) for i in range(5)]) == \
+        {"inserted": 5, "updated": 0, "unchanged": 0}
+
+    assert await store.sync_conversations([listing(i) for i in range(5)]) == \
+        {"inserted": 0, "updated": 0, "unchanged": 5}
+    assert scalar(store, "SELECT count(*) FROM writes") == 0
+
+    # The API repeating a conversation counts once, and the last payload wins
+    payload = [listing(1, "Old"), listing(1, "Renamed"), listing(2), listing(5)]
+    assert await store.sync_conversations(payload) == {"inserted": 1, "updated": 1, "unchanged": 1}
+    assert scalar(store, "SELECT group_concat(id) FROM writes") == "conv-1"
+    assert (await store.get_conversation("conv-1"))["title"] == "Renamed"
+
+
+@pytest.mark.asyncio
+async def test_save_hydrated_conversations(store):
+    await store.sync_conversations([listing(0), listing(1)])
+    assert await store.count_hydration_pending() == 2
+
+    written = await store.save_hydrated_conversations([
+        hydrated(0, "puffin question", "puffin answer", "follow-up", name="Not from the listing"),
+        hydrated(2, "razorbill"),
+    ])
+    assert written == 4
+    # Metadata is left to the listing sync; unknown conversations are added
+    conv = await store.get_conversation("conv-0")
+    assert conv["title"] == "Conversation 0" and conv["message_count"] == 3
+    assert [m["content"] for m in conv["messages"]] == ["puffin question", "puffin answer", "follow-up"]
+    assert [m["role"] for m in conv["messages"]] == ["user", "assistant", "user"]
+    assert (await store.get_conversation("conv-2", include_messages=False))["title"] == "Conversation 2"
+    assert await store.get_hydration_candidates() == ["conv-1"]
+
+    # Hydrating again replaces the messages, and the FTS index follows
+    assert await store.save_hydrated_conversations([hydrated(0, "guillemot")]) == 1
+    assert [m["content"] for m in await store.get_messages("conv-0")] == ["guillemot"]
+    assert scalar(store, "SELECT count(*) FROM messages_fts WHERE messages_fts MATCH 'puffin'") == 0
+    assert scalar(store, "SELECT count(*) FROM messages_fts WHERE messages_fts MATCH 'guillemot'") == 1
+
+    # A new version in the listing makes it pending again
+    await store.sync_conversations([listing(0, "Edited")])
+    assert await store.get_hydration_candidates(["conv-0", "conv-2"]) == ["conv-0"]
+
+
+@pytest.mark.asyncio
+async def test_get_conversations_keeps_the_requested_order(store):
+    await store.sync_conversations([listing(i) for i in range(4)])
+    await store.save_hydrated_conversations([hydrated(3, "a", "b"), hydrated(1, "c")])
+
+    assert await store.get_conversations([]) == []
+    found = await store.get_conversations(["conv-3", "missing", "conv-0", "conv-1"], include_messages=True)
+    assert [conv["id"] for conv in found] == ["conv-3", "conv-0", "conv-1"]
+    assert [[m["content"] for m in conv["messages"]] for conv in found] == [["a", "b"], [], ["c"]]
+    assert "messages" not in (await store.get_conversations(["conv-3"]))[0]
+
+
+@pytest.mark.asyncio
+async def test_delete_conversations(store):
+    await store.sync_conversations([listing(i) for i in range(3)])
+    await store.save_hydrated_conversations([hydrated(0, "auk"), hydrated(1, "auk"), hydrated(2, "auk")])
+
+    await store.delete_conversations(["conv-0", "conv-2", "missing"])
+
+    assert [conv["id"] for conv in await store.list_conversations()] == ["conv-1"]
+    assert await store.get_messages("conv-0") == []
+    assert scalar(store, "SELECT count(*) FROM messages") == 1
+    assert scalar(store, "SELECT count(*) FROM messages_fts WHERE messages_fts MATCH 'auk'") == 1
+    assert scalar(store, "SELECT count(*) FROM conversations_fts") == 1
+
+
+@pytest.mark.asyncio
+async def test_close_leaves_other_stores_working(store):
+    other = ConversationStore(store.db_path)
+    await store.sync_conversations([listing(0)])
+    await other.close()
+
+    # The shared engine is replaced, not left disposed in the registry
+    assert get_async_engine(store.db_path) is not store.engine
+    assert await store.sync_conversations([listing(1)]) == {"inserted": 1, "updated": 0, "unchanged": 0}
+    assert len(await ConversationStore(store.db_path).list_conversations()) == 2
+
+    # Only the registry's engine is the store's to dispose
+    engine = get_async_engine(store.db_path)
+    await ConversationStore(store.db_path, engine=engine).close()
+    assert get_async_engine(store.db_path) is engine
@@ -0,0 +1,123 @@
+"""Tests for incremental conversation sync."""
+
+from datetime import datetime, timedelta
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from src.models.conversation import init_database
+from src.models.store import ConversationStore
+from src.sync import ConversationSyncEngine
+from src.utils.http_client import AsyncHTTPTransport
+from src.utils.rate_limiter import RateLimiter, RateLimitConfig, RateLimitedSession
+
+
+def _conversation(i: int, updated: datetime) -> dict:
+    return {
+        "uuid": f"conv-{i:03d}",
+        "name": f"Conversation {i}",
+        "created_at": "2025-01-01T00:00:00Z",
+        "updated_at": updated.isoformat() + "Z",
+        "model": "claude",
+    }
+
+
+@pytest_asyncio.fixture
+async def api():
+    base = datetime(2025, 1, 1)
+    listing = [_conversation(i, base + timedelta(minutes=i)) for i in range(25)]
+    requests = []
+
+    async def list_conversations(request):
+        requests.append(dict(request.query))
+        listing.sort(key=lambda conv: conv["updated_at"], reverse=True)
+        offset, limit = int(request.query["offset"]), int(request.query["limit"])
+        return web.json_response(listing[offset:offset + limit])
+
+    app = web.Application()
+    app.router.add_get("/api/organizations/{org_id}/chat_conversations", list_conversations)
+    server = TestServer(app)
+    await server.start_server()
+    yield server, listing, requests
+    await server.close()
+
+
+@pytest_asyncio.fixture
+async def engine(api, tmp_path):
+    server, _, _ = api
+    db_path = str(tmp_path / "conversations.db")
+    init_database(db_path)
+    store = ConversationStore(db_path)
+    session = RateLimitedSession(
+        AsyncHTTPTransport(), RateLimiter(RateLimitConfig(requests_per_second=1000, burst_size=1000))
+    )
+    yield ConversationSyncEngine(session, store, page_size=10, api_base=str(server.make_url("/api")))
+    await session.close()
+    await store.close()
+
+
+@pytest.mark.asyncio
+async def test_first_sync_is_full(engine):
+    result = await engine.sync("org", headers={})
+
+    assert result["mode"] == "full"
+    assert result["pages"] == 3
+    assert result["inserted"] == 25
+    assert result["watermark"]["current"] == "2025-01-01T00:24:00Z"
+
+
+@pytest.mark.asyncio
+async def test_incremental_sync_stops_at_watermark(engine, api):
+    _, listing, requests = api
+    await engine.sync("org", headers={})
+    requests.clear()
+
+    result = await engine.sync("org", headers={})
+    assert result["mode"] == "incremental"
+    assert result["pages"] == 1
+    assert result["inserted"] == result["updated"] == 0
+
+    # Touch an old conversation: it moves to the front of the listing
+    oldest = next(conv for conv in listing if conv["uuid"] == "conv-000")
+    oldest["updated_at"] = "2025-02-01T00:00:00Z"
+    oldest["name"] = "Renamed"
+
+    result = await engine.sync("org", headers={})
+    # conv-024, at the old watermark, is compared again but left alone
+    assert result["changed_since_watermark"] == 2
+    assert (result["updated"], result["unchanged"]) == (1, 1)
+    assert result["watermark"]["current"] == "2025-02-01T00:00:00Z"
+
+    conv = await engine.store.get_conversation("conv-000", include_messages=False)
+    assert conv["title"] == "Renamed"
+
+
+@pytest.mark.asyncio
+async def test_incremental_sync_keeps_conversations_at_watermark(engine, api):
+    _, listing, _ = api
+    await engine.sync("org", headers={})
+
+    # Updated in the same instant as the watermark, after the sync read the listing
+    newest = next(conv for conv in listing if conv["uuid"] == "conv-024")
+    late = _conversation(25, datetime(2025, 1, 1))
+    late["updated_at"] = newest["updated_at"]
+    listing.append(late)
+
+    result = await engine.sync("org", headers={})
+    assert result["changed_since_watermark"] == 2
+    assert (result["inserted"], result["unchanged"]) == (1, 1)
+    assert result["watermark"]["current"] == newest["updated_at"]
+    assert await engine.store.get_conversation("conv-025", include_messages=False) is not None
+
+
+@pytest.mark.asyncio
+async def test_full_sync_skips_unchanged_rows(engine):
+    await engine.sync("org", headers={})
+
+    result = await engine.sync("org", headers={}, full=True)
+    assert result["mode"] == "full"
+    assert result["fetched"] == 25
+    assert result["unchanged"] == 25
+    assert result["inserted"] == result["updated"] == 0
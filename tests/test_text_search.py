@@ -0,0 +1,94 @@
+"""Tests for ranked, cursor-paginated FTS searches."""
+
+import pytest
+from sqlalchemy import text
+
+from src.models.bulk import BulkWriter
+from src.models.conversation import init_database
+from src.models.database import dispose_engines
+from src.search.text_search import TextSearch
+
+
+@pytest.fixture
+def search(tmp_path):
+    db_path = str(tmp_path / "conversations.db")
+    engine = init_database(db_path)
+    writer = BulkWriter(engine)
+    writer.upsert_conversations([
+        {"id": f"conv-{i}", "title": f"Conversation {i}", "search_vector": "zebra " * (i + 1)}
+        for i in range(12)
+    ])
+    # Repeating the term varies the bm25 scores; some rows tie
+    writer.upsert_messages([
+        {"id": f"conv-{i}-{j}", "conversation_id": f"conv-{i}", "role": "user",
+         "content": "zebra " * (j % 4 + 1) + "filler " * j, "created_at": None, "index": j, "extra_data": {}}
+        for i in range(3) for j in range(15)
+    ])
+    yield TextSearch(db_path)
+    dispose_engines()
+
+
+def all_pages(fetch, **kwargs):
+    ids, cursor, pages = [], None, 0
+    while True:
+        page = fetch(cursor=cursor, **kwargs)
+        ids.extend(row["id"] for row in page["results"])
+        pages += 1
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return ids, pages
+
+
+def ranking(search, query):
+    with search.engine.connect() as conn:
+        return [row.id for row in conn.execute(text("""
+            SELECT m.id FROM messages_fts JOIN messages m ON m.rowid = messages_fts.rowid
+            WHERE messages_fts MATCH :query ORDER BY bm25(messages_fts), messages_fts.rowid
+        """), {"query": query})]
+
+
+def test_pages_follow_the_full_ranking(search):
+    ids, pages = all_pages(search.search_messages_page, query="zebra", limit=7)
+
+    assert ids == ranking(search, "zebra")
+    assert len(ids) == 45 and pages == 7
+
+
+def test_page_rows_are_hydrated_with_snippets(search):
+    page = search.search_messages_page("zebra", limit=5)
+
+    assert len(page["results"]) == 5
+    scores = [row["score"] for row in page["results"]]
+    assert scores == sorted(scores)
+    for row in page["results"]:
+        assert "<mark>zebra</mark>" in row["snippet"]
+        assert row["conversation_title"].startswith("Conversation")
+
+
+def test_last_page_has_no_cursor(search):
+    assert search.search_messages_page("zebra", limit=45)["next_cursor"] is None
+    assert search.search_messages_page("nothing", limit=10) == {"results": [], "next_cursor": None}
+
+
+def test_conversation_scope(search):
+    ids, _ = all_pages(search.search_messages_page, query="zebra", conversation_id="conv-1", limit=4)
+
+    assert sorted(ids) == sorted(f"conv-1-{j}" for j in range(15))
+
+
+def test_conversation_pages(search):
+    ids, pages = all_pages(search.search_conversations_page, query="zebra", limit=5)
+
+    assert sorted(ids) == sorted(f"conv-{i}" for i in range(12))
+    assert pages == 3
+
+
+def test_cursor_is_tied_to_its_query(search):
+    cursor = search.search_messages_page("zebra", limit=5)["next_cursor"]
+
+    with pytest.raises(ValueError, match="different query"):
+        search.search_messages_page("filler", limit=5, cursor=cursor)
+    with pytest.raises(ValueError, match="different query"):
+        search.search_messages_page("zebra", conversation_id="conv-1", limit=5, cursor=cursor)
+    with pytest.raises(ValueError, match="Invalid"):
+        search.search_messages_page("zebra", limit=5, cursor="not-a-cursor")